@@ -21,6 +21,9 @@ except ImportError:
 
 # Keep all your existing imports
 from .utils.step_logger import step_logger
+from .utils.fast_router import fast_router
+from .utils.intent_scheduler import IntentScheduler
+from .prompts import MultiIntentPrompts
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +88,9 @@ class ResDexRootAgent(BaseAgent, MemoryMixin if MEMORY_AVAILABLE else object):
             tools=tools_list
         )
 
+        # Combined routing + filter extraction counters (fallback = two-stage LLM path)
+        self.combined_extraction_stats = {"used": 0, "fallback": 0}
+
         # Initialize sub-agents
         self.sub_agents = {}
         self._initialize_sub_agents()
@@ -194,13 +200,26 @@ class ResDexRootAgent(BaseAgent, MemoryMixin if MEMORY_AVAILABLE else object):
                 "details": str(e)
             })
     
+    def stream_search(self, search_filters: Dict[str, Any]):
+        """Progressive candidate search: async iterator of hydrated result pages."""
+        return self.tools["search_tool"].stream(search_filters)
+    
     async def _try_intelligent_routing(self, content: Content, session_id: str, user_id: str) -> Content:
         """FIXED intelligent routing that respects LLM decisions for single intents."""
         user_input = content.data.get("user_input", "")
         session_state = content.data.get("session_state", {})
         
-        # STEP 1: Multi-Intent Analysis using LLM
-        intent_breakdown = await self._analyze_multi_intent_breakdown(user_input, session_state)
+        # STEP 0: Deterministic fast path for common single-intent commands (no LLM call)
+        fast_path = fast_router.route(user_input, session_state)
+        if fast_path:
+            if session_id:
+                step_logger.log_step(f"⚡ Fast-path route: {fast_path['route']}", "routing")
+            intent_breakdown = fast_path["intent_breakdown"]
+            if fast_path.get("filter_intent") is not None:
+                content.data["precomputed_intent"] = fast_path["filter_intent"]
+        else:
+            # STEP 1: Multi-Intent Analysis using LLM
+            intent_breakdown = await self._analyze_multi_intent_breakdown(user_input, session_state)
         
         print(f"🔍 INTENT BREAKDOWN RESULT: {intent_breakdown}")
         
@@ -229,6 +248,8 @@ class ResDexRootAgent(BaseAgent, MemoryMixin if MEMORY_AVAILABLE else object):
                 if target_agent == "search_interaction":
                     if session_id:
                         step_logger.log_step("🎯 Routing to SearchInteractionAgent (LLM Analysis)", "routing")
+                    if first_intent.get("filter_operations") and "precomputed_intent" not in content.data:
+                        content.data["precomputed_intent"] = first_intent["filter_operations"]
                     return await self._route_to_agent("search_interaction", content, session_id)
                 
                 elif target_agent == "expansion":
@@ -448,474 +469,26 @@ class ResDexRootAgent(BaseAgent, MemoryMixin if MEMORY_AVAILABLE else object):
     async def _analyze_multi_intent_breakdown(self, user_input: str, session_state: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze if query has multiple intents and break them down - ENHANCED with intelligent extraction."""
         
-        prompt = f"""You are an intent analyzer. Break down this user query into distinct, actionable intents for a recruitment system with expansion capabilities.
-
-    User query: "{user_input}"
-
-    Current session context:
-    - Active skills: {session_state.get('keywords', [])}
-    - Experience: {session_state.get('min_exp', 0)}-{session_state.get('max_exp', 10)} years
-    - Salary: {session_state.get('min_salary',0)}-{session_state.get('max_salary'),0} lakhs
-    - Current locations: {session_state.get('current_cities', [])}
-
-    CRITICAL AGENT ROUTING RULES:
-    1. **Skill Expansion**: If user mentions "similar skills to X" or "related skills" → target_agent: "expansion"
-    2. **Title Expansion**: If user mentions "similar titles to X" or "related titles/roles/positions" → target_agent: "expansion"  
-    3. **Location Expansion**: If user mentions "nearby to X" or "similar locations" → target_agent: "expansion"
-    4.**For Company Expansion:**
-    - Company Similar: "similar companies to [COMPANY_NAME]" (e.g., "similar companies to Google")
-    - Company Groups: "add [GROUP_NAME] companies" (e.g., "add Big4 companies", "add fintech companies")
-    - Recruiter Similar: "add companies similar to my company" or "similar to recruiter company"
-    5. **Facet Generation**: If user mentions "facets", "categories", "drill down", "refine", "breakdown" → target_agent: "refinement"
-    6. **Query Relaxation**: If user mentions "relax", "broaden", "more results", "expand search", "not enough results", "too few candidates" → target_agent: "refinement"
-    5.a and 6.a Donot think much upon the raw entities for refinement agent, make them empty
-    7. **Filter Operations**: location/skills/Experience/salary/targetcompany modifications → target_agent: "search_interaction" without expansion filter
-    7.a. Send all filter operations at once to the search interaction agent. If the user enter multiple filter operations in the query, accumulate them and send at once to the search_interaction agent to proceed (means all filter operations (which are not expansion or refinement) are one intent)
-    8. **Search Execution**: Final search trigger → target_agent: "search_interaction"
-    9. **Expansion**: If the user mentions "similar skills/titles/locations to X and Y and .... then this is a single intent query
-    10. **Expansion**: If the user mentions "similar skills to X and similar titles to Y" then this is a multi intent query
-    11. **Expansion**: If the user mentions "similar skills to X, similar skills to Y" then this is a multi intent query
-    INTELLIGENT QUERY FORMATTING:
-    When creating extracted_query for expansion agent, ALWAYS format it properly:
-    - For skills: "similar skills to [SKILL_NAME]" (e.g., "similar skills to Python")
-    - For titles: "similar titles to [TITLE_NAME]" (e.g., "similar titles to Data Scientist")  
-    - For locations: "nearby locations to [LOCATION_NAME]" (e.g., "nearby locations to Mumbai")
-    - For companies: "similar companies to [Company_NAME]" (e.g., "similar companies to Infosys")
-
-    EXAMPLES OF INTELLIGENT FORMATTING:
-    Input: "skills like Python and React"
-    → Extract: ["Python", "React"]
-    → Format: "similar skills to Python and React"
-
-    Input: "titles for data scientist"  
-    → Extract: ["Data Scientist"]
-    → Format: "similar titles to Data Scientist"
-
-    Input: "nearby Mumbai"
-    → Extract: ["Mumbai"] 
-    → Format: "nearby locations to Mumbai"
-
-    Input: "expand frontend skills"
-    → Extract: ["frontend"]
-    → Format: "similar skills to frontend"
-
-    QUERY RELAXATION INTENT DETECTION:
-    User expressions that indicate need for query relaxation:
-    - "relax search", "broaden search", "more results", "expand search"
-    - "not enough candidates", "too few results", "increase results"
-    - "loosen criteria", "less strict", "widen search"
-    - "get more candidates", "find more profiles", "need more options"
-    - "current search too narrow", "search is too restrictive"
-    
-    **For Refinement Agent:**
-    - Facet Generation: "generate facets for [CONTEXT]" (e.g., "generate facets for python developers")
-    - Query Relaxation: "relax search for [CONTEXT]" (e.g., "relax search for more candidates")
-
-    REFINEMENT INTENT TYPES:
-    - facet_generation: Generate categorical facets from search results
-    - query_relaxation: Relax search constraints for more results
-
-    COMPANY EXPANSION INTENT DETECTION:
-    - "similar companies to X" → target_agent: "expansion", intent_type: "company_expansion" 
-    - "companies like X" → target_agent: "expansion", intent_type: "company_expansion"
-    - "companies similar to X" → target_agent: "expansion", intent_type: "company_expansion"
-    - "Big4", "Big5", "MBB", "FAANG", "top IT companies" → target_agent: "expansion", intent_type: "company_group"
-    - "add similar companies to my company" → target_agent: "expansion", intent_type: "recruiter_similar"
-    - "companies like mine" → target_agent: "expansion", intent_type: "recruiter_similar"
-
-    TARGET COMPANY FILTER OPERATIONS:
-    - "add Amazon filter" → target_agent: "search_interaction", intent_type: "filter_operation"
-    - "remove Google company" → target_agent: "search_interaction", intent_type: "filter_operation"
-    - "filter by TCS" → target_agent: "search_interaction", intent_type: "filter_operation"
-    - "exclude Microsoft" → target_agent: "search_interaction", intent_type: "filter_operation"
-
-    Break down the query into individual intents:
-    {{
-        "is_multi_intent": true/false,
-        "total_intents": number,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "skill_expansion|title_expansion|location_expansion|company_expansion|facet_generation|query_relaxation|filter_operation|search_execution",
-                "target_agent": "expansion|refinement|search_interaction",
-                "extracted_query": "PROPERLY FORMATTED QUERY FOR TARGET AGENT",
-                "raw_entities": ["extracted", "entities", "from", "input"],
-                "execution_order": 1,
-                "description": "human readable description"
-            }}
-        ],
-        "execution_strategy": "sequential",
-        "confidence": 0.0-1.0,
-        "reasoning": "explanation of the breakdown"
-    }}
-
-    EXAMPLES:
-
-    Input: "skills like Python and titles like Data Scientist"
-    Output: {{
-        "is_multi_intent": true,
-        "total_intents": 2,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "skill_expansion",
-                "target_agent": "expansion",
-                "extracted_query": "similar skills to Python",
-                "raw_entities": ["Python"],
-                "execution_order": 1,
-                "description": "Find skills similar to Python"
-            }},
-            {{
-                "intent_id": 2,
-                "intent_type": "title_expansion", 
-                "target_agent": "expansion",
-                "extracted_query": "similar titles to Data Scientist",
-                "raw_entities": ["Data Scientist"],
-                "execution_order": 2,
-                "description": "Find titles similar to Data Scientist"
-            }}
-        ]
-    }}
-
-    Input: "similar titles for data scientist"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "title_expansion",
-                "target_agent": "expansion", 
-                "extracted_query": "similar titles to Data Scientist",
-                "raw_entities": ["Data Scientist"],
-                "execution_order": 1,
-                "description": "Find titles similar to Data Scientist"
-            }}
-        ]
-    }}
-
-    Input: "expand Python skills"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "skill_expansion",
-                "target_agent": "expansion",
-                "extracted_query": "similar skills to Python", 
-                "raw_entities": ["Python"],
-                "execution_order": 1,
-                "description": "Find skills similar to Python"
-            }}
-        ]
-    }}
-
-    Input: "nearby Mumbai locations"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "location_expansion",
-                "target_agent": "expansion",
-                "extracted_query": "nearby locations to Mumbai",
-                "raw_entities": ["Mumbai"],
-                "execution_order": 1,
-                "description": "Find locations near Mumbai"
-            }}
-        ]
-    }}
-
-    Input: "show me facets for python developers"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "facet_generation",
-                "target_agent": "refinement",
-                "extracted_query": "generate facets for python developers",
-                "raw_entities": ["python", "developers"],
-                "execution_order": 1,
-                "description": "Generate facets for current search results"
-            }}
-        ]
-    }}
-
-    Input: "expand python skills and show categories"
-    Output: {{
-        "is_multi_intent": true,
-        "total_intents": 2,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "skill_expansion",
-                "target_agent": "expansion",
-                "extracted_query": "similar skills to python",
-                "raw_entities": ["python"],
-                "execution_order": 1,
-                "description": "Find skills similar to Python"
-            }},
-            {{
-                "intent_id": 2,
-                "intent_type": "facet_generation",
-                "target_agent": "refinement",
-                "extracted_query": "generate facets",
-                "raw_entities": [],
-                "execution_order": 2,
-                "description": "Generate facets after skill expansion"
-            }}
-        ]
-    }}
-
-    Input: "relax search criteria to get more candidates"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "query_relaxation",
-                "target_agent": "refinement",
-                "extracted_query": "relax search for more candidates",
-                "raw_entities": ["more", "candidates"],
-                "execution_order": 1,
-                "description": "Relax search constraints to increase candidate pool"
-            }}
-        ]
-    }}
-
-    Input: "not enough results, broaden the search"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "query_relaxation",
-                "target_agent": "refinement",
-                "extracted_query": "broaden search for more results",
-                "raw_entities": ["results", "search"],
-                "execution_order": 1,
-                "description": "Broaden search criteria for more results"
-            }}
-        ]
-    }}
-
-    Input: "similar skills to Python and relax experience criteria"
-    Output: {{
-        "is_multi_intent": true,
-        "total_intents": 2,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "skill_expansion",
-                "target_agent": "expansion",
-                "extracted_query": "similar skills to Python",
-                "raw_entities": ["Python"],
-                "execution_order": 1,
-                "description": "Find skills similar to Python"
-            }},
-            {{
-                "intent_id": 2,
-                "intent_type": "query_relaxation",
-                "target_agent": "refinement",
-                "extracted_query": "relax search for experience criteria",
-                "raw_entities": ["experience", "criteria"],
-                "execution_order": 2,
-                "description": "Relax experience requirements"
-            }}
-        ]
-    }}
-
-    Input: "expand Python skills and show categories and get more results"
-    Output: {{
-        "is_multi_intent": true,
-        "total_intents": 3,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "skill_expansion",
-                "target_agent": "expansion",
-                "extracted_query": "similar skills to Python",
-                "raw_entities": ["Python"],
-                "execution_order": 1,
-                "description": "Find skills similar to Python"
-            }},
-            {{
-                "intent_id": 2,
-                "intent_type": "facet_generation",
-                "target_agent": "refinement",
-                "extracted_query": "generate facets",
-                "raw_entities": [],
-                "execution_order": 2,
-                "description": "Generate facets after skill expansion"
-            }},
-            {{
-                "intent_id": 3,
-                "intent_type": "query_relaxation",
-                "target_agent": "refinement",
-                "extracted_query": "relax search for more results",
-                "raw_entities": ["more", "results"],
-                "execution_order": 3,
-                "description": "Relax search constraints for more candidates"
-            }}
-        ]
-    }}
-
-    Input: "need more candidates"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "query_relaxation",
-                "target_agent": "refinement",
-                "extracted_query": "relax search for more candidates",
-                "raw_entities": ["more", "candidates"],
-                "execution_order": 1,
-                "description": "Generate suggestions to get more candidates"
-            }}
-        ]
-    }}
-
-    Input: "too few results, suggest improvements"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "query_relaxation",
-                "target_agent": "refinement",
-                "extracted_query": "relax search for more results",
-                "raw_entities": ["results", "improvements"],
-                "execution_order": 1,
-                "description": "Generate relaxation suggestions for more results"
-            }}
-        ]
-    }}
-
-    Input: "similar companies to Google"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "company_expansion",
-                "target_agent": "expansion",
-                "extracted_query": "similar companies to Google",
-                "raw_entities": ["Google"],
-                "execution_order": 1,
-                "description": "Find companies similar to Google"
-            }}
-        ]
-    }}
-
-    Input: "add Big4 companies"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "company_group",
-                "target_agent": "expansion",
-                "extracted_query": "add Big4 companies",
-                "raw_entities": ["Big4"],
-                "execution_order": 1,
-                "description": "Add Big4 consulting companies"
-            }}
-        ]
-    }}
-
-    Input: "add companies like mine"
-    Output: {{
-        "is_multi_intent": false,
-        "total_intents": 1,
-        "intents": [
-            {{
-                "intent_id": 1,
-                "intent_type": "recruiter_similar",
-                "target_agent": "expansion",
-                "extracted_query": "companies similar to recruiter company",
-                "raw_entities": ["mine"],
-                "execution_order": 1,
-                "description": "Find companies similar to recruiter's company"
-            }}
-        ]
-    }}
-    Input: "add Amazon filter"
-    Output: {{
-    "is_multi_intent": false,
-    "total_intents": 1,
-    "intents": [
-        {{
-            "intent_id": 1,
-            "intent_type": "filter_operation",
-            "target_agent": "search_interaction",
-            "extracted_query": "add Amazon as target company filter",
-            "raw_entities": ["Amazon"],
-            "execution_order": 1,
-            "description": "Add Amazon to target companies filter"
-        }}
-    ]
-}}
-
-Input: "filter by Google and TCS"
-Output: {{
-    "is_multi_intent": true,
-    "total_intents": 2,
-    "intents": [
-        {{
-            "intent_id": 1,
-            "intent_type": "filter_operation",
-            "target_agent": "search_interaction",
-            "extracted_query": "add Google as target company filter",
-            "raw_entities": ["Google"],
-            "execution_order": 1,
-            "description": "Add Google to target companies filter"
-        }},
-        {{
-            "intent_id": 2,
-            "intent_type": "filter_operation",
-            "target_agent": "search_interaction",
-            "extracted_query": "add TCS as target company filter",
-            "raw_entities": ["TCS"],
-            "execution_order": 2,
-            "description": "Add TCS to target companies filter"
-        }}
-    ]
-}}
-
-Input: "remove Microsoft company"
-Output: {{
-    "is_multi_intent": false,
-    "total_intents": 1,
-    "intents": [
-        {{
-            "intent_id": 1,
-            "intent_type": "filter_operation",
-            "target_agent": "search_interaction",
-            "extracted_query": "remove Microsoft from target companies",
-            "raw_entities": ["Microsoft"],
-            "execution_order": 1,
-            "description": "Remove Microsoft from target companies filter"
-        }}
-    ]
-}}
-
-    Return ONLY the JSON response."""
+        # Static rules/examples go in the system message (prefix-cacheable); only context changes per turn
+        combined_extraction = self.config.routing_config.get("enable_combined_extraction", True)
+        system_prompt = MultiIntentPrompts.get_system_prompt(combined_extraction)
+        prompt = MultiIntentPrompts.get_user_prompt(user_input, session_state)
 
         try:
             llm_result = await self.tools["root_llm_tool"]._call_llm_direct(
                 prompt=prompt,
-                task="multi_intent_breakdown"
+                task="multi_intent_breakdown",
+                system_prompt=system_prompt,
+                cache_text=user_input,
+                cache_context={
+                    "keywords": session_state.get("keywords", []),
+                    "min_exp": session_state.get("min_exp"),
+                    "max_exp": session_state.get("max_exp"),
+                    "min_salary": session_state.get("min_salary"),
+                    "max_salary": session_state.get("max_salary"),
+                    "current_cities": session_state.get("current_cities", []),
+                    "combined_extraction": combined_extraction
+                }
             )
             
             print(f"🔍 LLM RESULT: {llm_result}")
@@ -951,6 +524,7 @@ Output: {{
                                 intent["extracted_query"] = improved_query
                                 print(f"🔧 Improved expansion query: '{original_query}' → '{improved_query}'")
                     
+                    self._attach_filter_operations(breakdown)
                     print(f"🧠 ENHANCED MULTI-INTENT BREAKDOWN: {breakdown}")
                     return {"success": True, **breakdown}
                 elif "response_text" in llm_result:
@@ -989,6 +563,7 @@ Output: {{
                                         intent["extracted_query"] = improved_query
                                         print(f"🔧 Improved expansion query: '{original_query}' → '{improved_query}'")
                             
+                            self._attach_filter_operations(breakdown)
                             print(f"🧠 ENHANCED MULTI-INTENT BREAKDOWN (manual): {breakdown}")
                             return {"success": True, **breakdown}
                     except json.JSONDecodeError as e:
@@ -1002,6 +577,32 @@ Output: {{
             print(f"❌ Multi-intent breakdown exception: {e}")
             return {"success": False, "is_multi_intent": False}
 
+    def _attach_filter_operations(self, breakdown: Dict[str, Any]):
+        """
+        Keep combined-call filter operations only where they validate; intents
+        without them fall back to SearchInteractionAgent's own LLM extraction.
+        """
+        from .sub_agents.search_interaction.tools import IntentProcessor
+
+        for intent in breakdown.get("intents", []):
+            if "filter_operations" not in intent:
+                if intent.get("target_agent") == "search_interaction":
+                    self.combined_extraction_stats["fallback"] += 1
+                continue
+            if intent.get("target_agent") != "search_interaction":
+                intent.pop("filter_operations")
+                continue
+
+            operations = IntentProcessor.validate_filter_operations(intent["filter_operations"])
+            if operations is None:
+                print(f"⚠️ Combined filter operations invalid, falling back to extraction: {intent['filter_operations']}")
+                intent.pop("filter_operations")
+                self.combined_extraction_stats["fallback"] += 1
+            else:
+                print(f"⚡ Combined extraction resolved {len(operations)} filter operations")
+                intent["filter_operations"] = operations
+                self.combined_extraction_stats["used"] += 1
+
     def _ensure_proper_expansion_format(self, extracted_query: str, intent_type: str, raw_entities: List[str]) -> str:
         """
         Ensure the extracted query is in the proper format that expansion agent patterns can handle.
@@ -1092,6 +693,58 @@ Output: {{
         # Default: return as-is
         return extracted_query
     
+    async def _run_orchestrated_intent(self, intent: Dict[str, Any], position: int, total: int,
+                                       user_input: str, session_state: Dict[str, Any],
+                                       session_id: str) -> Dict[str, Any]:
+        """Route one orchestrated intent to its agent and summarize the outcome."""
+        intent_type = intent.get("intent_type")
+        target_agent = intent.get("target_agent")
+        extracted_query = intent.get("extracted_query", "")
+        description = intent.get("description", f"Intent {position}")
+        
+        if session_id:
+            step_logger.log_step(f"⚙️ Step {position}/{total}: {description}", "orchestration")
+        
+        print(f"\n🔧 STEP {position}/{total}: {description}")
+        print(f"   Target Agent: {target_agent}")
+        print(f"   Query: '{extracted_query}'")
+        
+        try:
+            # Route to appropriate agent
+            intent_content = Content(data={
+                "user_input": extracted_query,
+                "session_state": session_state,
+                "intent_context": {
+                    "original_query": user_input,
+                    "intent_id": intent.get("intent_id"),
+                    "intent_type": intent_type,
+                    "is_orchestrated": True
+                }
+            })
+            if target_agent == "search_interaction" and intent.get("filter_operations"):
+                intent_content.data["precomputed_intent"] = intent["filter_operations"]
+            
+            result = await self._route_to_agent(target_agent, intent_content, session_id)
+            
+            if result.data.get("success", False):
+                modifications = result.data.get("modifications", [])
+                print(f"✅ Intent {position} completed: {len(modifications)} modifications")
+                return {
+                    "success": True,
+                    "modifications": modifications,
+                    "message": result.data.get("message", ""),
+                    "search_results": result.data.get("search_results", {}),
+                    "session_state": result.data.get("session_state") or session_state
+                }
+            
+            print(f"❌ Intent {position} failed: {result.data.get('error', 'Unknown error')}")
+            # Continue with other intents even if one fails
+            return {"success": False, "error": result.data.get("error", "Failed")}
+                
+        except Exception as e:
+            print(f"❌ Intent {position} exception: {e}")
+            return {"success": False, "error": str(e), "exception": str(e)}
+    
     async def _execute_multi_intent_orchestration(self, intent_breakdown: Dict[str, Any], 
                                                 user_input: str, session_state: Dict[str, Any],
                                                 session_id: str, user_id: str) -> Content:
@@ -1115,59 +768,48 @@ Output: {{
             # Sort intents by execution order
             sorted_intents = sorted(intents, key=lambda x: x.get('execution_order', 999))
             
-            # Execute each intent sequentially
-            for i, intent in enumerate(sorted_intents, 1):
-                intent_type = intent.get("intent_type")
-                target_agent = intent.get("target_agent")
-                extracted_query = intent.get("extracted_query", "")
-                description = intent.get("description", f"Intent {i}")
-                
-                if session_id:
-                    step_logger.log_step(f"⚙️ Step {i}/{len(sorted_intents)}: {description}", "orchestration")
+            if self.config.enable_parallel_execution and len(sorted_intents) > 1:
+                # Independent intents run concurrently on copies of the state; deltas merge in execution order
+                orchestration = self.config.get_orchestration_config()
+                scheduler = IntentScheduler(
+                    max_parallel=orchestration.get("max_parallel_agents", 3),
+                    timeout=orchestration.get("timeout_seconds")
+                )
                 
-                print(f"\n🔧 STEP {i}/{len(sorted_intents)}: {description}")
-                print(f"   Target Agent: {target_agent}")
-                print(f"   Query: '{extracted_query}'")
+                async def run_intent(index: int, intent: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
+                    return await self._run_orchestrated_intent(intent, index + 1, len(sorted_intents),
+                                                               user_input, state, session_id)
                 
-                try:
-                    # Route to appropriate agent
-                    intent_content = Content(data={
-                        "user_input": extracted_query,
-                        "session_state": session_state,
-                        "intent_context": {
-                            "original_query": user_input,
-                            "intent_id": intent.get("intent_id"),
-                            "intent_type": intent_type,
-                            "is_orchestrated": True
-                        }
-                    })
-                    
-                    result = await self._route_to_agent(target_agent, intent_content, session_id)
-                    
-                    if result.data.get("success", False):
-                        modifications = result.data.get("modifications", [])
-                        all_modifications.extend(modifications)
-                        if "search_executed" in modifications:
-                            search_executed = True  
-                            final_result = result.data.get("search_results", {})
-                        message = result.data.get("message", "")
-                        if message:
-                            all_messages.append(message)
-                        
-                        execution_log.append(f"✅ {description}: {len(modifications)} modifications")
-                        print(f"✅ Intent {i} completed: {len(modifications)} modifications")
-                        
+                scheduled = await scheduler.run(sorted_intents, session_state, run_intent)
+                records = scheduled["records"]
+                session_state.update(scheduled["session_state"])
+                print(f"⚡ Parallel orchestration: {scheduled['stats']}")
+            else:
+                # Execute each intent sequentially
+                records = []
+                for i, intent in enumerate(sorted_intents, 1):
+                    record = await self._run_orchestrated_intent(intent, i, len(sorted_intents),
+                                                                 user_input, session_state, session_id)
+                    if record["success"]:
                         # Update session state for next intent
-                        session_state.update(result.data.get("session_state", {}))
-                    else:
-                        execution_log.append(f"❌ {description}: {result.data.get('error', 'Failed')}")
-                        print(f"❌ Intent {i} failed: {result.data.get('error', 'Unknown error')}")
-                        # Continue with other intents even if one fails
-                        
-                except Exception as e:
-                    execution_log.append(f"❌ {description}: Exception {str(e)}")
-                    print(f"❌ Intent {i} exception: {e}")
-                    continue
+                        session_state.update(record.get("session_state") or {})
+                    records.append(record)
+            
+            for i, (intent, record) in enumerate(zip(sorted_intents, records), 1):
+                description = intent.get("description", f"Intent {i}")
+                if record["success"]:
+                    modifications = record.get("modifications", [])
+                    all_modifications.extend(modifications)
+                    if "search_executed" in modifications:
+                        search_executed = True  
+                        final_result = record.get("search_results", {})
+                    if record.get("message"):
+                        all_messages.append(record["message"])
+                    execution_log.append(f"✅ {description}: {len(modifications)} modifications")
+                elif "exception" in record:
+                    execution_log.append(f"❌ {description}: Exception {record['exception']}")
+                else:
+                    execution_log.append(f"❌ {description}: {record.get('error', 'Failed')}")
             
             # Generate comprehensive response
             combined_message = " | ".join(all_messages) if all_messages else f"Orchestrated {len(sorted_intents)} intents"
@@ -18,6 +18,12 @@ class DatabaseConfig(BaseModel):
     user: str = Field(default_factory=lambda: os.getenv("DB_USER", "user_analytics"))
     password: str = Field(default_factory=lambda: os.getenv("DB_PASSWORD", "anaKm7Iv80l"))
     database: str = Field(default_factory=lambda: os.getenv("DB_NAME", "ja_LSI"))
+    pool_size: int = Field(default_factory=lambda: int(os.getenv("DB_POOL_SIZE", "5")))
+    max_overflow: int = Field(default_factory=lambda: int(os.getenv("DB_MAX_OVERFLOW", "10")))
+    pool_timeout: float = Field(default_factory=lambda: float(os.getenv("DB_POOL_TIMEOUT", "10")))
+    name_chunk_size: int = Field(default_factory=lambda: int(os.getenv("DB_NAME_CHUNK_SIZE", "500")))
+    name_cache_size: int = Field(default_factory=lambda: int(os.getenv("DB_NAME_CACHE_SIZE", "20000")))
+    name_cache_ttl: float = Field(default_factory=lambda: float(os.getenv("DB_NAME_CACHE_TTL", "3600")))
 
 
 class LLMConfig(BaseModel):
@@ -27,6 +33,24 @@ class LLMConfig(BaseModel):
     model: str = Field(default_factory=lambda: os.getenv("LLM_MODEL", "Qwen/Qwen3-32B"))
     temperature: float = Field(default_factory=lambda: float(os.getenv("LLM_TEMPERATURE", "0.4")))
     max_tokens: int = Field(default_factory=lambda: int(os.getenv("LLM_MAX_TOKENS", "4000")))
+    max_concurrency: int = Field(default_factory=lambda: int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+    max_connections: int = Field(default_factory=lambda: int(os.getenv("LLM_MAX_CONNECTIONS", "20")))
+    keepalive_expiry: float = Field(default_factory=lambda: float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60")))
+    connect_timeout: float = Field(default_factory=lambda: float(os.getenv("LLM_CONNECT_TIMEOUT", "5")))
+    request_timeout: float = Field(default_factory=lambda: float(os.getenv("LLM_REQUEST_TIMEOUT", "120")))
+    cache_enabled: bool = Field(default_factory=lambda: os.getenv("LLM_CACHE_ENABLED", "True").lower() == "true")
+    cache_size: int = Field(default_factory=lambda: int(os.getenv("LLM_CACHE_SIZE", "5000")))
+    cache_ttl: float = Field(default_factory=lambda: float(os.getenv("LLM_CACHE_TTL", "86400")))
+    cache_path: str = Field(default_factory=lambda: os.getenv("LLM_CACHE_PATH", ""))
+    cache_similarity: float = Field(default_factory=lambda: float(os.getenv("LLM_CACHE_SIMILARITY", "0")))
+    prompt_budget: int = Field(default_factory=lambda: int(os.getenv("LLM_PROMPT_BUDGET", "12000")))
+    prompt_budgets: str = Field(default_factory=lambda: os.getenv("LLM_PROMPT_BUDGETS", "extract_intent:6000"))
+    cache_tasks: str = Field(default_factory=lambda: os.getenv(
+        "LLM_CACHE_TASKS",
+        "extract_intent,multi_intent_breakdown,skill_expansion,title_expansion,location_expansion,"
+        "location_analysis,metro_area_analysis,industry_hub_analysis,"
+        "company_similarity_analysis,company_group_analysis"
+    ))
 
 
 class APIConfig(BaseModel):
@@ -34,6 +58,53 @@ class APIConfig(BaseModel):
     search_api_url: str = Field(default_factory=lambda: os.getenv("SEARCH_API_URL", "http://staging1-ni-resdexsearch-exp-services.restapis.services.resdex.com/naukri-resdexsearch-simulator-services/v1/search/doSearch?source=es8"))
     user_details_api_url: str = Field(default_factory=lambda: os.getenv("USER_DETAILS_API_URL", "http://staging1-search-data-services.restapis.services.resdex.com/search-data-simulator-services/v0/search/profile/getDetails"))
     location_api_url: str = Field(default_factory=lambda: os.getenv("LOCATION_API_URL", "http://test.taxonomy.services.analytics.resdex.com/taxonomy-other-entities-service/v0/locationNormalization"))
+    location_cache_size: int = Field(default_factory=lambda: int(os.getenv("LOCATION_CACHE_SIZE", "5000")))
+    location_cache_ttl: float = Field(default_factory=lambda: float(os.getenv("LOCATION_CACHE_TTL", "86400")))
+    search_deadline: float = Field(default_factory=lambda: float(os.getenv("SEARCH_DEADLINE", "60")))
+    enrichment_timeout: float = Field(default_factory=lambda: float(os.getenv("SEARCH_ENRICHMENT_TIMEOUT", "10")))
+    hydration_page_size: int = Field(default_factory=lambda: int(os.getenv("HYDRATION_PAGE_SIZE", "20")))
+    hydration_prefetch_pages: int = Field(default_factory=lambda: int(os.getenv("HYDRATION_PREFETCH_PAGES", "2")))
+    location_cache_prewarm: bool = Field(default_factory=lambda: os.getenv("LOCATION_CACHE_PREWARM", "True").lower() == "true")
+
+
+class HTTPConfig(BaseModel):
+    """Shared async HTTP transport configuration."""
+    total_limit: int = Field(default_factory=lambda: int(os.getenv("HTTP_TOTAL_LIMIT", "100")))
+    limit_per_host: int = Field(default_factory=lambda: int(os.getenv("HTTP_LIMIT_PER_HOST", "20")))
+    keepalive_timeout: float = Field(default_factory=lambda: float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "60")))
+    connect_timeout: float = Field(default_factory=lambda: float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")))
+    request_timeout: float = Field(default_factory=lambda: float(os.getenv("HTTP_REQUEST_TIMEOUT", "30")))
+    dns_cache_ttl: int = Field(default_factory=lambda: int(os.getenv("HTTP_DNS_CACHE_TTL", "300")))
+    upstream_limits: Dict[str, int] = Field(default_factory=lambda: {
+        "search": int(os.getenv("HTTP_SEARCH_LIMIT", "20")),
+        "user_details": int(os.getenv("HTTP_USER_DETAILS_LIMIT", "20")),
+        "location": int(os.getenv("HTTP_LOCATION_LIMIT", "10")),
+        "facet": int(os.getenv("HTTP_FACET_LIMIT", "5")),
+        "relaxation": int(os.getenv("HTTP_RELAXATION_LIMIT", "5"))
+    })
+    upstream_timeouts: Dict[str, float] = Field(default_factory=lambda: {
+        "search": 30.0,
+        "user_details": 30.0,
+        "location": 10.0,
+        "facet": 90.0,
+        "relaxation": 30.0
+    })
+
+
+class MatrixServiceConfig(BaseModel):
+    """Shared matrix-expansion service (one process hosts the matrices for all workers)."""
+    socket_path: str = Field(default_factory=lambda: os.getenv("MATRIX_SERVICE_SOCKET", ""))
+    batch_window_ms: float = Field(default_factory=lambda: float(os.getenv("MATRIX_SERVICE_BATCH_WINDOW_MS", "5")))
+    max_batch_size: int = Field(default_factory=lambda: int(os.getenv("MATRIX_SERVICE_MAX_BATCH", "64")))
+    request_timeout: float = Field(default_factory=lambda: float(os.getenv("MATRIX_SERVICE_TIMEOUT", "10")))
+
+
+class GeoConfig(BaseModel):
+    """Offline geo knowledge built from sample_location (nearby, metro clusters, industry hubs)."""
+    cluster_eps_km: float = Field(default_factory=lambda: float(os.getenv("GEO_CLUSTER_EPS_KM", "30")))
+    cluster_min_samples: int = Field(default_factory=lambda: int(os.getenv("GEO_CLUSTER_MIN_SAMPLES", "3")))
+    metro_max_radius_km: float = Field(default_factory=lambda: float(os.getenv("GEO_METRO_MAX_RADIUS_KM", "60")))
+    industry_hubs_path: str = Field(default_factory=lambda: os.getenv("GEO_INDUSTRY_HUBS_PATH", ""))
 
 
 class AgentConfig(BaseModel):
@@ -48,6 +119,9 @@ class AgentConfig(BaseModel):
     database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     llm: LLMConfig = Field(default_factory=LLMConfig)
     api: APIConfig = Field(default_factory=APIConfig)
+    http: HTTPConfig = Field(default_factory=HTTPConfig)
+    matrix_service: MatrixServiceConfig = Field(default_factory=MatrixServiceConfig)
+    geo: GeoConfig = Field(default_factory=GeoConfig)
     
     # Agent behavior settings
     max_execution_time: float = Field(default_factory=lambda: float(os.getenv("MAX_EXECUTION_TIME", "30")))
@@ -59,6 +133,7 @@ class AgentConfig(BaseModel):
     ui_pagination_size: int = 5
     ui_max_candidates_display: int = 20
     ui_max_skills_display: int = 15
+    ui_step_render_interval: float = Field(default_factory=lambda: float(os.getenv("UI_STEP_RENDER_INTERVAL", "0.15")))
     
     # UPDATED: Sub-agent configurations for Phase 1 + Refinement
     sub_agent_configs: Dict[str, Dict[str, Any]] = Field(default_factory=lambda: {
@@ -116,6 +191,9 @@ class AgentConfig(BaseModel):
     # UPDATED: Agent routing configuration with refinement support
     routing_config: Dict[str, Any] = Field(default_factory=lambda: {
         "enable_intelligent_routing": True,
+        "enable_fast_path": os.getenv("ENABLE_FAST_PATH_ROUTING", "True").lower() == "true",
+        "fast_path_min_confidence": float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.8")),
+        "enable_combined_extraction": os.getenv("ENABLE_COMBINED_EXTRACTION", "True").lower() == "true",
         "enable_agent_chaining": True,
         "max_chain_length": 3,
         "routing_confidence_threshold": 0.7,
@@ -335,4 +335,619 @@ Recent conversation context:
     
     def build_prompt(self, user_input: str, current_filters: Dict[str, Any]) -> str:
         """Build intent extraction prompt without memory context (fallback)."""
-        return self.build_prompt_with_memory(user_input, current_filters, [])
\ No newline at end of file
+        return self.build_prompt_with_memory(user_input, current_filters, [])
+
+
+class MultiIntentPrompts:
+    """
+    Intent-analyzer prompt for the root agent, split into a static system prefix
+    and a small per-turn user message.
+
+    The routing rules and few-shot examples never change between turns, so an
+    OpenAI-compatible server with prefix caching reuses their KV cache and only
+    prefills the session context and query.
+    """
+
+    ROUTING_RULES = """You are an intent analyzer. Break down the user query (sent in the user message together with the current session context) into distinct, actionable intents for a recruitment system with expansion capabilities.
+
+    CRITICAL AGENT ROUTING RULES:
+    1. **Skill Expansion**: If user mentions "similar skills to X" or "related skills" → target_agent: "expansion"
+    2. **Title Expansion**: If user mentions "similar titles to X" or "related titles/roles/positions" → target_agent: "expansion"  
+    3. **Location Expansion**: If user mentions "nearby to X" or "similar locations" → target_agent: "expansion"
+    4.**For Company Expansion:**
+    - Company Similar: "similar companies to [COMPANY_NAME]" (e.g., "similar companies to Google")
+    - Company Groups: "add [GROUP_NAME] companies" (e.g., "add Big4 companies", "add fintech companies")
+    - Recruiter Similar: "add companies similar to my company" or "similar to recruiter company"
+    5. **Facet Generation**: If user mentions "facets", "categories", "drill down", "refine", "breakdown" → target_agent: "refinement"
+    6. **Query Relaxation**: If user mentions "relax", "broaden", "more results", "expand search", "not enough results", "too few candidates" → target_agent: "refinement"
+    5.a and 6.a Donot think much upon the raw entities for refinement agent, make them empty
+    7. **Filter Operations**: location/skills/Experience/salary/targetcompany modifications → target_agent: "search_interaction" without expansion filter
+    7.a. Send all filter operations at once to the search interaction agent. If the user enter multiple filter operations in the query, accumulate them and send at once to the search_interaction agent to proceed (means all filter operations (which are not expansion or refinement) are one intent)
+    8. **Search Execution**: Final search trigger → target_agent: "search_interaction"
+    9. **Expansion**: If the user mentions "similar skills/titles/locations to X and Y and .... then this is a single intent query
+    10. **Expansion**: If the user mentions "similar skills to X and similar titles to Y" then this is a multi intent query
+    11. **Expansion**: If the user mentions "similar skills to X, similar skills to Y" then this is a multi intent query
+    INTELLIGENT QUERY FORMATTING:
+    When creating extracted_query for expansion agent, ALWAYS format it properly:
+    - For skills: "similar skills to [SKILL_NAME]" (e.g., "similar skills to Python")
+    - For titles: "similar titles to [TITLE_NAME]" (e.g., "similar titles to Data Scientist")  
+    - For locations: "nearby locations to [LOCATION_NAME]" (e.g., "nearby locations to Mumbai")
+    - For companies: "similar companies to [Company_NAME]" (e.g., "similar companies to Infosys")
+
+    EXAMPLES OF INTELLIGENT FORMATTING:
+    Input: "skills like Python and React"
+    → Extract: ["Python", "React"]
+    → Format: "similar skills to Python and React"
+
+    Input: "titles for data scientist"  
+    → Extract: ["Data Scientist"]
+    → Format: "similar titles to Data Scientist"
+
+    Input: "nearby Mumbai"
+    → Extract: ["Mumbai"] 
+    → Format: "nearby locations to Mumbai"
+
+    Input: "expand frontend skills"
+    → Extract: ["frontend"]
+    → Format: "similar skills to frontend"
+
+    QUERY RELAXATION INTENT DETECTION:
+    User expressions that indicate need for query relaxation:
+    - "relax search", "broaden search", "more results", "expand search"
+    - "not enough candidates", "too few results", "increase results"
+    - "loosen criteria", "less strict", "widen search"
+    - "get more candidates", "find more profiles", "need more options"
+    - "current search too narrow", "search is too restrictive"
+    
+    **For Refinement Agent:**
+    - Facet Generation: "generate facets for [CONTEXT]" (e.g., "generate facets for python developers")
+    - Query Relaxation: "relax search for [CONTEXT]" (e.g., "relax search for more candidates")
+
+    REFINEMENT INTENT TYPES:
+    - facet_generation: Generate categorical facets from search results
+    - query_relaxation: Relax search constraints for more results
+
+    COMPANY EXPANSION INTENT DETECTION:
+    - "similar companies to X" → target_agent: "expansion", intent_type: "company_expansion" 
+    - "companies like X" → target_agent: "expansion", intent_type: "company_expansion"
+    - "companies similar to X" → target_agent: "expansion", intent_type: "company_expansion"
+    - "Big4", "Big5", "MBB", "FAANG", "top IT companies" → target_agent: "expansion", intent_type: "company_group"
+    - "add similar companies to my company" → target_agent: "expansion", intent_type: "recruiter_similar"
+    - "companies like mine" → target_agent: "expansion", intent_type: "recruiter_similar"
+
+    TARGET COMPANY FILTER OPERATIONS:
+    - "add Amazon filter" → target_agent: "search_interaction", intent_type: "filter_operation"
+    - "remove Google company" → target_agent: "search_interaction", intent_type: "filter_operation"
+    - "filter by TCS" → target_agent: "search_interaction", intent_type: "filter_operation"
+    - "exclude Microsoft" → target_agent: "search_interaction", intent_type: "filter_operation"
+
+"""
+
+    COMBINED_EXTRACTION_RULES = """    COMBINED FILTER EXTRACTION (search_interaction intents only):
+    For every intent with target_agent "search_interaction", ALSO add a "filter_operations" list with the
+    fully resolved filter actions, so no second extraction step is needed. Other intents must NOT have it.
+    Use the current experience/salary values from the session context in the user message.
+    Allowed actions: add_skill, remove_skill, modify_experience, modify_salary, add_location, remove_location,
+    add_target_company, remove_target_company, search_execution.
+    - Skills/locations/companies: {"action": "add_skill", "value": "Python", "mandatory": false, "response_text": "Added Python", "trigger_search": false}
+    - Experience/salary: always resolve to an absolute range using the current values,
+      e.g. "reduce max experience by 2" with 0-10 → {"action": "modify_experience", "operation": "set_range", "value": "0-8", "response_text": "Set experience 0-8 years", "trigger_search": false}
+    - mandatory=true only for "mandatory", "required", "must have", "essential"
+    - trigger_search=true for ALL actions when the user says "search with", "find", "show me" or "filter by"
+    Example: "add java as mandatory and search"
+    → "filter_operations": [{"action": "add_skill", "value": "Java", "mandatory": true, "response_text": "Added Java as mandatory", "trigger_search": true}]
+
+"""
+
+    OUTPUT_FORMAT = """    Break down the query into individual intents:
+    {
+        "is_multi_intent": true/false,
+        "total_intents": number,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "skill_expansion|title_expansion|location_expansion|company_expansion|facet_generation|query_relaxation|filter_operation|search_execution",
+                "target_agent": "expansion|refinement|search_interaction",
+                "extracted_query": "PROPERLY FORMATTED QUERY FOR TARGET AGENT",
+                "raw_entities": ["extracted", "entities", "from", "input"],
+                "execution_order": 1,
+                "description": "human readable description"
+            }
+        ],
+        "execution_strategy": "sequential",
+        "confidence": 0.0-1.0,
+        "reasoning": "explanation of the breakdown"
+    }
+
+    EXAMPLES:
+
+    Input: "skills like Python and titles like Data Scientist"
+    Output: {
+        "is_multi_intent": true,
+        "total_intents": 2,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "skill_expansion",
+                "target_agent": "expansion",
+                "extracted_query": "similar skills to Python",
+                "raw_entities": ["Python"],
+                "execution_order": 1,
+                "description": "Find skills similar to Python"
+            },
+            {
+                "intent_id": 2,
+                "intent_type": "title_expansion", 
+                "target_agent": "expansion",
+                "extracted_query": "similar titles to Data Scientist",
+                "raw_entities": ["Data Scientist"],
+                "execution_order": 2,
+                "description": "Find titles similar to Data Scientist"
+            }
+        ]
+    }
+
+    Input: "similar titles for data scientist"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "title_expansion",
+                "target_agent": "expansion", 
+                "extracted_query": "similar titles to Data Scientist",
+                "raw_entities": ["Data Scientist"],
+                "execution_order": 1,
+                "description": "Find titles similar to Data Scientist"
+            }
+        ]
+    }
+
+    Input: "expand Python skills"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "skill_expansion",
+                "target_agent": "expansion",
+                "extracted_query": "similar skills to Python", 
+                "raw_entities": ["Python"],
+                "execution_order": 1,
+                "description": "Find skills similar to Python"
+            }
+        ]
+    }
+
+    Input: "nearby Mumbai locations"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "location_expansion",
+                "target_agent": "expansion",
+                "extracted_query": "nearby locations to Mumbai",
+                "raw_entities": ["Mumbai"],
+                "execution_order": 1,
+                "description": "Find locations near Mumbai"
+            }
+        ]
+    }
+
+    Input: "show me facets for python developers"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "facet_generation",
+                "target_agent": "refinement",
+                "extracted_query": "generate facets for python developers",
+                "raw_entities": ["python", "developers"],
+                "execution_order": 1,
+                "description": "Generate facets for current search results"
+            }
+        ]
+    }
+
+    Input: "expand python skills and show categories"
+    Output: {
+        "is_multi_intent": true,
+        "total_intents": 2,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "skill_expansion",
+                "target_agent": "expansion",
+                "extracted_query": "similar skills to python",
+                "raw_entities": ["python"],
+                "execution_order": 1,
+                "description": "Find skills similar to Python"
+            },
+            {
+                "intent_id": 2,
+                "intent_type": "facet_generation",
+                "target_agent": "refinement",
+                "extracted_query": "generate facets",
+                "raw_entities": [],
+                "execution_order": 2,
+                "description": "Generate facets after skill expansion"
+            }
+        ]
+    }
+
+    Input: "relax search criteria to get more candidates"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "query_relaxation",
+                "target_agent": "refinement",
+                "extracted_query": "relax search for more candidates",
+                "raw_entities": ["more", "candidates"],
+                "execution_order": 1,
+                "description": "Relax search constraints to increase candidate pool"
+            }
+        ]
+    }
+
+    Input: "not enough results, broaden the search"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "query_relaxation",
+                "target_agent": "refinement",
+                "extracted_query": "broaden search for more results",
+                "raw_entities": ["results", "search"],
+                "execution_order": 1,
+                "description": "Broaden search criteria for more results"
+            }
+        ]
+    }
+
+    Input: "similar skills to Python and relax experience criteria"
+    Output: {
+        "is_multi_intent": true,
+        "total_intents": 2,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "skill_expansion",
+                "target_agent": "expansion",
+                "extracted_query": "similar skills to Python",
+                "raw_entities": ["Python"],
+                "execution_order": 1,
+                "description": "Find skills similar to Python"
+            },
+            {
+                "intent_id": 2,
+                "intent_type": "query_relaxation",
+                "target_agent": "refinement",
+                "extracted_query": "relax search for experience criteria",
+                "raw_entities": ["experience", "criteria"],
+                "execution_order": 2,
+                "description": "Relax experience requirements"
+            }
+        ]
+    }
+
+    Input: "expand Python skills and show categories and get more results"
+    Output: {
+        "is_multi_intent": true,
+        "total_intents": 3,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "skill_expansion",
+                "target_agent": "expansion",
+                "extracted_query": "similar skills to Python",
+                "raw_entities": ["Python"],
+                "execution_order": 1,
+                "description": "Find skills similar to Python"
+            },
+            {
+                "intent_id": 2,
+                "intent_type": "facet_generation",
+                "target_agent": "refinement",
+                "extracted_query": "generate facets",
+                "raw_entities": [],
+                "execution_order": 2,
+                "description": "Generate facets after skill expansion"
+            },
+            {
+                "intent_id": 3,
+                "intent_type": "query_relaxation",
+                "target_agent": "refinement",
+                "extracted_query": "relax search for more results",
+                "raw_entities": ["more", "results"],
+                "execution_order": 3,
+                "description": "Relax search constraints for more candidates"
+            }
+        ]
+    }
+
+    Input: "need more candidates"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "query_relaxation",
+                "target_agent": "refinement",
+                "extracted_query": "relax search for more candidates",
+                "raw_entities": ["more", "candidates"],
+                "execution_order": 1,
+                "description": "Generate suggestions to get more candidates"
+            }
+        ]
+    }
+
+    Input: "too few results, suggest improvements"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "query_relaxation",
+                "target_agent": "refinement",
+                "extracted_query": "relax search for more results",
+                "raw_entities": ["results", "improvements"],
+                "execution_order": 1,
+                "description": "Generate relaxation suggestions for more results"
+            }
+        ]
+    }
+
+    Input: "similar companies to Google"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "company_expansion",
+                "target_agent": "expansion",
+                "extracted_query": "similar companies to Google",
+                "raw_entities": ["Google"],
+                "execution_order": 1,
+                "description": "Find companies similar to Google"
+            }
+        ]
+    }
+
+    Input: "add Big4 companies"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "company_group",
+                "target_agent": "expansion",
+                "extracted_query": "add Big4 companies",
+                "raw_entities": ["Big4"],
+                "execution_order": 1,
+                "description": "Add Big4 consulting companies"
+            }
+        ]
+    }
+
+    Input: "add companies like mine"
+    Output: {
+        "is_multi_intent": false,
+        "total_intents": 1,
+        "intents": [
+            {
+                "intent_id": 1,
+                "intent_type": "recruiter_similar",
+                "target_agent": "expansion",
+                "extracted_query": "companies similar to recruiter company",
+                "raw_entities": ["mine"],
+                "execution_order": 1,
+                "description": "Find companies similar to recruiter's company"
+            }
+        ]
+    }
+    Input: "add Amazon filter"
+    Output: {
+    "is_multi_intent": false,
+    "total_intents": 1,
+    "intents": [
+        {
+            "intent_id": 1,
+            "intent_type": "filter_operation",
+            "target_agent": "search_interaction",
+            "extracted_query": "add Amazon as target company filter",
+            "raw_entities": ["Amazon"],
+            "execution_order": 1,
+            "description": "Add Amazon to target companies filter"
+        }
+    ]
+}
+
+Input: "filter by Google and TCS"
+Output: {
+    "is_multi_intent": true,
+    "total_intents": 2,
+    "intents": [
+        {
+            "intent_id": 1,
+            "intent_type": "filter_operation",
+            "target_agent": "search_interaction",
+            "extracted_query": "add Google as target company filter",
+            "raw_entities": ["Google"],
+            "execution_order": 1,
+            "description": "Add Google to target companies filter"
+        },
+        {
+            "intent_id": 2,
+            "intent_type": "filter_operation",
+            "target_agent": "search_interaction",
+            "extracted_query": "add TCS as target company filter",
+            "raw_entities": ["TCS"],
+            "execution_order": 2,
+            "description": "Add TCS to target companies filter"
+        }
+    ]
+}
+
+Input: "remove Microsoft company"
+Output: {
+    "is_multi_intent": false,
+    "total_intents": 1,
+    "intents": [
+        {
+            "intent_id": 1,
+            "intent_type": "filter_operation",
+            "target_agent": "search_interaction",
+            "extracted_query": "remove Microsoft from target companies",
+            "raw_entities": ["Microsoft"],
+            "execution_order": 1,
+            "description": "Remove Microsoft from target companies filter"
+        }
+    ]
+}
+
+    Return ONLY the JSON response."""
+
+    @classmethod
+    def get_system_prompt(cls, combined_extraction: bool = True) -> str:
+        """Static prefix; only changes when combined extraction is toggled in config."""
+        if combined_extraction:
+            return cls.ROUTING_RULES + cls.COMBINED_EXTRACTION_RULES + cls.OUTPUT_FORMAT
+        return cls.ROUTING_RULES + cls.OUTPUT_FORMAT
+
+    @staticmethod
+    def get_user_prompt(user_input: str, session_state: Dict[str, Any]) -> str:
+        """Per-turn suffix: the query plus the session context the rules refer to."""
+        return f"""User query: "{user_input}"
+
+Current session context:
+- Active skills: {session_state.get('keywords', [])}
+- Experience: {session_state.get('min_exp', 0)}-{session_state.get('max_exp', 10)} years
+- Salary: {session_state.get('min_salary', 0)}-{session_state.get('max_salary', 15)} lakhs
+- Current locations: {session_state.get('current_cities', [])}"""
+
+
+class FilterIntentPrompts:
+    """Filter-intent extraction prompt used by LLMTool: static system prefix plus per-turn filters."""
+
+    SYSTEM_PROMPT = """You are a JSON extraction assistant for a job candidate search system.   
+
+CRITICAL RULES:
+1. Return ONLY valid JSON - no explanations, no <think> tags, no extra text
+2. For single action: return one object
+3. For multiple actions: return array of objects
+4. **SEARCH EXECUTION**: When user says "execute search", "search now", "trigger search", etc.
+
+SEARCH EXECUTION SPECIAL HANDLING:
+If user request contains search execution keywords like:
+- "execute search", "trigger search", "search now", "run search"
+- "find candidates", "show results", "get candidates"
+- "show me", "find now"
+
+Return:
+{
+    "action": "search_execution",
+    "filter_type": "search",
+    "operation": "execute",
+    "value": "current_criteria",
+    "mandatory": false,
+    "response_text": "Executing search with current criteria",
+    "trigger_search": true
+}
+
+EXAMPLES:
+"execute search with updated criteria" → {"action": "search_execution", "response_text": "Executing search with current criteria", "trigger_search": true}
+"search now" → {"action": "search_execution", "response_text": "Executing search", "trigger_search": true}
+"find candidates" → {"action": "search_execution", "response_text": "Finding candidates with current filters", "trigger_search": true}
+
+ACTION TYPES:
+- add_skill: Add a keyword/skill
+- remove_skill: Remove a keyword/skill  
+- modify_experience: Change experience range
+- modify_salary: Change salary range
+- add_location: Add a city location
+
+OPERATION TYPES (USE ONLY THESE):
+- For experience/salary: "set_range" (for ranges like "5-10") or "set" (for single values)
+- NEVER use: "decrease_max_by", "increase_by", "reduce_by" - these don't exist!
+
+EXPERIENCE/SALARY MODIFICATION LOGIC:
+- "reduce experience by 2" → Calculate new range: current max - 2, use "set_range"
+- "increase salary by 5" → Calculate new range: current max + 5, use "set_range"  
+- "set experience to 8" → Use "set" with value "8"
+- "experience 5-12 years" → Use "set_range" with value "5-12"
+
+CURRENT VALUES FOR CALCULATIONS:
+- Use the current experience and salary ranges from "Current filters" in the user message
+
+TRIGGER_SEARCH LOGIC - SIMPLIFIED:
+- If user request starts with "search with" or "find" or "show me": SET trigger_search=true for ALL actions
+- If user request is just modifications without "search": SET trigger_search=false for ALL actions
+- For multiple actions: ALL actions get same trigger_search value
+- If the user asks "filter by" : SET trigger_search=true for ALL actions
+
+MANDATORY vs OPTIONAL:
+- mandatory=true for: "mandatory", "required", "must have", "should have", "essential", "permanent"
+- mandatory=false for: "optional", "nice to have", default case
+
+VALUE FORMATS:
+- Skills: "Python", "Java" (clean skill names)
+- Experience ranges: "6-15" (always min-max format)
+- Salary ranges: "7-30" (always min-max format)  
+- Locations: "Bangalore", "Mumbai" (clean city names)
+
+EXAMPLES:
+Input: "reduce experience by 2"
+Current: 0-10 years
+Calculation: 10 - 2 = 8
+Output: {"action": "modify_experience", "operation": "set_range", "value": "0-8", "response_text": "Reduced experience range to 0-8 years", "trigger_search": false}
+
+Input: "increase salary by 5"  
+Current: 0-15 lakhs
+Calculation: 15 + 5 = 20
+Output: {"action": "modify_salary", "operation": "set_range", "value": "0-20", "response_text": "Increased salary range to 0-20 lakhs", "trigger_search": false}
+
+Input: "set max experience to 12"
+Current: 0-10 years  
+Output: {"action": "modify_experience", "operation": "set_range", "value": "0-12", "response_text": "Set experience range to 0-12 years", "trigger_search": false}
+
+Input: "add python as mandatory"
+Output: {"action": "add_skill", "value": "Python", "mandatory": true, "response_text": "Added Python as mandatory skill", "trigger_search": false}
+
+Input: "search with java"
+Output: {"action": "add_skill", "value": "Java", "mandatory": false, "response_text": "Added Java and searching", "trigger_search": true}
+
+Input: "search with java as mandatory, experience 6-15 years, bangalore location, salary 7-30 lakhs"
+Output: [
+{"action": "add_skill", "value": "Java", "mandatory": true, "response_text": "Added Java as mandatory", "trigger_search": true},
+{"action": "modify_experience", "operation": "set_range", "value": "6-15", "response_text": "Set experience 6-15 years", "trigger_search": true},
+{"action": "add_location", "value": "Bangalore", "mandatory": false, "response_text": "Added Bangalore location", "trigger_search": true},
+{"action": "modify_salary", "operation": "set_range", "value": "7-30", "response_text": "Set salary 7-30 lakhs", "trigger_search": true}
+]
+
+Return ONLY the JSON response."""
+
+    @staticmethod
+    def get_user_prompt(user_input: str, current_filters: Dict[str, Any]) -> str:
+        return f"""Current filters:
+- Keywords: {current_filters.get('keywords', [])}
+- Experience: {current_filters.get('min_exp', 0)}-{current_filters.get('max_exp', 10)} years
+- Salary: {current_filters.get('min_salary', 0)}-{current_filters.get('max_salary', 15)} lakhs
+- Current Cities: {current_filters.get('current_cities', [])}
+- Preferred Cities: {current_filters.get('preferred_cities', [])}
+
+User request: {user_input}"""
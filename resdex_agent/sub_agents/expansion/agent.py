@@ -4,9 +4,11 @@ Enhanced Expansion Agent - Matrix-based skill and title expansion with LLM fallb
 """
 
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 
 from ...base_agent import BaseResDexAgent, Content
+from ...utils.intent_scheduler import fork_state, state_delta
 from .config import ExpansionConfig
 
 logger = logging.getLogger(__name__)
@@ -331,21 +333,15 @@ class ExpansionAgent(BaseResDexAgent):
             
             print(f"🔧 Processing {len(base_titles)} titles collectively: {base_titles}")
             
-            # Get similar titles
-            title_result = await self.tools["matrix_expansion"](
-                expansion_type="title_to_title",
-                base_items=base_titles,
-                top_n=5,
-                normalize=True
-            )
-            
-            # Get suggested skills for these titles
-            skills_result = await self.tools["matrix_expansion"](
-                expansion_type="title_to_skill",
-                base_items=base_titles,
+            # Similar titles and suggested skills for the same titles in one matrix pass
+            multi_result = await self.tools["matrix_expansion"].expand_multi(
+                ["title_to_title", "title_to_skill"],
+                base_titles,
                 top_n=5,
                 normalize=True
             )
+            title_result = multi_result["title_to_title"]
+            skills_result = multi_result["title_to_skill"]
             
             print(f"🔍 Title expansion result: success={title_result.get('success', False)}")
             print(f"🔍 Skills suggestion result: success={skills_result.get('success', False)}")
@@ -1092,7 +1088,7 @@ class ExpansionAgent(BaseResDexAgent):
     async def _handle_multi_expansion(self, user_input: str, session_state: Dict[str, Any],
                                 memory_context: List[Dict[str, Any]], session_id: str, 
                                 user_id: str) -> Content:
-        """Handle multiple expansion types in sequence with Matrix Features priority."""
+        """Handle multiple expansion types concurrently with Matrix Features priority."""
         try:
             print(f"🔄 ENHANCED MULTI-EXPANSION: Processing '{user_input}'")
             
@@ -1101,42 +1097,59 @@ class ExpansionAgent(BaseResDexAgent):
             
             # Determine which expansions are needed
             input_lower = user_input.lower()
+            # (label, coroutine) pairs; they run concurrently and are reported in this order
+            expansions = []
+            forks = []
+
+            def fork() -> Dict[str, Any]:
+                # Each expansion works on its own copy so a timed-out one leaves no partial changes
+                forks.append(fork_state(session_state))
+                return forks[-1]
             
             # Skill expansion with Matrix Features
             if any(indicator in input_lower for indicator in ["skill", "skills", "similar skills", "related skills"]):
-                skill_result = await self._handle_matrix_skill_expansion(user_input, session_state, memory_context, session_id, user_id)
-                if skill_result.data.get("success"):
-                    all_modifications.extend(skill_result.data.get("modifications", []))
-                    method = skill_result.data.get("method", "unknown")
-                    expansion_results.append(f"Skills ({method}): {skill_result.data.get('message', '')}")
+                expansions.append(("Skills", self._handle_matrix_skill_expansion(user_input, fork(), memory_context, session_id, user_id)))
             
             # Title expansion with Matrix Features
             if any(indicator in input_lower for indicator in ["title", "titles", "role", "roles", "position", "positions", "similar titles", "related titles", "similar roles", "related roles"]):
-                title_result = await self._handle_matrix_title_expansion(user_input, session_state, memory_context, session_id, user_id)
-                if title_result.data.get("success"):
-                    all_modifications.extend(title_result.data.get("modifications", []))
-                    method = title_result.data.get("method", "unknown")
-                    expansion_results.append(f"Titles ({method}): {title_result.data.get('message', '')}")
+                expansions.append(("Titles", self._handle_matrix_title_expansion(user_input, fork(), memory_context, session_id, user_id)))
             
             # Location expansion (unchanged)
             if any(indicator in input_lower for indicator in ["location", "locations", "nearby", "similar cities", "cities", "city"]):
-                location_result = await self._handle_location_expansion(user_input, session_state, memory_context, session_id, user_id)
-                if location_result.data.get("success"):
-                    all_modifications.extend(location_result.data.get("modifications", []))
-                    expansion_results.append(f"Locations: {location_result.data.get('message', '')}")
+                expansions.append(("Locations", self._handle_location_expansion(user_input, fork(), memory_context, session_id, user_id)))
             if any(indicator in input_lower for indicator in ["companies", "company", "similar companies", "big4", "faang"]):
                 # Try to determine which type of company expansion
                 if any(indicator in input_lower for indicator in ["big4", "big5", "mbb", "faang", "top"]):
-                    company_result = await self._handle_company_group_expansion(user_input, session_state, memory_context, session_id, user_id)
+                    company_coro = self._handle_company_group_expansion(user_input, fork(), memory_context, session_id, user_id)
                 elif any(indicator in input_lower for indicator in ["my company", "mine", "recruiter"]):
-                    company_result = await self._handle_recruiter_similar_expansion(user_input, session_state, memory_context, session_id, user_id)
+                    company_coro = self._handle_recruiter_similar_expansion(user_input, fork(), memory_context, session_id, user_id)
                 else:
-                    company_result = await self._handle_company_expansion(user_input, session_state, memory_context, session_id, user_id)
-                
-                if company_result.data.get("success"):
-                    all_modifications.extend(company_result.data.get("modifications", []))
-                    method = company_result.data.get("method", "unknown")
-                    expansion_results.append(f"Companies ({method}): {company_result.data.get('message', '')}")
+                    company_coro = self._handle_company_expansion(user_input, fork(), memory_context, session_id, user_id)
+                expansions.append(("Companies", company_coro))
+            
+            # Only expansions that completed successfully are merged back, in the order above
+            timeout = self.config.sub_expansion_timeout
+            before = fork_state(session_state)
+            results = await asyncio.gather(*[
+                asyncio.wait_for(coro, timeout=timeout) for _, coro in expansions
+            ], return_exceptions=True)
+            
+            for (label, _), state, result in zip(expansions, forks, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    print(f"⏱️ {label} expansion timed out after {timeout}s")
+                    expansion_results.append(f"{label}: timed out")
+                    continue
+                if isinstance(result, Exception):
+                    logger.error(f"{label} expansion failed: {result}")
+                    continue
+                if result.data.get("success"):
+                    self._merge_expansion_state(session_state, before, result.data.get("session_state") or state)
+                    all_modifications.extend(result.data.get("modifications", []))
+                    if label == "Locations":
+                        expansion_results.append(f"{label}: {result.data.get('message', '')}")
+                    else:
+                        method = result.data.get("method", "unknown")
+                        expansion_results.append(f"{label} ({method}): {result.data.get('message', '')}")
             
             combined_message = " | ".join(expansion_results) if expansion_results else "Multi-expansion completed"
             
@@ -1157,6 +1170,20 @@ class ExpansionAgent(BaseResDexAgent):
                 "success": False,
                 "error": f"Enhanced multi-expansion failed: {str(e)}"
             })
+
+    @staticmethod
+    def _merge_expansion_state(session_state: Dict[str, Any], before: Dict[str, Any], after: Dict[str, Any]):
+        """Apply one expansion's changes; list filters keep earlier expansions' additions."""
+        for key, value in state_delta(before, after).items():
+            current = session_state.get(key)
+            if isinstance(value, list) and isinstance(current, list):
+                original = before.get(key) or []
+                removed = [item for item in original if item not in value]
+                session_state[key] = [item for item in current if item not in removed] + \
+                    [item for item in value if item not in original and item not in current]
+            else:
+                session_state[key] = value
+
     async def _handle_llm_location_expansion_fallback(self, base_location: str, session_state: Dict[str, Any],
                                                 memory_context: List[Dict[str, Any]]) -> Content:
         """Fallback to LLM-based location expansion when matrix fails."""
@@ -20,6 +20,9 @@ class ExpansionConfig(BaseModel):
     max_locations_expansion: int = 4
     max_titles_expansion: int = 3
     
+    # Per sub-expansion limit in multi-expansion turns (covers slow LLM fallbacks)
+    sub_expansion_timeout: float = 20.0
+    
     # LLM settings for expansion
     expansion_temperature: float = 0.6
     expansion_max_tokens: int = 2000
@@ -89,7 +89,8 @@ class SearchInteractionAgent(BaseResDexAgent):
                 return await self._handle_direct_search(content, session_id)
             
             # Handle filter operations and searches
-            return await self._handle_filter_operation(user_input, session_state, memory_context, session_id, user_id)
+            return await self._handle_filter_operation(user_input, session_state, memory_context, session_id, user_id,
+                                                       precomputed_intent=content.data.get("precomputed_intent"))
                     
         except Exception as e:
             logger.error(f"SearchInteractionAgent execution failed: {e}")
@@ -139,8 +140,12 @@ class SearchInteractionAgent(BaseResDexAgent):
 
     async def _handle_filter_operation(self, user_input: str, session_state: Dict[str, Any],
                                     memory_context: List[Dict[str, Any]], session_id: str, 
-                                    user_id: str) -> Content:
-        """Handle filter operations with array support for multiple intents."""
+                                    user_id: str, precomputed_intent: Optional[Any] = None) -> Content:
+        """Handle filter operations with array support for multiple intents.
+        
+        precomputed_intent comes from the root agent (fast-path router or combined routing
+        call) and skips the extract_intent LLM call.
+        """
         try:
             print(f"🔧 FILTER OPERATION: Processing '{user_input}'")
             
@@ -174,12 +179,16 @@ class SearchInteractionAgent(BaseResDexAgent):
             
             print(f"🔍 Current filters: {current_filters}")
             
-            # Extract intent using LLM (FIXED - handle arrays)
-            llm_result = await self.tools["llm_tool"](
-                user_input=user_input,
-                current_filters=current_filters,
-                task="extract_intent"
-            )
+            # Extract intent using LLM (FIXED - handle arrays), unless the fast path already did
+            if precomputed_intent is not None:
+                print(f"⚡ Using precomputed intent (no LLM call)")
+                llm_result = {"success": True, "intent_data": precomputed_intent}
+            else:
+                llm_result = await self.tools["llm_tool"](
+                    user_input=user_input,
+                    current_filters=current_filters,
+                    task="extract_intent"
+                )
             
             if not llm_result["success"]:
                 return self.create_content({
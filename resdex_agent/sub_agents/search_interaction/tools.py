@@ -21,10 +21,68 @@ logger = logging.getLogger(__name__)
 
 class IntentProcessor(Tool):
     """Tool for processing search modification intents."""
-    
+
+    FILTER_ACTIONS = {"add_skill", "remove_skill", "modify_experience", "modify_salary", "add_location",
+                      "remove_location", "add_target_company", "remove_target_company"}
+    VALID_ACTIONS = FILTER_ACTIONS | {"search_execution", "general_query"}
+    # Actions whose value is a single name (skill, city or company)
+    TEXT_ACTIONS = {"add_skill", "remove_skill", "add_location", "remove_location", "add_target_company",
+                    "remove_target_company"}
+
     def __init__(self, name: str = "intent_processor"):
         super().__init__(name=name, description="Process extracted search intents")
-    
+
+    @staticmethod
+    def _as_bool(value: Any) -> bool:
+        # LLM output may carry "false"/"true" strings; bool("false") would be True
+        return value is True or str(value).lower() == "true"
+
+    @classmethod
+    def validate_filter_operations(cls, operations: Any) -> Optional[List[Dict[str, Any]]]:
+        """
+        Validate filter operations produced upstream (e.g. by the root agent's
+        combined routing call) so they can be processed without another LLM call.
+
+        Returns the cleaned operation list, or None when any operation is
+        malformed and the caller should fall back to the extract_intent path.
+        """
+        if isinstance(operations, dict):
+            operations = [operations]
+        if not isinstance(operations, list) or not operations:
+            return None
+
+        cleaned = []
+        for operation in operations:
+            if not isinstance(operation, dict):
+                return None
+            action = operation.get("action")
+            if action not in cls.VALID_ACTIONS:
+                return None
+
+            value = operation.get("value")
+            if action in cls.TEXT_ACTIONS:
+                if not isinstance(value, str) or not value.strip():
+                    return None
+            elif action in cls.FILTER_ACTIONS:
+                if isinstance(value, dict):
+                    if "min" not in value and "max" not in value:
+                        return None
+                elif value is None or str(value).strip() == "":
+                    return None
+                if action in ["modify_experience", "modify_salary"] and not isinstance(value, dict):
+                    # Ranges must be numeric, e.g. "5", "3-8"
+                    bounds = str(value).replace(" ", "").split("-")
+                    if not all(bound.replace(".", "", 1).isdigit() for bound in bounds):
+                        return None
+
+            cleaned.append({
+                **operation,
+                "mandatory": cls._as_bool(operation.get("mandatory", False)),
+                "trigger_search": cls._as_bool(operation.get("trigger_search", False)),
+                "response_text": operation.get("response_text", "")
+            })
+        return cleaned
+
     async def __call__(self, intent_data: Dict[str, Any], session_state: Dict[str, Any]) -> Dict[str, Any]:
         """Process intent data and apply modifications."""
         try:
@@ -4,8 +4,16 @@ import numpy as np
 from time import time
 import sys
 import math, pickle
+import os, json, hashlib, heapq
 from time import sleep
 
+MMAP_DIR = 'mmap'
+MMAP_FORMAT_VERSION = 1
+MMAP_ARRAYS = ['data', 'indices', 'indptr', 'row_vocab', 'col_vocab', 'row_sorted_keys', 'row_sorted_pos']
+TOPK_DIR = 'topk'
+TOPK_DEFAULT = int(os.getenv('MATRIX_TOPK', '50'))
+TOPK_ARRAYS = ['topk_ids', 'topk_scores', 'col_vocab', 'row_sorted_keys', 'row_sorted_pos']
+
 def convert_size(size_bytes):
     if size_bytes == 0:
         return "0B"
@@ -15,6 +23,238 @@ def convert_size(size_bytes):
     s = round(size_bytes / p, 2)
     return "%s %s" % (s, size_name[i])
 
+def file_checksum(path, block_size = 4 * 1024 * 1024):
+    h = hashlib.blake2b(digest_size = 16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+def _vocab_array(vocab):
+    # object arrays cannot be memory-mapped; fall back to fixed-width unicode
+    arr = np.asarray(list(vocab))
+    if arr.dtype == object:
+        arr = arr.astype(str)
+    return arr
+
+def file_stat(path):
+    st = os.stat(path)
+    return int(st.st_size), int(st.st_mtime_ns)
+
+def write_manifest(out_dir, manifest):
+    # workers may be loading concurrently; never expose a half-written manifest
+    tmp_path = os.path.join(out_dir, 'manifest.json.%d.tmp' % os.getpid())
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent = 2)
+    os.replace(tmp_path, os.path.join(out_dir, 'manifest.json'))
+
+def save_arrays(out_dir, arrays, manifest):
+    # every array is a plain .npy so np.load(mmap_mode = 'r') can map it; manifest.json carries checksums
+    manifest = dict(manifest, files = {})
+    for name, arr in arrays.items():
+        path = os.path.join(out_dir, name + '.npy')
+        np.save(path, arr, allow_pickle = False)
+        size, mtime_ns = file_stat(path)
+        manifest['files'][name] = {'dtype': str(arr.dtype), 'length': int(arr.shape[0]), 'checksum': file_checksum(path),
+                                   'size': size, 'mtime_ns': mtime_ns}
+
+    write_manifest(out_dir, manifest)
+    return manifest
+
+def load_arrays(in_dir, names, verify = True):
+    with open(os.path.join(in_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MMAP_FORMAT_VERSION:
+        raise MatrixChecksumError("unsupported mmap format version %s in %s" % (manifest.get('version'), in_dir))
+
+    arrays = {}
+    refreshed = False
+    for name in names:
+        path = os.path.join(in_dir, name + '.npy')
+        meta = manifest['files'][name]
+        if verify:
+            # only files whose size or mtime moved since they were last verified are hashed
+            stat = file_stat(path)
+            if stat != (meta.get('size'), meta.get('mtime_ns')):
+                if file_checksum(path) != meta['checksum']:
+                    raise MatrixChecksumError("checksum mismatch for " + path)
+                meta['size'], meta['mtime_ns'] = stat
+                refreshed = True
+        arrays[name] = np.load(path, mmap_mode = 'r')
+        if arrays[name].shape[0] != meta['length']:
+            raise MatrixChecksumError("length mismatch for " + path)
+
+    if refreshed:
+        # e.g. after a copy that reset mtimes; record the verified stats so the next start skips hashing
+        try:
+            write_manifest(in_dir, manifest)
+        except OSError as e:
+            print("could not refresh", os.path.join(in_dir, 'manifest.json'), ":", e)
+    return manifest, arrays
+
+def convert_to_mmap(file_path, out_dir = None):
+    """Convert a row_vocab/col_vocab/row_vocab_dict .pkl + matrix.npz directory into the mmap layout."""
+    out_dir = out_dir or os.path.join(file_path, MMAP_DIR)
+    os.makedirs(out_dir, exist_ok = True)
+
+    with open(file_path + '/row_vocab.pkl', 'rb') as handle:
+        row_vocab = _vocab_array(pickle.load(handle))
+    with open(file_path + '/col_vocab.pkl', 'rb') as handle:
+        col_vocab = _vocab_array(pickle.load(handle))
+    matrix = sparse.load_npz(file_path + '/matrix.npz').tocsr()
+    matrix.sort_indices()
+
+    order = np.argsort(row_vocab, kind = 'stable')
+    # scipy wants indices and indptr in the same dtype, otherwise it copies on load
+    index_dtype = np.int32 if matrix.nnz < np.iinfo(np.int32).max else np.int64
+    arrays = {
+        'data': matrix.data.astype(np.float32),
+        'indices': matrix.indices.astype(index_dtype),
+        'indptr': matrix.indptr.astype(index_dtype),
+        'row_vocab': row_vocab,
+        'col_vocab': col_vocab,
+        'row_sorted_keys': row_vocab[order],
+        'row_sorted_pos': order.astype(np.int64),
+    }
+
+    save_arrays(out_dir, arrays, {'version': MMAP_FORMAT_VERSION, 'shape': list(matrix.shape)})
+
+    print("converted", file_path, "->", out_dir, "shape:", matrix.shape, "nnz:", matrix.nnz)
+    return out_dir
+
+class MatrixChecksumError(Exception):
+    pass
+
+class SortedVocabIndex():
+    """dict.get-compatible row lookup backed by memory-mapped sorted keys (no Python dict build)."""
+    def __init__(self, sorted_keys, positions):
+        self.sorted_keys = sorted_keys
+        self.positions = positions
+
+    def get(self, key, default = None):
+        try:
+            i = int(np.searchsorted(self.sorted_keys, key))
+        except (TypeError, ValueError):
+            return default
+        if i < len(self.sorted_keys) and self.sorted_keys[i] == key:
+            return int(self.positions[i])
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self.sorted_keys)
+
+def topk_per_row(matrix, k):
+    """Top-k (column, score) per CSR row as dense (n_rows x k) int32/float32 arrays, -1 padded."""
+    matrix = matrix.tocsr()
+    n_rows = matrix.shape[0]
+    row_lengths = np.diff(matrix.indptr)
+    row_of_nnz = np.repeat(np.arange(n_rows), row_lengths)
+    # rows ascending, scores descending; lexsort is stable so equal scores keep column order
+    order = np.lexsort((matrix.indices, -matrix.data, row_of_nnz))
+    rank = np.arange(matrix.nnz) - matrix.indptr[row_of_nnz[order]]
+    keep = order[rank < k]
+    keep_rank = rank[rank < k]
+
+    ids = np.full((n_rows, k), -1, dtype = np.int32)
+    scores = np.zeros((n_rows, k), dtype = np.float32)
+    ids[row_of_nnz[keep], keep_rank] = matrix.indices[keep]
+    scores[row_of_nnz[keep], keep_rank] = matrix.data[keep]
+    return ids, scores
+
+def build_topk_index(file_path, k = TOPK_DEFAULT, out_dir = None):
+    """Offline step: materialize each row's top-k neighbours next to a matrix directory."""
+    out_dir = out_dir or os.path.join(file_path, TOPK_DIR)
+    os.makedirs(out_dir, exist_ok = True)
+
+    feature = Feature2dMatrix(None, None, None, file_path = file_path, use_topk = False)
+    row_vocab = _vocab_array(feature.row_vocab)
+    order = np.argsort(row_vocab, kind = 'stable')
+    ids, scores = topk_per_row(feature.matrix, k)
+
+    arrays = {
+        'topk_ids': ids,
+        'topk_scores': scores,
+        'col_vocab': _vocab_array(feature.col_vocab),
+        'row_sorted_keys': row_vocab[order],
+        'row_sorted_pos': order.astype(np.int64),
+    }
+    save_arrays(out_dir, arrays, {'version': MMAP_FORMAT_VERSION, 'k': int(k), 'shape': list(feature.matrix.shape)})
+
+    print("top-%d index" % k, file_path, "->", out_dir, "size:", convert_size(ids.nbytes + scores.nbytes))
+    return out_dir
+
+class TopKNeighborIndex():
+    """
+    Precomputed per-row top-k neighbours. A single-item query is a slice of one row;
+    multi-item queries heap-merge the per-row lists. Columns outside a row's top-k
+    count as 0 for that row, so multi-item scores are a (close) lower bound of the
+    full row mean.
+    """
+    def __init__(self, ids, scores, col_vocab, row_vocab_dict):
+        self.ids = ids
+        self.scores = scores
+        self.col_vocab = col_vocab
+        self.row_vocab_dict = row_vocab_dict
+        self.k = ids.shape[1]
+
+    @classmethod
+    def load(cls, topk_dir, verify = True):
+        manifest, arrays = load_arrays(topk_dir, TOPK_ARRAYS, verify = verify)
+        return cls(arrays['topk_ids'], arrays['topk_scores'], arrays['col_vocab'],
+                   SortedVocabIndex(arrays['row_sorted_keys'], arrays['row_sorted_pos']))
+
+    def row_neighbours(self, row):
+        ids = self.ids[row]
+        valid = ids >= 0
+        return ids[valid], self.scores[row][valid]
+
+    def query(self, values, topN = None, normalize = True):
+        topN = min(topN or self.k, self.k)
+        rows = [self.row_vocab_dict.get(s) for s in values]
+        rows = [r for r in rows if r is not None]
+        if not rows:
+            return {}
+
+        if len(rows) == 1:
+            # dominant case: the row is already sorted, O(k) with no sparse arithmetic
+            ids, scores = self.row_neighbours(rows[0])
+            pairs = list(zip(ids[:topN].tolist(), scores[:topN].astype(np.float64).tolist()))
+        else:
+            pairs = self.merge_rows(rows, topN)
+
+        if normalize:
+            total = sum(score for _, score in pairs)
+            pairs = [(c, score / total if total else 0.0) for c, score in pairs]
+        return {self.col_vocab[c].item(): score for c, score in pairs}
+
+    def merge_rows(self, rows, topN):
+        # each row list sorted by column id; heapq.merge walks them together and sums equal columns
+        n_values = len(rows)
+        streams = []
+        for row in rows:
+            ids, scores = self.row_neighbours(row)
+            by_col = np.argsort(ids, kind = 'stable')
+            streams.append(zip(ids[by_col].tolist(), scores[by_col].astype(np.float64).tolist()))
+
+        merged = []
+        current, total = None, 0.0
+        for col, score in heapq.merge(*streams):
+            if col != current:
+                if current is not None:
+                    merged.append((current, total / n_values))
+                current, total = col, 0.0
+            total += score
+        if current is not None:
+            merged.append((current, total / n_values))
+
+        return heapq.nlargest(topN, merged, key = lambda x: (x[1], -x[0]))
+
+    def get_size(self):
+        return self.ids.nbytes + self.scores.nbytes
+
 class Feature2dMatrix():
     # def __init__(self, col1, col2, value_col, file_path = None, df = None, type = '2d', thres = 50):
     #     start = time()
@@ -30,9 +270,21 @@ class Feature2dMatrix():
     #     end_time = round(time() - start, 2)
     #     print ("time elapsed: ", end_time, " sec\n")
 
-    def __init__(self, col1, col2, value_col, file_path = None, df = None, type = '2d', thres = 50, create_now = 0):
+    def __init__(self, col1, col2, value_col, file_path = None, df = None, type = '2d', thres = 50, create_now = 0, use_topk = True):
         start = time()
-        if create_now:
+        verify = os.getenv('MATRIX_VERIFY_CHECKSUMS', '1') == '1'
+        self.topk = None
+        topk_dir = os.path.join(file_path, TOPK_DIR) if file_path and not create_now else None
+        if use_topk and topk_dir and os.path.exists(os.path.join(topk_dir, 'manifest.json')):
+            self.topk = TopKNeighborIndex.load(topk_dir, verify = verify)
+
+        if self.topk is not None and os.getenv('MATRIX_TOPK_ONLY', '0') == '1':
+            # serve every query from the top-k arrays; the sparse matrix is never loaded
+            self.row_vocab = None
+            self.col_vocab = self.topk.col_vocab
+            self.row_vocab_dict = self.topk.row_vocab_dict
+            self.matrix = None
+        elif create_now:
             self.row_vocab, self.col_vocab,\
             self.row_vocab_dict, self.matrix = self.create_sparse_matrix(
                 file_path,
@@ -42,6 +294,8 @@ class Feature2dMatrix():
                 value_col,
                 thres
                 )
+        elif os.path.exists(os.path.join(file_path, MMAP_DIR, 'manifest.json')):
+            self.load_mmap(os.path.join(file_path, MMAP_DIR), verify = verify)
         else:
             self.row_vocab = self.load_pickle(file_path + '/row_vocab.pkl')
             self.col_vocab = self.load_pickle(file_path + '/col_vocab.pkl')
@@ -51,6 +305,16 @@ class Feature2dMatrix():
         end_time = round(time() - start, 2)
         print ("time elapsed: ", end_time, " sec\n")
 
+    def load_mmap(self, mmap_dir, verify = True):
+        # Arrays are np.memmap-backed: pages are shared through the OS cache across workers
+        manifest, arrays = load_arrays(mmap_dir, MMAP_ARRAYS, verify = verify)
+
+        self.row_vocab = arrays['row_vocab']
+        self.col_vocab = arrays['col_vocab']
+        self.row_vocab_dict = SortedVocabIndex(arrays['row_sorted_keys'], arrays['row_sorted_pos'])
+        self.matrix = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                        shape = tuple(manifest['shape']), copy = False)
+
     def load_pickle(self, path):
         with open(path, 'rb') as handle:
             return pickle.load(handle)
@@ -78,30 +342,64 @@ class Feature2dMatrix():
 
         return row_vocab, col_vocab, row_vocab_dict, matrix
     
-    def get_feature_value(self, values, topN = None, normalize = True):
-        # if indices:
-        #     output = list(zip(self.col_vocab, np.around(np.array(self.matrix[indices].mean(axis = 0))[0], 3)))
-        #     output.sort(key = lambda x: -1 * x[1])
-        #     if topN: output = output[0 : topN]
-        #     output = dict(output)
-        #     if normalize:
-        #         total_sum = sum(output.values())
-        #         output = {k : round(v / total_sum, 2) for k,v in output.items()}
-        # else:
-        #     output = {}
-        indices = [self.row_vocab_dict.get(s) for s in values if self.row_vocab_dict.get(s) is not None]
-        if indices:
-            scores = np.array(self.matrix[indices].mean(axis = 0))[0]
-            x = np.argsort(scores)[::-1][:topN]
-            values = scores[x]
-            if normalize : values = values / values.sum()
-            vocab = np.array(self.col_vocab)[x]
-            output = dict(zip(vocab.tolist(), values.tolist()))
+    @property
+    def col_vocab_array(self):
+        # cached once; np.array(self.col_vocab) used to be rebuilt on every query
+        if getattr(self, '_col_vocab_array', None) is None:
+            self._col_vocab_array = np.asarray(self.col_vocab)
+        return self._col_vocab_array
+
+    def query_indicator(self, queries):
+        # (n_queries x n_rows) matrix with 1/len(indices) weights, so indicator @ matrix = row means
+        rows, cols, weights = [], [], []
+        for q, values in enumerate(queries):
+            indices = [self.row_vocab_dict.get(s) for s in values]
+            indices = [i for i in indices if i is not None]
+            for i in indices:
+                rows.append(q)
+                cols.append(i)
+                weights.append(1.0 / len(indices))
+        return sparse.csr_matrix((weights, (rows, cols)), shape = (len(queries), self.matrix.shape[0]))
+
+    @staticmethod
+    def top_n_2d(scores, topN):
+        # argpartition per row, then sort only the selected topN columns
+        n_cols = scores.shape[1]
+        if topN is None or topN >= n_cols:
+            top = np.argsort(-scores, axis = 1, kind = 'stable')
         else:
-            output = {}
-        return output
-    
+            top = np.argpartition(-scores, topN - 1, axis = 1)[:, :topN]
+            top_scores = np.take_along_axis(scores, top, axis = 1)
+            top = np.take_along_axis(top, np.argsort(-top_scores, axis = 1, kind = 'stable'), axis = 1)
+        return top, np.take_along_axis(scores, top, axis = 1)
+
+    def get_topn_batch(self, queries, topN = None, normalize = True):
+        """One sparse matmul for a batch of queries -> 2-D (col index, score) arrays plus a hit mask."""
+        indicator = self.query_indicator(queries)
+        has_hits = np.diff(indicator.indptr) > 0
+        scores = np.asarray((indicator @ self.matrix).todense(), dtype = np.float64)
+        top, top_scores = self.top_n_2d(scores, topN)
+        if normalize:
+            sums = top_scores.sum(axis = 1, keepdims = True)
+            top_scores = np.divide(top_scores, sums, out = np.zeros_like(top_scores), where = sums != 0)
+        return top, top_scores, has_hits
+
+    def get_feature_values_batch(self, queries, topN = None, normalize = True):
+        if not queries:
+            return []
+        if self.topk is not None and ((topN and topN <= self.topk.k) or self.matrix is None):
+            return [self.topk.query(values, topN = topN, normalize = normalize) for values in queries]
+        top, top_scores, has_hits = self.get_topn_batch(queries, topN, normalize)
+        vocab = self.col_vocab_array
+        return [dict(zip(vocab[top[q]].tolist(), top_scores[q].tolist())) if has_hits[q] else {}
+                for q in range(len(queries))]
+
+    def get_feature_value(self, values, topN = None, normalize = True):
+        return self.get_feature_values_batch([values], topN = topN, normalize = normalize)[0]
+
     def get_size(self):
+        if self.matrix is None:
+            return self.topk.get_size()
         data_size = self.matrix.data.nbytes
         indices_size = self.matrix.indices.nbytes
         indptr_size = self.matrix.indptr.nbytes
@@ -109,51 +407,118 @@ class Feature2dMatrix():
         byte_size = data_size + indices_size + indptr_size
         return byte_size
 
+STACKED_3D_SUFFIX = '.stacked'
+STACKED_3D_ARRAYS = ['data', 'indices', 'indptr', 'row_vocab', 'col2_vocab', 'col3_vocab', 'row_sorted_keys', 'row_sorted_pos']
+
 class Feature3dMatrix():
+    """
+    col1 -> col2 -> col3 affinities as one stacked CSR matrix: row (segment * n_rows + row)
+    holds that segment's col3 scores, so all segments are scored in a single weighted
+    sparse product against the col2_scores vector.
+    """
     def __init__(self, col1, col2, col3, value_col, file_path = None, type = '3d', thres=50):
         start = time()
-        df = pd.read_parquet(file_path, columns = [col1, col2, col3, value_col, 'count'])
-        # print (df.columns)
+        stacked_dir = file_path.rstrip('/') + STACKED_3D_SUFFIX
+        if os.path.exists(os.path.join(stacked_dir, 'manifest.json')):
+            self.load(stacked_dir, verify = os.getenv('MATRIX_VERIFY_CHECKSUMS', '1') == '1')
+        else:
+            df = pd.read_parquet(file_path, columns = [col1, col2, col3, value_col, 'count'])
+            self.build(df, col1, col2, col3, value_col, thres)
+
+        end_time = round(time() - start, 2)
+        print ("time elapsed: ", end_time, " sec\n")
 
+    def build(self, df, col1, col2, col3, value_col, thres):
         self.col2List = df[col2].unique().tolist()
         self.col3List = df[col3].unique().tolist()
 
-        self.col2Matrices = []
-        for col2Val in self.col2List: 
-            self.col2Matrices.append(Feature2dMatrix(col1, col3, value_col, file_path = None, df = df[df[col2] == col2Val], thres = thres, create_now = 1))
-        
-    def convert_dict_to_list(self, dict):
-        return [dict.get(s) if dict.get(s) else 0 for s in self.col3List]
-        
+        # same per-segment row filter as Feature2dMatrix.create_sparse_matrix, without the pivot
+        df = df[[col1, col2, col3, value_col, 'count']].copy()
+        df[value_col] = (df[value_col] * 100).round(3)
+        query_feature_sum = df.groupby([col2, col1])['count'].transform('sum')
+        df = df[query_feature_sum > thres]
+
+        row_idx, row_vocab = pd.factorize(df[col1], sort = True)
+        seg_idx = pd.Index(self.col2List).get_indexer(df[col2])
+        col_idx = pd.Index(self.col3List).get_indexer(df[col3])
+
+        self.row_vocab = np.asarray(row_vocab)
+        self.row_vocab_dict = dict(zip(self.row_vocab.tolist(), range(len(self.row_vocab))))
+        n_rows = len(self.row_vocab)
+        self.matrix = sparse.csr_matrix(
+            (df[value_col].to_numpy(dtype = np.float32), (seg_idx * n_rows + row_idx, col_idx)),
+            shape = (len(self.col2List) * n_rows, len(self.col3List))
+        )
+        self.matrix.sum_duplicates()
+        self._init_row_sums()
+
+    def _init_row_sums(self):
+        self.n_rows = len(self.row_vocab)
+        self.row_sums = np.asarray(self.matrix.sum(axis = 1)).ravel()
+        self.col3_array = np.asarray(self.col3List)
+
+    def save(self, out_dir):
+        os.makedirs(out_dir, exist_ok = True)
+        row_vocab = _vocab_array(self.row_vocab)
+        order = np.argsort(row_vocab, kind = 'stable')
+        index_dtype = np.int32 if self.matrix.nnz < np.iinfo(np.int32).max else np.int64
+        arrays = {
+            'data': self.matrix.data.astype(np.float32),
+            'indices': self.matrix.indices.astype(index_dtype),
+            'indptr': self.matrix.indptr.astype(index_dtype),
+            'row_vocab': row_vocab,
+            'col2_vocab': _vocab_array(self.col2List),
+            'col3_vocab': _vocab_array(self.col3List),
+            'row_sorted_keys': row_vocab[order],
+            'row_sorted_pos': order.astype(np.int64),
+        }
+        save_arrays(out_dir, arrays, {'version': MMAP_FORMAT_VERSION, 'shape': list(self.matrix.shape)})
+        print("saved stacked 3d matrix ->", out_dir, "shape:", self.matrix.shape, "nnz:", self.matrix.nnz)
+        return out_dir
+
+    def load(self, stacked_dir, verify = True):
+        manifest, arrays = load_arrays(stacked_dir, STACKED_3D_ARRAYS, verify = verify)
+        self.row_vocab = arrays['row_vocab']
+        self.row_vocab_dict = SortedVocabIndex(arrays['row_sorted_keys'], arrays['row_sorted_pos'])
+        self.col2List = arrays['col2_vocab'].tolist()
+        self.col3List = arrays['col3_vocab'].tolist()
+        self.matrix = sparse.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                                        shape = tuple(manifest['shape']), copy = False)
+        self._init_row_sums()
+
     def get_feature_value(self, values, col2_scores, topN = None, normalize = True):
-    
-        col2List = []
-        output = []
-    
-        for i, m in enumerate(self.col2Matrices):
-            m_out = m.get_feature_value(values)
-            if m_out:
-                output.append(self.convert_dict_to_list(m_out))
-                col2List.append(self.col2List[i])
-
-        if output:
-            output = np.array(output)
-            multiplier = np.array([col2_scores.get(s) if col2_scores.get(s) else 0 for s in col2List])
-            multiplier = np.expand_dims(multiplier, axis = -1)
-            output = output * multiplier
-            output = list(zip(self.col3List, np.around(output.sum(axis = 0), 3)))
-            output.sort(key = lambda x: -1 * x[1])
-            if topN: output = output[0 : topN]
-            output = dict(output)
-            if normalize:
-                total_sum = sum(output.values())
-                output = {k : round(v / total_sum, 4) for k,v in output.items()}
-        else:
-            output = {}
+        rows = [self.row_vocab_dict.get(s) for s in values]
+        rows = np.array([r for r in rows if r is not None], dtype = np.int64)
+        if not len(rows):
+            return {}
+
+        # stacked row ids of the query rows in every segment, and each segment's score mass
+        stacked = (np.arange(len(self.col2List))[:, None] * self.n_rows + rows[None, :])
+        stacked_sums = self.row_sums[stacked]
+        present = self.matrix.indptr[stacked + 1] > self.matrix.indptr[stacked]
+        if not present.any():
+            return {}
+        totals = stacked_sums.sum(axis = 1)
+
+        # per-segment normalisation and col2 weight folded into one query vector
+        multiplier = np.array([col2_scores.get(s) or 0 for s in self.col2List], dtype = np.float64)
+        seg_weight = np.divide(multiplier, totals, out = np.zeros_like(multiplier), where = totals != 0)
+        weights = np.repeat(seg_weight, len(rows))
+        keep = weights != 0
+        query = sparse.csr_matrix((weights[keep], (np.zeros(keep.sum(), dtype = np.int64), stacked.ravel()[keep])),
+                                  shape = (1, self.matrix.shape[0]))
+        scores = np.around(np.asarray((query @ self.matrix).todense()).ravel(), 3)
+
+        order = np.argsort(-scores, kind = 'stable')
+        if topN: order = order[0 : topN]
+        output = dict(zip(self.col3_array[order].tolist(), scores[order].tolist()))
+        if normalize:
+            total_sum = sum(output.values())
+            output = {k : round(v / total_sum, 4) for k,v in output.items()}
         return output
 
     def get_size(self, ):
-        return sum([m.get_size() for m in self.col2Matrices])
+        return self.matrix.data.nbytes + self.matrix.indices.nbytes + self.matrix.indptr.nbytes
 
 if __name__=='__main__':
 
@@ -1,13 +1,16 @@
-from FeatureMatrixLoader import Feature2dMatrix , convert_size
+from FeatureMatrixLoader import Feature2dMatrix , Feature3dMatrix, convert_size, convert_to_mmap, build_topk_index, TOPK_DEFAULT, STACKED_3D_SUFFIX
 from time import time
-import os
+import os, sys
 from dotenv import load_dotenv
 #load_dotenv(os.environ.get('ENV_FILE_PATH', ''))
 import warnings
 warnings.filterwarnings("ignore", message="A value is trying to be set on a copy of a slice from a DataFrame")
+FEATURE_MATRIX_NAMES = ["skillToSkillFeature", "titleToSkillFeature", "skillToTitleFeature", "titleToTitleFeature"]
+SKILL_TO_SEG_TO_ROLE_NAME = "skillToSegToRoleFeature"
+
 class MatrixFeatures():
     def __init__(self):
-        self.base_dir = "/data/analytics/rohit.agarwal/ResDex_Agent/Matrices/feature_matrices/"
+        self.base_dir = os.getenv("FEATURE_MATRIX_DIR", "/data/analytics/rohit.agarwal/ResDex_Agent/Matrices/feature_matrices/")
 
         print("Loading Matrix Features")
         start = time()
@@ -70,26 +73,44 @@ class MatrixFeatures():
         titles = input_values['titles']
         return {int(titleId):  (100 * 100) for titleId in titles}
 
+    def getSkillFeatureBatch(self, input_values_list):
+        # one kernel call per matrix for the whole batch
+        from_s = self.skillToSkillFeature.get_feature_values_batch([v['skills'] for v in input_values_list], topN = 15, normalize = True)
+        from_t = self.titleToSkillFeature.get_feature_values_batch([v['titles'] for v in input_values_list], topN = 15, normalize = True)
+        return [{'from_skill': self.get_transformed_vector(s), 'from_title': self.get_transformed_vector(t)} for s, t in zip(from_s, from_t)]
+
     def getSkillFeature(self, input_values):
-        skills = input_values['skills']
-        titles = input_values['titles']
-        from_s = self.skillToSkillFeature.get_feature_value(skills, topN = 15, normalize = True)
-        from_s_transformed = self.get_transformed_vector(from_s)
-        from_t = self.titleToSkillFeature.get_feature_value(titles, topN = 15, normalize = True)
-        from_t_transformed = self.get_transformed_vector(from_t)
-        return {'from_skill':from_s_transformed, 'from_title':from_t_transformed}
+        return self.getSkillFeatureBatch([input_values])[0]
     
 
+    def getTitleFeatureBatch(self, input_values_list):
+        from_s = self.skillToTitleFeature.get_feature_values_batch([v['skills'] for v in input_values_list], topN = 15, normalize = True)
+        from_t = self.titleToTitleFeature.get_feature_values_batch([v['titles'] for v in input_values_list], topN = 15, normalize = True)
+        return [{'from_skill': self.get_transformed_vector(s), 'from_title': self.get_transformed_vector(t)} for s, t in zip(from_s, from_t)]
+
     def getTitleFeature(self, input_values):
-        skills = input_values['skills']
-        titles = input_values['titles']
-        from_s = self.skillToTitleFeature.get_feature_value(skills, topN = 15, normalize = True)
-        from_s_transformed = self.get_transformed_vector(from_s)
-        from_t = self.titleToTitleFeature.get_feature_value(titles, topN = 15, normalize = True)
-        from_t_transformed = self.get_transformed_vector(from_t)
-        return {'from_skill':from_s_transformed, 'from_title':from_t_transformed}
-        
+        return self.getTitleFeatureBatch([input_values])[0]
+
     
 if __name__=='__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        # One-off: build the memory-mapped layout next to each npz+pickle matrix
+        base_dir = os.getenv("FEATURE_MATRIX_DIR", "/data/analytics/rohit.agarwal/ResDex_Agent/Matrices/feature_matrices/")
+        for name in FEATURE_MATRIX_NAMES:
+            convert_to_mmap(base_dir + name)
+        sys.exit(0)
+    if len(sys.argv) > 1 and sys.argv[1] == 'topk':
+        # One-off: precompute per-row top-K neighbours (python MatrixFeatures.py topk [K])
+        base_dir = os.getenv("FEATURE_MATRIX_DIR", "/data/analytics/rohit.agarwal/ResDex_Agent/Matrices/feature_matrices/")
+        k = int(sys.argv[2]) if len(sys.argv) > 2 else TOPK_DEFAULT
+        for name in FEATURE_MATRIX_NAMES:
+            build_topk_index(base_dir + name, k = k)
+        sys.exit(0)
+    if len(sys.argv) > 2 and sys.argv[1] == 'stack3d':
+        # One-off: build the stacked skill -> segment -> role matrix from its parquet (python MatrixFeatures.py stack3d <parquet>)
+        base_dir = os.getenv("FEATURE_MATRIX_DIR", "/data/analytics/rohit.agarwal/ResDex_Agent/Matrices/feature_matrices/")
+        feature = Feature3dMatrix('query_skill_id', 'segmentId', 'roleId', 'score', file_path = sys.argv[2])
+        feature.save(base_dir + SKILL_TO_SEG_TO_ROLE_NAME + STACKED_3D_SUFFIX)
+        sys.exit(0)
     mf = MatrixFeatures()
     print ("Size : ", convert_size(mf.size))
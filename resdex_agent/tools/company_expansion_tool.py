@@ -14,6 +14,7 @@ class CompanyExpansionTool:
         self.company_normalizer = CompanyNormalizationTool()
         self.csv_path = "/data/analytics/rohit.agarwal/Resdex/resdex_agent/utils/similar_companies.csv" 
         self.company_df = None
+        self._llm_tool = None
         
         self._load_company_csv()
         
@@ -207,14 +208,19 @@ class CompanyExpansionTool:
             print(f"❌ CSV expansion failed, trying LLM fallback: {e}")
             return await self._llm_fallback_similar_companies(company_name)
     
+    def _get_llm_tool(self):
+        """One LLMTool per expansion tool, created on first fallback (shares the global LLM client)."""
+        if self._llm_tool is None:
+            from .llm_tools import LLMTool
+            self._llm_tool = LLMTool("company_expansion_llm")
+        return self._llm_tool
+    
     async def _llm_fallback_similar_companies(self, company_name: str) -> Dict[str, Any]:
         """LLM fallback for similar company expansion."""
         try:
             print(f"🤖 LLM fallback for similar companies to: {company_name}")
             
-            # Import LLM tool
-            from .llm_tools import LLMTool
-            llm_tool = LLMTool("company_expansion_llm")
+            llm_tool = self._get_llm_tool()
             
             prompt = f"""You are a business intelligence expert. Find 5-8 companies that are similar to "{company_name}" based on:
 - Industry segment
@@ -329,8 +335,7 @@ Focus on well-known companies that would be relevant for recruitment/talent sear
         try:
             print(f"🤖 LLM fallback for company group: {group_name}")
             
-            from .llm_tools import LLMTool
-            llm_tool = LLMTool("company_group_llm")
+            llm_tool = self._get_llm_tool()
             
             prompt = f"""You are a business intelligence expert. The user is asking for companies in the category: "{group_name}"
 
@@ -5,8 +5,11 @@ Facet Generation Tool for integrating with external facet generation API.
 #Credits : Akshat Jain( IIT Jodhpur, Co-Intern( Rahul Mittal Team, Infoedge, Noida))
 from typing import Dict, Any, List, Optional
 import logging
-import requests
 import asyncio
+import aiohttp
+
+from ..utils.http_client import http_pool
+from ..utils.location_resolver import LocationResolver, get_location_resolver
 
 # Base tool class
 class Tool:
@@ -30,6 +33,7 @@ class FacetGenerationTool(Tool):
         # API configuration
         self.api_url = "http://10.10.112.238:8004/generate"
         self.timeout = 90
+        self.http_pool = http_pool
         
         # Mapping for city names to IDs (from app.py)
         self.city_mapping = self._load_city_mapping()
@@ -65,24 +69,9 @@ class FacetGenerationTool(Tool):
         
         print(f"🔧 FacetGenerationTool initialized with API: {self.api_url}")
     
-    def _load_city_mapping(self) -> Dict[str, int]:
-        """Load city mapping - simplified version for common cities."""
-        # Simplified city mapping based on common cities
-        return {
-            "Bangalore": 1,
-            "Mumbai": 2,
-            "Delhi": 3,
-            "Hyderabad": 4,
-            "Chennai": 5,
-            "Pune": 6,
-            "Kolkata": 7,
-            "Ahmedabad": 8,
-            "Gurgaon": 9,
-            "Noida": 10,
-            "Bengaluru": 1,  # Alias for Bangalore
-            "New Delhi": 3,  # Alias for Delhi
-            # Add more mappings as needed
-        }
+    def _load_city_mapping(self) -> LocationResolver:
+        """City name to globalId lookups, backed by the shared location resolver."""
+        return get_location_resolver()
     
     async def __call__(self, 
                       session_state: Dict[str, Any],
@@ -144,7 +133,7 @@ class FacetGenerationTool(Tool):
             city_names = session_state.get('current_cities', []) + session_state.get('preferred_cities', [])
             city_ids = []
             for city in city_names:
-                city_id = self.city_mapping.get(city)
+                city_id = self.city_mapping.resolve_id(city, min_score=0.8, prefer_located=False)
                 if city_id:
                     city_ids.append(str(city_id))
                 else:
@@ -253,22 +242,17 @@ class FacetGenerationTool(Tool):
             
             print(f"  - Request body: {request_body}")
             
-            def make_request():
-                return requests.post(
-                    self.api_url,
-                    json=request_body,  # Use json parameter instead of data + headers
-                    timeout=self.timeout
-                )
-            
-            # Make async HTTP request
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(None, make_request)
+            # Pooled keep-alive request, no executor thread needed
+            response = await self.http_pool.post(
+                "facet",
+                self.api_url,
+                json=request_body,
+                timeout=self.timeout
+            )
             
             print(f"  - Response status: {response.status_code}")
             
-            try:
-                response.raise_for_status()
-                
+            if response.ok:
                 data = response.json()
                 print(f"  - Response data keys: {list(data.keys())}")
                 
@@ -277,20 +261,19 @@ class FacetGenerationTool(Tool):
                     "data": data,
                     "status_code": response.status_code
                 }
-                
-            except requests.exceptions.HTTPError as http_err:
-                print(f"  - HTTP Error: {http_err}")
+            else:
+                print(f"  - HTTP Error: {response.status_code}")
                 print(f"  - Response text: {response.text[:500]}")
                 
                 return {
                     "success": False,
-                    "error": f"HTTP {response.status_code}: {str(http_err)}",
+                    "error": f"HTTP {response.status_code}: facet API request failed",
                     "details": response.text[:500],
                     "status_code": response.status_code,
                     "user_message": f"Facet generation failed (HTTP {response.status_code}). Please try again."
                 }
                 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             print(f"⏰ API TIMEOUT after {self.timeout} seconds")
             return {
                 "success": False,
@@ -298,7 +281,7 @@ class FacetGenerationTool(Tool):
                 "details": f"Server did not respond within {self.timeout} seconds",
                 "user_message": "Facet generation is taking too long. Please try again later."
             }
-        except requests.exceptions.ConnectionError:
+        except aiohttp.ClientConnectionError:
             print(f"🔌 CONNECTION ERROR to {self.api_url}")
             return {
                 "success": False,
@@ -374,10 +357,10 @@ class FacetGenerationTool(Tool):
             logger.error(f"Error cleaning facets data: {e}")
             return facets_data
     
-    def get_api_status(self) -> Dict[str, Any]:
+    async def get_api_status(self) -> Dict[str, Any]:
         """Check the status of the facet generation API."""
         try:
-            response = requests.get(f"{self.api_url.replace('/generate', '')}/", timeout=5)
+            response = await self.http_pool.get("facet", f"{self.api_url.replace('/generate', '')}/", timeout=5)
             
             if response.status_code == 200:
                 return {
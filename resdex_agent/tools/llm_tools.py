@@ -13,15 +13,28 @@ class Tool:
     async def __call__(self, **kwargs) -> Dict[str, Any]:
         raise NotImplementedError
 
-from openai import OpenAI
 from ..config import config
 from ..utils.data_processing import DataProcessor
+from ..utils.llm_client import llm_client
+from ..utils.llm_cache import llm_cache
+from ..utils.prompt_budget import prompt_budget
+from ..utils.stream_json import StreamingJSONParser, parse_first_json
+from ..prompts import FilterIntentPrompts
 
 logger = logging.getLogger(__name__)
 
 
 class LLMTool(Tool):
     """Tool for LLM interactions and intent extraction using Qwen API with streaming."""
+
+    # Tasks whose callers read parsed_response; their streams stop at the first complete JSON value
+    JSON_TASKS = {
+        "routing", "routing_with_memory", "task_breakdown", "multi_intent_analysis", "multi_intent_breakdown",
+        "skill_expansion", "title_expansion", "location_expansion", "designation_skill_analysis",
+        "location_analysis", "metro_area_analysis", "industry_hub_analysis",
+        "company_similarity_analysis", "company_group_analysis"
+    }
+
     def __init__(self, name: str = "llm_tool"):
         super().__init__(name=name, description="Process natural language using Qwen LLM with streaming")
         
@@ -31,15 +44,16 @@ class LLMTool(Tool):
         self.temperature = config.llm.temperature  
         self.max_tokens = config.llm.max_tokens 
         
-        # Initialize OpenAI client
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-        )
+        # Shared async client: pooled connections and a process-wide concurrency cap
+        self.llm_client = llm_client
+        # Shared response cache for deterministic tasks (see LLM_CACHE_TASKS)
+        self.llm_cache = llm_cache
+        # Per-task prompt size accounting and trimming
+        self.prompt_budget = prompt_budget
         
         self.data_processor = DataProcessor()
         
-        logger.info(f"LLM Tool initialized with OpenAI client:")
+        logger.info(f"LLM Tool initialized with shared async LLM client:")
         logger.info(f"  API Base URL: {self.base_url}")
         logger.info(f"  Model: {self.model_name}")
         logger.info(f"  Temperature: {self.temperature}")
@@ -60,45 +74,60 @@ class LLMTool(Tool):
             logger.error(f"Qwen LLM processing failed: {e}")
             return {"success": False, "error": str(e)}
     
-    async def _call_llm_direct(self, prompt: str, task: str = "general") -> Dict[str, Any]:
+    async def _call_llm_direct(self, prompt: str, task: str = "general", cache_text: Optional[str] = None,
+                               cache_context: Optional[Dict[str, Any]] = None,
+                               system_prompt: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run a single-prompt LLM call, answering cacheable tasks from the response cache.
+
+        Callers that know the user text and the session slice their prompt depends on
+        pass them as cache_text/cache_context; this gives stable keys and enables
+        near-duplicate matching. Otherwise the whole prompt is the key.
+
+        A static ``system_prompt`` is sent as its own leading message so servers with
+        prefix caching reuse it across turns; ``prompt`` then carries only the per-turn part.
+        """
+        key_text = prompt if cache_text is None else cache_text
+        if cache_text is None and system_prompt:
+            key_text = f"{system_prompt}\n{prompt}"
+        cached = self.llm_cache.get(task, key_text, cache_context, allow_similar=cache_text is not None)
+        if cached is not None:
+            print(f"💾 LLM CACHE HIT: {task}")
+            return {**cached, "cached": True}
+
+        result = await self._run_llm_direct(prompt, task, system_prompt)
+        if result.get("success"):
+            self.llm_cache.set(task, key_text, result, cache_context)
+        return result
+
+    async def _run_llm_direct(self, prompt: str, task: str = "general",
+                              system_prompt: Optional[str] = None) -> Dict[str, Any]:
         try:
             messages = [{"role": "user", "content": prompt}]
+            if system_prompt:
+                messages.insert(0, {"role": "system", "content": system_prompt})
+            messages = self.prompt_budget.apply(task, messages)
             
             logger.info(f"🚀 Direct LLM call for task: {task}")
             print(f"🚀 DIRECT LLM CALL: {task}")
             
-            completion = self.client.chat.completions.create(
+            print(f"📡 LLM RESPONSE ({task}):")
+            # JSON tasks: parse while streaming and stop generation at the first complete value
+            parser = StreamingJSONParser() if task in self.JSON_TASKS else None
+            full_response = await self.llm_client.stream_chat(
+                messages,
+                label=task,
+                stop_on=parser.feed if parser else None,
                 model=self.model_name,
-                messages=messages,
                 max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                stream=True,
-                presence_penalty=0,
-                top_p=0.6,
-                n=1
+                temperature=self.temperature
             )
             
-            full_response = ""
-            print(f"📡 LLM RESPONSE ({task}):")
-            
-            for chunk in completion:
-                if chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    print(content, end='', flush=True)
-            
             print(f"\n✅ STREAMING COMPLETE - Length: {len(full_response)} characters")
             
-            # ENHANCED: Handle JSON parsing tasks with debugging
-            if task in ["routing", "routing_with_memory", "task_breakdown","multi_intent_analysis", "skill_expansion", "designation_skill_analysis"]:
-                print(f"🔍 ATTEMPTING JSON PARSING for task: {task}")
-                
-                # Clean the response
-                cleaned_response = self._clean_llm_response(full_response)
-                print(f"🧹 CLEANED RESPONSE: {cleaned_response}")
-                
-                # Try to parse JSON
-                parsed_data = self.data_processor.extract_json_from_text(cleaned_response)
+            if parser is not None:
+                # Without an early stop, take the best value in the full text (e.g. a bare ["React", "Vue"])
+                parsed_data = parser.value if parser.done else parse_first_json(full_response)
                 print(f"🔍 PARSED DATA: {parsed_data} (type: {type(parsed_data)})")
                 
                 if parsed_data:
@@ -107,61 +136,29 @@ class LLMTool(Tool):
                         "success": True,
                         "parsed_response": parsed_data,
                         "raw_response": full_response,
-                        "cleaned_response": cleaned_response,
+                        "cleaned_response": json.dumps(parsed_data, ensure_ascii=False),
                         "task": task
                     }
                 else:
                     print(f"❌ JSON PARSING FAILED for task: {task}")
                     print(f"🔍 Raw response preview: {full_response[:300]}...")
-                    print(f"🧹 Cleaned response preview: {cleaned_response[:300]}...")
-                    
-                    # Try manual JSON extraction as fallback
-                    import json
-                    import re
-                    
-                    # Look for JSON patterns manually
-                    json_patterns = [
-                        r'\{[^{}]*"request_type"[^{}]*\}',  # Simple object pattern
-                        r'\{[\s\S]*?"request_type"[\s\S]*?\}',  # Multi-line object
-                        r'\[[\s\S]*?\]'  # Array pattern
-                    ]
-                    
-                    for pattern in json_patterns:
-                        matches = re.findall(pattern, cleaned_response, re.IGNORECASE)
-                        for match in matches:
-                            try:
-                                manual_parsed = json.loads(match)
-                                print(f"✅ MANUAL JSON PARSING SUCCESS: {manual_parsed}")
-                                return {
-                                    "success": True,
-                                    "parsed_response": manual_parsed,
-                                    "raw_response": full_response,
-                                    "cleaned_response": cleaned_response,
-                                    "task": task,
-                                    "parsing_method": "manual_regex"
-                                }
-                            except json.JSONDecodeError:
-                                continue
-                    
-                    print(f"❌ ALL JSON PARSING METHODS FAILED for {task}")
                     return {
                         "success": False,
-                        "error": "Failed to parse JSON response after all attempts",
+                        "error": "No complete JSON value in LLM response",
                         "raw_response": full_response,
-                        "cleaned_response": cleaned_response,
+                        "cleaned_response": self._clean_llm_response(full_response),
                         "task": task
                     }
             
             # ENHANCED: Handle non-JSON tasks  
-            else:
-                cleaned_response = self._clean_llm_response(full_response)
-                print(f"✅ NON-JSON TASK COMPLETED: {task}")
-                return {
-                    "success": True,
-                    "response_text": cleaned_response,
-                    "raw_response": full_response,
-                    "task": task
-                }
+            cleaned_response = self._clean_llm_response(full_response)
+            print(f"✅ NON-JSON TASK COMPLETED: {task}")
+            return {
+                "success": True,
+                "response_text": cleaned_response,
+                "raw_response": full_response,
+                "task": task
+            }
                 
         except Exception as e:
             logger.error(f"Direct LLM call failed: {e}")
@@ -175,13 +172,28 @@ class LLMTool(Tool):
             }
     
     async def _extract_search_intent(self, user_input: str, current_filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract search modification intent, served from the response cache on repeat."""
+        # Only the filters rendered into the extraction prompt affect the answer
+        cache_context = {key: current_filters.get(key) for key in
+                         ["keywords", "min_exp", "max_exp", "min_salary", "max_salary",
+                          "current_cities", "preferred_cities"]}
+        cached = self.llm_cache.get("extract_intent", user_input, cache_context)
+        if cached is not None:
+            print(f"💾 LLM CACHE HIT: extract_intent")
+            return {**cached, "cached": True}
+
+        result = await self._stream_search_intent(user_input, current_filters)
+        if result.get("success") and result.get("intent_data") != self._default_intent_response(user_input):
+            self.llm_cache.set("extract_intent", user_input, result, cache_context)
+        return result
+
+    async def _stream_search_intent(self, user_input: str, current_filters: Dict[str, Any]) -> Dict[str, Any]:
         """Extract search modification intent from user input using Qwen with streaming."""
-        system_prompt = self._build_intent_extraction_prompt(current_filters)
-        
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"User request: {user_input}"}
-        ]
+        # Static rules first so the server can reuse their prefix cache; filters change per turn
+        messages = self.prompt_budget.apply("extract_intent", [
+            {"role": "system", "content": FilterIntentPrompts.SYSTEM_PROMPT},
+            {"role": "user", "content": FilterIntentPrompts.get_user_prompt(user_input, current_filters)}
+        ])
         
         try:
             logger.info(f"🚀 Sending streaming request to Qwen API at {self.base_url}")
@@ -190,26 +202,17 @@ class LLMTool(Tool):
             print(f"  - User Input: '{user_input}'")
             print(f"  - Streaming: Enabled")
             
-            completion = self.client.chat.completions.create(
+            print(f"📡 QWEN STREAMING RESPONSE:")
+            parser = StreamingJSONParser()
+            full_response = await self.llm_client.stream_chat(
+                messages,
+                label="extract_intent",
+                stop_on=parser.feed,
                 model=self.model_name,
-                messages=messages,  
                 max_tokens=self.max_tokens,
-                temperature=self.temperature,
-                stream=True, 
-                presence_penalty=0,
-                top_p=0.6,
-                n=1
+                temperature=self.temperature
             )
             
-            full_response = ""
-            print(f"📡 QWEN STREAMING RESPONSE:")
-            
-            for chunk in completion:
-                if chunk.choices[0].delta.content is not None:
-                    content = chunk.choices[0].delta.content
-                    full_response += content
-                    print(content, end='', flush=True)  
-            
             print(f"\n✅ STREAMING COMPLETE - Total length: {len(full_response)} characters")
             cleaned_response = self._clean_llm_response(full_response)
             print(f"🧹 CLEANED RESPONSE: {cleaned_response}")
@@ -217,8 +220,8 @@ class LLMTool(Tool):
             logger.info(f"Qwen streaming response completed: {len(full_response)} characters")
             
             if cleaned_response.strip():
-                # CRITICAL FIX: Parse JSON manually to preserve arrays
-                intent_data = self._parse_intent_json(cleaned_response)
+                # The stream stopped at the first complete JSON value (object or array)
+                intent_data = parser.value if parser.done else self._parse_intent_json(cleaned_response)
                 
                 # DEBUG: Show what we extracted
                 print(f"🔍 EXTRACTED INTENT TYPE: {type(intent_data)}")
@@ -268,214 +271,29 @@ class LLMTool(Tool):
     # ADD THIS NEW METHOD to your LLMTool class:
 
     def _parse_intent_json(self, cleaned_response: str):
-        """Parse JSON response while preserving arrays - FIXED VERSION."""
-        import json
-        import re
-        
+        """Parse JSON response while preserving arrays (first complete top-level value wins)."""
         try:
-            # FIRST: Try direct JSON parsing (best case)
-            try:
-                parsed = json.loads(cleaned_response)
-                print(f"✅ DIRECT JSON PARSE SUCCESS: {type(parsed)}")
-                return parsed  # This preserves arrays!
-            except json.JSONDecodeError:
-                print(f"⚠️ Direct JSON parse failed, trying extraction...")
-        
-            # SECOND: Try to extract JSON from text
-            # Look for array pattern first (priority for multi-intent)
-            array_pattern = r'\[[\s\S]*?\]'
-            array_matches = re.findall(array_pattern, cleaned_response, re.MULTILINE | re.DOTALL)
-            
-            for match in array_matches:
-                try:
-                    match_clean = match.strip()
-                    # Remove trailing commas
-                    match_clean = re.sub(r',(\s*[}\]])', r'\1', match_clean)
-                    
-                    parsed = json.loads(match_clean)
-                    if isinstance(parsed, list):
-                        print(f"✅ FOUND ARRAY: {len(parsed)} items")
-                        return parsed  # Return the full array!
-                except json.JSONDecodeError:
-                    continue
-            
-            # THIRD: Look for object pattern
-            object_pattern = r'\{[\s\S]*?\}'
-            object_matches = re.findall(object_pattern, cleaned_response, re.MULTILINE | re.DOTALL)
-            
-            for match in object_matches:
-                try:
-                    match_clean = match.strip()
-                    # Remove trailing commas
-                    match_clean = re.sub(r',(\s*[}\]])', r'\1', match_clean)
-                    
-                    parsed = json.loads(match_clean)
-                    if isinstance(parsed, dict):
-                        print(f"✅ FOUND OBJECT: {parsed.get('action', 'unknown')}")
-                        return parsed  # Return the single object
-                except json.JSONDecodeError:
-                    continue
-            
-            # FOURTH: Use the data processor as last resort
-            print(f"⚠️ Using data_processor as fallback...")
-            return self.data_processor.extract_json_from_text(cleaned_response)
+            parsed = parse_first_json(cleaned_response)
+            if parsed is not None:
+                print(f"✅ JSON PARSE SUCCESS: {type(parsed)}")
+            else:
+                print(f"⚠️ No complete JSON value found")
+            return parsed
             
         except Exception as e:
             print(f"❌ JSON parsing exception: {e}")
             return None
     
-    def _build_intent_extraction_prompt(self, current_filters: Dict[str, Any]) -> str:
-        """Build system prompt for intent extraction."""
-        return f"""You are a JSON extraction assistant for a job candidate search system.   
-
-Current filters:
-- Keywords: {current_filters.get('keywords', [])}
-- Experience: {current_filters.get('min_exp', 0)}-{current_filters.get('max_exp', 10)} years
-- Salary: {current_filters.get('min_salary', 0)}-{current_filters.get('max_salary', 15)} lakhs
-- Current Cities: {current_filters.get('current_cities', [])}
-- Preferred Cities: {current_filters.get('preferred_cities', [])}
-
-CRITICAL RULES:
-1. Return ONLY valid JSON - no explanations, no <think> tags, no extra text
-2. For single action: return one object
-3. For multiple actions: return array of objects
-4. **SEARCH EXECUTION**: When user says "execute search", "search now", "trigger search", etc.
-
-SEARCH EXECUTION SPECIAL HANDLING:
-If user request contains search execution keywords like:
-- "execute search", "trigger search", "search now", "run search"
-- "find candidates", "show results", "get candidates"
-- "show me", "find now"
-
-Return:
-{{
-    "action": "search_execution",
-    "filter_type": "search",
-    "operation": "execute",
-    "value": "current_criteria",
-    "mandatory": false,
-    "response_text": "Executing search with current criteria",
-    "trigger_search": true
-}}
-
-EXAMPLES:
-"execute search with updated criteria" → {{"action": "search_execution", "response_text": "Executing search with current criteria", "trigger_search": true}}
-"search now" → {{"action": "search_execution", "response_text": "Executing search", "trigger_search": true}}
-"find candidates" → {{"action": "search_execution", "response_text": "Finding candidates with current filters", "trigger_search": true}}
-
-ACTION TYPES:
-- add_skill: Add a keyword/skill
-- remove_skill: Remove a keyword/skill  
-- modify_experience: Change experience range
-- modify_salary: Change salary range
-- add_location: Add a city location
-
-OPERATION TYPES (USE ONLY THESE):
-- For experience/salary: "set_range" (for ranges like "5-10") or "set" (for single values)
-- NEVER use: "decrease_max_by", "increase_by", "reduce_by" - these don't exist!
-
-EXPERIENCE/SALARY MODIFICATION LOGIC:
-- "reduce experience by 2" → Calculate new range: current max - 2, use "set_range"
-- "increase salary by 5" → Calculate new range: current max + 5, use "set_range"  
-- "set experience to 8" → Use "set" with value "8"
-- "experience 5-12 years" → Use "set_range" with value "5-12"
-
-CURRENT VALUES FOR CALCULATIONS:
-- Current experience: {current_filters.get('min_exp', 0)}-{current_filters.get('max_exp', 10)} years
-- Current salary: {current_filters.get('min_salary', 0)}-{current_filters.get('max_salary', 15)} lakhs
-
-TRIGGER_SEARCH LOGIC - SIMPLIFIED:
-- If user request starts with "search with" or "find" or "show me": SET trigger_search=true for ALL actions
-- If user request is just modifications without "search": SET trigger_search=false for ALL actions
-- For multiple actions: ALL actions get same trigger_search value
-- If the user asks "filter by" : SET trigger_search=true for ALL actions
-
-MANDATORY vs OPTIONAL:
-- mandatory=true for: "mandatory", "required", "must have", "should have", "essential", "permanent"
-- mandatory=false for: "optional", "nice to have", default case
-
-VALUE FORMATS:
-- Skills: "Python", "Java" (clean skill names)
-- Experience ranges: "6-15" (always min-max format)
-- Salary ranges: "7-30" (always min-max format)  
-- Locations: "Bangalore", "Mumbai" (clean city names)
-
-EXAMPLES:
-Input: "reduce experience by 2"
-Current: 0-10 years
-Calculation: 10 - 2 = 8
-Output: {{"action": "modify_experience", "operation": "set_range", "value": "0-8", "response_text": "Reduced experience range to 0-8 years", "trigger_search": false}}
-
-Input: "increase salary by 5"  
-Current: 0-15 lakhs
-Calculation: 15 + 5 = 20
-Output: {{"action": "modify_salary", "operation": "set_range", "value": "0-20", "response_text": "Increased salary range to 0-20 lakhs", "trigger_search": false}}
-
-Input: "set max experience to 12"
-Current: 0-10 years  
-Output: {{"action": "modify_experience", "operation": "set_range", "value": "0-12", "response_text": "Set experience range to 0-12 years", "trigger_search": false}}
-
-Input: "add python as mandatory"
-Output: {{"action": "add_skill", "value": "Python", "mandatory": true, "response_text": "Added Python as mandatory skill", "trigger_search": false}}
-
-Input: "search with java"
-Output: {{"action": "add_skill", "value": "Java", "mandatory": false, "response_text": "Added Java and searching", "trigger_search": true}}
-
-Input: "search with java as mandatory, experience 6-15 years, bangalore location, salary 7-30 lakhs"
-Output: [
-{{"action": "add_skill", "value": "Java", "mandatory": true, "response_text": "Added Java as mandatory", "trigger_search": true}},
-{{"action": "modify_experience", "operation": "set_range", "value": "6-15", "response_text": "Set experience 6-15 years", "trigger_search": true}},
-{{"action": "add_location", "value": "Bangalore", "mandatory": false, "response_text": "Added Bangalore location", "trigger_search": true}},
-{{"action": "modify_salary", "operation": "set_range", "value": "7-30", "response_text": "Set salary 7-30 lakhs", "trigger_search": true}}
-]
-
-Return ONLY the JSON response."""
-    
     # In resdex_agent/tools/llm_tools.py
     def _clean_llm_response(self, response: str) -> str:
+        """Return the first JSON value in the response as text, or the response without <think> blocks."""
         import re
-        import json
-        
-        # Remove <think> tags first
-        cleaned = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL | re.IGNORECASE)
-        cleaned = cleaned.strip()
-        
-        # ENHANCED: Try multiple JSON extraction patterns
-        patterns = [
-            # Multi-intent specific pattern (PRIORITY 1)
-            r'\{[\s\S]*?"is_multi_intent"[\s\S]*?"reasoning":\s*"[^"]*"[\s\S]*?\}',
-            # Array pattern for skill expansion
-            r'\[[\s\S]*?\]',
-            # General object pattern
-            r'\{[\s\S]*?\}'
-        ]
         
-        for pattern in patterns:
-            matches = re.findall(pattern, cleaned, re.MULTILINE | re.DOTALL)
-            for match in matches:
-                try:
-                    match_clean = match.strip()
-                    # Remove trailing commas
-                    match_clean = re.sub(r',(\s*[}\]])', r'\1', match_clean)
-                    
-                    parsed = json.loads(match_clean)
-                    
-                    # CRITICAL: Validate response type
-                    if isinstance(parsed, dict):
-                        # Multi-intent response
-                        if "is_multi_intent" in parsed:
-                            print(f"✅ FOUND MULTI-INTENT OBJECT: {parsed}")
-                            return match_clean
-                        # Other object types
-                        else:
-                            return match_clean
-                    elif isinstance(parsed, list):
-                        return match_clean
-                            
-                except json.JSONDecodeError as e:
-                    print(f"❌ JSON parse failed for pattern: {e}")
-                    continue
+        parsed = parse_first_json(response)
+        if parsed is not None:
+            return json.dumps(parsed, ensure_ascii=False)
         
+        cleaned = re.sub(r'<think>.*?</think>', '', response, flags=re.DOTALL | re.IGNORECASE).strip()
         print(f"⚠️ No valid JSON found in response: {cleaned[:200]}...")
         return cleaned
     def _default_intent_response(self, user_input: str) -> Dict[str, Any]:
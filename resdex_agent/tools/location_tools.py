@@ -1,10 +1,16 @@
 """
 Location analysis tools using Qwen LLM for intelligent location matching.
+
+Nearby, metro-area and industry-hub questions are answered offline from the
+shipped location data (utils.geo_knowledge); the LLM is only asked about
+cities that are missing from it.
 """
 
 from typing import Dict, Any, List, Optional
 import logging
 
+from ..utils.geo_knowledge import get_geo_knowledge
+
 # Simple Tool base class
 class Tool:
     """Base tool class."""
@@ -27,6 +33,13 @@ class LocationAnalysisTool(Tool):
         # Initialize LLM tool for location analysis
         from ..tools.llm_tools import LLMTool
         self.llm_tool = LLMTool("location_llm_tool")
+        
+        # Offline geography from sample_location coordinates
+        try:
+            self.geo_knowledge = get_geo_knowledge()
+        except Exception as e:
+            logger.warning(f"Geo knowledge unavailable, location analysis will use the LLM: {e}")
+            self.geo_knowledge = None
     
     async def __call__(self, 
                       base_location: str, 
@@ -147,6 +160,22 @@ class LocationAnalysisTool(Tool):
     async def _find_nearby_locations(self, base_location: str, radius_km: Optional[int] = None) -> Dict[str, Any]:
         radius = radius_km or 200  # Default 200km radius
         
+        if self.geo_knowledge:
+            local = self.geo_knowledge.nearby(base_location, radius)
+            if local["success"]:
+                nearby_locations = [loc["city"] for loc in local["locations"]]
+                print(f"🧭 GEO KNOWLEDGE: {len(nearby_locations)} cities within {radius}km of {base_location}")
+                return {
+                    "success": True,
+                    "base_location": base_location,
+                    "nearby_locations": nearby_locations,
+                    "detailed_locations": local["locations"],
+                    "radius_km": radius,
+                    "method": "offline_geo_knowledge",
+                    "message": f"Found {len(nearby_locations)} locations within {radius}km"
+                }
+            print(f"⚠️ {local['error']}, asking the LLM")
+        
         prompt = f"""You are a geography expert for India. Find cities within approximately {radius} km of {base_location}.
 
     Base Location: {base_location}
@@ -258,7 +287,23 @@ class LocationAnalysisTool(Tool):
             return await self._fallback_nearby_mapping(base_location, radius)
     
     async def _find_metro_area_locations(self, base_location: str) -> Dict[str, Any]:
-        """Find metropolitan area locations using Qwen LLM."""
+        """Find metropolitan area locations from local metro clusters, using Qwen LLM for unknown cities."""
+        
+        if self.geo_knowledge:
+            local = self.geo_knowledge.metro_area(base_location)
+            if local["success"]:
+                metro_locations = [loc["city"] for loc in local["locations"]]
+                print(f"🧭 GEO KNOWLEDGE METRO AREA: {metro_locations}")
+                return {
+                    "success": True,
+                    "base_location": base_location,
+                    "metro_area_locations": metro_locations,
+                    "detailed_locations": local["locations"],
+                    "metro_type": local["metro_type"],
+                    "method": "offline_geo_knowledge",
+                    "message": f"Found {len(metro_locations)} areas in {base_location} metro region"
+                }
+            print(f"⚠️ {local['error']}, asking the LLM")
         
         prompt = f"""You are an urban planning expert for India. Find all cities/areas that are part of the {base_location} metropolitan region.
 
@@ -310,10 +355,26 @@ Return ONLY the JSON response."""
         return await self._fallback_metro_mapping(base_location)
     
     async def _find_industry_hubs(self, base_location: str, industry: Optional[str] = None) -> Dict[str, Any]:
-        """Find industry-specific hub locations using Qwen LLM."""
+        """Find industry-specific hub locations from the hub table, using Qwen LLM for unknown cities."""
         
         industry_focus = industry or "technology and software"
         
+        if self.geo_knowledge:
+            local = self.geo_knowledge.industry_hubs_for(base_location, industry_focus)
+            if local["success"]:
+                hub_cities = [hub["city"] for hub in local["hubs"]]
+                print(f"🧭 GEO KNOWLEDGE INDUSTRY HUBS: {hub_cities}")
+                return {
+                    "success": True,
+                    "base_location": base_location,
+                    "industry_hubs": hub_cities,
+                    "detailed_hubs": local["hubs"],
+                    "industry_focus": industry_focus,
+                    "method": "offline_geo_knowledge",
+                    "message": f"Found {len(hub_cities)} {industry_focus} hubs similar to {base_location}"
+                }
+            print(f"⚠️ {local['error']}, asking the LLM")
+        
         prompt = f"""You are an industry analysis expert for India. Find cities with similar {industry_focus} industry presence as {base_location}.
 
 Base Location: {base_location}
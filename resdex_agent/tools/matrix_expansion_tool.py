@@ -3,6 +3,7 @@
 Matrix-based skill and title expansion tool with singleton pattern and fixed skill extraction.
 """
 
+import asyncio
 import time
 import os
 import sys
@@ -40,14 +41,17 @@ class MatrixExpansionTool(Tool):
     _feature_matrix_loader = None
     _initialization_error = None
     
-    def __new__(cls, name: str = "matrix_expansion_tool"):
+    # Client mode: talk to a shared matrix service instead of loading matrices in-process
+    _service_client = None
+    
+    def __new__(cls, name: str = "matrix_expansion_tool", local: bool = False):
         """Singleton pattern to ensure only one instance with loaded matrices."""
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super(MatrixExpansionTool, cls).__new__(cls)
             return cls._instance
     
-    def __init__(self, name: str = "matrix_expansion_tool"):
+    def __init__(self, name: str = "matrix_expansion_tool", local: bool = False):
         # Only initialize once
         if self._initialized:
             print(f"🔄 MatrixExpansionTool: Reusing existing matrix system (no reload)")
@@ -56,10 +60,44 @@ class MatrixExpansionTool(Tool):
         
         super().__init__(name=name, description="Matrix-based skill and title expansion")
         
+        # With MATRIX_SERVICE_SOCKET set, every worker shares the service's matrices
+        from ..config import config
+        if config.matrix_service.socket_path and not local:
+            from .matrix_service import MatrixServiceClient
+            MatrixExpansionTool._service_client = MatrixServiceClient()
+            # Name/ID conversions outside the service calls (e.g. the expansion agent) stay local
+            MatrixExpansionTool._load_convertors()
+            MatrixExpansionTool._initialized = True
+            print(f"🔌 MatrixExpansionTool: client mode via {config.matrix_service.socket_path} (no local matrices)")
+            return
+        
         # Initialize matrix system only once
         self._initialize_matrix_system_once()
         self._initialized = True
     
+    @classmethod
+    def _load_convertors(cls):
+        """Load the taxonomy skill/title convertors; each falls back to name normalization if missing."""
+        # Step 3: Try to import SkillConvertor from taxonomy
+        try:
+            print("📦 Step 3: Importing SkillConvertor from taxonomy...")
+            from taxonomy.common_functions import SkillConvertor
+            cls._skill_convertor = SkillConvertor()
+            print("✅ SkillConvertor imported from installed taxonomy package")
+        except ImportError as e:
+            print(f"⚠️ SkillConvertor import failed: {e}")
+            cls._skill_convertor = None
+        
+        # Step 4: NEW - Import TitleConvertor from taxonomy
+        try:
+            print("📦 Step 4: Importing TitleConvertor from taxonomy...")
+            from taxonomy.common_functions import TitleConvertor
+            cls._title_convertor = TitleConvertor()
+            print("✅ TitleConvertor imported from installed taxonomy package")
+        except ImportError as e:
+            print(f"⚠️ TitleConvertor import failed: {e}")
+            cls._title_convertor = None
+    
     @classmethod
     def _initialize_matrix_system_once(cls):
         """Initialize matrix system only once for all instances."""
@@ -99,25 +137,8 @@ class MatrixExpansionTool(Tool):
                 print(f"⚠️ FeatureMatrixLoader import failed: {e}")
                 cls._feature_matrix_loader = None
             
-            # Step 3: Try to import SkillConvertor from taxonomy
-            try:
-                print("📦 Step 3: Importing SkillConvertor from taxonomy...")
-                from taxonomy.common_functions import SkillConvertor
-                cls._skill_convertor = SkillConvertor()
-                print("✅ SkillConvertor imported from installed taxonomy package")
-            except ImportError as e:
-                print(f"⚠️ SkillConvertor import failed: {e}")
-                cls._skill_convertor = None
-            
-            # Step 4: NEW - Import TitleConvertor from taxonomy
-            try:
-                print("📦 Step 4: Importing TitleConvertor from taxonomy...")
-                from taxonomy.common_functions import TitleConvertor
-                cls._title_convertor = TitleConvertor()
-                print("✅ TitleConvertor imported from installed taxonomy package")
-            except ImportError as e:
-                print(f"⚠️ TitleConvertor import failed: {e}")
-                cls._title_convertor = None
+            # Steps 3-4: SkillConvertor and TitleConvertor from taxonomy
+            cls._load_convertors()
             
             # Step 5: Verify MatrixFeatures has the required methods
             print("🔍 Step 5: Verifying MatrixFeatures methods...")
@@ -168,6 +189,8 @@ class MatrixExpansionTool(Tool):
     
     def _is_available(self) -> bool:
         """Check if matrix system is available."""
+        if self._service_client is not None:
+            return self._service_client.is_available()
         return self._matrix_features is not None and self._initialization_error is None
     
     def _convert_skill_to_id(self, skill: str):
@@ -700,6 +723,9 @@ class MatrixExpansionTool(Tool):
             
             start_time = time.time()
             
+            if self._service_client is not None:
+                return await self._service_client.expand(expansion_type, base_items, top_n, normalize)
+            
             if expansion_type == "skill_to_skill":
                 return await self._expand_skill_to_skill(base_items, top_n, normalize)
             elif expansion_type == "skill_to_title":
@@ -726,356 +752,233 @@ class MatrixExpansionTool(Tool):
                 "method": "matrix_error"
             }
     
+    # Per-type wiring for the shared batched expansion path
+    _EXPANSION_SPECS = {
+        "skill_to_skill": {
+            "feature": "skillToSkillFeature", "source": "skill", "target": "skill",
+            "skip_inputs": True, "require_results": False,
+            "message": "Found {count} skills similar to ALL input skills: {items}"
+        },
+        "skill_to_title": {
+            # Result ids of skillToTitleFeature have always been named through SkillConvertor
+            "feature": "skillToTitleFeature", "source": "skill", "target": "title", "result_ids": "skill",
+            "skip_inputs": False, "require_results": False,
+            "message": "Found {count} related titles for skills using matrix analysis"
+        },
+        "title_to_skill": {
+            "feature": "titleToSkillFeature", "source": "title", "target": "skill",
+            "skip_inputs": False, "require_results": True,
+            "empty_error": "No skills found in matrix database for the given titles",
+            "message": "Found {count} related skills for titles using matrix analysis"
+        },
+        "title_to_title": {
+            "feature": "titleToTitleFeature", "source": "title", "target": "title",
+            "skip_inputs": True, "require_results": True,
+            "empty_error": "No titles found in matrix database for the given inputs",
+            "message": "Found {count} related titles using matrix analysis"
+        }
+    }
+    
     async def _expand_skill_to_skill(self, skills: List[str], top_n: int, normalize: bool) -> Dict[str, Any]:
-        """Expand skills to related skills - FIXED to use multiple skills collectively."""
-        try:
-            print(f"🔧 SKILL-TO-SKILL EXPANSION for: {skills}")
-            
-            if not hasattr(self._matrix_features, 'skillToSkillFeature'):
-                return {
-                    "success": False,
-                    "error": "skillToSkillFeature not available in MatrixFeatures",
-                    "method": "feature_missing"
-                }
-            
-            # Convert ALL skill names to IDs first
-            skill_ids = []
-            skill_mapping = {}
-            
-            for skill in skills:
-                skill_id = self._convert_skill_to_id(skill)
-                if skill_id and skill_id != "":
-                    skill_ids.append(skill_id)
-                    skill_mapping[skill_id] = skill
-                    print(f"  ✅ {skill} -> ID: {skill_id}")
-                else:
-                    print(f"  ❌ {skill} -> No valid ID found")
-            
-            if not skill_ids:
-                print(f"❌ No valid skill IDs found, falling back to LLM")
-                return {
-                    "success": False,
-                    "error": "No valid skill IDs found",
-                    "method": "skill_to_skill_matrix"
-                }
-            
-            # CRITICAL FIX: Pass ALL skill IDs to matrix at once
-            # This finds skills similar to the COMBINATION of input skills
-            print(f"🔍 Calling skillToSkillFeature.get_feature_value...")
-            print(f"  - Input IDs: {skill_ids}")
-            print(f"  - TopN: {top_n * 2}")
-            print(f"  - Normalize: {normalize}")
-            
-            # This is the correct usage - multiple skills as input
-            expansion_results = self._matrix_features.skillToSkillFeature.get_feature_value(
-                skill_ids, topN=top_n * 2, normalize=normalize
-            )
-            
-            print(f"📊 Matrix returned {len(expansion_results)} results")
-            print(f"🎯 Finding skills similar to ALL input skills: {[skill_mapping.get(sid, sid) for sid in skill_ids]}")
-            
-            # Convert back to skill names and format results
-            expanded_skills = []
-            processed_count = 0
-            
-            for skill_id, score in sorted(expansion_results.items(), key=lambda x: -x[1]):
-                # Skip if it's one of the input skills
-                if skill_id in skill_mapping:
-                    print(f"  ⏭️  Skipping input skill: {skill_mapping[skill_id]} (ID: {skill_id})")
-                    continue
-                    
-                skill_name = self._convert_id_to_skill(skill_id)
-                if skill_name and skill_name != "UNKNOWN" and processed_count < top_n:
-                    expanded_skills.append({
-                        "name": skill_name,
-                        "id": skill_id,
-                        "score": float(score),
-                        "type": "skill"
-                    })
-                    processed_count += 1
-                    print(f"  🎯 {skill_name} (ID: {skill_id}, Score: {score:.4f})")
-            
-            return {
-                "success": True,
-                "expansion_type": "skill_to_skill",
-                "base_items": skills,
-                "expanded_items": expanded_skills,
-                "total_found": len(expansion_results),
-                "method": "skill_to_skill_matrix",
-                "message": f"Found {len(expanded_skills)} skills similar to ALL input skills: {', '.join(skills)}"
-            }
-            
-        except Exception as e:
-            logger.error(f"Skill-to-skill expansion failed: {e}")
-            print(f"❌ Skill-to-skill expansion error: {e}")
-            import traceback
-            traceback.print_exc()
-            return {
-                "success": False,
-                "error": str(e),
-                "method": "skill_to_skill_matrix"
-            }
+        """Expand skills to related skills - uses multiple skills collectively."""
+        return (await self.expand_batch("skill_to_skill", [skills], top_n, normalize))[0]
     
     async def _expand_skill_to_title(self, skills: List[str], top_n: int, normalize: bool) -> Dict[str, Any]:
         """Expand skills to related titles."""
-        try:
-            print(f"🔧 SKILL-TO-TITLE EXPANSION for: {skills}")
-            
-            if not hasattr(self._matrix_features, 'skillToTitleFeature'):
-                return {
-                    "success": False,
-                    "error": "skillToTitleFeature not available in MatrixFeatures",
-                    "method": "feature_missing"
-                }
-            
-            # Convert skill names to IDs
-            skill_ids = []
-            for skill in skills:
-                skill_id = self._convert_skill_to_id(skill)
-                if skill_id:
-                    skill_ids.append(skill_id)
-                    print(f"  ✅ {skill} -> ID: {skill_id}")
-            
-            if not skill_ids:
-                return {
-                    "success": False,
-                    "error": "No valid skill IDs found",
-                    "method": "skill_to_title_matrix"
-                }
-            
-            # Call the matrix feature
-            print(f"🔍 Calling skillToTitleFeature.get_feature_value...")
-            expansion_results = self._matrix_features.skillToTitleFeature.get_feature_value(
-                skill_ids, topN=top_n * 2, normalize=normalize
-            )
-            
-            print(f"📊 Matrix returned {len(expansion_results)} results")
-            
-            # Convert title IDs back to names
-            expanded_titles = []
-            processed_count = 0
-            
-            for title_id, score in sorted(expansion_results.items(), key=lambda x: -x[1]):
-                title_name = self._convert_id_to_skill(title_id)
-                if title_name and title_name != "UNKNOWN" and processed_count < top_n:
-                    expanded_titles.append({
-                        "name": title_name,
-                        "id": title_id,
-                        "score": float(score),
-                        "type": "title"
-                    })
-                    processed_count += 1
-                    print(f"  🎯 {title_name} (ID: {title_id}, Score: {score:.4f})")
-            
-            return {
-                "success": True,
-                "expansion_type": "skill_to_title",
-                "base_items": skills,
-                "expanded_items": expanded_titles,
-                "total_found": len(expansion_results),
-                "method": "skill_to_title_matrix",
-                "message": f"Found {len(expanded_titles)} related titles for skills using matrix analysis"
-            }
-            
-        except Exception as e:
-            logger.error(f"Skill-to-title expansion failed: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "method": "skill_to_title_matrix"
-            }
+        return (await self.expand_batch("skill_to_title", [skills], top_n, normalize))[0]
     
     async def _expand_title_to_skill(self, titles: List[str], top_n: int, normalize: bool) -> Dict[str, Any]:
         """Expand titles to related skills using TitleConvertor."""
+        return (await self.expand_batch("title_to_skill", [titles], top_n, normalize))[0]
+    
+    async def _expand_title_to_title(self, titles: List[str], top_n: int, normalize: bool) -> Dict[str, Any]:
+        """Expand titles to related titles using TitleConvertor."""
+        return (await self.expand_batch("title_to_title", [titles], top_n, normalize))[0]
+    
+    async def expand_batch(self, expansion_type: str, base_item_groups: List[List[str]],
+                           top_n: int = 5, normalize: bool = True) -> List[Dict[str, Any]]:
+        """
+        Expand several independent groups of items with one matrix kernel call.
+        
+        Each group is scored collectively (row mean over its IDs); all groups go
+        through a single sparse matmul in Feature2dMatrix.get_feature_values_batch.
+        """
+        if self._service_client is not None:
+            return await self._service_client.expand_batch(expansion_type, base_item_groups, top_n, normalize)
+        return self._expand_batch_local(expansion_type, base_item_groups, top_n, normalize)
+    
+    async def expand_multi(self, expansion_types: List[str], base_items: List[str],
+                           top_n: int = 5, normalize: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Run several expansion types over the same items in one pass, e.g.
+        title_to_title and title_to_skill for the same titles.
+        
+        Locally the names are converted to IDs once per source vocabulary and all
+        matrices are scored in one executor hop, so the event loop stays free for
+        concurrent lookups. In client mode the requests land in the same service
+        batching window.
+        """
+        if not self._is_available():
+            error_msg = self._initialization_error or "Matrix expansion system not available"
+            return {expansion_type: {"success": False, "method": "matrix_unavailable",
+                                     "error": f"Matrix expansion system not available: {error_msg}"}
+                    for expansion_type in expansion_types}
+        
+        if self._service_client is not None:
+            results = await asyncio.gather(*[
+                self._service_client.expand(expansion_type, base_items, top_n, normalize)
+                for expansion_type in expansion_types
+            ])
+            return dict(zip(expansion_types, results))
+        
+        def run_all() -> Dict[str, Dict[str, Any]]:
+            converted = {}
+            return {
+                expansion_type: self._expand_batch_local(expansion_type, [base_items], top_n, normalize, converted)[0]
+                for expansion_type in expansion_types
+            }
+        
+        return await asyncio.get_running_loop().run_in_executor(None, run_all)
+    
+    def _convert_groups(self, source: str, base_item_groups: List[List[str]]) -> Tuple[List[List[Any]], List[Dict[Any, str]]]:
+        """Convert every group's names to matrix IDs for the given source vocabulary."""
+        to_id = self._convert_skill_to_id if source == "skill" else self._convert_title_to_id
+        id_groups = []
+        id_mappings = []
+        for items in base_item_groups:
+            ids, mapping = [], {}
+            for item in items:
+                item_id = to_id(item)
+                if item_id:
+                    ids.append(item_id)
+                    mapping[item_id] = item
+                    print(f"  ✅ {item} -> ID: {item_id}")
+                else:
+                    print(f"  ❌ {item} -> No valid ID found")
+            id_groups.append(ids)
+            id_mappings.append(mapping)
+        return id_groups, id_mappings
+    
+    def _expand_batch_local(self, expansion_type: str, base_item_groups: List[List[str]], top_n: int,
+                            normalize: bool, converted: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """
+        In-process batched expansion. ``converted`` caches ID conversions per
+        source vocabulary across calls that share the same groups.
+        """
+        method = f"{expansion_type}_matrix"
+        spec = self._EXPANSION_SPECS.get(expansion_type)
+        if spec is None:
+            return [{"success": False, "error": f"Unknown expansion type: {expansion_type}", "method": "invalid_type"}
+                    for _ in base_item_groups]
+        
         try:
-            print(f"🔧 TITLE-TO-SKILL EXPANSION for: {titles}")
+            print(f"🔧 {expansion_type.upper().replace('_', '-')} EXPANSION for: {base_item_groups}")
             
-            if not hasattr(self._matrix_features, 'titleToSkillFeature'):
-                return {
-                    "success": False,
-                    "error": "titleToSkillFeature not available in MatrixFeatures",
-                    "method": "feature_missing"
-                }
+            feature = getattr(self._matrix_features, spec["feature"], None)
+            if feature is None:
+                return [{"success": False, "error": f"{spec['feature']} not available in MatrixFeatures",
+                         "method": "feature_missing"} for _ in base_item_groups]
             
-            # Convert title names to IDs using TitleConvertor
-            title_ids = []
-            for title in titles:
-                title_id = self._convert_title_to_id(title)  # Use TitleConvertor
-                if title_id:
-                    title_ids.append(title_id)
-                    print(f"  ✅ {title} -> ID: {title_id}")
+            result_ids = spec.get("result_ids", spec["target"])
+            from_id = self._convert_id_to_skill if result_ids == "skill" else self._convert_id_to_title
             
-            if not title_ids:
-                return {
-                    "success": False,
-                    "error": "No valid title IDs found",
-                    "method": "title_to_skill_matrix"
-                }
+            # Convert every group's names to IDs first
+            if converted is None:
+                converted = {}
+            if spec["source"] not in converted:
+                converted[spec["source"]] = self._convert_groups(spec["source"], base_item_groups)
+            id_groups, id_mappings = converted[spec["source"]]
             
-            # Call the matrix feature
-            print(f"🔍 Calling titleToSkillFeature.get_feature_value...")
-            expansion_results = self._matrix_features.titleToSkillFeature.get_feature_value(
-                title_ids, topN=top_n * 2, normalize=normalize
-            )
+            # One batched kernel invocation for all groups
+            print(f"🔍 Calling {spec['feature']}.get_feature_values_batch for {len(id_groups)} group(s)...")
+            batch_results = feature.get_feature_values_batch(id_groups, topN=top_n * 2, normalize=normalize)
             
-            print(f"📊 Matrix returned {len(expansion_results)} results")
-            
-            # Validate that we actually got meaningful results
-            if not expansion_results or len(expansion_results) == 0:
-                print(f"❌ Matrix returned empty results - titles may not exist in matrix")
-                return {
-                    "success": False,
-                    "error": "No skills found in matrix database for the given titles",
-                    "method": "title_to_skill_matrix",
-                    "details": f"Title IDs {title_ids} not found in matrix"
-                }
-            
-            # Convert skill IDs back to names using SkillConvertor
-            expanded_skills = []
-            processed_count = 0
-            
-            for skill_id, score in sorted(expansion_results.items(), key=lambda x: -x[1]):
-                skill_name = self._convert_id_to_skill(skill_id)  # Use SkillConvertor for skills
-                if skill_name and skill_name != "UNKNOWN" and processed_count < top_n:
-                    expanded_skills.append({
-                        "name": skill_name,
-                        "id": skill_id,
-                        "score": float(score),
-                        "type": "skill"
-                    })
-                    processed_count += 1
-                    print(f"  🎯 {skill_name} (ID: {skill_id}, Score: {score:.4f})")
-            
-            # Validate that we got actual expanded skills
-            if not expanded_skills:
-                print(f"❌ No valid expanded skills after processing")
-                return {
-                    "success": False,
-                    "error": "No valid skills found after processing matrix results",
-                    "method": "title_to_skill_matrix"
-                }
-            
-            return {
-                "success": True,
-                "expansion_type": "title_to_skill",
-                "base_items": titles,
-                "expanded_items": expanded_skills,
-                "total_found": len(expansion_results),
-                "method": "title_to_skill_matrix",
-                "message": f"Found {len(expanded_skills)} related skills for titles using matrix analysis"
-            }
+            return [
+                self._format_expansion(expansion_type, spec, items, ids, mapping, results, from_id, top_n, method)
+                for items, ids, mapping, results in zip(base_item_groups, id_groups, id_mappings, batch_results)
+            ]
             
         except Exception as e:
-            logger.error(f"Title-to-skill expansion failed: {e}")
+            logger.error(f"{expansion_type} expansion failed: {e}")
+            print(f"❌ {expansion_type} expansion error: {e}")
+            import traceback
+            traceback.print_exc()
+            return [{"success": False, "error": str(e), "method": method} for _ in base_item_groups]
+    
+    def _format_expansion(self, expansion_type: str, spec: Dict[str, Any], base_items: List[str],
+                          ids: List[Any], id_mapping: Dict[Any, str], expansion_results: Dict[Any, float],
+                          from_id, top_n: int, method: str) -> Dict[str, Any]:
+        """Turn one group's raw matrix scores into the tool's expansion result format."""
+        if not ids:
             return {
                 "success": False,
-                "error": str(e),
-                "method": "title_to_skill_matrix"
+                "error": f"No valid {spec['source']} IDs found",
+                "method": method
             }
-    async def _expand_title_to_title(self, titles: List[str], top_n: int, normalize: bool) -> Dict[str, Any]:
-        """Expand titles to related titles using TitleConvertor."""
-        try:
-            print(f"🔧 TITLE-TO-TITLE EXPANSION for: {titles}")
-            
-            if not hasattr(self._matrix_features, 'titleToTitleFeature'):
-                return {
-                    "success": False,
-                    "error": "titleToTitleFeature not available in MatrixFeatures",
-                    "method": "feature_missing"
-                }
-            
-            # Convert title names to IDs using TitleConvertor
-            title_ids = []
-            title_mapping = {}
-            
-            for title in titles:
-                title_id = self._convert_title_to_id(title)  # Use TitleConvertor
-                if title_id:
-                    title_ids.append(title_id)
-                    title_mapping[title_id] = title
-                    print(f"  ✅ {title} -> ID: {title_id}")
-                else:
-                    print(f"  ❌ {title} -> No valid ID found")
-            
-            if not title_ids:
-                return {
-                    "success": False,
-                    "error": "No valid title IDs found",
-                    "method": "title_to_title_matrix"
-                }
-            
-            # Call the matrix feature
-            print(f"🔍 Calling titleToTitleFeature.get_feature_value...")
-            expansion_results = self._matrix_features.titleToTitleFeature.get_feature_value(
-                title_ids, topN=top_n * 2, normalize=normalize
-            )
-            
-            print(f"📊 Matrix returned {len(expansion_results)} results")
-            
-            # Validate that we actually got meaningful results
-            if not expansion_results or len(expansion_results) == 0:
-                print(f"❌ Matrix returned empty results - titles may not exist in matrix")
-                return {
-                    "success": False,
-                    "error": "No titles found in matrix database for the given inputs",
-                    "method": "title_to_title_matrix",
-                    "details": f"Title IDs {title_ids} not found in matrix"
-                }
-            
-            # Convert back to title names and format results
-            expanded_titles = []
-            processed_count = 0
-            
-            for title_id, score in sorted(expansion_results.items(), key=lambda x: -x[1]):
-                # Skip if it's one of the input titles
-                if title_id in title_mapping:
-                    print(f"  ⏭️  Skipping input title: {title_mapping[title_id]} (ID: {title_id})")
-                    continue
-                    
-                title_name = self._convert_id_to_title(title_id)  # Use TitleConvertor
-                if title_name and title_name != "UNKNOWN" and processed_count < top_n:
-                    expanded_titles.append({
-                        "name": title_name,
-                        "id": title_id,
-                        "score": float(score),
-                        "type": "title"
-                    })
-                    processed_count += 1
-                    print(f"  🎯 {title_name} (ID: {title_id}, Score: {score:.4f})")
-            
-            # Validate that we got actual expanded titles
-            if not expanded_titles:
-                print(f"❌ No valid expanded titles after processing")
-                return {
-                    "success": False,
-                    "error": "No valid expanded titles found after processing matrix results",
-                    "method": "title_to_title_matrix"
-                }
-            
+        
+        print(f"📊 Matrix returned {len(expansion_results)} results")
+        
+        if spec["require_results"] and not expansion_results:
+            print(f"❌ Matrix returned empty results - inputs may not exist in matrix")
             return {
-                "success": True,
-                "expansion_type": "title_to_title",
-                "base_items": titles,
-                "expanded_items": expanded_titles,
-                "total_found": len(expansion_results),
-                "method": "title_to_title_matrix",
-                "message": f"Found {len(expanded_titles)} related titles using matrix analysis"
+                "success": False,
+                "error": spec["empty_error"],
+                "method": method,
+                "details": f"IDs {ids} not found in matrix"
             }
-            
-        except Exception as e:
-            logger.error(f"Title-to-title expansion failed: {e}")
-            print(f"❌ Title-to-title expansion error: {e}")
+        
+        expanded_items = []
+        for item_id, score in sorted(expansion_results.items(), key=lambda x: -x[1]):
+            if len(expanded_items) >= top_n:
+                break
+            # Skip the input items themselves
+            if spec["skip_inputs"] and item_id in id_mapping:
+                print(f"  ⏭️  Skipping input item: {id_mapping[item_id]} (ID: {item_id})")
+                continue
+            
+            name = from_id(item_id)
+            if name and name != "UNKNOWN":
+                expanded_items.append({
+                    "name": name,
+                    "id": item_id,
+                    "score": float(score),
+                    "type": spec["target"]
+                })
+                print(f"  🎯 {name} (ID: {item_id}, Score: {score:.4f})")
+        
+        if spec["require_results"] and not expanded_items:
+            print(f"❌ No valid expanded items after processing")
             return {
                 "success": False,
-                "error": str(e),
-                "method": "title_to_title_matrix"
+                "error": f"No valid {spec['target']}s found after processing matrix results",
+                "method": method
             }
+        
+        return {
+            "success": True,
+            "expansion_type": expansion_type,
+            "base_items": base_items,
+            "expanded_items": expanded_items,
+            "total_found": len(expansion_results),
+            "method": method,
+            "message": spec["message"].format(count=len(expanded_items), items=", ".join(base_items))
+        }
 
     
     
     def get_matrix_stats(self) -> Dict[str, Any]:
         """Get statistics about the matrix system."""
         try:
+            if self._service_client is not None:
+                return {
+                    "available": self._service_client.is_available(),
+                    "mode": "client",
+                    "socket_path": self._service_client.socket_path,
+                    "skill_convertor_available": self._skill_convertor is not None,
+                    "title_convertor_available": self._title_convertor is not None,
+                    "singleton_initialized": self._initialized
+                }
+            
             if not self._is_available():
                 return {
                     "available": False,
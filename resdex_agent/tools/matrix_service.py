@@ -0,0 +1,285 @@
+"""
+Shared matrix-expansion service for multi-worker deployments.
+
+One process loads the affinity matrices and taxonomy convertors once and
+serves every agent worker over a local Unix socket. Concurrent expand
+requests are collected for a short batching window and scored with a single
+MatrixExpansionTool.expand_batch call per (expansion_type, top_n, normalize).
+
+Wire format is newline-delimited JSON:
+    request:  {"id": 1, "op": "expand", "expansion_type": ..., "base_items": [...], "top_n": 5, "normalize": true}
+    response: {"id": 1, "result": {...}}  or  {"id": 1, "error": "..."}
+
+Run with:  python -m resdex_agent.tools.matrix_service [socket_path]
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+# Expansion results can carry a few hundred items; leave headroom over asyncio's 64KB line limit
+STREAM_LIMIT = 4 * 1024 * 1024
+
+
+class MatrixServiceError(Exception):
+    """Raised by the client when the service is unreachable or returns an error."""
+
+
+class MatrixService:
+    """Hosts one in-process MatrixExpansionTool and micro-batches requests from all workers."""
+
+    def __init__(self, socket_path: Optional[str] = None, batch_window_ms: Optional[float] = None,
+                 max_batch_size: Optional[int] = None):
+        service_config = config.matrix_service
+        self.socket_path = socket_path or service_config.socket_path
+        if not self.socket_path:
+            raise ValueError("MATRIX_SERVICE_SOCKET is not set and no socket path was given")
+        window_ms = service_config.batch_window_ms if batch_window_ms is None else batch_window_ms
+        self.batch_window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size or service_config.max_batch_size
+
+        self.tool = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._server = None
+        self._batcher: Optional[asyncio.Task] = None
+        self.stats = {"requests": 0, "errors": 0, "batches": 0, "batched_requests": 0,
+                      "max_batch": 0, "connections": 0, "started_at": None}
+
+    async def start(self):
+        """Load the matrices and start listening on the Unix socket."""
+        from .matrix_expansion_tool import MatrixExpansionTool
+
+        self.tool = MatrixExpansionTool("matrix_expansion_service", local=True)
+        if not self.tool._is_available():
+            raise RuntimeError(f"Matrix system failed to load: {self.tool._initialization_error}")
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path,
+                                                       limit=STREAM_LIMIT)
+        self.stats["started_at"] = time.time()
+        print(f"🧮 Matrix service listening on {self.socket_path} "
+              f"(batch window {self.batch_window * 1000:.1f}ms, max batch {self.max_batch_size})")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            self._batcher.cancel()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Read requests off one worker connection; responses may return out of order."""
+        self.stats["connections"] += 1
+        write_lock = asyncio.Lock()
+        in_flight = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"Matrix service dropped malformed request: {e}")
+                    continue
+                task = asyncio.create_task(self._dispatch(request, writer, write_lock))
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for task in in_flight:
+                task.cancel()
+            writer.close()
+
+    async def _dispatch(self, request: Dict[str, Any], writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        self.stats["requests"] += 1
+        op = request.get("op")
+        try:
+            if op == "expand":
+                future = asyncio.get_running_loop().create_future()
+                await self._queue.put((request, future))
+                result = await future
+            elif op == "stats":
+                result = self.get_stats()
+            elif op == "ping":
+                result = "pong"
+            else:
+                raise ValueError(f"Unknown op: {op}")
+            response = {"id": request.get("id"), "result": result}
+        except Exception as e:
+            self.stats["errors"] += 1
+            response = {"id": request.get("id"), "error": str(e)}
+
+        async with write_lock:
+            writer.write((json.dumps(response, default=str) + "\n").encode())
+            await writer.drain()
+
+    async def _batch_loop(self):
+        """Collect requests for up to batch_window (or max_batch_size), then score them together."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._run_batch(batch)
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        groups: Dict[Tuple[str, int, bool], List[Tuple[Dict[str, Any], asyncio.Future]]] = {}
+        for request, future in batch:
+            key = (request.get("expansion_type"), int(request.get("top_n", 5)), bool(request.get("normalize", True)))
+            groups.setdefault(key, []).append((request, future))
+
+        self.stats["batches"] += 1
+        self.stats["batched_requests"] += len(batch)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+
+        for (expansion_type, top_n, normalize), members in groups.items():
+            try:
+                results = await self.tool.expand_batch(
+                    expansion_type, [request.get("base_items", []) for request, _ in members], top_n, normalize
+                )
+                for (_, future), result in zip(members, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                logger.error(f"Matrix service batch failed for {expansion_type}: {e}")
+                for _, future in members:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["avg_batch"] = stats["batched_requests"] / stats["batches"] if stats["batches"] else 0.0
+        stats["matrix"] = self.tool.get_matrix_stats() if self.tool else {}
+        return stats
+
+
+class MatrixServiceClient:
+    """
+    Multiplexed async client: one socket connection per event loop, responses
+    matched to callers by request id so many coroutines share the connection.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, request_timeout: Optional[float] = None):
+        service_config = config.matrix_service
+        self.socket_path = socket_path or service_config.socket_path
+        self.request_timeout = request_timeout or service_config.request_timeout
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connecting: Optional[asyncio.Task] = None
+
+    def is_available(self) -> bool:
+        return bool(self.socket_path) and os.path.exists(self.socket_path)
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=STREAM_LIMIT)
+        self._writer = writer
+        asyncio.get_running_loop().create_task(self._read_responses(reader, writer))
+
+    async def _ensure_connection(self):
+        loop = asyncio.get_running_loop()
+        if self._writer is not None and self._loop is loop and not self._writer.is_closing():
+            return
+        # Connections cannot cross event loops; open a fresh one for this loop
+        if self._connecting is None or self._loop is not loop:
+            self._loop = loop
+            self._writer = None
+            self._connecting = loop.create_task(self._connect())
+        try:
+            await asyncio.shield(self._connecting)
+        except Exception as e:
+            self._connecting = None
+            raise MatrixServiceError(f"Cannot reach matrix service at {self.socket_path}: {e}")
+
+    async def _read_responses(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(MatrixServiceError(response["error"]))
+                else:
+                    future.set_result(response.get("result"))
+        except Exception as e:
+            logger.warning(f"Matrix service connection lost: {e}")
+        finally:
+            if self._writer is writer:
+                self._writer = None
+                self._connecting = None
+            for request_id, future in list(self._pending.items()):
+                if future.get_loop() is asyncio.get_running_loop() and not future.done():
+                    future.set_exception(MatrixServiceError("Matrix service connection closed"))
+                    self._pending.pop(request_id, None)
+
+    async def request(self, op: str, **payload) -> Any:
+        await self._ensure_connection()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            self._writer.write((json.dumps({"id": request_id, "op": op, **payload}) + "\n").encode())
+            await self._writer.drain()
+            return await asyncio.wait_for(future, timeout=self.request_timeout)
+        except asyncio.TimeoutError:
+            raise MatrixServiceError(f"Matrix service timed out after {self.request_timeout}s")
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def expand(self, expansion_type: str, base_items: List[str], top_n: int = 5,
+                     normalize: bool = True) -> Dict[str, Any]:
+        return await self.request("expand", expansion_type=expansion_type, base_items=base_items,
+                                  top_n=top_n, normalize=normalize)
+
+    async def expand_batch(self, expansion_type: str, base_item_groups: List[List[str]],
+                           top_n: int = 5, normalize: bool = True) -> List[Dict[str, Any]]:
+        # Sent as independent requests; the service's batching window merges them again
+        return list(await asyncio.gather(*[
+            self.expand(expansion_type, items, top_n, normalize) for items in base_item_groups
+        ]))
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return await self.request("stats")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else None
+    try:
+        asyncio.run(MatrixService(socket_path=socket_path).serve_forever())
+    except KeyboardInterrupt:
+        print("🛑 Matrix service stopped")
+
+
+if __name__ == "__main__":
+    main()
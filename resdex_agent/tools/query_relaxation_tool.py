@@ -3,11 +3,12 @@
 Query Relaxation Tool for ResDex Agent - Integration with external relaxation API.
 """
 
-import requests
+import asyncio
 import json
 import logging
 from typing import Dict, Any, List, Optional
 from ..config import config
+from ..utils.http_client import http_pool
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,7 @@ class QueryRelaxationTool(Tool):
             'Content-Type': 'application/json',
             'X-TRANSACTION-ID': '3113ea131'
         }
+        self.http_pool = http_pool
         
         # Default company/recruiter info (can be made configurable)
         self.default_company_info = {
@@ -440,11 +442,11 @@ class QueryRelaxationTool(Tool):
             
             logger.info(f"Calling relaxation API with current count: {current_count}")
             
-            response = requests.post(
+            response = await self.http_pool.post(
+                "relaxation",
                 self.api_url,
                 headers=self.headers,
-                data=json.dumps(payload, default=str),
-                timeout=30
+                data=json.dumps(payload, default=str)
             )
             
             print(f"📡 API Response Status: {response.status_code}")
@@ -477,7 +479,7 @@ class QueryRelaxationTool(Tool):
                     "raw_response": None
                 }
                 
-        except requests.exceptions.Timeout:
+        except asyncio.TimeoutError:
             error_msg = "API request timed out"
             logger.error(f"Relaxation API timeout")
             return {"success": False, "error": error_msg}
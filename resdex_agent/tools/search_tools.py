@@ -2,7 +2,9 @@
 Search-related tools for ResDex Agent.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, AsyncIterator
+from collections import deque
+import asyncio
 import logging
 
 # Create a simple Tool base class
@@ -18,6 +20,8 @@ class Tool:
 from ..utils.api_client import api_client
 from ..utils.data_processing import DataProcessor
 from ..utils.db_manager import db_manager
+from ..utils.dag_executor import DAGExecutor, PipelineStage
+from ..config import config
 
 logger = logging.getLogger(__name__)
 
@@ -30,101 +34,117 @@ class SearchTool(Tool):
         self.api_client = api_client
         self.db_manager = db_manager
         self.data_processor = DataProcessor()
-    # Update the search_tools.py to ensure we get at least 20 candidates
-
+        self.deadline = config.api.search_deadline
+        self.enrichment_timeout = config.api.enrichment_timeout
+        self.page_size = config.api.hydration_page_size
+        self.prefetch_pages = config.api.hydration_prefetch_pages
+    
+    def _build_pipeline(self, search_filters: Dict[str, Any], hydrate: bool = True) -> DAGExecutor:
+        """
+        Search pipeline as a DAG:
+        
+            build_request -> search -> user_ids -> {user_details, real_names} -> candidates
+        
+        Stages that only need the user IDs (details, names, future enrichment)
+        run concurrently. real_names is optional and degrades to fallback names.
+        With hydrate=False the DAG stops at user_ids (used by stream()).
+        """
+        max_candidates = search_filters.get('max_candidates', 100)
+        
+        async def build_request(deps):
+            request_payload = await self.api_client.build_search_request_async(search_filters)
+            # FIXED: Override the API request to fetch more candidates
+            if 'SEARCH_COUNT' in request_payload:
+                request_payload['SEARCH_COUNT'] = max(200, max_candidates * 2)  # Request 2x to ensure we get enough
+                print(f"🔧 OVERRIDING API SEARCH_COUNT to: {request_payload['SEARCH_COUNT']}")
+            return request_payload
+        
+        async def search(deps):
+            search_response = await self.api_client.search_candidates(deps["build_request"])
+            print(f"📥 SEARCH API RESPONSE: Success={search_response['success']}")
+            if not search_response["success"]:
+                raise RuntimeError(search_response["error"])
+            return search_response
+        
+        async def user_ids(deps):
+            extracted = self._extract_user_ids_from_search_response(deps["search"]["data"])
+            print(f"👥 EXTRACTED USER IDS: {len(extracted)} users")
+            # FIXED: Take up to max_candidates, but at least 20 if available
+            target_candidates = max(20, min(max_candidates, len(extracted)))
+            print(f"🎯 PROCESSING: {min(len(extracted), target_candidates)} user IDs (target: {target_candidates})")
+            return extracted[:target_candidates]
+        
+        async def user_details(deps):
+            if not deps["user_ids"]:
+                return []
+            return await self.api_client.get_user_details(deps["user_ids"])
+        
+        async def real_names(deps):
+            if not deps["user_ids"]:
+                return {}
+            return await self.db_manager.get_real_names(deps["user_ids"])
+        
+        async def candidates(deps):
+            return self._format_candidates(deps["user_details"], deps["real_names"])
+        
+        stages = [
+            PipelineStage("build_request", build_request),
+            PipelineStage("search", search, depends_on=["build_request"]),
+            PipelineStage("user_ids", user_ids, depends_on=["search"])
+        ]
+        if hydrate:
+            stages.extend([
+                PipelineStage("user_details", user_details, depends_on=["user_ids"]),
+                PipelineStage("real_names", real_names, depends_on=["user_ids"],
+                              required=False, default={}, timeout=self.enrichment_timeout),
+                PipelineStage("candidates", candidates, depends_on=["user_details", "real_names"])
+            ])
+        return DAGExecutor(stages, deadline=self.deadline)
+    
     async def __call__(self, search_filters: Dict[str, Any]) -> Dict[str, Any]:
         """Execute candidate search - FIXED to ensure minimum 20 candidates."""
         try:
             logger.info(f"Executing search with filters: {search_filters}")
             print(f"🔍 SEARCH TOOL DEBUG: Starting search with filters: {search_filters}")
+            print(f"📊 REQUESTING: {search_filters.get('max_candidates', 100)} candidates from API")
             
-            # FIXED: Ensure we request enough candidates from API
-            max_candidates = search_filters.get('max_candidates', 100)
-            print(f"📊 REQUESTING: {max_candidates} candidates from API")
-            
-            # Build search request using the API client
-            request_payload = self.api_client.build_search_request(search_filters)
+            run = await self._build_pipeline(search_filters).run()
+            results, errors = run["results"], run["errors"]
+            timings = run["timings"]
+            print(f"⏱️ SEARCH STAGE TIMINGS: {timings}")
             
-            # FIXED: Override the API request to fetch more candidates
-            # Increase the search count in the API request
-            if 'SEARCH_COUNT' in request_payload:
-                request_payload['SEARCH_COUNT'] = max(200, max_candidates * 2)  # Request 2x to ensure we get enough
-                print(f"🔧 OVERRIDING API SEARCH_COUNT to: {request_payload['SEARCH_COUNT']}")
-            
-            # Execute search
-            search_response = await self.api_client.search_candidates(request_payload)
-            
-            print(f"📥 SEARCH API RESPONSE: Success={search_response['success']}")
-            
-            if not search_response["success"]:
+            if "search" not in results:
+                failed_stage = next(iter(errors), "search")
                 return {
                     "success": False,
-                    "error": search_response["error"],
+                    "error": errors.get(failed_stage, "Search pipeline failed"),
                     "candidates": [],
-                    "total_count": 0
+                    "total_count": 0,
+                    "timings": timings
                 }
             
-            # Process the search response data
-            search_data = search_response["data"]
-            total_count = search_response["total_count"]
-            
-            print(f"📊 RAW API DATA STRUCTURE:")
-            print(f"  - Type: {type(search_data)}")
-            print(f"  - Keys: {list(search_data.keys()) if isinstance(search_data, dict) else 'Not a dict'}")
-            if isinstance(search_data, dict) and 'results' in search_data:
-                print(f"  - Results type: {type(search_data['results'])}")
-                print(f"  - Results count: {len(search_data['results'])}")
-            print(f"  - Total count: {total_count}")
-            
-            # Extract user IDs
-            user_ids = self._extract_user_ids_from_search_response(search_data)
+            total_count = results["search"]["total_count"]
             
-            print(f"👥 EXTRACTED USER IDS: {len(user_ids)} users")
-            
-            if not user_ids:
+            if not results.get("user_ids"):
                 return {
                     "success": True,
                     "candidates": [],
                     "total_count": total_count,
-                    "message": "No candidates found matching the criteria"
+                    "message": "No candidates found matching the criteria",
+                    "timings": timings
                 }
             
-            # FIXED: Ensure we take enough user IDs for processing
-            # Take up to max_candidates, but at least 20 if available
-            target_candidates = max(20, min(max_candidates, len(user_ids)))
-            user_ids_to_process = user_ids[:target_candidates]
-            
-            print(f"🎯 PROCESSING: {len(user_ids_to_process)} user IDs (target: {target_candidates})")
-            
-            # Get detailed user information
-            user_details = await self.api_client.get_user_details(user_ids_to_process)
-            
-            if not user_details:
+            if not results.get("user_details"):
                 return {
                     "success": True,
                     "candidates": [],
                     "total_count": total_count,
-                    "message": f"Found {total_count:,} matches but failed to fetch candidate details"
+                    "message": f"Found {total_count:,} matches but failed to fetch candidate details",
+                    "timings": timings,
+                    "degraded_stages": run["degraded"]
                 }
             
-            print(f"📋 USER DETAILS RECEIVED: {len(user_details)} candidates")
-            
-            # Get real names from database
-            real_names = await self.db_manager.get_real_names(user_ids_to_process)
-            
-            # Format candidate data
-            candidates = []
-            for user_data in user_details:
-                user_id = None
-                if 'basic' in user_data and 'userid' in user_data['basic']:
-                    user_id = user_data['basic']['userid']
-                
-                real_name = real_names.get(user_id) if user_id else None
-                
-                candidate = self.data_processor.format_candidate_data(user_data, real_name)
-                if candidate:
-                    candidates.append(candidate)
-            
+            candidates = results.get("candidates", [])
             print(f"✅ FINAL CANDIDATES: {len(candidates)} successfully formatted")
             
             # FIXED: If we have fewer than 20 candidates but API has more results, warn
@@ -135,7 +155,9 @@ class SearchTool(Tool):
                 "success": True,
                 "candidates": candidates,
                 "total_count": total_count,
-                "message": f"Found {len(candidates)} detailed profiles from {total_count:,} total matches"
+                "message": f"Found {len(candidates)} detailed profiles from {total_count:,} total matches",
+                "timings": timings,
+                "degraded_stages": run["degraded"]
             }
             
         except Exception as e:
@@ -149,6 +171,112 @@ class SearchTool(Tool):
                 "total_count": 0
             }
     
+    async def stream(self, search_filters: Dict[str, Any], page_size: Optional[int] = None,
+                     prefetch_pages: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streaming hydration: yield formatted candidates page by page.
+        
+        The first page is dispatched on its own before any prefetch, so it
+        gets the first pooled connection; up to ``prefetch_pages`` later pages
+        are fetched in the background while earlier ones are consumed. Only
+        that window of raw user details is ever held in memory.
+        """
+        page_size = page_size or self.page_size
+        prefetch_pages = self.prefetch_pages if prefetch_pages is None else prefetch_pages
+        
+        run = await self._build_pipeline(search_filters, hydrate=False).run()
+        results, errors, timings = run["results"], run["errors"], run["timings"]
+        print(f"⏱️ SEARCH STAGE TIMINGS: {timings}")
+        
+        if "user_ids" not in results:
+            failed_stage = next(iter(errors), "search")
+            yield {
+                "success": False,
+                "error": errors.get(failed_stage, "Search pipeline failed"),
+                "candidates": [],
+                "total_count": 0,
+                "page": 0,
+                "done": True,
+                "timings": timings
+            }
+            return
+        
+        total_count = results["search"]["total_count"]
+        pages = self.db_manager.chunk(results["user_ids"], page_size)
+        
+        if not pages:
+            yield {
+                "success": True,
+                "candidates": [],
+                "total_count": total_count,
+                "page": 0,
+                "done": True,
+                "message": "No candidates found matching the criteria",
+                "timings": timings
+            }
+            return
+        
+        pending = deque([asyncio.ensure_future(self._hydrate_page(pages[0]))])
+        next_page = 1
+        
+        try:
+            for page_idx in range(len(pages)):
+                # Keep a bounded prefetch window running behind the page being awaited
+                while next_page < len(pages) and len(pending) <= prefetch_pages:
+                    pending.append(asyncio.ensure_future(self._hydrate_page(pages[next_page])))
+                    next_page += 1
+                
+                page_start = asyncio.get_running_loop().time()
+                candidates = await pending.popleft()
+                timings[f"page_{page_idx}"] = round(asyncio.get_running_loop().time() - page_start, 4)
+                
+                print(f"📦 HYDRATED PAGE {page_idx + 1}/{len(pages)}: {len(candidates)} candidates")
+                yield {
+                    "success": True,
+                    "candidates": candidates,
+                    "total_count": total_count,
+                    "page": page_idx,
+                    "total_pages": len(pages),
+                    "done": page_idx == len(pages) - 1,
+                    "timings": timings
+                }
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _hydrate_page(self, page_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch details and names for one page concurrently and format them."""
+        async def page_names():
+            try:
+                return await asyncio.wait_for(self.db_manager.get_real_names(page_ids), timeout=self.enrichment_timeout)
+            except Exception as e:
+                print(f"⚠️ Real names unavailable for page: {e}")
+                return {}
+        
+        user_details, real_names = await asyncio.gather(
+            self.api_client.get_user_details(page_ids),
+            page_names()
+        )
+        return self._format_candidates(user_details or [], real_names)
+    
+    def _format_candidates(self, user_details: List[Dict[str, Any]], real_names: Dict[Any, str]) -> List[Dict[str, Any]]:
+        """Merge user details with real names into display-ready candidates."""
+        print(f"📋 USER DETAILS RECEIVED: {len(user_details)} candidates")
+        
+        candidates = []
+        for user_data in user_details:
+            user_id = None
+            if 'basic' in user_data and 'userid' in user_data['basic']:
+                user_id = user_data['basic']['userid']
+            
+            real_name = real_names.get(user_id) if user_id else None
+            
+            candidate = self.data_processor.format_candidate_data(user_data, real_name)
+            if candidate:
+                candidates.append(candidate)
+        
+        return candidates
+    
     def _extract_user_ids_from_search_response(self, search_data: Dict[str, Any]) -> List[str]:
         """Extract user IDs from the search API response using working version logic"""
         user_ids = []
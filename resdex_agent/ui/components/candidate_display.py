@@ -13,8 +13,12 @@ class CandidateDisplay:
         self.session_state = session_state
         self.page_size = 5
     
-    def render_results(self):
-        """Render the complete results section - FIXED for batch display system."""
+    def render_results(self, show_pagination: bool = True):
+        """
+        Render the complete results section - FIXED for batch display system.
+        Previews rendered while a search is still streaming pass show_pagination=False
+        so the pagination buttons are only created once per script run.
+        """
         candidates = self.session_state.get('displayed_candidates', [])
         total_results = self.session_state.get('total_results', 0)
         all_candidates_count = len(self.session_state.get('all_candidates', []))
@@ -37,7 +41,8 @@ class CandidateDisplay:
             self._render_candidate_card(candidate, i)
         
         # Pagination controls
-        self._render_pagination_controls_with_batch_info(len(candidates), page_size)
+        if show_pagination:
+            self._render_pagination_controls_with_batch_info(len(candidates), page_size)
 
     def _render_results_header_with_batch_info(self, total_results: int, selected_keywords: List[str], displayed_count: int, fetched_count: int):
         """Render results header with complete filter information."""
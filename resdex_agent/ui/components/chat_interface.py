@@ -4,14 +4,15 @@ Chat interface component with Memory Integration and LIVE step streaming
 """
 
 import streamlit as st #type: ignore
-import asyncio
 import time
 import uuid
 from typing import Dict, Any, Optional, List
 
 # Step logging imports
+from ...config import config
 from ...utils.step_logger import step_logger
-from .step_display import StepDisplay, poll_and_update_steps
+from ..runtime import run_async, submit_async
+from .step_display import StepDisplay
 from .facet_display import FacetDisplay
 
 
@@ -109,7 +110,7 @@ class ChatInterface:
         )
         
         if st.button("Search Memory") and search_query:
-            asyncio.run(self._perform_memory_search(search_query))
+            run_async(self._perform_memory_search(search_query))
     
     async def _perform_memory_search(self, query: str):
         """NEW: Perform memory search and display results."""
@@ -207,14 +208,14 @@ class ChatInterface:
             if st.button("Clear Chat 🗑️"):
                 # Save current conversation to memory before clearing
                 if self.session_manager and len(self.session_state.get('chat_history', [])) > 0:
-                    asyncio.run(self._save_conversation_to_memory())
+                    run_async(self._save_conversation_to_memory())
                 self.session_state['chat_history'] = []
                 self.session_state['conversation_session_id'] = str(uuid.uuid4())  # New conversation session
                 st.experimental_rerun()
         
         with col2:
             if st.button("💾 Save to Memory") and self.session_manager:
-                asyncio.run(self._save_conversation_to_memory())
+                run_async(self._save_conversation_to_memory())
                 st.success("Conversation saved to memory!")
                 time.sleep(1)
                 st.experimental_rerun()
@@ -258,9 +259,7 @@ class ChatInterface:
             step_logger.start_session(session_id)
             
             # Process the message with memory integration
-            success = asyncio.run(self._handle_chat_message_with_memory_and_steps(
-                user_input, session_id, step_container
-            ))
+            success = self._run_chat_turn_with_live_steps(user_input, session_id, step_container)
             
             # Keep the step display visible with final status
             final_steps = step_logger.get_steps(session_id)
@@ -314,50 +313,67 @@ class ChatInterface:
         
         st.caption(f"📊 {len(steps)} processing steps • 🧠 Memory integrated")
     
-    async def _handle_chat_message_with_memory_and_steps(self, user_input: str, session_id: str, step_container) -> bool:
-        """Handle chat message with memory integration and step streaming."""
+    def _render_live_steps(self, step_container, steps):
+        """Render the latest steps of an in-progress turn with the LIVE badge."""
+        with step_container.container():
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.markdown("**🔄 AI Processing Steps (Memory Enhanced)**")
+            with col2:
+                st.markdown('<span style="background: #28a745; color: white; padding: 2px 6px; border-radius: 8px; font-size: 10px; font-weight: bold;">LIVE</span>', unsafe_allow_html=True)
+            
+            for step in steps[-15:]:
+                icon = self.step_display.step_icons.get(step["type"], "💡")
+                
+                # Add memory indicator
+                message = step['message']
+                if any(keyword in message.lower() for keyword in ['memory', 'conversation', 'remember', 'recall']):
+                    icon = "🧠"
+                
+                step_col1, step_col2, step_col3 = st.columns([0.5, 6, 1.5])
+                
+                with step_col1:
+                    st.markdown(f"<div style='text-align: center; font-size: 14px;'>{icon}</div>", unsafe_allow_html=True)
+                
+                with step_col2:
+                    display_message = message
+                    if len(display_message) > 45:
+                        display_message = display_message[:42] + "..."
+                    st.markdown(f"<div style='padding-top: 2px; font-size: 12px; word-wrap: break-word;'>{display_message}</div>", unsafe_allow_html=True)
+                
+                with step_col3:
+                    timestamp = step['timestamp']
+                    st.markdown(f"<div style='text-align: right; font-size: 9px; color: #999; padding-top: 4px; font-family: monospace;'>{timestamp}</div>", unsafe_allow_html=True)
+    
+    def _run_chat_turn_with_live_steps(self, user_input: str, session_id: str, step_container) -> bool:
+        """
+        Run one chat turn on the agent runtime while this script thread repaints
+        the live step panel from the step stream.
+        
+        Pacing lives here: the stream coalesces bursts into one repaint per
+        ui_step_render_interval, while the agent keeps running.
+        """
+        steps_stream = step_logger.stream_blocking(session_id, min_interval=config.ui_step_render_interval)
+        future = submit_async(self._process_chat_turn(user_input, session_id, step_container))
+        future.add_done_callback(lambda _: step_logger.end_stream(session_id))
+        
+        steps = []
+        for batch in steps_stream:
+            steps.extend(batch)
+            try:
+                self._render_live_steps(step_container, steps)
+            except Exception as e:
+                print(f"❌ Live step render error: {e}")
+        return future.result()
+    
+    async def _process_chat_turn(self, user_input: str, session_id: str, step_container) -> bool:
+        """Run one chat turn through the agent; steps are logged, never awaited for display."""
         try:
             user_id = self.session_state['user_id']
             conversation_session_id = self.session_state['conversation_session_id']
             
-            # Function to update steps display
-            def update_all_steps():
-                current_steps = step_logger.get_steps(session_id)
-                if current_steps:
-                    with step_container.container():
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.markdown("**🔄 AI Processing Steps (Memory Enhanced)**")
-                        with col2:
-                            st.markdown('<span style="background: #28a745; color: white; padding: 2px 6px; border-radius: 8px; font-size: 10px; font-weight: bold;">LIVE</span>', unsafe_allow_html=True)
-                        
-                        for step in current_steps[-15:]:
-                            icon = self.step_display.step_icons.get(step["type"], "💡")
-                            
-                            # Add memory indicator
-                            message = step['message']
-                            if any(keyword in message.lower() for keyword in ['memory', 'conversation', 'remember', 'recall']):
-                                icon = "🧠"
-                            
-                            step_col1, step_col2, step_col3 = st.columns([0.5, 6, 1.5])
-                            
-                            with step_col1:
-                                st.markdown(f"<div style='text-align: center; font-size: 14px;'>{icon}</div>", unsafe_allow_html=True)
-                            
-                            with step_col2:
-                                display_message = message
-                                if len(display_message) > 45:
-                                    display_message = display_message[:42] + "..."
-                                st.markdown(f"<div style='padding-top: 2px; font-size: 12px; word-wrap: break-word;'>{display_message}</div>", unsafe_allow_html=True)
-                            
-                            with step_col3:
-                                timestamp = step['timestamp']
-                                st.markdown(f"<div style='text-align: right; font-size: 9px; color: #999; padding-top: 4px; font-family: monospace;'>{timestamp}</div>", unsafe_allow_html=True)
-            
             # Log initial step with memory awareness
             step_logger.log_step(f"🧠 Memory-enhanced analysis: \"{user_input[:40]}{'...' if len(user_input) > 40 else ''}\"", "routing")
-            update_all_steps()
-            await asyncio.sleep(0.3)
             
             # NEW: Add this interaction to conversation memory
             if self.session_manager:
@@ -368,25 +384,18 @@ class ChatInterface:
                     content={"message": user_input}
                 )
                 step_logger.log_step("💾 Added to conversation memory", "system")
-                update_all_steps()
-                await asyncio.sleep(0.3)
             
             # Check for "show more candidates" command
             if self._is_show_more_command(user_input):
                 step_logger.log_step("📋 Show more candidates detected", "decision")
-                update_all_steps()
-                await asyncio.sleep(0.3)
                 
                 await self._handle_show_more_command()
                 step_logger.log_completion("Additional candidates loaded")
-                update_all_steps()
                 return True
             
             # Prepare session state
             session_state_dict = self._get_clean_session_state()
             step_logger.log_step("🔧 Preparing agent context with memory", "system")
-            update_all_steps()
-            await asyncio.sleep(0.3)
             self.session_state['chat_history'].append({
                 "role": "user",
                 "content": user_input
@@ -402,22 +411,15 @@ class ChatInterface:
             })
             
             step_logger.log_llm_call("Qwen/Qwen3-32B", "processing with memory")
-            update_all_steps()
-            await asyncio.sleep(0.3)
             
             # Execute the agent request
             result = await self.root_agent.execute(content)
             
             # Process the result with memory integration
-            update_all_steps()
-            await asyncio.sleep(0.5)
-            
             if result.data["success"]:
                 response_type = result.data.get("type", "search_interaction")
                 if response_type == "general_query":
                     step_logger.log_step("💬 Memory-enhanced response generated", "llm")
-                    update_all_steps()
-                    await asyncio.sleep(0.5)
                     
                     ai_message = result.data.get("message", "I'm here to help!")
                     self.session_state['chat_history'].append({
@@ -431,13 +433,11 @@ class ChatInterface:
                     session_id=conversation_session_id
                 )
                     step_logger.log_completion("Memory-enhanced response ready")
-                    update_all_steps()
-                    await asyncio.sleep(0.5)
                     
                 else:
                     # Handle search interaction responses with memory
                     await self._handle_search_response_with_memory(
-                        result, user_id, conversation_session_id, update_all_steps
+                        result, user_id, conversation_session_id
                     )
                 
                 return True
@@ -445,8 +445,6 @@ class ChatInterface:
             else:
                 # Handle error with memory
                 step_logger.log_error(result.data.get("error", "Unknown error"))
-                update_all_steps()
-                await asyncio.sleep(5.0)
                 
                 error_message = result.data.get("error", "Sorry, I couldn't process that request.")
                 self.session_state['chat_history'].append({
@@ -468,12 +466,10 @@ class ChatInterface:
             })
             return False
     
-    async def _handle_search_response_with_memory(self, result, user_id: str, conversation_session_id: str, update_callback):
+    async def _handle_search_response_with_memory(self, result, user_id: str, conversation_session_id: str):
         """ENHANCED method with query relaxation support."""
         try:
             step_logger.log_step("🔧 Processing search modifications with memory", "tool")
-            update_callback()
-            await asyncio.sleep(0.5)
             
             # Update session state if provided
             if "session_state" in result.data:
@@ -481,8 +477,6 @@ class ChatInterface:
                 if isinstance(updated_state, dict):
                     self._update_session_state_safely(updated_state)
                     step_logger.log_step("💾 Session state updated", "system")
-                    update_callback()
-                    await asyncio.sleep(0.5)
             
             # Check response type to handle different agent responses
             response_type = result.data.get("type", "")
@@ -491,7 +485,6 @@ class ChatInterface:
             # Handle refinement responses specially
             if response_type == "refinement_response":
                 step_logger.log_step(f"🎯 Refinement response processed: {refinement_type}", "refinement")
-                update_callback()
                 
                 # Handle facet generation
                 if refinement_type == "facet_generation" and result.data.get("facets_data"):
@@ -512,7 +505,6 @@ class ChatInterface:
                         })
                     
                     step_logger.log_completion("Enhanced facets ready for sidebar display")
-                    update_callback()
                 
                 # NEW: Handle query relaxation
                 elif refinement_type == "query_relaxation":
@@ -533,7 +525,6 @@ class ChatInterface:
                         })
                     
                     step_logger.log_completion("Query relaxation suggestions ready")
-                    update_callback()
                 
                 # Don't process further for refinement responses
                 return
@@ -565,19 +556,15 @@ class ChatInterface:
             # Handle search triggering
             if result.data.get("trigger_search", False):
                 step_logger.log_step("🚀 Search triggered by agent", "search")
-                update_callback()
-                await asyncio.sleep(0.5)
                 
                 await self._handle_triggered_search_with_memory(
-                    result.data, user_id, conversation_session_id, update_callback
+                    result.data, user_id, conversation_session_id
                 )
             else:
                 step_logger.log_completion("Request processed without search trigger")
-                update_callback()
                 
         except Exception as e:
             step_logger.log_error(f"Search response handling failed: {str(e)}")
-            update_callback()
             
             error_msg = f"❌ Error processing request: {str(e)}"
             if not self._is_duplicate_chat_message(error_msg):
@@ -823,12 +810,10 @@ class ChatInterface:
             total_count = 0
         
         return total_count
-    async def _handle_triggered_search_with_memory(self, result_data: Dict[str, Any], user_id: str, conversation_session_id: str, update_callback):
+    async def _handle_triggered_search_with_memory(self, result_data: Dict[str, Any], user_id: str, conversation_session_id: str):
         """Handle search triggered by AI agent with memory context - ENHANCED VERSION."""
         try:
             step_logger.log_step("⚙️ Preparing memory-enhanced search execution", "search")
-            update_callback()
-            await asyncio.sleep(0.1)
             
             # Get updated session state
             updated_state = result_data.get("session_state", self.session_state)
@@ -858,8 +843,6 @@ class ChatInterface:
                 )
             
             step_logger.log_search_execution(search_filters)
-            update_callback()
-            await asyncio.sleep(0.1)
             
             # Execute search through root agent
             from ...agent import Content
@@ -870,8 +853,6 @@ class ChatInterface:
             })
             
             step_logger.log_step("📡 Calling ResDex API with memory context", "search")
-            update_callback()
-            await asyncio.sleep(0.1)
             
             # Execute the search
             search_result = await self.root_agent.execute(search_content)
@@ -881,8 +862,6 @@ class ChatInterface:
                 total_count = search_result.data["total_count"]
                 
                 step_logger.log_results(len(candidates), total_count)
-                update_callback()
-                await asyncio.sleep(0.1)
                 
                 # Update session state with search results
                 self.session_state['candidates'] = candidates
@@ -914,13 +893,11 @@ class ChatInterface:
                 })
                 
                 step_logger.log_completion("Memory-enhanced search completed successfully")
-                update_callback()
                 
             else:
                 # Handle search failure
                 error_msg = search_result.data.get('error', 'Unknown error')
                 step_logger.log_error(f"Search failed: {error_msg}")
-                update_callback()
                 
                 error_response = f"❌ Search failed: {error_msg}"
                 self.session_state['chat_history'].append({
@@ -939,7 +916,6 @@ class ChatInterface:
                     
         except Exception as e:
             step_logger.log_error(f"Memory-enhanced search execution failed: {str(e)}")
-            update_callback()
             
             error_msg = f"❌ Search execution failed: {str(e)}"
             self.session_state['chat_history'].append({
@@ -964,7 +940,7 @@ class ChatInterface:
             
             with col1:
                 if st.button("📚 View All Memories"):
-                    asyncio.run(self._show_all_user_memories())
+                    run_async(self._show_all_user_memories())
             
             with col2:
                 if st.button("🔍 Advanced Search"):
@@ -1026,7 +1002,7 @@ class ChatInterface:
         max_results = st.slider("Max Results:", 1, 20, 10)
         
         if st.button("🔍 Advanced Search") and search_query:
-            asyncio.run(self._perform_advanced_memory_search(search_type, search_query, max_results))
+            run_async(self._perform_advanced_memory_search(search_type, search_query, max_results))
     
     async def _perform_advanced_memory_search(self, search_type: str, query: str, max_results: int):
         """NEW: Perform advanced memory search."""
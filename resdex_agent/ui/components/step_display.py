@@ -3,7 +3,6 @@ Real-time step display component - Fixed for live streaming in Streamlit 1.12
 """
 
 import streamlit as st
-import time
 from typing import Dict, Any, List, Optional
 from ...utils.step_logger import step_logger
 
@@ -193,34 +192,3 @@ class StepDisplay:
                     placeholder.markdown(f"🔄 **Step {len(steps)}:** {latest_step['message']}")
             except:
                 placeholder.markdown("🔄 **Processing...**")
-
-
-def poll_and_update_steps(session_id: str, placeholder, max_polls: int = 50):
-    """
-    FIXED: Poll for steps and update display - works with Streamlit 1.12
-    """
-    step_display = StepDisplay()
-    
-    for poll_count in range(max_polls):
-        try:
-            # Get current steps
-            current_steps = step_logger.get_steps(session_id)
-            
-            if current_steps:
-                # Update display with ALL steps
-                step_display._render_live_steps_container(placeholder, current_steps)
-                
-                # Check if complete
-                if current_steps[-1]["type"] in ["completion", "error"]:
-                    # Keep final display for a moment
-                    time.sleep(2)
-                    return True
-            
-            # Small delay between polls
-            time.sleep(0.1)
-            
-        except Exception as e:
-            print(f"❌ Step polling error: {e}")
-            break
-    
-    return False
\ No newline at end of file
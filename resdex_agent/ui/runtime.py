@@ -0,0 +1,41 @@
+"""
+Run UI coroutines on the shared agent runtime loop instead of asyncio.run.
+
+UI coroutines read and write st.session_state and render widgets, and Streamlit
+resolves both through the script-run context attached to the current thread.
+The helpers below re-attach the calling script's context on the runtime thread
+before every step of the submitted coroutine.
+"""
+
+import threading
+from typing import Any, Callable, Coroutine, Optional
+
+from ..utils.agent_runtime import agent_runtime
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:  # Streamlit < 1.14
+    try:
+        from streamlit.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    except ImportError:
+        add_script_run_ctx = get_script_run_ctx = None
+
+
+def _script_context_hook() -> Optional[Callable[[], None]]:
+    """Return a callable that attaches the caller's script-run context to the current thread."""
+    if get_script_run_ctx is None:
+        return None
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return None
+    return lambda: add_script_run_ctx(threading.current_thread(), ctx)
+
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the agent runtime and wait for its result."""
+    return agent_runtime.run(coro, timeout=timeout, enter=_script_context_hook())
+
+
+def submit_async(coro: Coroutine):
+    """Submit a coroutine to the agent runtime and return its future without waiting."""
+    return agent_runtime.submit(coro, enter=_script_context_hook())
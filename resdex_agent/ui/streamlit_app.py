@@ -4,7 +4,6 @@ Streamlit application for ResDex Agent with Memory Integration and live step str
 """
 
 import streamlit as st
-import asyncio
 import logging
 import uuid
 import time
@@ -17,6 +16,7 @@ from resdex_agent.ui.components.chat_interface import ChatInterface
 from resdex_agent.ui.components.step_display import StepDisplay
 from resdex_agent.utils.step_logger import step_logger
 from resdex_agent.ui.components.facet_display import FacetDisplay
+from resdex_agent.ui.runtime import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -103,7 +103,7 @@ class StreamlitApp:
         # Initialize memory session if not exists
         if hasattr(self.root_agent, 'session_manager') and st.session_state.get('memory_enabled'):
             try:
-                asyncio.run(self._initialize_memory_session())
+                run_async(self._initialize_memory_session())
             except Exception as e:
                 logger.error(f"Failed to initialize memory session: {e}")
     
@@ -174,7 +174,7 @@ class StreamlitApp:
             with col1:
                 st.markdown("**Agent Health**")
                 if st.button("Check System Health"):
-                    health_status = asyncio.run(self._check_agent_health())
+                    health_status = run_async(self._check_agent_health())
                     if health_status["success"]:
                         st.success("✅ All systems operational")
                         
@@ -195,7 +195,7 @@ class StreamlitApp:
                 
                 if st.button("💾 Save Current Session"):
                     if hasattr(self.root_agent, 'session_manager'):
-                        asyncio.run(self._manual_save_session())
+                        run_async(self._manual_save_session())
                         st.success("Session saved to memory!")
                     else:
                         st.error("Memory service not available")
@@ -205,7 +205,7 @@ class StreamlitApp:
                 
                 if st.button("🧹 Cleanup Old Sessions"):
                     if hasattr(self.root_agent, 'cleanup_old_sessions'):
-                        asyncio.run(self.root_agent.cleanup_old_sessions(max_age_hours=24))
+                        run_async(self.root_agent.cleanup_old_sessions(max_age_hours=24))
                         st.success("Old sessions cleaned up!")
     
     async def _manual_save_session(self):
@@ -258,7 +258,7 @@ class StreamlitApp:
                     
                     # Show user-specific stats
                     if hasattr(self.root_agent, 'session_manager'):
-                        session_stats = asyncio.run(self.root_agent.session_manager.get_session_stats())
+                        session_stats = run_async(self.root_agent.session_manager.get_session_stats())
                         st.metric("User Sessions", session_stats.get("total_sessions", 0))
                 
                 # Show detailed stats
@@ -278,7 +278,7 @@ class StreamlitApp:
             self.search_form.render_company_input()
             search_button = st.button("🔍 Search Candidates", key="search_candidates_main")
             if search_button:
-                asyncio.run(self._handle_search_request_with_memory())            
+                run_async(self._handle_search_request_with_memory())            
             # Reduced gap
             st.markdown("<div style='margin: 0.5rem 0;'></div>", unsafe_allow_html=True)
             
@@ -345,7 +345,7 @@ class StreamlitApp:
                     
                     if st.button("✨ Generate Facets", help="Generate interactive facets for current search"):
                         session_id = str(uuid.uuid4())
-                        asyncio.run(self._generate_facets_for_current_search(session_id))
+                        run_async(self._generate_facets_for_current_search(session_id))
                     
                 else:
                     st.markdown("### 🤖 AI Assistant with Memory")
@@ -367,7 +367,7 @@ class StreamlitApp:
                 # Get recent interactions
                 memory_tool = self.root_agent.tools.get("memory_tool")
                 if memory_tool:
-                    recent_memories = asyncio.run(memory_tool.get_recent_interactions(
+                    recent_memories = run_async(memory_tool.get_recent_interactions(
                         user_id=user_id,
                         hours=24,
                         max_results=3
@@ -542,15 +542,33 @@ class StreamlitApp:
             # Show loading message
             with st.spinner("🔍 Searching candidates with memory context..."):
                 
-                # Execute search with memory context
+                # Execute search with progressive hydration: the first page is
+                # rendered as soon as it arrives, later pages keep streaming in
                 from resdex_agent.agent import Content
-                content = Content(data={
-                    "request_type": "candidate_search",
-                    "search_filters": search_filters,
-                    "user_id": user_id  # NEW: Include user_id for memory
-                })
+                preview = st.empty()
+                all_candidates = []
+                result_data = {"success": True, "candidates": [], "total_count": 0}
                 
-                result = await self.root_agent.execute(content)
+                async for page in self.root_agent.stream_search(search_filters):
+                    if not page["success"]:
+                        result_data = page
+                        break
+                    
+                    all_candidates.extend(page["candidates"])
+                    result_data = {**page, "candidates": all_candidates}
+                    
+                    if page["page"] == 0 and all_candidates:
+                        st.session_state['all_candidates'] = all_candidates
+                        st.session_state['displayed_candidates'] = all_candidates[:20]
+                        st.session_state['total_results'] = page["total_count"]
+                        st.session_state['page'] = 0
+                        with preview.container():
+                            st.markdown("### Search Results")
+                            self.candidate_display.render_results(show_pagination=False)
+                
+                # The full results section is rendered by _render_main_content
+                preview.empty()
+                result = Content(data=result_data)
                 
                 if result.data["success"]:
                     all_candidates = result.data["candidates"]
@@ -5,13 +5,48 @@ Utilities package for ResDex Agent - Enhanced with step logging.
 from .data_processing import DataProcessor
 from .db_manager import db_manager
 from .api_client import api_client
+from .http_client import http_pool, HTTPSessionPool
+from .llm_client import llm_client, AsyncLLMClient
+from .llm_cache import llm_cache, LLMResponseCache
+from .prompt_budget import prompt_budget, PromptBudget
+from .stream_json import StreamingJSONParser, parse_first_json
 from .constants import *
 from .step_logger import step_logger, StepLogger
+from .fast_router import fast_router, FastPathRouter
+from .agent_runtime import agent_runtime, AgentRuntime
+from .geo_distance import DistanceEngine, haversine_matrix
+from .geo_index import GeoIndex
+from .location_dataset import get_location_dataset, LocationDataset
+from .location_resolver import get_location_resolver, LocationResolver
+from .geo_knowledge import get_geo_knowledge, GeoKnowledge
 
 __all__ = [
     "DataProcessor",
     "db_manager", 
     "api_client",
+    "http_pool",
+    "HTTPSessionPool",
+    "llm_client",
+    "AsyncLLMClient",
+    "llm_cache",
+    "LLMResponseCache",
+    "prompt_budget",
+    "PromptBudget",
+    "StreamingJSONParser",
+    "parse_first_json",
     "step_logger",
-    "StepLogger"
+    "StepLogger",
+    "fast_router",
+    "FastPathRouter",
+    "agent_runtime",
+    "AgentRuntime",
+    "DistanceEngine",
+    "haversine_matrix",
+    "GeoIndex",
+    "get_location_dataset",
+    "LocationDataset",
+    "get_location_resolver",
+    "LocationResolver",
+    "get_geo_knowledge",
+    "GeoKnowledge"
 ]
\ No newline at end of file
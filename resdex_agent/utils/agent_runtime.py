@@ -0,0 +1,159 @@
+"""
+Persistent event loop for running agent coroutines from synchronous callers.
+
+Streamlit re-executes its script on every interaction, and calling asyncio.run
+each time creates and tears down an event loop. That orphans the pooled HTTP
+sessions and LLM clients bound to the loop. AgentRuntime owns one loop on a
+daemon thread for the life of the process: callers submit coroutines and wait
+on the returned futures.
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _StepHook:
+    """Awaitable that calls ``enter`` on the loop thread before every step of ``coro``."""
+
+    def __init__(self, coro: Coroutine, enter: Callable[[], None]):
+        self.coro = coro
+        self.enter = enter
+
+    def __await__(self):
+        value, error = None, None
+        try:
+            while True:
+                self.enter()
+                try:
+                    yielded = self.coro.throw(error) if error is not None else self.coro.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                value, error = None, None
+                try:
+                    value = yield yielded
+                except BaseException as e:
+                    error = e
+        finally:
+            self.coro.close()
+
+
+async def _bind(coro: Coroutine, enter: Callable[[], None]) -> Any:
+    return await _StepHook(coro, enter)
+
+
+async def _close_shared_clients():
+    """Close the pooled clients owned by the runtime loop."""
+    from .http_client import http_pool
+    from .llm_client import llm_client
+    await http_pool.close()
+    await llm_client.aclose()
+
+
+class AgentRuntime:
+    """One long-lived event loop on a background thread that synchronous code submits coroutines to."""
+
+    def __init__(self, name: str = "resdex-agent-runtime"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        self.start()
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_runtime(self) -> bool:
+        return self._thread is threading.current_thread()
+
+    def start(self):
+        """Start the loop thread if it is not running yet."""
+        with self._lock:
+            if self.running:
+                return
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,), name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+        print(f"🔁 Agent runtime loop started on thread '{self.name}'")
+
+    def _run_loop(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            pending = [task for task in asyncio.all_tasks(loop) if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+            loop.close()
+
+    def _record(self, future: concurrent.futures.Future):
+        if future.cancelled():
+            self.stats["cancelled"] += 1
+        elif future.exception() is not None:
+            self.stats["failed"] += 1
+        else:
+            self.stats["completed"] += 1
+
+    def submit(self, coro: Coroutine, enter: Optional[Callable[[], None]] = None) -> concurrent.futures.Future:
+        """
+        Schedule ``coro`` on the runtime loop and return a concurrent Future.
+
+        ``enter`` runs on the loop thread before every step of the coroutine,
+        e.g. to attach the caller's thread-local UI context.
+        """
+        if enter is not None:
+            coro = _bind(coro, enter)
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        self.stats["submitted"] += 1
+        future.add_done_callback(self._record)
+        return future
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None,
+            enter: Optional[Callable[[], None]] = None) -> Any:
+        """Run ``coro`` on the runtime loop and block for its result; a drop-in for asyncio.run."""
+        if self.in_runtime():
+            raise RuntimeError("AgentRuntime.run() cannot block the runtime thread; await the coroutine instead")
+        future = self.submit(coro, enter=enter)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def shutdown(self, timeout: float = 5.0):
+        """Close shared clients on the runtime loop, then stop it."""
+        if not self.running:
+            return
+        try:
+            self.run(_close_shared_clients(), timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Closing shared clients on runtime shutdown failed: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "running": self.running}
+
+
+# Global agent runtime shared by every Streamlit session in the process
+agent_runtime = AgentRuntime()
+atexit.register(agent_runtime.shutdown)
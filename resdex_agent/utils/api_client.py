@@ -4,11 +4,11 @@
 API client utilities for external service integration.
 """
 
-import requests
-import json
 from typing import Dict, Any, List, Optional
 import logging
 from .constants import API_HEADERS, BASE_API_REQUEST, API_COOKIES, ACTIVE_PERIOD_MAPPING
+from .http_client import http_pool
+from .location_normalizer import location_normalizer
 from ..config import config
 
 logger = logging.getLogger(__name__)
@@ -21,24 +21,12 @@ class APIClient:
         self.search_api_url = config.api.search_api_url
         self.user_details_api_url = config.api.user_details_api_url
         self.location_api_url = config.api.location_api_url
+        self.http_pool = http_pool
+        self.location_normalizer = location_normalizer
     
     def get_normalized_location_id(self, city):
         """Get normalized location ID for a city"""
-        payload = json.dumps({
-            "location": [
-                {
-                    "city": city
-                }
-            ]
-        })
-        
-        try:
-            response = requests.request("POST", self.location_api_url, headers=API_HEADERS["location"], data=payload)
-            loc_id = eval(response.text)[0]['city']['globalId']
-            return str(loc_id)
-        except Exception as e:
-            print(f"Error getting location ID for {city}: {e}")
-            return None
+        return self.location_normalizer.resolve_sync([city]).get(city)
     
     def get_days_old_mapping(self, active_period):
         """Convert active period to days_old value"""
@@ -58,13 +46,13 @@ class APIClient:
             print(f"🏢 emp_key: '{emp_key}'")
             print(f"🏢 emp_key_globalid: {emp_key_globalid}")
             
-            response = requests.post(
+            response = await self.http_pool.post(
+                "search",
                 self.search_api_url,
                 headers=API_HEADERS["search"],
                 cookies=API_COOKIES["search"],
-                json=request_payload,
-                timeout=30
-            )           
+                json=request_payload
+            )
             print(f"📡 SEARCH API RESPONSE:")
             print(f"  - Status Code: {response.status_code}")
             print(f"  - Response size: {len(response.text)} characters")
@@ -113,12 +101,12 @@ class APIClient:
                 'visibilityFlag': ['a', 'b']
             }
             
-            response = requests.post(
+            response = await self.http_pool.post(
+                "user_details",
                 self.user_details_api_url,
                 headers=API_HEADERS["user_details"],
                 cookies=API_COOKIES["user_details"],
-                json=json_data,
-                timeout=30
+                json=json_data
             )
             
             print(f"🔍 User details API response status: {response.status_code}")
@@ -139,11 +127,18 @@ class APIClient:
             return []
     
     async def normalize_location(self, city: str) -> Optional[str]:
-        """Get normalized location ID for a city."""
-        return self.get_normalized_location_id(city)
-    # Update the build_search_request method in api_client.py
+        """Get normalized location ID for a city without blocking the event loop."""
+        location_ids = await self.location_normalizer.resolve([city])
+        return location_ids.get(city)
+    
+    async def build_search_request_async(self, session_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve all cities in one non-blocking batch, then build the request."""
+        cities = session_state.get('current_cities', []) + session_state.get('preferred_cities', [])
+        location_ids = await self.location_normalizer.resolve(cities) if cities else {}
+        return self.build_search_request(session_state, location_ids=location_ids)
 
-    def build_search_request(self, session_state: Dict[str, Any]) -> Dict[str, Any]:
+    def build_search_request(self, session_state: Dict[str, Any],
+                             location_ids: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Any]:
         """Build the API request object using company normalization API."""
         print(f"🔧 Building search request with session state...")
         print(f"🔹 Keywords: {session_state.get('keywords', [])}")
@@ -154,22 +149,14 @@ class APIClient:
         print(f"🔹 Recruiter Company: {session_state.get('recruiter_company', '')}")
         print(f"🔹 Target Companies: {session_state.get('target_companies', [])}")
         
-        # Get city IDs (existing working logic)
-        city_ids = []
-        for city in session_state.get('current_cities', []):
-            city_id = self.get_normalized_location_id(city)
-            if city_id:
-                city_ids.append(city_id)
-            else:
-                city_ids.append(city)
+        # Get city IDs - one batched, cached lookup for current + preferred cities
+        current_cities = session_state.get('current_cities', [])
+        preferred_cities = session_state.get('preferred_cities', [])
+        if location_ids is None:
+            location_ids = self.location_normalizer.resolve_sync(current_cities + preferred_cities)
         
-        pref_city_ids = []
-        for city in session_state.get('preferred_cities', []):
-            city_id = self.get_normalized_location_id(city)
-            if city_id:
-                pref_city_ids.append(city_id)
-            else:
-                pref_city_ids.append(city)
+        city_ids = [location_ids.get(city) or city for city in current_cities]
+        pref_city_ids = [location_ids.get(city) or city for city in preferred_cities]
         
         # NEW: Get company IDs using normalization API
         target_companies = session_state.get('target_companies', [])
@@ -159,6 +159,45 @@ TECH_SKILLS: List[str] = [
     "Requirement Analysis", "Technical Specification", "System Design", "Architecture Design"
 ]
 
+# Metro names as they appear in city_dict.pickle; distance matrices between them are precomputed
+TOP_METRO_CITIES: List[str] = [
+    "Ahmedabad", "Bengaluru / Bangalore", "Chandigarh", "Chennai", "Delhi", "Gurgaon",
+    "Hyderabad / Secunderabad", "Kolkata", "Mumbai", "Noida", "Pune"
+]
+
+# Industry -> hub cities, strongest first; keywords map free-text industry focus onto a table entry
+INDUSTRY_HUBS: Dict[str, Dict[str, List[str]]] = {
+    "technology": {
+        "keywords": ["technology", "tech", "software", "it", "saas", "product", "startup", "internet", "data", "ai"],
+        "hubs": ["Bengaluru", "Hyderabad", "Pune", "Chennai", "Gurgaon", "Noida", "Mumbai", "Kolkata",
+                 "Ahmedabad", "Kochi", "Trivandrum", "Coimbatore", "Chandigarh", "Indore", "Jaipur"]
+    },
+    "finance": {
+        "keywords": ["finance", "banking", "bfsi", "fintech", "insurance", "investment", "financial", "accounting"],
+        "hubs": ["Mumbai", "Gurgaon", "Bengaluru", "Delhi", "Chennai", "Pune", "Hyderabad", "Kolkata",
+                 "Ahmedabad", "Noida"]
+    },
+    "bpo": {
+        "keywords": ["bpo", "kpo", "call center", "customer support", "ites", "back office"],
+        "hubs": ["Gurgaon", "Noida", "Bengaluru", "Hyderabad", "Pune", "Mumbai", "Chennai", "Kolkata",
+                 "Mohali", "Jaipur"]
+    },
+    "manufacturing": {
+        "keywords": ["manufacturing", "automotive", "automobile", "engineering", "industrial", "core engineering"],
+        "hubs": ["Pune", "Chennai", "Gurgaon", "Ahmedabad", "Aurangabad", "Coimbatore", "Jamshedpur",
+                 "Manesar", "Hosur", "Nashik", "Vadodara", "Faridabad"]
+    },
+    "pharma": {
+        "keywords": ["pharma", "pharmaceutical", "biotech", "life sciences", "healthcare", "clinical"],
+        "hubs": ["Hyderabad", "Ahmedabad", "Mumbai", "Vadodara", "Bengaluru", "Visakhapatnam", "Pune",
+                 "Baddi", "Chennai"]
+    },
+    "textile": {
+        "keywords": ["textile", "apparel", "garment", "fashion"],
+        "hubs": ["Surat", "Tiruppur", "Coimbatore", "Ludhiana", "Ahmedabad", "Panipat", "Bhiwandi", "Erode"]
+    },
+}
+
 CITIES: List[str] = [
     # Tier 1 Cities (Major Metro Cities)
     "Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai", "Kolkata", "Pune", "Ahmedabad",
@@ -0,0 +1,145 @@
+"""
+Small async DAG executor used to fan out independent pipeline steps.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineStage:
+    """
+    One pipeline step.
+
+    ``func`` receives a dict of the results of the stages it depends on. A
+    non-required stage that fails or times out yields ``default`` instead of
+    aborting its dependents.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: List[str] = field(default_factory=list)
+    required: bool = True
+    default: Any = None
+    timeout: Optional[float] = None
+
+
+class StageFailedError(Exception):
+    """Raised for a required stage that failed, timed out or lost a dependency."""
+
+    def __init__(self, stage: str, reason: str):
+        super().__init__(f"Stage '{stage}' failed: {reason}")
+        self.stage = stage
+        self.reason = reason
+
+
+class DAGExecutor:
+    """Runs each stage as soon as its dependencies finish, under one deadline."""
+
+    def __init__(self, stages: List[PipelineStage], deadline: Optional[float] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.deadline = deadline
+
+        for stage in stages:
+            for dep in stage.depends_on:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Execute the DAG.
+
+        Returns ``results`` (stage -> value), ``timings`` (stage -> seconds),
+        ``errors`` (stage -> reason) and ``degraded`` (non-required stages
+        that fell back to their default).
+        """
+        start_time = time.time()
+        deadline_at = start_time + self.deadline if self.deadline else None
+        results: Dict[str, Any] = {}
+        timings: Dict[str, float] = {}
+        errors: Dict[str, str] = {}
+        degraded: List[str] = []
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: PipelineStage):
+            # Wait for dependencies; a failed required dependency fails this stage too
+            dep_results = {}
+            for dep in stage.depends_on:
+                try:
+                    dep_results[dep] = await tasks[dep]
+                except StageFailedError as e:
+                    raise StageFailedError(stage.name, f"dependency '{e.stage}' failed")
+
+            timeout = stage.timeout
+            if deadline_at is not None:
+                remaining = max(deadline_at - time.time(), 0.0)
+                timeout = remaining if timeout is None else min(timeout, remaining)
+
+            stage_start = time.time()
+            try:
+                value = await asyncio.wait_for(stage.func(dep_results), timeout=timeout)
+            except asyncio.TimeoutError:
+                reason = f"timed out after {time.time() - stage_start:.2f}s"
+                value = self._handle_failure(stage, reason, errors, degraded)
+            except StageFailedError:
+                raise
+            except Exception as e:
+                logger.error(f"Pipeline stage '{stage.name}' raised: {e}")
+                value = self._handle_failure(stage, str(e), errors, degraded)
+            finally:
+                timings[stage.name] = round(time.time() - stage_start, 4)
+
+            results[stage.name] = value
+            return value
+
+        for name in self._topological_order():
+            tasks[name] = asyncio.ensure_future(run_stage(self.stages[name]))
+
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        for name, task in tasks.items():
+            exc = task.exception() if not task.cancelled() else None
+            if isinstance(exc, StageFailedError) and name not in errors:
+                errors[name] = exc.reason
+
+        timings["total"] = round(time.time() - start_time, 4)
+        return {
+            "results": results,
+            "timings": timings,
+            "errors": errors,
+            "degraded": degraded
+        }
+
+    @staticmethod
+    def _handle_failure(stage: PipelineStage, reason: str,
+                        errors: Dict[str, str], degraded: List[str]) -> Any:
+        errors[stage.name] = reason
+        if stage.required:
+            raise StageFailedError(stage.name, reason)
+        degraded.append(stage.name)
+        print(f"⚠️ Pipeline stage '{stage.name}' degraded: {reason}")
+        return stage.default
+
+    def _topological_order(self) -> List[str]:
+        """Stage names ordered so dependencies come first; rejects cycles."""
+        order: List[str] = []
+        state: Dict[str, int] = {}
+
+        def visit(name: str):
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                raise ValueError(f"Cycle detected at pipeline stage '{name}'")
+            state[name] = 1
+            for dep in self.stages[name].depends_on:
+                visit(dep)
+            state[name] = 2
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
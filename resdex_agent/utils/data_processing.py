@@ -34,6 +34,16 @@ class DataProcessor:
     def normalize_location(location: str) -> str:
         """Normalize location name for consistent matching."""
         from .constants import CITIES
+        from .location_resolver import get_location_resolver
+        
+        # Known spellings and aliases ("bombay" -> "Mumbai", "gurugram" -> "Gurgaon")
+        try:
+            canonical = get_location_resolver().canonical_name(location)
+        except Exception as e:
+            logger.warning(f"Location resolver unavailable, normalizing '{location}' without it: {e}")
+            canonical = None
+        if canonical:
+            return canonical
         
         # Check against known cities for exact matches
         for city in CITIES:
@@ -1,10 +1,13 @@
 # In resdex_agent/utils/db_manager.py
 
+import asyncio
+import threading
 import pandas as pd
 import pymysql
-from sqlalchemy import create_engine, text
-from typing import Dict, List, Optional, Any
+from sqlalchemy import create_engine, text, bindparam
+from typing import Dict, List, Optional, Any, Tuple
 import logging
+from .cache import TTLCache
 from ..config import config
 
 logger = logging.getLogger(__name__)
@@ -37,86 +40,128 @@ class DatabaseManager:
             f'?charset={self.connection_params["charset"]}'
         )
         
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        self.name_chunk_size = db_config.name_chunk_size
+        self.name_cache = TTLCache(maxsize=db_config.name_cache_size, ttl=db_config.name_cache_ttl)
+        self._name_query = text(
+            "SELECT userid, name FROM UserDetails WHERE userid IN :user_ids"
+        ).bindparams(bindparam("user_ids", expanding=True))
+        
+        # Long-lived engine created once at startup; connections come from its pool
+        self.get_connection()
+        
         print(f"💾 DATABASE MANAGER INITIALIZED:")
         print(f"  - Host: {self.connection_params['host']}:{self.connection_params['port']}")
         print(f"  - User: {self.connection_params['user']}")
         print(f"  - Database: {self.connection_params['database']}")
     
+    def _create_engine(self):
+        """Create the long-lived pooled engine shared by every query."""
+        db_config = config.database
+        return create_engine(
+            self.connection_string,
+            pool_size=db_config.pool_size,
+            max_overflow=db_config.max_overflow,
+            pool_timeout=db_config.pool_timeout,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            echo=False  # Set to True for SQL debugging
+        )
+    
     def get_connection(self):
-        """Create database connection with enhanced error handling."""
+        """Return the shared pooled engine, creating it on first use."""
+        if self._engine is not None:
+            return self._engine
+        
+        with self._engine_lock:
+            if self._engine is None:
+                try:
+                    print(f"🔌 CREATING POOLED DATABASE ENGINE...")
+                    self._engine = self._create_engine()
+                    print(f"✅ Database engine created (pool_size={config.database.pool_size})")
+                except Exception as e:
+                    logger.error(f"Database connection error: {e}")
+                    print(f"❌ Database connection failed: {e}")
+                    return None
+        
+        return self._engine
+    
+    @staticmethod
+    def _normalize_user_id(user_id):
+        """UserDetails.userid is numeric; keep non-numeric ids as-is."""
         try:
-            print(f"🔌 CREATING DATABASE CONNECTION...")
-            
-            # FIXED: Create engine with explicit parameters
-            engine = create_engine(
-                self.connection_string,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                echo=False  # Set to True for SQL debugging
-            )
-            
-            # Test the connection
-            with engine.connect() as conn:
-                result = conn.execute(text("SELECT 1"))
-                result.fetchone()
-            
-            print(f"✅ Database engine created and tested successfully")
-            return engine
-            
-        except Exception as e:
-            logger.error(f"Database connection error: {e}")
-            print(f"❌ Database connection failed: {e}")
-            return None
+            return int(user_id)
+        except (TypeError, ValueError):
+            return user_id
     
-    async def get_real_names(self, user_ids: List[str]) -> Dict[str, str]:
-        """Fetch real names with enhanced error handling and fallback methods."""
-        if not user_ids:
-            return {}
+    def _query_names_sync(self, user_ids: List[Any]) -> Tuple[Dict[Any, str], List[Any]]:
+        """
+        Blocking, parameterized IN lookup executed in configurable chunks.
         
-        try:
-            engine = self.get_connection()
-            if not engine:
-                print("❌ Failed to connect to database")
-                return {}
-            
-            print(f"🔍 Fetching real names for {len(user_ids)} users from database...")
-            print(f"🔍 Sample user IDs: {user_ids[:5]}")
-            
-            # Convert to string format for SQL
-            user_ids_str = ",".join([str(uid) for uid in user_ids])
-            
-            # FIXED: Use text() for raw SQL to avoid pandas/SQLAlchemy conflicts
-            query = text(f"""
-                SELECT userid, name
-                FROM UserDetails 
-                WHERE userid IN ({user_ids_str})
-            """)
-            
-            print(f"  - Executing query...")
-            
-            # FIXED: Use direct connection instead of pandas read_sql
-            name_mapping = {}
-            
-            with engine.connect() as conn:
-                result = conn.execute(query)
-                rows = result.fetchall()
-                
-                print(f"✅ DATABASE QUERY SUCCESSFUL:")
-                print(f"  - UserDetails table returned {len(rows)} matching rows")
+        Returns the names found and the ids whose chunk was actually queried;
+        ids from failed chunks (or all ids, without an engine) are left out so
+        callers don't negative-cache them.
+        """
+        engine = self.get_connection()
+        if not engine:
+            print("❌ Failed to connect to database")
+            return {}, []
+        
+        chunk_size = self.name_chunk_size
+        name_mapping = {}
+        queried_ids = []
+        
+        with engine.connect() as conn:
+            for i, chunk in enumerate(self.chunk(user_ids, chunk_size)):
+                try:
+                    rows = conn.execute(self._name_query, {"user_ids": chunk}).fetchall()
+                except Exception as chunk_error:
+                    print(f"❌ Chunk {i + 1} failed: {chunk_error}")
+                    continue
                 
-                # Create mapping dictionary
+                queried_ids.extend(chunk)
                 for row in rows:
                     user_id = int(row[0])  # userid
                     name = str(row[1]).strip() if row[1] else None  # name
                     
-                    if name and name != 'None' and name != '' and name.lower() != 'null':
+                    if name and name != 'None' and name.lower() != 'null':
                         name_mapping[user_id] = name
+        
+        return name_mapping, queried_ids
+    
+    async def get_real_names(self, user_ids: List[str]) -> Dict[str, str]:
+        """Fetch real names through the bounded cache, querying only unseen ids off the event loop."""
+        if not user_ids:
+            return {}
+        
+        name_mapping = {}
+        missing_ids = []
+        for uid in dict.fromkeys(self._normalize_user_id(uid) for uid in user_ids):
+            cached_name = self.name_cache.get(uid)
+            if cached_name is None:
+                missing_ids.append(uid)
+            elif cached_name:
+                name_mapping[uid] = cached_name
+        
+        print(f"🔍 Real names: {len(user_ids) - len(missing_ids)} cached, {len(missing_ids)} to fetch")
+        
+        if not missing_ids:
+            return name_mapping
+        
+        try:
+            loop = asyncio.get_running_loop()
+            fetched, queried_ids = await loop.run_in_executor(None, self._query_names_sync, missing_ids)
+            
+            print(f"✅ DATABASE QUERY SUCCESSFUL: {len(fetched)} names for {len(queried_ids)}/{len(missing_ids)} users queried")
             
-            print(f"✅ Successfully created name mapping for {len(name_mapping)} users")
+            # Empty string marks ids the database answered without a usable name so pages
+            # don't re-query them; ids from failed chunks stay uncached and are retried
+            for uid in queried_ids:
+                self.name_cache.set(uid, fetched.get(uid, ""))
+            name_mapping.update(fetched)
             
-            if len(name_mapping) > 0:
-                print(f"🔍 Sample name mappings: {dict(list(name_mapping.items())[:3])}")
-            else:
+            if not fetched:
                 print(f"⚠️ No valid names found in database")
             
             return name_mapping
@@ -124,48 +169,7 @@ class DatabaseManager:
         except Exception as e:
             logger.error(f"Database error in get_real_names: {e}")
             print(f"❌ Database error in get_real_names: {e}")
-            import traceback
-            traceback.print_exc()
-            
-            # FALLBACK: Try alternative query method
-            try:
-                return await self._fallback_name_query(user_ids, engine)
-            except Exception as fallback_error:
-                print(f"❌ Fallback query also failed: {fallback_error}")
-                return {}
-    
-    async def _fallback_name_query(self, user_ids: List[str], engine) -> Dict[str, str]:
-        """Fallback method using chunked queries."""
-        print(f"🔄 ATTEMPTING FALLBACK NAME QUERY...")
-        
-        name_mapping = {}
-        chunk_size = 20  # Smaller chunks
-        
-        for i in range(0, len(user_ids), chunk_size):
-            chunk = user_ids[i:i + chunk_size]
-            chunk_str = ",".join([str(uid) for uid in chunk])
-            
-            try:
-                query = text(f"SELECT userid, name FROM UserDetails WHERE userid IN ({chunk_str}) AND name IS NOT NULL AND name != ''")
-                
-                with engine.connect() as conn:
-                    result = conn.execute(query)
-                    rows = result.fetchall()
-                    
-                    for row in rows:
-                        user_id = int(row[0])
-                        name = str(row[1]).strip()
-                        if name and name != 'None' and name.lower() != 'null':
-                            name_mapping[user_id] = name
-                            
-                print(f"✅ Chunk {i//chunk_size + 1}: Found {len([r for r in rows if r[1]])} names")
-                
-            except Exception as chunk_error:
-                print(f"❌ Chunk {i//chunk_size + 1} failed: {chunk_error}")
-                continue
-        
-        print(f"🔄 FALLBACK COMPLETE: {len(name_mapping)} total names found")
-        return name_mapping
+            return name_mapping
     
     async def test_connection(self) -> Dict[str, Any]:
         """Test database connection with enhanced diagnostics."""
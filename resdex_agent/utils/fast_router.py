@@ -0,0 +1,306 @@
+"""
+Deterministic fast-path router for common single-intent commands.
+
+Short commands like "add python and java", "experience 5-10 years" or
+"similar skills to react" are matched against compiled patterns and turned
+into the same intent JSON the LLM would produce: the multi-intent breakdown
+used for routing, plus the LLMTool extract_intent actions for filter
+commands. Anything ambiguous returns None and falls through to the LLM.
+"""
+
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from ..config import config
+from .constants import TECH_SKILLS
+from .location_normalizer import location_normalizer
+
+logger = logging.getLogger(__name__)
+
+# Words that mean the "items" part is not a plain skill/city list
+NON_ENTITY_WORDS = {
+    "skill", "skills", "experience", "exp", "salary", "ctc", "location", "locations", "city", "cities",
+    "filter", "filters", "company", "companies", "years", "year", "lakhs", "lpa", "similar", "related",
+    "like", "near", "nearby", "more", "candidates", "results", "search", "title", "titles", "role",
+    "roles", "and", "or", "not", "to", "from", "with", "without", "the", "all", "my", "it", "them"
+}
+# Common acronyms typed as skills that are not in TECH_SKILLS
+SKILL_ACRONYMS = ["AI", "ML", "DSA", "OOP", "OOPS", "UI", "UX", "QA", "SEO", "ERP", "CRM", "SDLC"]
+# Lowercase spelling -> canonical skill name; only these take the fast path for add/remove skill
+SKILL_VOCABULARY: Dict[str, str] = {skill.lower(): skill for skill in SKILL_ACRONYMS + TECH_SKILLS}
+# Below any sensible fast_path_min_confidence: unknown entities ("remote", "freshers") go to the LLM
+UNKNOWN_ENTITY_CONFIDENCE = 0.5
+ENTITY_RE = re.compile(r"[a-z0-9][a-z0-9.+#\-]*(?: [a-z0-9.+#\-]+){0,3}", re.IGNORECASE)
+LIST_SPLIT_RE = re.compile(r"\s*(?:,|&|\band\b)\s*", re.IGNORECASE)
+MANDATORY_RE = r"(?:\s+(?:as\s+)?(?P<flag>mandatory|required|must[\s-]have|optional|nice[\s-]to[\s-]have))?"
+RANGE_RE = r"(?P<low>\d+(?:\.\d+)?)\s*(?:-|to|and)\s*(?P<high>\d+(?:\.\d+)?)"
+
+Rule = Tuple[str, Pattern, Callable[[re.Match, Dict[str, Any]], Optional[Dict[str, Any]]]]
+
+
+class FastPathRouter:
+    """Compiled-pattern router; records per-route hit rates."""
+
+    def __init__(self, min_confidence: Optional[float] = None, enabled: Optional[bool] = None):
+        routing = config.routing_config
+        self.enabled = routing.get("enable_fast_path", True) if enabled is None else enabled
+        self.min_confidence = (routing.get("fast_path_min_confidence", 0.8)
+                               if min_confidence is None else min_confidence)
+        self.rules: List[Rule] = self._compile_rules()
+        self.stats: Dict[str, Any] = {"total": 0, "hits": 0, "low_confidence": 0, "misses": 0, "routes": {}}
+
+    def _compile_rules(self) -> List[Rule]:
+        def rx(pattern: str) -> Pattern:
+            return re.compile(pattern, re.IGNORECASE)
+
+        return [
+            ("facet_generation",
+             rx(r"(?:show|generate|get|give me|display)?\s*(?:me\s+)?(?:the\s+)?(?:search\s+)?(?:facets|categories|category breakdown)"),
+             self._build_facets),
+            ("query_relaxation",
+             rx(r"(?:relax|broaden|widen|loosen)(?:\s+(?:the|my|this))?(?:\s+(?:search|query|filters|criteria))*"
+                r"|(?:get|need|show|find)\s+(?:me\s+)?more\s+(?:candidates|results)"),
+             self._build_relaxation),
+            ("skill_expansion",
+             rx(r"(?:find|show|get|suggest|give me)?\s*(?:me\s+)?(?:similar|related)\s+skills\s+(?:to|for|like|of)\s+(?P<items>.+)"
+                r"|skills\s+(?:similar\s+to|like)\s+(?P<items2>.+)"),
+             self._build_skill_expansion),
+            ("modify_experience",
+             rx(r"(?:set\s+|change\s+)?(?P<bound>min(?:imum)?|max(?:imum)?)?\s*(?:exp|experience)\s*(?:to|=|:|of|between|range)?\s*"
+                r"(?:" + RANGE_RE + r"|(?P<single>\d+(?:\.\d+)?))\s*(?:\+\s*)?(?:years?|yrs?)?"),
+             self._build_range("modify_experience", "experience", "years", "min_exp", "max_exp", 0, 10)),
+            ("modify_salary",
+             rx(r"(?:set\s+|change\s+)?(?P<bound>min(?:imum)?|max(?:imum)?)?\s*(?:salary|ctc|package)\s*(?:to|=|:|of|between|range)?\s*"
+                r"(?:" + RANGE_RE + r"|(?P<single>\d+(?:\.\d+)?))\s*(?:lakhs?|lacs?|lpa|l)?"),
+             self._build_range("modify_salary", "salary", "lakhs", "min_salary", "max_salary", 0, 15)),
+            ("add_location",
+             rx(r"(?:add|include)\s+(?:(?:the\s+)?(?:location|city|cities|locations)\s+)?(?P<items>.+?)(?:\s+(?:location|city|as location))?"),
+             self._build_add_location),
+            ("add_skill",
+             rx(r"(?:add|include)\s+(?:(?:the\s+)?skills?\s+)?(?P<items>.+?)" + MANDATORY_RE + r"(?:\s+skills?)?"),
+             self._build_skill_filter("add_skill")),
+            ("remove_skill",
+             rx(r"(?:remove|delete|drop|exclude)\s+(?:(?:the\s+)?skills?\s+)?(?P<items>.+?)(?:\s+skills?)?"),
+             self._build_skill_filter("remove_skill")),
+        ]
+
+    # ---- routing ---------------------------------------------------------
+
+    def route(self, user_input: str, session_state: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return ``{"route", "confidence", "intent_breakdown", "filter_intent"}`` for a
+        confident match, or None to fall through to the LLM.
+        """
+        if not self.enabled or not user_input:
+            return None
+
+        self.stats["total"] += 1
+        text = self._normalize(user_input)
+
+        for name, pattern, build in self.rules:
+            match = pattern.fullmatch(text)
+            if not match:
+                continue
+            result = build(match, session_state or {})
+            if result is None:
+                continue
+            if result["confidence"] < self.min_confidence:
+                self.stats["low_confidence"] += 1
+                print(f"⚡ FAST PATH: '{name}' matched with low confidence {result['confidence']:.2f} - using LLM")
+                return None
+
+            self.stats["routes"][result["route"]] = self.stats["routes"].get(result["route"], 0) + 1
+            self.stats["hits"] += 1
+            print(f"⚡ FAST PATH HIT: {result['route']} (confidence {result['confidence']:.2f})")
+            return result
+
+        self.stats["misses"] += 1
+        return None
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        text = " ".join(text.strip().split())
+        text = re.sub(r"^(?:please|pls|can you|could you|kindly)\s+", "", text, flags=re.IGNORECASE)
+        return text.rstrip(" .!?")
+
+    def get_stats(self) -> Dict[str, Any]:
+        total = self.stats["total"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / total if total else 0.0,
+            "route_hit_rates": {route: hits / total for route, hits in self.stats["routes"].items()} if total else {}
+        }
+
+    # ---- result builders -------------------------------------------------
+
+    @staticmethod
+    def _result(route: str, intent_type: str, target_agent: str, extracted_query: str,
+                entities: List[str], description: str, filter_intent: Optional[Any] = None,
+                confidence: float = 1.0) -> Dict[str, Any]:
+        return {
+            "route": route,
+            "confidence": confidence,
+            "intent_breakdown": {
+                "success": True,
+                "is_multi_intent": False,
+                "total_intents": 1,
+                "intents": [{
+                    "intent_id": 1,
+                    "intent_type": intent_type,
+                    "target_agent": target_agent,
+                    "extracted_query": extracted_query,
+                    "raw_entities": entities,
+                    "execution_order": 1,
+                    "description": description
+                }],
+                "fast_path": route
+            },
+            "filter_intent": filter_intent
+        }
+
+    @staticmethod
+    def _split_entities(text: str) -> Optional[List[str]]:
+        """Split "python, java and c++" into entities; None if anything looks like prose."""
+        entities = [e.strip() for e in LIST_SPLIT_RE.split(text) if e.strip()]
+        if not entities:
+            return None
+        for entity in entities:
+            if not ENTITY_RE.fullmatch(entity) or entity.replace(".", "").isdigit():
+                return None
+            if any(word in NON_ENTITY_WORDS for word in entity.lower().split()):
+                return None
+        return entities
+
+    @staticmethod
+    def _skill_name(entity: str) -> Optional[str]:
+        """Canonical spelling of a known skill ("aws" -> "AWS", "sql server" -> "SQL Server")."""
+        return SKILL_VOCABULARY.get(entity.lower())
+
+    @staticmethod
+    def _current_skill(entity: str, session_state: Dict[str, Any]) -> Optional[str]:
+        """The matching keyword already in the search, as it is spelled there."""
+        for keyword in session_state.get("keywords", []):
+            keyword = keyword.replace("★ ", "")
+            if keyword.lower() == entity.lower():
+                return keyword
+        return None
+
+    def _build_facets(self, match: re.Match, session_state: Dict[str, Any]) -> Dict[str, Any]:
+        return self._result("facet_generation", "facet_generation", "refinement", "generate facets", [],
+                            "Generate facets for current search")
+
+    def _build_relaxation(self, match: re.Match, session_state: Dict[str, Any]) -> Dict[str, Any]:
+        return self._result("query_relaxation", "query_relaxation", "refinement",
+                            "relax search for more candidates", ["more", "candidates"],
+                            "Relax search constraints to increase candidate pool")
+
+    def _build_skill_expansion(self, match: re.Match, session_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        entities = self._split_entities(match.group("items") or match.group("items2"))
+        if not entities:
+            return None
+        names = [self._skill_name(e) or e for e in entities]
+        return self._result("skill_expansion", "skill_expansion", "expansion",
+                            f"similar skills to {' and '.join(names)}", names,
+                            f"Find skills similar to {', '.join(names)}")
+
+    def _build_add_location(self, match: re.Match, session_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        entities = self._split_entities(match.group("items"))
+        # Only claim the command when every entity is a known city; otherwise it may be a skill
+        if not entities or not all(location_normalizer.is_known_city(e) for e in entities):
+            return None
+        names = [location_normalizer.canonical_city(e) or e for e in entities]
+        actions = [{
+            "action": "add_location",
+            "value": name,
+            "mandatory": False,
+            "response_text": f"Added {name} location",
+            "trigger_search": False
+        } for name in names]
+        return self._result("add_location", "filter_operation", "search_interaction",
+                            f"add {' and '.join(names)} location", names, f"Add {', '.join(names)} to locations",
+                            filter_intent=actions if len(actions) > 1 else actions[0])
+
+    def _build_skill_filter(self, action: str) -> Callable[[re.Match, Dict[str, Any]], Optional[Dict[str, Any]]]:
+        verb = "Added" if action == "add_skill" else "Removed"
+
+        def build(match: re.Match, session_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            entities = self._split_entities(match.group("items"))
+            if not entities:
+                return None
+            # Cities are locations, not skills; leave mixed lists to the LLM
+            if any(location_normalizer.is_known_city(e) for e in entities):
+                return None
+
+            flag = (match.groupdict().get("flag") or "").lower()
+            mandatory = flag in ("mandatory", "required") or flag.startswith("must")
+            # Known skills get their canonical spelling; removals may also name any current keyword
+            known = [self._skill_name(e) or (self._current_skill(e, session_state) if action == "remove_skill"
+                                             else None) for e in entities]
+            names = [name or e for name, e in zip(known, entities)]
+            actions = []
+            for name in names:
+                intent = {
+                    "action": action,
+                    "value": name,
+                    "response_text": f"{verb} {name}{' as mandatory skill' if mandatory else ''}",
+                    "trigger_search": False
+                }
+                if action == "add_skill":
+                    intent["mandatory"] = mandatory
+                actions.append(intent)
+
+            # Anything outside the vocabulary ("remote", "notice period") is left for the LLM to interpret
+            confidence = 1.0 if all(known) else UNKNOWN_ENTITY_CONFIDENCE
+            return self._result(action, "filter_operation", "search_interaction",
+                                f"{'add' if action == 'add_skill' else 'remove'} {' and '.join(names)}", names,
+                                f"{verb} {', '.join(names)} {'to' if action == 'add_skill' else 'from'} skills",
+                                filter_intent=actions if len(actions) > 1 else actions[0], confidence=confidence)
+
+        return build
+
+    def _build_range(self, action: str, label: str, unit: str, min_key: str, max_key: str,
+                     min_default: float, max_default: float) -> Callable[[re.Match, Dict[str, Any]], Dict[str, Any]]:
+        def fmt(value: str) -> str:
+            return str(int(float(value))) if float(value).is_integer() else value
+
+        def build(match: re.Match, session_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            bound = (match.group("bound") or "").lower()
+            if match.group("low") is not None:
+                if bound:
+                    return None
+                low, high = fmt(match.group("low")), fmt(match.group("high"))
+                if float(low) > float(high):
+                    return None
+                operation, value = "set_range", f"{low}-{high}"
+                text = f"Set {label} range to {value} {unit}"
+            else:
+                single = fmt(match.group("single"))
+                if bound:
+                    if bound.startswith("max"):
+                        low, high = fmt(str(session_state.get(min_key, min_default))), single
+                    else:
+                        low, high = single, fmt(str(session_state.get(max_key, max_default)))
+                    # The other bound comes from the current filters; let the LLM decide how to reconcile
+                    if float(low) > float(high):
+                        return None
+                    operation, value = "set_range", f"{low}-{high}"
+                else:
+                    operation, value = "set", single
+                text = f"Set {label} to {value} {unit}"
+
+            intent = {
+                "action": action,
+                "operation": operation,
+                "value": value,
+                "response_text": text,
+                "trigger_search": False
+            }
+            return self._result(action, "filter_operation", "search_interaction",
+                                f"set {label} {value} {unit}", [value], text, filter_intent=intent)
+
+        return build
+
+
+# Global fast-path router
+fast_router = FastPathRouter()
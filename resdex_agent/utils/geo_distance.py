@@ -0,0 +1,158 @@
+"""
+Vectorized great-circle distance engine for the location dataset.
+
+Latitudes/longitudes are converted to radians once and kept as contiguous
+arrays together with cos(latitude), so one-to-many and many-to-many distances
+over the whole dataset are a single broadcast haversine evaluation instead of
+one Python call per pair. float32 mode halves memory and bandwidth for large
+matrices; float64 is the default. Distance matrices between fixed location
+sets (e.g. the top metros) are precomputed and cached.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_matrix(lats1: Iterable[float], lngs1: Iterable[float],
+                     lats2: Iterable[float], lngs2: Iterable[float], dtype=np.float64) -> np.ndarray:
+    """(m, n) great-circle distances in km between two sets of points given in degrees."""
+    lat1 = np.radians(np.asarray(lats1, dtype=np.float64)).astype(dtype)[:, None]
+    lng1 = np.radians(np.asarray(lngs1, dtype=np.float64)).astype(dtype)[:, None]
+    lat2 = np.radians(np.asarray(lats2, dtype=np.float64)).astype(dtype)[None, :]
+    lng2 = np.radians(np.asarray(lngs2, dtype=np.float64)).astype(dtype)[None, :]
+    return _haversine(lat1, np.cos(lat1), lng1, lat2, np.cos(lat2), lng2)
+
+
+def haversine_km(lat: float, lng: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """Distances in km from one point to many."""
+    return haversine_matrix([lat], [lng], lats, lngs)[0]
+
+
+def _haversine(lat1, cos_lat1, lng1, lat2, cos_lat2, lng2) -> np.ndarray:
+    a = np.sin((lat2 - lat1) * 0.5) ** 2 + cos_lat1 * cos_lat2 * np.sin((lng2 - lng1) * 0.5) ** 2
+    np.clip(a, 0.0, 1.0, out=a)
+    return (2.0 * EARTH_RADIUS_KM) * np.arcsin(np.sqrt(a, out=a), out=a)
+
+
+class DistanceEngine:
+    """Batch haversine over a fixed set of locations, with cached distance matrices."""
+
+    def __init__(self, ids: Sequence[str], lat: Iterable[float], lng: Iterable[float],
+                 dtype=np.float64, matrix_cache_size: int = 32):
+        self.dtype = np.dtype(dtype)
+        self.ids: List[str] = [str(location_id) for location_id in ids]
+        self.position: Dict[str, int] = {location_id: i for i, location_id in enumerate(self.ids)}
+        self.lat = np.ascontiguousarray(lat, dtype=np.float64)
+        self.lng = np.ascontiguousarray(lng, dtype=np.float64)
+        self.lat_rad = np.radians(self.lat).astype(self.dtype)
+        self.lng_rad = np.radians(self.lng).astype(self.dtype)
+        self.cos_lat = np.cos(self.lat_rad)
+        self._matrices = TTLCache(maxsize=matrix_cache_size)
+        self.stats = {"one_to_many": 0, "many_to_many": 0, "rows": 0, "matrix_hits": 0, "total_time": 0.0}
+
+    @classmethod
+    def from_index(cls, geo_index, dtype=np.float64) -> "DistanceEngine":
+        """Share the coordinate arrays of a GeoIndex."""
+        return cls(geo_index.ids, geo_index.lat, geo_index.lng, dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _rows(self, location_ids: Sequence[str]) -> np.ndarray:
+        return np.fromiter((self.position[str(location_id)] for location_id in location_ids),
+                           dtype=np.intp, count=len(location_ids))
+
+    def _from_radians(self, lat_rad: np.ndarray, lng_rad: np.ndarray,
+                      columns: Optional[np.ndarray] = None) -> np.ndarray:
+        start_time = time.time()
+        lat2, lng2, cos2 = self.lat_rad, self.lng_rad, self.cos_lat
+        if columns is not None:
+            lat2, lng2, cos2 = lat2[columns], lng2[columns], cos2[columns]
+        lat1 = lat_rad.astype(self.dtype)[:, None]
+        distances = _haversine(lat1, np.cos(lat1), lng_rad.astype(self.dtype)[:, None],
+                               lat2[None, :], cos2[None, :], lng2[None, :])
+        self.stats["rows"] += len(lat_rad)
+        self.stats["total_time"] += time.time() - start_time
+        return distances
+
+    def one_to_many(self, lat: float, lng: float) -> np.ndarray:
+        """Distances in km from (lat, lng) to every location, in ``ids`` order."""
+        self.stats["one_to_many"] += 1
+        return self._from_radians(np.radians([lat]), np.radians([lng]))[0]
+
+    def many_to_many(self, lats: Iterable[float], lngs: Iterable[float]) -> np.ndarray:
+        """(m, N) distances in km from each query point to every location."""
+        self.stats["many_to_many"] += 1
+        return self._from_radians(np.radians(np.asarray(lats, dtype=np.float64)),
+                                  np.radians(np.asarray(lngs, dtype=np.float64)))
+
+    def distances_from(self, location_ids: Sequence[str]) -> np.ndarray:
+        """(m, N) distances in km from indexed locations to every location."""
+        rows = self._rows(location_ids)
+        self.stats["many_to_many"] += 1
+        return self._from_radians(self.lat_rad[rows], self.lng_rad[rows])
+
+    def matrix(self, location_ids: Sequence[str]) -> np.ndarray:
+        """(m, m) distance matrix between indexed locations; cached per id tuple."""
+        key = tuple(str(location_id) for location_id in location_ids)
+        cached = self._matrices.get(key)
+        if cached is not None:
+            self.stats["matrix_hits"] += 1
+            return cached
+        rows = self._rows(key)
+        self.stats["many_to_many"] += 1
+        matrix = self._from_radians(self.lat_rad[rows], self.lng_rad[rows], columns=rows)
+        matrix.setflags(write=False)
+        self._matrices.set(key, matrix)
+        return matrix
+
+    def precompute(self, location_ids: Sequence[str]) -> np.ndarray:
+        """Warm the matrix cache for a fixed location set such as the top metros."""
+        start_time = time.time()
+        matrix = self.matrix(location_ids)
+        logger.info(f"Precomputed {matrix.shape[0]}x{matrix.shape[1]} distance matrix "
+                    f"in {(time.time() - start_time) * 1000:.2f}ms")
+        return matrix
+
+    def batch_nearby(self, location_ids: Sequence[str], radius_km: float = 50.0,
+                     max_results: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Nearby locations for many base locations from one many-to-many pass.
+        Each base location is excluded from its own results.
+        """
+        known = [str(location_id) for location_id in location_ids if str(location_id) in self.position]
+        if not known:
+            return {}
+        distances = self.distances_from(known)
+        distances[np.arange(len(known)), self._rows(known)] = np.inf
+
+        results = {}
+        for row, location_id in enumerate(known):
+            row_distances = distances[row]
+            candidates = np.flatnonzero(row_distances <= radius_km)
+            order = candidates[np.argsort(row_distances[candidates], kind="stable")]
+            if max_results is not None:
+                order = order[:max_results]
+            results[location_id] = [{
+                "location_id": self.ids[i],
+                "coordinates": [float(self.lat[i]), float(self.lng[i])],
+                "distance_km": round(float(row_distances[i]), 2)
+            } for i in order]
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "locations": len(self.ids),
+            "dtype": self.dtype.name,
+            "cached_matrices": len(self._matrices)
+        }
@@ -0,0 +1,167 @@
+"""
+Spatial index over location coordinates.
+
+Coordinates are held in contiguous float64 arrays and indexed with a k-d tree
+over unit-sphere vectors, so radius and k-nearest queries only visit points
+near the query instead of scanning every location. Chord length on the unit
+sphere grows monotonically with great-circle distance, so tree pruning is
+exact; reported distances use the haversine formula.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .geo_distance import EARTH_RADIUS_KM, haversine_km
+
+logger = logging.getLogger(__name__)
+
+# Default tiers used for multi-radius expansion (cumulative: each tier includes closer ones)
+DEFAULT_RADIUS_TIERS = [
+    {"label": "very_close", "radius_km": 5, "max_results": 5},
+    {"label": "close", "radius_km": 15, "max_results": 8},
+    {"label": "nearby", "radius_km": 30, "max_results": 10},
+    {"label": "regional", "radius_km": 50, "max_results": 12}
+]
+
+
+def to_unit_vectors(lat_deg: np.ndarray, lng_deg: np.ndarray) -> np.ndarray:
+    lat = np.radians(lat_deg)
+    lng = np.radians(lng_deg)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lng), cos_lat * np.sin(lng), np.sin(lat)))
+
+
+def km_to_chord(radius_km: float) -> float:
+    """Unit-sphere chord length spanning a great-circle distance."""
+    angle = min(radius_km / EARTH_RADIUS_KM, np.pi)
+    return 2.0 * np.sin(angle / 2.0)
+
+
+def is_valid_coordinate(lat: Any, lng: Any) -> bool:
+    return (
+        isinstance(lat, (int, float)) and
+        isinstance(lng, (int, float)) and
+        -90 <= lat <= 90 and
+        -180 <= lng <= 180 and
+        lat != -1.0 and lng != -1.0
+    )
+
+
+class GeoIndex:
+    """k-d tree over unit-sphere vectors answering radius, k-nearest and multi-radius queries."""
+
+    def __init__(self, ids: Sequence[str], lat: Iterable[float], lng: Iterable[float]):
+        start_time = time.time()
+        self.ids: List[str] = [str(location_id) for location_id in ids]
+        self.lat = np.ascontiguousarray(lat, dtype=np.float64)
+        self.lng = np.ascontiguousarray(lng, dtype=np.float64)
+        self.position: Dict[str, int] = {location_id: i for i, location_id in enumerate(self.ids)}
+        self.tree = cKDTree(to_unit_vectors(self.lat, self.lng)) if self.ids else None
+        self.build_time = time.time() - start_time
+        logger.info(f"GeoIndex built over {len(self.ids):,} locations in {self.build_time * 1000:.1f}ms")
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Dict[str, List[float]]) -> "GeoIndex":
+        """Build from a {location_id: [lat, lng]} mapping, skipping invalid coordinates."""
+        valid = [(str(location_id), coords[0], coords[1]) for location_id, coords in coordinates.items()
+                 if isinstance(coords, (list, tuple)) and len(coords) == 2 and is_valid_coordinate(coords[0], coords[1])]
+        ids = [item[0] for item in valid]
+        return cls(ids, [item[1] for item in valid], [item[2] for item in valid])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, location_id: str) -> bool:
+        return str(location_id) in self.position
+
+    def coordinates(self, location_id: str) -> Optional[Tuple[float, float]]:
+        index = self.position.get(str(location_id))
+        if index is None:
+            return None
+        return float(self.lat[index]), float(self.lng[index])
+
+    def _format(self, indices: np.ndarray, distances: np.ndarray) -> List[Dict[str, Any]]:
+        return [{
+            "location_id": self.ids[i],
+            "coordinates": [float(self.lat[i]), float(self.lng[i])],
+            "distance_km": round(float(d), 2)
+        } for i, d in zip(indices, distances)]
+
+    def _within(self, lat: float, lng: float, radius_km: float,
+                exclude: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and haversine distances of points within radius_km, nearest first."""
+        if self.tree is None:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        center = to_unit_vectors(np.array([lat]), np.array([lng]))[0]
+        indices = np.asarray(self.tree.query_ball_point(center, km_to_chord(radius_km) * (1 + 1e-9)), dtype=np.intp)
+        if exclude is not None and str(exclude) in self.position:
+            indices = indices[indices != self.position[str(exclude)]]
+        distances = haversine_km(lat, lng, self.lat[indices], self.lng[indices])
+        keep = distances <= radius_km
+        indices, distances = indices[keep], distances[keep]
+        order = np.argsort(distances, kind="stable")
+        return indices[order], distances[order]
+
+    def query_radius(self, lat: float, lng: float, radius_km: float,
+                     max_results: Optional[int] = None, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Locations within radius_km of (lat, lng), nearest first."""
+        indices, distances = self._within(lat, lng, radius_km, exclude)
+        if max_results is not None:
+            indices, distances = indices[:max_results], distances[:max_results]
+        return self._format(indices, distances)
+
+    def query_nearest(self, lat: float, lng: float, k: int, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The k locations closest to (lat, lng)."""
+        if self.tree is None or k <= 0:
+            return []
+        extra = 1 if exclude is not None and str(exclude) in self.position else 0
+        count = min(k + extra, len(self.ids))
+        center = to_unit_vectors(np.array([lat]), np.array([lng]))[0]
+        _, indices = self.tree.query(center, k=count)
+        indices = np.atleast_1d(indices)
+        if extra:
+            indices = indices[indices != self.position[str(exclude)]]
+        indices = indices[:k]
+        distances = haversine_km(lat, lng, self.lat[indices], self.lng[indices])
+        order = np.argsort(distances, kind="stable")
+        return self._format(indices[order], distances[order])
+
+    def query_radius_tiers(self, lat: float, lng: float,
+                           tiers: Optional[List[Dict[str, Any]]] = None,
+                           exclude: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Results for several radius tiers from a single traversal at the largest
+        radius. Tiers are cumulative, each capped at its own max_results.
+        """
+        tiers = tiers or DEFAULT_RADIUS_TIERS
+        indices, distances = self._within(lat, lng, max(tier["radius_km"] for tier in tiers), exclude)
+        results = {}
+        for tier in tiers:
+            count = int(np.searchsorted(distances, tier["radius_km"], side="right"))
+            count = min(count, tier.get("max_results", count))
+            results[tier["label"]] = self._format(indices[:count], distances[:count])
+        return results
+
+    def nearby(self, location_id: str, radius_km: float = 50.0,
+               max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Locations within radius_km of an indexed location, excluding itself."""
+        coords = self.coordinates(location_id)
+        if coords is None:
+            return []
+        return self.query_radius(coords[0], coords[1], radius_km, max_results, exclude=location_id)
+
+    def distances_to(self, location_id: str, other_ids: Sequence[str]) -> np.ndarray:
+        """Haversine distances in km from an indexed location to other indexed locations."""
+        lat, lng = self.coordinates(location_id)
+        others = np.fromiter((self.position[str(other)] for other in other_ids), dtype=np.intp, count=len(other_ids))
+        return haversine_km(lat, lng, self.lat[others], self.lng[others])
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "locations": len(self.ids),
+            "build_time_ms": round(self.build_time * 1000, 2)
+        }
@@ -0,0 +1,276 @@
+"""
+Offline geography answers for location analysis.
+
+Built once from the shared location dataset: radius neighbours come from its
+GeoIndex, metro areas from DBSCAN clusters computed over the same k-d tree, and
+industry hubs from a pluggable table (constants.INDUSTRY_HUBS, optionally
+extended by a JSON file). Every answer is deterministic and computed in-process; callers only
+need an LLM when a city is not in the data.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .constants import INDUSTRY_HUBS
+from .geo_index import GeoIndex, km_to_chord
+from .location_dataset import LocationDataset, get_location_dataset
+from .location_resolver import LocationResolver, get_location_resolver, normalize_name
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+NOISE = -1
+
+
+def dbscan_labels(geo_index: GeoIndex, eps_km: float, min_samples: int) -> np.ndarray:
+    """
+    DBSCAN cluster label per indexed location (NOISE for unclustered points).
+
+    Neighbourhoods for all points come from one batched k-d tree query; a
+    point is a core point when at least ``min_samples`` locations (itself
+    included) lie within ``eps_km``.
+    """
+    labels = np.full(len(geo_index), NOISE, dtype=np.intp)
+    if geo_index.tree is None:
+        return labels
+
+    neighbours = geo_index.tree.query_ball_point(geo_index.tree.data, km_to_chord(eps_km))
+    core = np.fromiter((len(points) >= min_samples for points in neighbours), dtype=bool, count=len(labels))
+
+    cluster = 0
+    for start in np.flatnonzero(core):
+        if labels[start] != NOISE:
+            continue
+        labels[start] = cluster
+        stack = [start]
+        while stack:
+            point = stack.pop()
+            for neighbour in neighbours[point]:
+                if labels[neighbour] == NOISE:
+                    labels[neighbour] = cluster
+                    if core[neighbour]:
+                        stack.append(neighbour)
+        cluster += 1
+    return labels
+
+
+class GeoKnowledge:
+    """Nearby cities, metro areas and industry hubs answered from local coordinates."""
+
+    def __init__(self, geo_index: GeoIndex, resolver: LocationResolver,
+                 industry_hubs: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                 cluster_eps_km: float = 30.0, cluster_min_samples: int = 3,
+                 metro_max_radius_km: float = 60.0, min_match_score: float = 0.65):
+        start_time = time.time()
+        self.geo_index = geo_index
+        self.resolver = resolver
+        self.names: Dict[str, str] = dict(zip(resolver.ids, resolver.names))
+        self.cluster_eps_km = cluster_eps_km
+        self.cluster_min_samples = cluster_min_samples
+        self.metro_max_radius_km = metro_max_radius_km
+        self.min_match_score = min_match_score
+
+        self.labels = dbscan_labels(geo_index, cluster_eps_km, cluster_min_samples)
+        self.cluster_sizes = np.bincount(self.labels[self.labels != NOISE]) if (self.labels != NOISE).any() \
+            else np.zeros(0, dtype=np.intp)
+
+        self.industry_hubs: Dict[str, Dict[str, List[str]]] = {}
+        for industry, entry in (industry_hubs if industry_hubs is not None else INDUSTRY_HUBS).items():
+            self.register_industry_hubs(industry, entry["hubs"], entry.get("keywords", []))
+
+        self.build_time = time.time() - start_time
+        self.stats = {"nearby": 0, "metro_area": 0, "industry_hubs": 0, "unknown_city": 0}
+        logger.info(f"GeoKnowledge built {len(self.cluster_sizes)} metro clusters over {len(geo_index):,} "
+                    f"locations in {self.build_time * 1000:.1f}ms")
+
+    @classmethod
+    def from_dataset(cls, dataset: LocationDataset, industry_hubs_path: Optional[str] = None,
+                     **kwargs) -> "GeoKnowledge":
+        """Share the dataset's spatial index and the global resolver."""
+        industry_hubs = dict(INDUSTRY_HUBS)
+        if industry_hubs_path:
+            industry_hubs.update(load_industry_hubs(industry_hubs_path))
+        return cls(dataset.geo_index, get_location_resolver(), industry_hubs=industry_hubs, **kwargs)
+
+    def register_industry_hubs(self, industry: str, hubs: Iterable[str], keywords: Iterable[str] = ()):
+        """Add or replace an industry's hub list; keywords route free-text industry focus to it."""
+        self.industry_hubs[industry] = {
+            "hubs": list(hubs),
+            "keywords": [normalize_name(keyword) for keyword in keywords] or [normalize_name(industry)]
+        }
+
+    def locate(self, city: str) -> Optional[str]:
+        """Indexed location id for a city name, or None when it has no coordinates in the data."""
+        for match in self.resolver.match(city, limit=5, min_score=self.min_match_score):
+            if match["location_id"] in self.geo_index:
+                return match["location_id"]
+        return None
+
+    def city_name(self, location_id: str) -> str:
+        """Primary spelling of a location ("Bengaluru / Bangalore" -> "Bengaluru")."""
+        return self.names.get(str(location_id), f"Location_{location_id}").split("/")[0].strip()
+
+    def _unknown(self, city: str) -> Dict[str, Any]:
+        self.stats["unknown_city"] += 1
+        return {"success": False, "error": f"'{city}' has no coordinates in the location data"}
+
+    def _named(self, locations: List[Dict[str, Any]], base_id: str,
+               max_results: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Attach city names, dropping unnamed ids and repeats of the base city or earlier names."""
+        seen = {self.city_name(base_id).lower()}
+        named = []
+        for location in locations:
+            if location["location_id"] not in self.names:
+                continue
+            city = self.city_name(location["location_id"])
+            if city.lower() in seen:
+                continue
+            seen.add(city.lower())
+            named.append({"city": city, "location_id": location["location_id"],
+                          "distance_km": location["distance_km"]})
+            if max_results is not None and len(named) >= max_results:
+                break
+        return named
+
+    def nearby(self, city: str, radius_km: float = 200.0, max_results: int = 15) -> Dict[str, Any]:
+        """Named locations within radius_km of a city, nearest first."""
+        location_id = self.locate(city)
+        if location_id is None:
+            return self._unknown(city)
+        self.stats["nearby"] += 1
+        locations = self._named(self.geo_index.nearby(location_id, radius_km), location_id, max_results)
+        return {
+            "success": True,
+            "base_location": self.city_name(location_id),
+            "location_id": location_id,
+            "radius_km": radius_km,
+            "locations": locations
+        }
+
+    def metro_area(self, city: str, max_results: int = 20) -> Dict[str, Any]:
+        """
+        Members of the city's DBSCAN cluster within metro_max_radius_km, nearest
+        first. Unclustered cities fall back to neighbours within the cluster eps.
+        """
+        location_id = self.locate(city)
+        if location_id is None:
+            return self._unknown(city)
+        self.stats["metro_area"] += 1
+
+        label = int(self.labels[self.geo_index.position[location_id]])
+        candidates = self.geo_index.nearby(location_id, self.metro_max_radius_km)
+        if label == NOISE:
+            candidates = [location for location in candidates if location["distance_km"] <= self.cluster_eps_km]
+            size = 1 + len(candidates)
+        else:
+            candidates = [location for location in candidates
+                          if self.labels[self.geo_index.position[location["location_id"]]] == label]
+            size = int(self.cluster_sizes[label])
+
+        return {
+            "success": True,
+            "base_location": self.city_name(location_id),
+            "location_id": location_id,
+            "cluster_id": None if label == NOISE else label,
+            "metro_type": "major_metro" if size >= 15 else "metro" if size >= 5 else "urban_agglomeration",
+            "locations": self._named(candidates, location_id, max_results)
+        }
+
+    def match_industry(self, industry: Optional[str]) -> Optional[str]:
+        """Table entry for a free-text industry focus; defaults to technology when none is given."""
+        if not industry:
+            return "technology" if "technology" in self.industry_hubs else None
+        text = f" {normalize_name(industry)} "
+        best, best_hits = None, 0
+        for name, entry in self.industry_hubs.items():
+            hits = sum(1 for keyword in entry["keywords"] if f" {keyword} " in text)
+            if hits > best_hits:
+                best, best_hits = name, hits
+        return best
+
+    def industry_hubs_for(self, city: str, industry: Optional[str] = None,
+                          max_results: int = 8) -> Dict[str, Any]:
+        """Hub cities for an industry other than the base city, with their distance from it."""
+        location_id = self.locate(city)
+        if location_id is None:
+            return self._unknown(city)
+        table_entry = self.match_industry(industry)
+        if table_entry is None:
+            return {"success": False, "error": f"No industry hub data for '{industry}'"}
+        self.stats["industry_hubs"] += 1
+
+        base_name = self.city_name(location_id).lower()
+        hubs_list = self.industry_hubs[table_entry]["hubs"]
+        hub_ids = [self.locate(hub) for hub in hubs_list]
+        known = [hub_id for hub_id in hub_ids if hub_id is not None]
+        distances = dict(zip(known, self.geo_index.distances_to(location_id, known))) if known else {}
+
+        hubs = []
+        for rank, (hub, hub_id) in enumerate(zip(hubs_list, hub_ids)):
+            if hub_id == location_id or (hub_id and self.city_name(hub_id).lower() == base_name):
+                continue
+            hubs.append({
+                "city": self.city_name(hub_id) if hub_id else hub,
+                "location_id": hub_id,
+                "rank": rank + 1,
+                "industry_strength": "excellent" if rank < 3 else "good" if rank < 8 else "moderate",
+                "distance_km": round(float(distances[hub_id]), 2) if hub_id in distances else None
+            })
+        return {
+            "success": True,
+            "base_location": self.city_name(location_id),
+            "location_id": location_id,
+            "industry": table_entry,
+            "hubs": hubs[:max_results]
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "locations": len(self.geo_index),
+            "metro_clusters": len(self.cluster_sizes),
+            "clustered_locations": int((self.labels != NOISE).sum()),
+            "industries": len(self.industry_hubs),
+            "build_time_ms": round(self.build_time * 1000, 2)
+        }
+
+
+def load_industry_hubs(path: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Read an industry-hub table from JSON: {"industry": ["City", ...]} or
+    {"industry": {"hubs": [...], "keywords": [...]}}.
+    """
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load industry hubs from {path}: {e}")
+        return {}
+    return {industry: entry if isinstance(entry, dict) else {"hubs": entry}
+            for industry, entry in data.items()}
+
+
+_geo_knowledge: Optional[GeoKnowledge] = None
+_geo_knowledge_lock = threading.Lock()
+
+
+def get_geo_knowledge() -> GeoKnowledge:
+    """Global geo knowledge over the shared location dataset, built on first use."""
+    global _geo_knowledge
+    if _geo_knowledge is None:
+        with _geo_knowledge_lock:
+            if _geo_knowledge is None:
+                geo_config = config.geo
+                _geo_knowledge = GeoKnowledge.from_dataset(
+                    get_location_dataset(),
+                    industry_hubs_path=geo_config.industry_hubs_path or None,
+                    cluster_eps_km=geo_config.cluster_eps_km,
+                    cluster_min_samples=geo_config.cluster_min_samples,
+                    metro_max_radius_km=geo_config.metro_max_radius_km
+                )
+    return _geo_knowledge
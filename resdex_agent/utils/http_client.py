@@ -0,0 +1,133 @@
+"""
+Shared async HTTP transport for ResDex upstream services.
+
+Every upstream (search, user details, location, facets, relaxation) gets one
+long-lived keep-alive aiohttp session with its own connection limit, so tools
+reuse TCP connections across turns instead of opening a new one per call.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Any, Optional, Tuple
+
+import aiohttp
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPResponse:
+    """Buffered upstream response with a requests-like surface."""
+
+    def __init__(self, status_code: int, text: str, headers: Dict[str, str], elapsed: float):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self.text)
+
+
+class HTTPSessionPool:
+    """One pooled keep-alive ClientSession per upstream, bound to the running loop."""
+
+    def __init__(self, http_config=None):
+        self.http_config = http_config or config.http
+        self._sessions: Dict[str, Tuple[aiohttp.ClientSession, asyncio.AbstractEventLoop]] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _build_session(self, upstream: str) -> aiohttp.ClientSession:
+        """Create a keep-alive session sized for the given upstream."""
+        cfg = self.http_config
+        connector = aiohttp.TCPConnector(
+            limit=cfg.total_limit,
+            limit_per_host=cfg.upstream_limits.get(upstream, cfg.limit_per_host),
+            keepalive_timeout=cfg.keepalive_timeout,
+            ttl_dns_cache=cfg.dns_cache_ttl,
+            enable_cleanup_closed=True
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=cfg.upstream_timeouts.get(upstream, cfg.request_timeout),
+            connect=cfg.connect_timeout
+        )
+        print(f"🌐 Created pooled HTTP session for '{upstream}' "
+              f"(limit_per_host={connector.limit_per_host}, timeout={timeout.total}s)")
+        return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+    def get_session(self, upstream: str) -> aiohttp.ClientSession:
+        """Return the shared session for an upstream, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        entry = self._sessions.get(upstream)
+
+        if entry is not None:
+            session, session_loop = entry
+            if not session.closed and session_loop is loop:
+                return session
+            # Sessions cannot cross event loops; drop the stale one
+            logger.debug(f"Recreating HTTP session for '{upstream}' on a new event loop")
+            if not session.closed and not session_loop.is_closed():
+                asyncio.run_coroutine_threadsafe(session.close(), session_loop)
+
+        session = self._build_session(upstream)
+        self._sessions[upstream] = (session, loop)
+        return session
+
+    async def request(self, upstream: str, method: str, url: str,
+                      timeout: Optional[float] = None, **kwargs) -> HTTPResponse:
+        """Send a request through the upstream's pooled session and buffer the body."""
+        session = self.get_session(upstream)
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout, connect=self.http_config.connect_timeout)
+
+        stats = self._stats.setdefault(upstream, {"requests": 0, "errors": 0, "total_time": 0.0})
+        stats["requests"] += 1
+        start_time = time.time()
+
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                text = await response.text()
+                elapsed = time.time() - start_time
+                stats["total_time"] += elapsed
+                return HTTPResponse(response.status, text, dict(response.headers), elapsed)
+        except Exception:
+            stats["errors"] += 1
+            stats["total_time"] += time.time() - start_time
+            raise
+
+    async def post(self, upstream: str, url: str, **kwargs) -> HTTPResponse:
+        return await self.request(upstream, "POST", url, **kwargs)
+
+    async def get(self, upstream: str, url: str, **kwargs) -> HTTPResponse:
+        return await self.request(upstream, "GET", url, **kwargs)
+
+    async def close(self):
+        """Close every session owned by the running loop."""
+        loop = asyncio.get_running_loop()
+        for upstream, (session, session_loop) in list(self._sessions.items()):
+            if session_loop is loop and not session.closed:
+                await session.close()
+            self._sessions.pop(upstream, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-upstream request counts, error counts and mean latency."""
+        return {
+            upstream: {
+                **stats,
+                "avg_time": stats["total_time"] / stats["requests"] if stats["requests"] else 0.0,
+                "open": upstream in self._sessions and not self._sessions[upstream][0].closed
+            }
+            for upstream, stats in self._stats.items()
+        }
+
+
+# Global HTTP session pool
+http_pool = HTTPSessionPool()
@@ -0,0 +1,204 @@
+"""
+Dependency-aware scheduling of orchestrated intents.
+
+Each intent type declares which session_state keys it reads and writes. An
+intent waits for an earlier intent (by execution_order) only when it reads or
+overwrites keys that intent writes; everything else runs concurrently on its
+own copy of the session state, on top of the shared DAGExecutor. Read-only
+intents (facets, relaxation suggestions) run speculatively on the starting
+state and are re-run only if an earlier writer actually changed what they read.
+State deltas are merged back in execution_order, so the result is
+deterministic.
+"""
+
+import asyncio
+import copy
+import logging
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .dag_executor import DAGExecutor, PipelineStage
+
+logger = logging.getLogger(__name__)
+
+FILTER_KEYS = frozenset({"keywords", "min_exp", "max_exp", "min_salary", "max_salary",
+                         "current_cities", "preferred_cities", "target_companies"})
+LOCATION_KEYS = frozenset({"current_cities", "preferred_cities"})
+
+# intent_type -> (reads, writes); types not listed here run exclusively
+INTENT_FOOTPRINTS: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {
+    "skill_expansion": (frozenset({"keywords"}), frozenset({"keywords"})),
+    "title_expansion": (frozenset({"keywords"}), frozenset({"keywords"})),
+    "location_expansion": (LOCATION_KEYS, LOCATION_KEYS),
+    "company_expansion": (frozenset({"target_companies"}), frozenset({"target_companies"})),
+    "company_group": (frozenset({"target_companies"}), frozenset({"target_companies"})),
+    "recruiter_similar": (frozenset({"target_companies", "recruiter_company_id"}), frozenset({"target_companies"})),
+    "facet_generation": (FILTER_KEYS | {"recruiter_company_id"}, frozenset()),
+    "query_relaxation": (FILTER_KEYS | {"total_results"}, frozenset()),
+    "filter_operation": (FILTER_KEYS, FILTER_KEYS),
+}
+
+# Filter actions resolved upstream narrow a filter_operation's footprint
+ACTION_KEYS: Dict[str, FrozenSet[str]] = {
+    "add_skill": frozenset({"keywords"}),
+    "remove_skill": frozenset({"keywords"}),
+    "modify_experience": frozenset({"min_exp", "max_exp"}),
+    "modify_salary": frozenset({"min_salary", "max_salary"}),
+    "add_location": LOCATION_KEYS,
+    "remove_location": LOCATION_KEYS,
+    "add_target_company": frozenset({"target_companies"}),
+    "remove_target_company": frozenset({"target_companies"}),
+}
+
+# Large or runtime-only values that agents replace rather than mutate; shared instead of copied
+SHARED_STATE_KEYS = frozenset({"candidates"})
+
+IntentRunner = Callable[[int, Dict[str, Any], Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def fork_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy session state so an intent can mutate it without affecting concurrent intents."""
+    forked = {}
+    for key, value in state.items():
+        if key in SHARED_STATE_KEYS:
+            forked[key] = value
+            continue
+        try:
+            forked[key] = copy.deepcopy(value)
+        except Exception:
+            forked[key] = value
+    return forked
+
+
+def state_delta(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in after.items() if key not in before or before[key] != value}
+
+
+class IntentScheduler:
+    """Plans intent dependencies from their state footprints and runs them on a DAG."""
+
+    def __init__(self, max_parallel: int = 3, timeout: Optional[float] = None, speculative: bool = True):
+        self.max_parallel = max(1, max_parallel)
+        self.timeout = timeout
+        self.speculative = speculative
+
+    @staticmethod
+    def footprint(intent: Dict[str, Any]) -> Optional[Tuple[FrozenSet[str], FrozenSet[str]]]:
+        """(reads, writes) for an intent, or None when it must run exclusively."""
+        intent_type = intent.get("intent_type")
+        if intent_type == "filter_operation" and intent.get("filter_operations"):
+            operations = intent["filter_operations"]
+            if any(op.get("trigger_search") or op.get("action") not in ACTION_KEYS for op in operations):
+                return None
+            keys = frozenset().union(*(ACTION_KEYS[op["action"]] for op in operations))
+            return keys, keys
+        return INTENT_FOOTPRINTS.get(intent_type)
+
+    def plan(self, intents: List[Dict[str, Any]]) -> Tuple[Dict[int, Set[int]], Dict[int, Set[int]]]:
+        """
+        Dependencies for intents already sorted by execution_order.
+
+        Returns (depends_on, speculative_on): index -> earlier indices it must
+        wait for, and index -> earlier writers a read-only intent is only
+        speculatively independent of.
+        """
+        footprints = [self.footprint(intent) for intent in intents]
+        depends_on: Dict[int, Set[int]] = {i: set() for i in range(len(intents))}
+        speculative_on: Dict[int, Set[int]] = {i: set() for i in range(len(intents))}
+
+        for later in range(len(intents)):
+            for earlier in range(later):
+                if footprints[earlier] is None or footprints[later] is None:
+                    depends_on[later].add(earlier)
+                    continue
+                earlier_reads, earlier_writes = footprints[earlier]
+                later_reads, later_writes = footprints[later]
+                if earlier_writes & later_writes:
+                    depends_on[later].add(earlier)
+                elif earlier_writes & later_reads:
+                    if self.speculative and not later_writes:
+                        speculative_on[later].add(earlier)
+                    else:
+                        depends_on[later].add(earlier)
+        return depends_on, speculative_on
+
+    async def run(self, intents: List[Dict[str, Any]], session_state: Dict[str, Any],
+                  run_intent: IntentRunner) -> Dict[str, Any]:
+        """
+        Run intents (sorted by execution_order) with ``run_intent(index, intent, state)``,
+        which returns a record with "success" and the updated "session_state".
+
+        Returns per-intent ``records`` in execution order, the merged
+        ``session_state`` and scheduling stats.
+        """
+        depends_on, speculative_on = self.plan(intents)
+        base_state = fork_state(session_state)
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        deltas: Dict[int, Dict[str, Any]] = {}
+        inputs: Dict[int, Dict[str, Any]] = {}
+        records: Dict[int, Dict[str, Any]] = {}
+
+        def ancestors(index: int) -> Set[int]:
+            found: Set[int] = set()
+            stack = list(depends_on[index])
+            while stack:
+                dep = stack.pop()
+                if dep not in found:
+                    found.add(dep)
+                    stack.extend(depends_on[dep])
+            return found
+
+        def state_after(indices: Set[int]) -> Dict[str, Any]:
+            state = fork_state(base_state)
+            for dep in sorted(indices):
+                state.update(fork_state(deltas.get(dep, {})))
+            return state
+
+        async def execute(index: int, state: Dict[str, Any]):
+            before = fork_state(state)
+            inputs[index] = before
+            async with semaphore:
+                record = await run_intent(index, intents[index], state)
+            after = record.get("session_state") or state
+            deltas[index] = state_delta(before, after) if record.get("success") else {}
+            records[index] = record
+
+        def make_stage(index: int) -> PipelineStage:
+            async def stage_func(_dep_results: Dict[str, Any]):
+                await execute(index, state_after(ancestors(index)))
+            return PipelineStage(name=str(index), func=stage_func,
+                                 depends_on=[str(dep) for dep in sorted(depends_on[index])],
+                                 required=False)
+
+        dag_result = await DAGExecutor([make_stage(i) for i in range(len(intents))], deadline=self.timeout).run()
+        for name, reason in dag_result["errors"].items():
+            index = int(name)
+            records.setdefault(index, {"success": False, "error": reason})
+            deltas.setdefault(index, {})
+
+        # Validate speculative runs: re-run when an earlier writer changed a key they read
+        reruns = 0
+        for index in range(len(intents)):
+            if not speculative_on[index] or index not in inputs:
+                continue
+            reads = self.footprint(intents[index])[0]
+            writers = speculative_on[index] | ancestors(index)
+            actual = state_after(writers)
+            if any(actual.get(key) != inputs[index].get(key) for key in reads):
+                reruns += 1
+                print(f"🔁 Re-running intent {index + 1}: its inputs changed during parallel execution")
+                await execute(index, actual)
+
+        merged = fork_state(base_state)
+        for index in range(len(intents)):
+            merged.update(deltas.get(index, {}))
+
+        return {
+            "records": [records.get(i, {"success": False, "error": "not executed"}) for i in range(len(intents))],
+            "session_state": merged,
+            "stats": {
+                "dependencies": {i: sorted(deps) for i, deps in depends_on.items() if deps},
+                "speculative": {i: sorted(deps) for i, deps in speculative_on.items() if deps},
+                "reruns": reruns,
+                "timings": dag_result["timings"]
+            }
+        }
@@ -0,0 +1,201 @@
+"""
+LLM response cache for ResDex Agent.
+
+Routing and extraction prompts repeat across recruiters ("add python",
+"increase experience by 5 years"), so LLMTool answers deterministic tasks from
+this cache before streaming a new completion. Keys are the task name, the
+normalized user text and the slice of session state the prompt depends on.
+Entries live in an LRU+TTL TTLCache, can be persisted to a JSON-lines file and
+optionally matched by character-trigram similarity for near-duplicate input.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ..config import config
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_PUNCT_RE = re.compile(r"[^\w\s.+#/-]")
+_SPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, drop punctuation that never changes intent and collapse whitespace."""
+    text = _PUNCT_RE.sub(" ", (text or "").lower())
+    return _SPACE_RE.sub(" ", text).strip(" .")
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class LLMResponseCache:
+    """Exact + near-duplicate cache of successful LLM results, keyed per task and context."""
+
+    def __init__(self, llm_config=None):
+        cfg = llm_config or config.llm
+        self.enabled = cfg.cache_enabled
+        self.tasks = {task.strip() for task in cfg.cache_tasks.split(",") if task.strip()}
+        self.similarity = cfg.cache_similarity
+        self.path = cfg.cache_path or None
+        self._cache = TTLCache(maxsize=cfg.cache_size, ttl=cfg.cache_ttl or None)
+        # bucket (task + context digest) -> {key: (normalized text, trigrams, numbers)}
+        self._buckets: Dict[str, Dict[str, Tuple[str, Set[str], Tuple[str, ...]]]] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "near_hits": 0, "misses": 0, "stores": 0, "skipped": 0, "by_task": {}}
+
+        if self.enabled and self.path:
+            self._load()
+
+    def is_cacheable(self, task: str) -> bool:
+        return self.enabled and task in self.tasks
+
+    @staticmethod
+    def _digest(*parts: str) -> str:
+        return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+
+    def _bucket_and_key(self, task: str, text: str, context: Optional[Dict[str, Any]]) -> Tuple[str, str, str]:
+        normalized = normalize_text(text)
+        context_json = json.dumps(context or {}, sort_keys=True, default=str)
+        bucket = self._digest(task, context_json)
+        return bucket, self._digest(bucket, normalized), normalized
+
+    def _task_stats(self, task: str) -> Dict[str, int]:
+        return self.stats["by_task"].setdefault(task, {"hits": 0, "near_hits": 0, "misses": 0})
+
+    def get(self, task: str, text: str, context: Optional[Dict[str, Any]] = None,
+            allow_similar: bool = True) -> Optional[Dict[str, Any]]:
+        """Return a fresh copy of the cached result, or None on a miss."""
+        if not self.is_cacheable(task):
+            return None
+        bucket, key, normalized = self._bucket_and_key(task, text, context)
+        task_stats = self._task_stats(task)
+
+        payload = self._cache.get(key)
+        if payload is not None:
+            self.stats["hits"] += 1
+            task_stats["hits"] += 1
+            return json.loads(payload)
+
+        if allow_similar and self.similarity > 0:
+            similar_key = self._find_similar(bucket, normalized)
+            if similar_key is not None:
+                payload = self._cache.get(similar_key)
+                if payload is not None:
+                    self.stats["near_hits"] += 1
+                    task_stats["near_hits"] += 1
+                    return json.loads(payload)
+
+        self.stats["misses"] += 1
+        task_stats["misses"] += 1
+        return None
+
+    def set(self, task: str, text: str, value: Dict[str, Any], context: Optional[Dict[str, Any]] = None):
+        """Store a successful result; values that are not JSON-serializable are skipped."""
+        if not self.is_cacheable(task):
+            return
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError):
+            self.stats["skipped"] += 1
+            return
+        bucket, key, normalized = self._bucket_and_key(task, text, context)
+        self._store(bucket, key, normalized, payload)
+        self.stats["stores"] += 1
+        if self.path:
+            self._append({"bucket": bucket, "key": key, "text": normalized, "value": payload,
+                          "expires_at": time.time() + self._cache.ttl if self._cache.ttl else None})
+
+    def _store(self, bucket: str, key: str, normalized: str, payload: str, expires_at: Optional[float] = None):
+        self._cache.set(key, payload, expires_at=expires_at)
+        if self.similarity > 0:
+            with self._lock:
+                self._buckets.setdefault(bucket, {})[key] = (
+                    normalized, _trigrams(normalized), tuple(_NUMBER_RE.findall(normalized))
+                )
+
+    def _find_similar(self, bucket: str, normalized: str) -> Optional[str]:
+        """Best trigram-Jaccard match in the same bucket; numbers must match exactly."""
+        grams = _trigrams(normalized)
+        numbers = tuple(_NUMBER_RE.findall(normalized))
+        best_key, best_score = None, self.similarity
+        with self._lock:
+            entries = self._buckets.get(bucket, {})
+            for key in [k for k in entries if k not in self._cache]:
+                del entries[key]
+            for key, (_, other_grams, other_numbers) in entries.items():
+                if other_numbers != numbers:
+                    continue
+                score = len(grams & other_grams) / len(grams | other_grams)
+                if score >= best_score:
+                    best_key, best_score = key, score
+        return best_key
+
+    def _append(self, record: Dict[str, Any]):
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.warning(f"LLM cache persistence failed: {e}")
+
+    def _load(self):
+        """Load live entries from disk and compact the file to what was kept."""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        kept = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if record.get("expires_at") is not None and record["expires_at"] < now:
+                        continue
+                    kept[record["key"]] = record
+        except OSError as e:
+            logger.warning(f"LLM cache load failed: {e}")
+            return
+
+        # Keep only the newest maxsize entries, in insertion order
+        records = list(kept.values())[-self._cache.maxsize:]
+        for record in records:
+            self._store(record["bucket"], record["key"], record["text"], record["value"], record.get("expires_at"))
+
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+        os.replace(tmp_path, self.path)
+        print(f"💾 Loaded {len(records)} cached LLM responses from {self.path}")
+
+    def clear(self):
+        self._cache.clear()
+        with self._lock:
+            self._buckets.clear()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["near_hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "hit_rate": (self.stats["hits"] + self.stats["near_hits"]) / lookups if lookups else 0.0,
+            "cache": self._cache.get_stats()
+        }
+
+
+# Global LLM response cache shared by every LLMTool
+llm_cache = LLMResponseCache()
@@ -0,0 +1,146 @@
+"""
+Shared non-blocking LLM transport for ResDex Agent.
+
+All LLMTool instances (and through them every sub-agent and tool) stream
+completions through one AsyncOpenAI client per event loop. The client sits
+on a pooled keep-alive httpx transport, a semaphore caps concurrent
+generations, and cancelling the awaiting task closes the upstream stream so
+the model server stops generating.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncLLMClient:
+    """Process-wide async chat-completions client with pooling and a concurrency cap."""
+
+    def __init__(self, llm_config=None):
+        self.llm_config = llm_config or config.llm
+        self._clients: Dict[asyncio.AbstractEventLoop, Tuple[AsyncOpenAI, asyncio.Semaphore]] = {}
+        self.stats = {"requests": 0, "errors": 0, "cancelled": 0, "early_stops": 0, "in_flight": 0,
+                      "waiting": 0, "total_time": 0.0, "total_chars": 0}
+
+    def _build_client(self) -> AsyncOpenAI:
+        cfg = self.llm_config
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=cfg.max_connections,
+                max_keepalive_connections=cfg.max_connections,
+                keepalive_expiry=cfg.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(cfg.request_timeout, connect=cfg.connect_timeout)
+        )
+        print(f"🌐 Created pooled LLM client (max_connections={cfg.max_connections}, "
+              f"max_concurrency={cfg.max_concurrency})")
+        return AsyncOpenAI(api_key=cfg.api_key, base_url=cfg.base_url, http_client=http_client)
+
+    def _get_client(self) -> Tuple[AsyncOpenAI, asyncio.Semaphore]:
+        """Return the client and semaphore for the running loop; they cannot cross loops."""
+        loop = asyncio.get_running_loop()
+        entry = self._clients.get(loop)
+        if entry is None:
+            # Forget clients whose loop has already been closed
+            for stale_loop in [l for l in self._clients if l.is_closed()]:
+                self._clients.pop(stale_loop, None)
+            entry = (self._build_client(), asyncio.Semaphore(self.llm_config.max_concurrency))
+            self._clients[loop] = entry
+        return entry
+
+    async def stream_chat(self, messages: List[Dict[str, str]], label: str = "general",
+                          on_token: Optional[Callable[[str], None]] = None, echo: bool = True,
+                          stop_on: Optional[Callable[[str], bool]] = None, **params) -> str:
+        """
+        Stream one chat completion and return the text received.
+
+        ``on_token`` is called with every content delta. When ``stop_on``
+        returns True for a delta the stream is closed right away, which stops
+        generation upstream. Extra keyword arguments override the configured
+        sampling parameters.
+        """
+        client, semaphore = self._get_client()
+        request_params = {
+            "model": self.llm_config.model,
+            "max_tokens": self.llm_config.max_tokens,
+            "temperature": self.llm_config.temperature,
+            "presence_penalty": 0,
+            "top_p": 0.6,
+            "n": 1,
+            **params
+        }
+
+        self.stats["waiting"] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.stats["waiting"] -= 1
+
+        self.stats["requests"] += 1
+        self.stats["in_flight"] += 1
+        start_time = time.time()
+        stream = None
+        parts: List[str] = []
+        try:
+            stream = await client.chat.completions.create(messages=messages, stream=True, **request_params)
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content is None:
+                    continue
+                parts.append(content)
+                if echo:
+                    print(content, end='', flush=True)
+                if on_token is not None:
+                    on_token(content)
+                if stop_on is not None and stop_on(content):
+                    self.stats["early_stops"] += 1
+                    break
+            return "".join(parts)
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            logger.info(f"LLM call '{label}' cancelled after {len(parts)} chunks")
+            raise
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            if stream is not None:
+                # Closing the response stops generation upstream when the caller was cancelled
+                try:
+                    await asyncio.shield(stream.close())
+                except Exception:
+                    pass
+            elapsed = time.time() - start_time
+            self.stats["in_flight"] -= 1
+            self.stats["total_time"] += elapsed
+            self.stats["total_chars"] += sum(len(p) for p in parts)
+            semaphore.release()
+
+    async def aclose(self):
+        """Close the client owned by the running loop."""
+        entry = self._clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        completed = self.stats["requests"] - self.stats["in_flight"]
+        return {
+            **self.stats,
+            "avg_time": self.stats["total_time"] / completed if completed else 0.0,
+            "max_concurrency": self.llm_config.max_concurrency,
+            "loops": len(self._clients)
+        }
+
+
+# Global LLM client shared by every LLMTool
+llm_client = AsyncLLMClient()
@@ -0,0 +1,280 @@
+"""
+Compact binary location dataset shared by every location consumer.
+
+``build_location_bundle`` packs coordinates.json and city_dict.pickle into a
+directory of plain .npy files: int64 ids, float32 (lat, lng) pairs with NaN for
+missing or invalid coordinates, and a UTF-8 string table (one byte blob plus
+int64 offsets) for names. A manifest.json records dtypes, lengths and
+checksums of both the arrays and the source files. Loading memory-maps the
+arrays, so startup costs a few file opens; dicts, the spatial index and the
+distance engine are derived lazily, once per process, and shared by every
+tool instance. When the bundle is missing or stale the JSON/pickle sources
+are parsed instead.
+
+Build: python -m resdex_agent.utils.location_dataset build
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .geo_distance import DistanceEngine
+from .geo_index import GeoIndex, is_valid_coordinate
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_LOCATION_DIR = Path(__file__).parent.parent.parent / "sample_location"
+CITY_DICT_PATH = SAMPLE_LOCATION_DIR / "city_dict.pickle"
+COORDINATES_PATH = SAMPLE_LOCATION_DIR / "coordinates.json"
+BUNDLE_DIR = SAMPLE_LOCATION_DIR / "location_bundle"
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_ARRAYS = ["ids", "coords", "name_blob", "name_offsets"]
+
+# float32 keeps ~1m precision; derived indexes round to this many decimals to drop float32 noise
+COORDINATE_DECIMALS = 5
+
+
+class LocationBundleError(Exception):
+    pass
+
+
+def file_checksum(path: Path, block_size: int = 4 * 1024 * 1024) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_source(path: Path, loader) -> Dict[Any, Any]:
+    """A source mapping, or {} (with a warning) when it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            data = loader(f)
+    except Exception as e:
+        logger.warning(f"Could not load location source {path}: {e}")
+        return {}
+    if not isinstance(data, dict):
+        logger.warning(f"Unexpected format in {path}: {type(data)}")
+        return {}
+    return data
+
+
+def pack_sources(coordinates_path: Path = COORDINATES_PATH,
+                 city_dict_path: Path = CITY_DICT_PATH) -> Dict[str, np.ndarray]:
+    """
+    Parse the JSON/pickle sources into the bundle arrays (city_dict order, then
+    coordinate-only ids). A missing source contributes no entries.
+    """
+    id_to_name = _read_source(city_dict_path, pickle.load)
+    coordinates = _read_source(coordinates_path, json.load)
+
+    names: Dict[int, str] = {int(location_id): str(name) for location_id, name in id_to_name.items()}
+    points: Dict[int, Any] = {int(location_id): coords for location_id, coords in coordinates.items()}
+    ids = list(names) + [location_id for location_id in points if location_id not in names]
+
+    coords = np.full((len(ids), 2), np.nan, dtype=np.float32)
+    for row, location_id in enumerate(ids):
+        point = points.get(location_id)
+        if isinstance(point, list) and len(point) == 2 and is_valid_coordinate(point[0], point[1]):
+            coords[row] = point
+
+    encoded = [names.get(location_id, "").encode("utf-8") for location_id in ids]
+    name_offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=name_offsets[1:])
+    return {
+        "ids": np.asarray(ids, dtype=np.int64),
+        "coords": coords,
+        "name_blob": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "name_offsets": name_offsets
+    }
+
+
+def build_location_bundle(output_dir: Path = BUNDLE_DIR, coordinates_path: Path = COORDINATES_PATH,
+                          city_dict_path: Path = CITY_DICT_PATH) -> Path:
+    """Write the .npy bundle and its manifest."""
+    for source in (Path(coordinates_path), Path(city_dict_path)):
+        if not source.exists():
+            raise LocationBundleError(f"Cannot build location bundle: {source} is missing")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    arrays = pack_sources(coordinates_path, city_dict_path)
+
+    manifest = {
+        "version": BUNDLE_FORMAT_VERSION,
+        "count": int(len(arrays["ids"])),
+        "sources": {
+            path.name: {"size": path.stat().st_size, "checksum": file_checksum(path)}
+            for path in (Path(coordinates_path), Path(city_dict_path))
+        },
+        "files": {}
+    }
+    for name, array in arrays.items():
+        path = output_dir / f"{name}.npy"
+        np.save(path, array, allow_pickle=False)
+        manifest["files"][name] = {"dtype": str(array.dtype), "length": int(array.shape[0]),
+                                   "checksum": file_checksum(path)}
+
+    with open(output_dir / "manifest.json", 'w') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"📦 Built location bundle: {manifest['count']:,} locations -> {output_dir}")
+    return output_dir
+
+
+def load_location_bundle(bundle_dir: Path = BUNDLE_DIR, verify: bool = True,
+                         sources: Optional[List[Path]] = None) -> Dict[str, np.ndarray]:
+    """
+    Memory-map the bundle arrays. Source files are compared by size (and by
+    checksum when ``verify``) so a bundle older than its sources is rejected.
+    """
+    bundle_dir = Path(bundle_dir)
+    try:
+        with open(bundle_dir / "manifest.json") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        raise LocationBundleError(f"No location bundle in {bundle_dir}")
+    if manifest.get("version") != BUNDLE_FORMAT_VERSION:
+        raise LocationBundleError(f"Unsupported bundle format version {manifest.get('version')} in {bundle_dir}")
+
+    for source in sources or []:
+        recorded = manifest["sources"].get(source.name)
+        if not source.exists() or recorded is None:
+            continue
+        if source.stat().st_size != recorded["size"] or (verify and file_checksum(source) != recorded["checksum"]):
+            raise LocationBundleError(f"Location bundle is stale: {source.name} changed since it was built")
+
+    arrays = {}
+    for name in BUNDLE_ARRAYS:
+        path = bundle_dir / f"{name}.npy"
+        meta = manifest["files"][name]
+        if verify and file_checksum(path) != meta["checksum"]:
+            raise LocationBundleError(f"Checksum mismatch for {path}")
+        arrays[name] = np.load(path, mmap_mode='r')
+        if arrays[name].shape[0] != meta["length"]:
+            raise LocationBundleError(f"Length mismatch for {path}")
+    return arrays
+
+
+class LocationDataset:
+    """Location ids, float32 coordinates and names, with shared lazily derived views."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], source: str, load_time: float):
+        self.ids = arrays["ids"]
+        self.coords = arrays["coords"]
+        self.name_blob = arrays["name_blob"]
+        self.name_offsets = arrays["name_offsets"]
+        self.source = source
+        self.load_time = load_time
+
+    @classmethod
+    def empty(cls, source: str = "empty") -> "LocationDataset":
+        """A dataset with no locations, for callers that degrade instead of failing."""
+        return cls({
+            "ids": np.zeros(0, dtype=np.int64),
+            "coords": np.zeros((0, 2), dtype=np.float32),
+            "name_blob": np.zeros(0, dtype=np.uint8),
+            "name_offsets": np.zeros(1, dtype=np.int64)
+        }, source, 0.0)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @cached_property
+    def location_ids(self) -> List[str]:
+        return [str(location_id) for location_id in self.ids.tolist()]
+
+    @cached_property
+    def names(self) -> List[str]:
+        blob = self.name_blob.tobytes()
+        offsets = self.name_offsets.tolist()
+        return [blob[start:end].decode("utf-8") for start, end in zip(offsets[:-1], offsets[1:])]
+
+    @cached_property
+    def valid(self) -> np.ndarray:
+        return ~np.isnan(self.coords).any(axis=1)
+
+    @cached_property
+    def id_to_name(self) -> Dict[str, str]:
+        """{location_id: 'Name / Alias'} in city_dict order."""
+        return {location_id: name for location_id, name in zip(self.location_ids, self.names) if name}
+
+    @cached_property
+    def located_ids(self) -> List[str]:
+        return [self.location_ids[row] for row in np.flatnonzero(self.valid)]
+
+    @cached_property
+    def coordinates(self) -> Dict[str, List[float]]:
+        """{location_id: [lat, lng]} for valid coordinates."""
+        rows = np.flatnonzero(self.valid)
+        points = np.round(self.coords[rows].astype(np.float64), COORDINATE_DECIMALS).tolist()
+        return {self.location_ids[row]: point for row, point in zip(rows, points)}
+
+    @cached_property
+    def geo_index(self) -> GeoIndex:
+        rows = np.flatnonzero(self.valid)
+        points = np.round(self.coords[rows].astype(np.float64), COORDINATE_DECIMALS)
+        return GeoIndex([self.location_ids[row] for row in rows], points[:, 0], points[:, 1])
+
+    @cached_property
+    def distance_engine(self) -> DistanceEngine:
+        return DistanceEngine.from_index(self.geo_index)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "source": self.source,
+            "locations": len(self.ids),
+            "located": int(self.valid.sum()),
+            "load_time_ms": round(self.load_time * 1000, 2)
+        }
+
+
+def load_location_dataset(bundle_dir: Path = BUNDLE_DIR, coordinates_path: Path = COORDINATES_PATH,
+                          city_dict_path: Path = CITY_DICT_PATH, verify: bool = True) -> LocationDataset:
+    """Memory-map the bundle, falling back to parsing the JSON/pickle sources."""
+    start_time = time.time()
+    try:
+        arrays = load_location_bundle(bundle_dir, verify=verify,
+                                      sources=[Path(coordinates_path), Path(city_dict_path)])
+        source = "bundle"
+    except Exception as e:
+        logger.warning(f"{e}; parsing location sources instead "
+                       f"(rebuild with: python -m resdex_agent.utils.location_dataset build)")
+        arrays = pack_sources(coordinates_path, city_dict_path)
+        source = "json+pickle"
+
+    dataset = LocationDataset(arrays, source, time.time() - start_time)
+    print(f"🗺️ Location dataset loaded from {source}: {len(dataset):,} locations "
+          f"in {dataset.load_time * 1000:.1f}ms")
+    return dataset
+
+
+_dataset: Optional[LocationDataset] = None
+_dataset_lock = threading.Lock()
+
+
+def get_location_dataset() -> LocationDataset:
+    """Global location dataset, loaded on first use."""
+    global _dataset
+    if _dataset is None:
+        with _dataset_lock:
+            if _dataset is None:
+                _dataset = load_location_dataset(verify=os.getenv("LOCATION_BUNDLE_VERIFY", "1") == "1")
+    return _dataset
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "build":
+        build_location_bundle()
+        sys.exit(0)
+    print(get_location_dataset().get_stats())
@@ -0,0 +1,191 @@
+"""
+Batched, cached city-name to globalId normalization.
+"""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from .cache import TTLCache
+from .constants import API_HEADERS
+from .http_client import http_pool
+from .location_dataset import CITY_DICT_PATH
+from .location_resolver import LocationResolver, get_location_resolver
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+# Static-tier matches must be exact, an alias or equally confident; the API handles the rest
+STATIC_MATCH_MIN_SCORE = 0.9
+
+
+class LocationNormalizer:
+    """
+    Resolves city names to taxonomy globalIds.
+
+    Lookups go through three tiers: the static ids of city_dict.pickle via the
+    indexed location resolver (spellings and aliases), a process-wide TTL/LRU
+    cache of API answers, and finally a single batched locationNormalization
+    request for all remaining cities.
+    """
+
+    def __init__(self, api_url: Optional[str] = None, cache_size: Optional[int] = None,
+                 cache_ttl: Optional[float] = None, prewarm: Optional[bool] = None):
+        api_config = config.api
+        self.api_url = api_url or api_config.location_api_url
+        self.cache = TTLCache(
+            maxsize=cache_size or api_config.location_cache_size,
+            ttl=cache_ttl if cache_ttl is not None else api_config.location_cache_ttl
+        )
+        self.resolver: Optional[LocationResolver] = None
+        self.http_pool = http_pool
+        self.api_requests = 0
+        self.seed_hits = 0
+
+        if api_config.location_cache_prewarm if prewarm is None else prewarm:
+            self.warm_from_city_dict(CITY_DICT_PATH)
+
+    @staticmethod
+    def _normalize_key(city: str) -> str:
+        return " ".join(str(city).lower().split())
+
+    def warm_from_city_dict(self, pickle_path: Path) -> int:
+        """Back the static tier with a resolver over a {globalId: 'Name / Alias'} pickle."""
+        try:
+            if Path(pickle_path) == CITY_DICT_PATH:
+                self.resolver = get_location_resolver()
+            else:
+                self.resolver = LocationResolver.from_files(pickle_path, coordinates_path=None)
+        except Exception as e:
+            logger.warning(f"Could not pre-warm location cache from {pickle_path}: {e}")
+            return 0
+
+        logger.info(f"Pre-warmed location cache with {len(self.resolver.terms):,} city names")
+        return len(self.resolver.terms)
+
+    def _static_id(self, city: str) -> Optional[str]:
+        if self.resolver is None:
+            return None
+        # Same-named ids keep city_dict order, i.e. the globalIds sent before
+        return self.resolver.resolve_id(city, min_score=STATIC_MATCH_MIN_SCORE, prefer_located=False)
+
+    def is_known_city(self, city: str) -> bool:
+        """True if the city is in the pre-warmed static tier (no API call)."""
+        return self._static_id(city) is not None
+
+    def canonical_city(self, city: str) -> Optional[str]:
+        """Static-tier spelling of a known city ("delhi ncr" -> "Delhi/NCR"), or None."""
+        if self.resolver is None:
+            return None
+        match = self.resolver.best_match(city, min_score=STATIC_MATCH_MIN_SCORE, prefer_located=False)
+        return match["matched_name"] if match else None
+
+    def _lookup_cached(self, cities: List[str]) -> Tuple[Dict[str, Optional[str]], List[str]]:
+        """Split cities into already-known ids and the ones that need the API."""
+        resolved: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+
+        for city in dict.fromkeys(cities):
+            static_id = self._static_id(city)
+            if static_id is not None:
+                resolved[city] = static_id
+                self.seed_hits += 1
+                continue
+
+            key = self._normalize_key(city)
+            cached_id = self.cache.get(key)
+            if cached_id is not None:
+                resolved[city] = cached_id
+            else:
+                missing.append(city)
+
+        return resolved, missing
+
+    def _parse_response(self, text: str, cities: List[str]) -> Dict[str, Optional[str]]:
+        """Decode a batched response; entries are returned in request order."""
+        resolved: Dict[str, Optional[str]] = {}
+
+        try:
+            entries = json.loads(text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid location API response: {e}")
+            entries = []
+
+        if not isinstance(entries, list):
+            entries = []
+
+        for idx, city in enumerate(cities):
+            loc_id = None
+            if idx < len(entries) and isinstance(entries[idx], dict):
+                city_entry = entries[idx].get('city') or {}
+                if isinstance(city_entry, dict) and city_entry.get('globalId') is not None:
+                    loc_id = str(city_entry['globalId'])
+
+            resolved[city] = loc_id
+            if loc_id:
+                self.cache.set(self._normalize_key(city), loc_id)
+            else:
+                print(f"Error getting location ID for {city}: not found in normalization response")
+
+        return resolved
+
+    @staticmethod
+    def _build_payload(cities: List[str]) -> Dict[str, List[Dict[str, str]]]:
+        return {"location": [{"city": city} for city in cities]}
+
+    async def resolve(self, cities: List[str]) -> Dict[str, Optional[str]]:
+        """Resolve cities to globalIds with at most one non-blocking API call."""
+        resolved, missing = self._lookup_cached(cities)
+        if not missing:
+            return resolved
+
+        self.api_requests += 1
+        try:
+            response = await self.http_pool.post(
+                "location",
+                self.api_url,
+                headers=API_HEADERS["location"],
+                json=self._build_payload(missing)
+            )
+            resolved.update(self._parse_response(response.text, missing))
+        except Exception as e:
+            logger.error(f"Location normalization failed for {missing}: {e}")
+            resolved.update({city: None for city in missing})
+
+        return resolved
+
+    def resolve_sync(self, cities: List[str]) -> Dict[str, Optional[str]]:
+        """Blocking variant of resolve() for callers outside the event loop."""
+        resolved, missing = self._lookup_cached(cities)
+        if not missing:
+            return resolved
+
+        self.api_requests += 1
+        try:
+            response = requests.post(
+                self.api_url,
+                headers=API_HEADERS["location"],
+                json=self._build_payload(missing),
+                timeout=config.http.upstream_timeouts.get("location", config.http.request_timeout)
+            )
+            resolved.update(self._parse_response(response.text, missing))
+        except Exception as e:
+            logger.error(f"Location normalization failed for {missing}: {e}")
+            resolved.update({city: None for city in missing})
+
+        return resolved
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "seed_entries": len(self.resolver.terms) if self.resolver else 0,
+            "seed_hits": self.seed_hits,
+            "api_requests": self.api_requests,
+            **{f"cache_{k}": v for k, v in self.cache.get_stats().items()}
+        }
+
+
+# Global location normalizer instance
+location_normalizer = LocationNormalizer()
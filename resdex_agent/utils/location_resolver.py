@@ -0,0 +1,320 @@
+"""
+Indexed fuzzy resolution of free-text location names to city_dict ids.
+
+Names from city_dict.pickle ("Bengaluru / Bangalore") are split into their
+spellings, normalized and indexed once: an exact/alias table, a prefix trie
+whose nodes keep their shortest completions, and a trigram inverted index for
+typo-tolerant matching. Lookups never scan the full name list, so a ranked
+answer costs microseconds instead of one substring test per location.
+"""
+
+import json
+import logging
+import pickle
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .cache import TTLCache
+from .geo_index import is_valid_coordinate
+from .location_dataset import CITY_DICT_PATH, COORDINATES_PATH, get_location_dataset
+
+logger = logging.getLogger(__name__)
+
+# Alternate spellings -> the spelling used in city_dict
+LOCATION_ALIASES: Dict[str, str] = {
+    "bangalore": "bengaluru",
+    "bengaluru": "bangalore",
+    "gurugram": "gurgaon",
+    "bombay": "mumbai",
+    "calcutta": "kolkata",
+    "madras": "chennai",
+    "poona": "pune",
+    "new delhi": "delhi",
+    "ncr": "delhi/ncr",
+    "delhi ncr": "delhi/ncr",
+    "mysuru": "mysore",
+    "mangaluru": "mangalore",
+    "belagavi": "belgaum",
+    "hubballi": "hubli",
+    "prayagraj": "allahabad",
+    "thiruvananthapuram": "trivandrum",
+    "bhubaneswar": "bhubaneshwar",
+    "tiruchirappalli": "trichy",
+    "vizag": "visakhapatnam",
+    "puducherry": "pondicherry",
+}
+
+_NON_ALNUM = re.compile(r"[^a-z0-9/]+")
+
+# Score ceilings per match type; ranking is by score, then ids with coordinates
+MATCH_SCORES = {"exact": 1.0, "alias": 0.98, "contains": 0.9, "prefix": 0.9, "fuzzy": 0.95}
+
+
+def normalize_name(text: Any) -> str:
+    """Lowercase, drop punctuation and collapse whitespace ("Navi-Mumbai " -> "navi mumbai")."""
+    return " ".join(_NON_ALNUM.sub(" ", str(text).lower()).split()).replace(" / ", "/")
+
+
+def trigrams(term: str) -> List[str]:
+    padded = f"  {term} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+class LocationResolver:
+    """Exact, alias, prefix and trigram lookups over location names, returning ranked ids."""
+
+    def __init__(self, id_to_name: Dict[Any, str], located_ids: Optional[Iterable[Any]] = None,
+                 aliases: Optional[Dict[str, str]] = None, trie_width: int = 8,
+                 fuzzy_threshold: float = 0.45, cache_size: int = 2048):
+        start_time = time.time()
+        self.trie_width = trie_width
+        self.fuzzy_threshold = fuzzy_threshold
+        self.ids: List[str] = [str(location_id) for location_id in id_to_name]
+        self.names: List[str] = [str(name) for name in id_to_name.values()]
+        located = {str(location_id) for location_id in located_ids} if located_ids is not None else set()
+        self.located = np.fromiter((location_id in located for location_id in self.ids), dtype=bool,
+                                   count=len(self.ids))
+
+        # term -> index; each term keeps its display spelling and the entries it names
+        self.terms: List[str] = []
+        self.term_display: List[str] = []
+        self.term_entries: List[List[int]] = []
+        self._term_index: Dict[str, int] = {}
+        for entry, name in enumerate(self.names):
+            spellings = [name] + (name.split("/") if "/" in name else [])
+            for spelling in spellings:
+                self._add_term(normalize_name(spelling), spelling.strip(), entry)
+
+        self.aliases: Dict[str, int] = {}
+        for alias, target in (aliases if aliases is not None else LOCATION_ALIASES).items():
+            alias_key, target_key = normalize_name(alias), normalize_name(target)
+            if target_key in self._term_index:
+                self.aliases.setdefault(alias_key, self._term_index[target_key])
+
+        self._build_trie()
+        self._build_trigram_index()
+        self._matches = TTLCache(maxsize=cache_size)
+        self.build_time = time.time() - start_time
+        self.stats = {"lookups": 0, "exact": 0, "alias": 0, "contains": 0, "prefix": 0, "fuzzy": 0, "misses": 0}
+        logger.info(f"LocationResolver indexed {len(self.terms):,} names for {len(self.ids):,} locations "
+                    f"in {self.build_time * 1000:.1f}ms")
+
+    @classmethod
+    def from_files(cls, city_dict_path: Path = CITY_DICT_PATH,
+                   coordinates_path: Optional[Path] = COORDINATES_PATH) -> "LocationResolver":
+        """Build from the city_dict pickle, ranking ids with valid coordinates first."""
+        with open(city_dict_path, 'rb') as f:
+            id_to_name = pickle.load(f)
+        if not isinstance(id_to_name, dict):
+            raise ValueError(f"Unexpected city dict format: {type(id_to_name)}")
+
+        located_ids = []
+        if coordinates_path is not None and Path(coordinates_path).exists():
+            with open(coordinates_path, 'r') as f:
+                coordinates = json.load(f)
+            located_ids = [location_id for location_id, coords in coordinates.items()
+                           if isinstance(coords, list) and len(coords) == 2 and is_valid_coordinate(*coords)]
+        return cls(id_to_name, located_ids)
+
+    def _add_term(self, term: str, display: str, entry: int):
+        if not term:
+            return
+        index = self._term_index.get(term)
+        if index is None:
+            index = len(self.terms)
+            self._term_index[term] = index
+            self.terms.append(term)
+            self.term_display.append(display)
+            self.term_entries.append([])
+        if entry not in self.term_entries[index]:
+            self.term_entries[index].append(entry)
+
+    def _build_trie(self):
+        """Character trie; every node stores its ``trie_width`` shortest completions."""
+        self._trie: Dict[Any, Any] = {None: []}
+        for index in sorted(range(len(self.terms)), key=lambda i: (len(self.terms[i]), self.terms[i])):
+            node = self._trie
+            for char in self.terms[index]:
+                node = node.setdefault(char, {None: []})
+                if len(node[None]) < self.trie_width:
+                    node[None].append(index)
+
+    def _build_trigram_index(self):
+        postings: Dict[str, List[int]] = {}
+        counts = np.zeros(len(self.terms), dtype=np.float64)
+        for index, term in enumerate(self.terms):
+            grams = trigrams(term)
+            counts[index] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(index)
+        self._postings = {gram: np.asarray(indices, dtype=np.intp) for gram, indices in postings.items()}
+        self._gram_counts = counts
+
+    def _prefix_terms(self, key: str) -> List[int]:
+        node = self._trie
+        for char in key:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node[None]
+
+    def _fuzzy_terms(self, key: str, limit: int) -> List[Tuple[int, float]]:
+        """Terms by trigram Dice similarity to ``key``, best first."""
+        key_grams = trigrams(key)
+        grams = [gram for gram in key_grams if gram in self._postings]
+        if not grams:
+            return []
+        shared = np.bincount(np.concatenate([self._postings[gram] for gram in grams]),
+                             minlength=len(self.terms))
+        candidates = np.flatnonzero(shared)
+        similarity = 2.0 * shared[candidates] / (len(key_grams) + self._gram_counts[candidates])
+        keep = similarity >= self.fuzzy_threshold
+        candidates, similarity = candidates[keep], similarity[keep]
+        if len(candidates) > limit:
+            top = np.argpartition(-similarity, limit - 1)[:limit]
+            candidates, similarity = candidates[top], similarity[top]
+        order = np.argsort(-similarity, kind="stable")
+        return [(int(candidates[i]), float(similarity[i])) for i in order]
+
+    def _contained_terms(self, key: str) -> List[Tuple[int, float]]:
+        """Known names appearing as whole words inside a longer query ("whitefield bangalore")."""
+        words = key.split()
+        found = []
+        for size in range(len(words) - 1, 0, -1):
+            for start in range(len(words) - size + 1):
+                window = " ".join(words[start:start + size])
+                index = self._term_index.get(window, self.aliases.get(window))
+                if index is not None:
+                    found.append((index, len(window) / len(key)))
+        return found
+
+    def _candidate_terms(self, key: str, head: str, limit: int) -> List[Tuple[int, float, str]]:
+        """
+        (term index, score, match type) from every tier, best score per term.
+        ``head`` is the part before the first comma ("Pune" in "Pune, Maharashtra").
+        """
+        best: Dict[int, Tuple[float, str]] = {}
+
+        def offer(index: int, score: float, match_type: str):
+            if index not in best or score > best[index][0]:
+                best[index] = (score, match_type)
+
+        if key in self._term_index:
+            offer(self._term_index[key], MATCH_SCORES["exact"], "exact")
+        if key in self.aliases:
+            offer(self.aliases[key], MATCH_SCORES["alias"], "alias")
+        if best:
+            return [(index, score, match_type) for index, (score, match_type) in best.items()]
+
+        if head != key:
+            index = self._term_index.get(head, self.aliases.get(head))
+            if index is not None:
+                offer(index, MATCH_SCORES["contains"], "contains")
+        for index, coverage in self._contained_terms(key):
+            offer(index, 0.6 + 0.3 * coverage, "contains")
+        for index in self._prefix_terms(key):
+            offer(index, 0.6 + 0.3 * len(key) / len(self.terms[index]), "prefix")
+        for index, similarity in self._fuzzy_terms(key, limit):
+            offer(index, MATCH_SCORES["fuzzy"] * similarity, "fuzzy")
+        return [(index, score, match_type) for index, (score, match_type) in best.items()]
+
+    def match(self, query: str, limit: int = 5, min_score: float = 0.0,
+              prefer_located: bool = True) -> List[Dict[str, Any]]:
+        """
+        Ranked location matches for a free-text name.
+
+        Each match has the location id, its full city_dict name, the spelling
+        that matched, a score in (0, 1] and the match type (exact, alias,
+        contains, prefix or fuzzy). With ``prefer_located`` ids that have
+        coordinates rank ahead of same-scored ids without.
+        """
+        self.stats["lookups"] += 1
+        key = normalize_name(query)
+        if not key:
+            return []
+        cache_key = (key, limit, min_score, prefer_located)
+        cached = self._matches.get(cache_key)
+        if cached is not None:
+            return [dict(match) for match in cached]
+
+        head = normalize_name(str(query).split(",")[0])
+        terms = [term for term in self._candidate_terms(key, head, max(limit, self.trie_width))
+                 if term[1] >= min_score]
+        if not terms:
+            self.stats["misses"] += 1
+            self._matches.set(cache_key, [])
+            return []
+
+        ranked: Dict[int, Tuple[float, bool, int, str]] = {}
+        for index, score, match_type in terms:
+            for entry in self.term_entries[index]:
+                located = bool(self.located[entry]) if prefer_located else False
+                candidate = (score, located, index, match_type)
+                if entry not in ranked or candidate[:2] > ranked[entry][:2]:
+                    ranked[entry] = candidate
+
+        ordered = sorted(ranked.items(), key=lambda item: (-item[1][0], not item[1][1], item[0]))[:limit]
+        self.stats[ordered[0][1][3]] += 1
+        matches = [{
+            "location_id": self.ids[entry],
+            "name": self.names[entry],
+            "matched_name": self.term_display[index],
+            "score": round(score, 3),
+            "match_type": match_type,
+            "has_coordinates": bool(self.located[entry])
+        } for entry, (score, _, index, match_type) in ordered]
+        self._matches.set(cache_key, matches)
+        return [dict(match) for match in matches]
+
+    def best_match(self, query: str, min_score: float = 0.0,
+                   prefer_located: bool = True) -> Optional[Dict[str, Any]]:
+        matches = self.match(query, limit=1, min_score=min_score, prefer_located=prefer_located)
+        return matches[0] if matches else None
+
+    def resolve_id(self, query: str, min_score: float = 0.0, prefer_located: bool = True) -> Optional[str]:
+        match = self.best_match(query, min_score=min_score, prefer_located=prefer_located)
+        return match["location_id"] if match else None
+
+    def canonical_name(self, query: str, min_score: float = 0.8) -> Optional[str]:
+        """Display spelling of the best confident match ("bombay" -> "Mumbai")."""
+        match = self.best_match(query, min_score=min_score)
+        return match["matched_name"] if match else None
+
+    def suggestions(self, query: str, limit: int = 5) -> List[str]:
+        """Distinct full names of the closest matches, for "did you mean" messages."""
+        names = []
+        for match in self.match(query, limit=limit * 2):
+            if match["name"] not in names:
+                names.append(match["name"])
+        return names[:limit]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "locations": len(self.ids),
+            "terms": len(self.terms),
+            "aliases": len(self.aliases),
+            "trigrams": len(self._postings),
+            "cached_queries": len(self._matches),
+            "build_time_ms": round(self.build_time * 1000, 2)
+        }
+
+
+_resolver: Optional[LocationResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_location_resolver() -> LocationResolver:
+    """Global resolver over the shared location dataset, built on first use."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                dataset = get_location_dataset()
+                _resolver = LocationResolver(dataset.id_to_name, dataset.located_ids)
+    return _resolver
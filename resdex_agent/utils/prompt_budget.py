@@ -0,0 +1,98 @@
+"""
+Prompt-size budget for LLM calls in ResDex Agent.
+
+Every request LLMTool sends passes through PromptBudget.apply, which records the
+static (system) and dynamic (per-turn) token estimate per task and trims the
+dynamic part when a prompt exceeds its task budget. The static prefix is never
+trimmed, so prefix caching on the model server keeps working.
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+# Rough English/JSON average for Qwen-style BPE tokenizers; no tokenizer is loaded in-process
+CHARS_PER_TOKEN = 4
+TRIM_MARKER = "\n...[trimmed]...\n"
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class PromptBudget:
+    """Per-task prompt token accounting with head/tail trimming of the dynamic message."""
+
+    def __init__(self, llm_config=None):
+        cfg = llm_config or config.llm
+        self.default_budget = cfg.prompt_budget
+        self.budgets: Dict[str, int] = {}
+        for item in cfg.prompt_budgets.split(","):
+            task, _, tokens = item.partition(":")
+            if task.strip() and tokens.strip().isdigit():
+                self.budgets[task.strip()] = int(tokens)
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def get_budget(self, task: str) -> int:
+        return self.budgets.get(task, self.default_budget)
+
+    def apply(self, task: str, messages: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Record prompt size for ``task`` and return messages that fit its budget."""
+        static_tokens = sum(estimate_tokens(m["content"]) for m in messages if m["role"] == "system")
+        dynamic_tokens = sum(estimate_tokens(m["content"]) for m in messages if m["role"] != "system")
+        budget = self.get_budget(task)
+
+        task_stats = self.stats.setdefault(task, {
+            "calls": 0, "trimmed": 0, "over_budget": 0, "static_tokens": 0,
+            "max_dynamic_tokens": 0, "total_tokens": 0, "budget": budget
+        })
+        task_stats["calls"] += 1
+        task_stats["static_tokens"] = static_tokens
+        task_stats["max_dynamic_tokens"] = max(task_stats["max_dynamic_tokens"], dynamic_tokens)
+        task_stats["total_tokens"] += static_tokens + dynamic_tokens
+
+        if static_tokens + dynamic_tokens <= budget:
+            return messages
+
+        available = budget - static_tokens - (dynamic_tokens - estimate_tokens(messages[-1]["content"]))
+        if messages[-1]["role"] == "system" or available <= estimate_tokens(TRIM_MARKER):
+            task_stats["over_budget"] += 1
+            logger.warning(f"Prompt for '{task}' is ~{static_tokens + dynamic_tokens} tokens "
+                           f"(budget {budget}) and cannot be trimmed")
+            return messages
+
+        trimmed = self.trim(messages[-1]["content"], available)
+        task_stats["trimmed"] += 1
+        print(f"✂️ Trimmed '{task}' prompt from ~{static_tokens + dynamic_tokens} to ~{budget} tokens")
+        return messages[:-1] + [{**messages[-1], "content": trimmed}]
+
+    @staticmethod
+    def trim(text: str, max_tokens: int) -> str:
+        """Keep the head and tail of ``text``: the query and instructions sit at the ends."""
+        max_chars = max_tokens * CHARS_PER_TOKEN - len(TRIM_MARKER)
+        if len(text) <= max_chars:
+            return text
+        head = max_chars // 2
+        return text[:head] + TRIM_MARKER + text[len(text) - (max_chars - head):]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            task: {**s, "avg_tokens": s["total_tokens"] / s["calls"] if s["calls"] else 0.0}
+            for task, s in self.stats.items()
+        }
+
+    def report(self) -> str:
+        """One line per task, largest average prompt first."""
+        lines = []
+        for task, s in sorted(self.get_stats().items(), key=lambda kv: -kv[1]["avg_tokens"]):
+            lines.append(f"{task}: {s['calls']} calls, static ~{s['static_tokens']} + dynamic "
+                         f"≤{s['max_dynamic_tokens']} tokens (avg ~{s['avg_tokens']:.0f}, budget {s['budget']}, "
+                         f"trimmed {s['trimmed']}, over {s['over_budget']})")
+        return "\n".join(lines)
+
+
+# Global prompt budget shared by every LLMTool
+prompt_budget = PromptBudget()
@@ -1,9 +1,13 @@
 # resdex_agent/utils/step_logger.py - ENHANCED for live streaming
 """
 Real-time step logging system for ResDex Agent UI with enhanced live streaming support.
+
+Steps are published to per-session subscriber queues as they are logged, so the UI
+renders them when the agent emits them instead of pacing itself with sleeps.
 """
+import queue as sync_queue
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
 from datetime import datetime
 import threading
 
@@ -28,6 +32,9 @@ class StepLogger:
         if not self._initialized:
             self.sessions: Dict[str, List[Dict[str, Any]]] = {}
             self.current_session_id: Optional[str] = None
+            # session_id -> subscriber queues; a None item ends the stream
+            self.subscribers: Dict[str, List[sync_queue.Queue]] = {}
+            self._publish_lock = threading.Lock()
             self._initialized = True
     
     def start_session(self, session_id: str):
@@ -53,11 +60,78 @@ class StepLogger:
             "created_at": time.time()  # For ordering and performance tracking
         }
         
-        session_steps.append(step)
-        self.sessions[self.current_session_id] = session_steps
+        with self._publish_lock:
+            session_steps.append(step)
+            self.sessions[self.current_session_id] = session_steps
+            self._publish(self.current_session_id, step)
         
         print(f"🔍 STEP LOGGED: {message}")  # For backend debugging
     
+    def _publish(self, session_id: str, item: Optional[Dict[str, Any]]):
+        """Push an item to every subscriber queue of a session."""
+        for queue in self.subscribers.get(session_id, []):
+            queue.put_nowait(item)
+    
+    def subscribe(self, session_id: str) -> sync_queue.Queue:
+        """
+        Subscribe to a session's steps with a thread-safe queue.
+        
+        Steps already logged are replayed first, so a subscriber that attaches
+        late sees the full sequence. ``end_stream`` puts None on the queue.
+        """
+        queue: sync_queue.Queue = sync_queue.Queue()
+        with self._publish_lock:
+            for step in self.sessions.get(session_id, []):
+                queue.put_nowait(step)
+            self.subscribers.setdefault(session_id, []).append(queue)
+        return queue
+    
+    def unsubscribe(self, session_id: str, queue: sync_queue.Queue):
+        with self._publish_lock:
+            remaining = [q for q in self.subscribers.get(session_id, []) if q is not queue]
+            if remaining:
+                self.subscribers[session_id] = remaining
+            else:
+                self.subscribers.pop(session_id, None)
+    
+    def end_stream(self, session_id: Optional[str] = None):
+        """Tell every subscriber of a session that no more steps will be logged."""
+        target_session = session_id or self.current_session_id
+        if target_session:
+            with self._publish_lock:
+                self._publish(target_session, None)
+    
+    def stream_blocking(self, session_id: str, min_interval: float = 0.0) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Blocking iterator over batches of new steps until ``end_stream`` is called,
+        for a UI thread while the agent runs on another thread (see AgentRuntime).
+        
+        The subscription is taken immediately, not on first iteration. Steps
+        that arrive within ``min_interval`` of the previous batch are coalesced
+        into the next one; the wait only delays the consumer, never the logger.
+        """
+        queue = self.subscribe(session_id)
+        return self._iterate_blocking(session_id, queue, min_interval)
+    
+    def _iterate_blocking(self, session_id: str, queue: sync_queue.Queue, min_interval: float):
+        try:
+            while True:
+                batch = [queue.get()]
+                while True:
+                    try:
+                        batch.append(queue.get_nowait())
+                    except sync_queue.Empty:
+                        break
+                steps = [step for step in batch if step is not None]
+                if steps:
+                    yield steps
+                if len(steps) < len(batch):
+                    return
+                if min_interval > 0:
+                    time.sleep(min_interval)
+        finally:
+            self.unsubscribe(session_id, queue)
+    
     def get_steps(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all steps for current or specified session."""
         target_session = session_id or self.current_session_id
@@ -99,6 +173,8 @@ class StepLogger:
         
         for session_id in sessions_to_remove:
             del self.sessions[session_id]
+            if session_id in self.subscribers:
+                self.end_stream(session_id)
     
     def log_routing_decision(self, user_input: str, decision: str, confidence: float = 0.0):
         """Log routing decision with classification details."""
@@ -0,0 +1,139 @@
+"""
+Incremental JSON extraction from streamed LLM output.
+
+StreamingJSONParser consumes completion chunks as they arrive, skips
+<think>...</think> sections and reports the first complete top-level JSON
+object, or array of objects. Stray arrays of scalars such as a "[1]" footnote
+are kept only as a fallback, so the object that follows still wins. LLMTool stops the generation as soon as it is found, so
+latency tracks the useful output rather than the model's trailing chatter.
+Scanning is a single linear pass; no backtracking regexes are involved.
+"""
+
+import json
+import re
+from typing import Any, Optional
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+# Models emit the tags in either case
+_THINK_OPEN_RE = re.compile(re.escape(THINK_OPEN), re.IGNORECASE)
+_THINK_CLOSE_RE = re.compile(re.escape(THINK_CLOSE), re.IGNORECASE)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_NOT_FOUND = object()
+
+
+class StreamingJSONParser:
+    """Feed chunks with ``feed``; ``done`` turns True once a JSON value has been parsed."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.value: Any = None
+        self.done = False
+        self.fallback: Any = None  # first array without objects, used if nothing better arrives
+        self._pos = 0            # next character of buffer to scan
+        self._in_think = False
+        self._start = -1         # buffer index of the current candidate's opening bracket
+        self._stack = []         # expected closing brackets of the candidate
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Consume one chunk; returns True when a complete JSON value is available."""
+        if self.done:
+            return True
+        self.buffer += chunk
+        self._scan()
+        return self.done
+
+    def _scan(self):
+        buffer = self.buffer
+        length = len(buffer)
+        pos = self._pos
+        while pos < length:
+            if self._in_think:
+                close = _THINK_CLOSE_RE.search(buffer, pos)
+                if close is None:
+                    # Keep a possible partial closing tag for the next chunk
+                    pos = max(pos, length - len(THINK_CLOSE) + 1)
+                    break
+                self._in_think = False
+                pos = close.end()
+                continue
+
+            char = buffer[pos]
+            if self._start < 0:
+                if char == "<":
+                    if _THINK_OPEN_RE.match(buffer, pos):
+                        self._in_think = True
+                        pos += len(THINK_OPEN)
+                        continue
+                    if THINK_OPEN.startswith(buffer[pos:].lower()):
+                        break  # partial "<think" at the end of the buffer
+                elif char == "{" or char == "[":
+                    self._start = pos
+                    self._stack = ["}" if char == "{" else "]"]
+                    self._in_string = False
+                    self._escaped = False
+                pos += 1
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._stack.append("}")
+            elif char == "[":
+                self._stack.append("]")
+            elif char == "}" or char == "]":
+                if char != self._stack[-1]:
+                    # Mismatched bracket: this was not JSON, rescan after its opening bracket
+                    pos = self._start + 1
+                    self._start = -1
+                    continue
+                self._stack.pop()
+                if not self._stack:
+                    value = self._decode(buffer[self._start:pos + 1])
+                    if value is not _NOT_FOUND and not self._is_answer(value):
+                        if self.fallback is None:
+                            self.fallback = value
+                        pos += 1
+                        self._start = -1
+                        continue
+                    if value is not _NOT_FOUND:
+                        self.value = value
+                        self.done = True
+                        self._pos = pos + 1
+                        return
+                    pos = self._start + 1
+                    self._start = -1
+                    continue
+            pos += 1
+        self._pos = pos
+
+    @staticmethod
+    def _is_answer(value: Any) -> bool:
+        return isinstance(value, dict) or any(isinstance(item, dict) for item in value)
+
+    @staticmethod
+    def _decode(candidate: str) -> Any:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            pass
+        try:
+            return json.loads(_TRAILING_COMMA_RE.sub(r"\1", candidate))
+        except json.JSONDecodeError:
+            return _NOT_FOUND
+
+
+def parse_first_json(text: str) -> Optional[Any]:
+    """Parse the first complete JSON object (or array of objects) in ``text`` outside <think> sections."""
+    parser = StreamingJSONParser()
+    parser.feed(text)
+    return parser.value if parser.done else parser.fallback
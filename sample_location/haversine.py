@@ -129,6 +129,13 @@ class HaversineCalculator:
                 {"label": "regional", "radius_km": 50, "max_results": 12}
             ]
         
+        # One scan at the largest radius; every tier is a prefix of the sorted result
+        max_radius = max(config["radius_km"] for config in radius_configs)
+        print(f"\n🔍 Finding locations for {len(radius_configs)} radius tiers (up to {max_radius}km)...")
+        all_nearby = self.find_nearby_locations(
+            locations_data, target_id, max_radius, len(locations_data)
+        )
+        
         results = {}
         
         for config in radius_configs:
@@ -136,17 +143,12 @@ class HaversineCalculator:
             radius_km = config["radius_km"]
             max_results = config.get("max_results", 5)
             
-            print(f"\n🔍 Finding {label} locations (within {radius_km}km)...")
-            
-            nearby = self.find_nearby_locations(
-                locations_data, target_id, radius_km, max_results
-            )
-            
+            nearby = [loc for loc in all_nearby if loc['distance_km'] <= radius_km][:max_results]
             results[label] = nearby
             
             if nearby:
                 distances = [loc['distance_km'] for loc in nearby]
-                print(f"📏 Distance range: {min(distances):.1f}km - {max(distances):.1f}km")
+                print(f"📏 {label} (≤{radius_km}km): {min(distances):.1f}km - {max(distances):.1f}km")
             else:
                 print(f"❌ No locations found within {radius_km}km")
         
@@ -8,6 +8,9 @@ import time
 
 from haversine import HaversineCalculator, load_locations_from_json
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from resdex_agent.utils.geo_distance import DistanceEngine
+
 
 class LocationExpansionMatrix:
     def __init__(self, coordinates_json_path: str, mapping_pickle_path: str):
@@ -19,6 +22,11 @@ class LocationExpansionMatrix:
         # Load data
         self.load_coordinates(coordinates_json_path)
         self.load_id_mapping(mapping_pickle_path)
+        self.distance_engine = DistanceEngine(
+            list(self.coordinates_data.keys()),
+            [coords[0] for coords in self.coordinates_data.values()],
+            [coords[1] for coords in self.coordinates_data.values()]
+        )
         
         print(f"🎯 LocationExpansionMatrix initialized with:")
         print(f"   📍 {len(self.coordinates_data):,} coordinate entries")
@@ -170,28 +178,54 @@ class LocationExpansionMatrix:
         batch_results = {}
         start_time = time.time()
         
-        for i, identifier in enumerate(location_identifiers, 1):
-            print(f"\n📍 [{i}/{len(location_identifiers)}] Processing: {identifier}")
-            
-            # Try as ID first, then as name
+        # Resolve every identifier first (ID, then name), then compute all distances in one pass
+        resolved_ids = {}
+        for identifier in location_identifiers:
             if identifier in self.coordinates_data:
-                result = self.expand_location_by_id(identifier, radius_km, max_results)
+                resolved_ids[identifier] = identifier
             else:
-                result = self.expand_location_by_name(identifier, radius_km, max_results)
+                location_id = self.find_location_id_by_name(identifier)
+                if location_id and location_id in self.coordinates_data:
+                    resolved_ids[identifier] = location_id
+                else:
+                    batch_results[identifier] = self.expand_location_by_name(identifier, radius_km, max_results)
+        
+        nearby_by_id = self.distance_engine.batch_nearby(list(resolved_ids.values()), radius_km, max_results)
+        
+        for i, identifier in enumerate(location_identifiers, 1):
+            if identifier not in resolved_ids:
+                print(f"❌ [{i}/{len(location_identifiers)}] {identifier}: {batch_results[identifier]['error']}")
+                continue
             
-            batch_results[identifier] = result
+            location_id = resolved_ids[identifier]
+            nearby_locations = [{
+                "location_id": location["location_id"],
+                "location_name": self.get_location_name(location["location_id"]),
+                "coordinates": location["coordinates"],
+                "distance_km": location["distance_km"]
+            } for location in nearby_by_id.get(location_id, [])]
             
-            if result["success"]:
-                nearby_count = result["total_found"]
-                base_name = result["base_location"]["name"]
-                print(f"✅ {base_name}: Found {nearby_count} nearby locations")
-            else:
-                print(f"❌ Failed: {result['error']}")
+            batch_results[identifier] = {
+                "success": True,
+                "base_location": {
+                    "id": location_id,
+                    "name": self.get_location_name(location_id),
+                    "coordinates": self.coordinates_data[location_id]
+                },
+                "search_params": {
+                    "radius_km": radius_km,
+                    "max_results": max_results
+                },
+                "nearby_locations": nearby_locations,
+                "total_found": len(nearby_locations)
+            }
+            print(f"✅ [{i}/{len(location_identifiers)}] {self.get_location_name(location_id)}: "
+                  f"Found {len(nearby_locations)} nearby locations")
         
         total_time = time.time() - start_time
         print(f"\n⚡ Batch processing completed in {total_time:.2f} seconds")
         
-        return batch_results
+        return {identifier: batch_results[identifier] for identifier in location_identifiers}
     
     def get_location_statistics(self) -> Dict[str, any]:
         """Get statistics about the location dataset."""
@@ -0,0 +1,38 @@
+"""Shared test helpers."""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+TOOLS_DIR = Path(__file__).resolve().parent.parent / "resdex_agent" / "tools"
+
+
+@pytest.fixture(scope="session")
+def load_tool():
+    """
+    Import one resdex_agent.tools module by file.
+
+    The package __init__ imports every tool, including company_tools which
+    is not part of this tree, so the module is executed under a bare package
+    entry that is removed again once its relative imports have resolved.
+    """
+    def load(module_name):
+        package = "resdex_agent.tools"
+        saved = sys.modules.get(package)
+        stub = types.ModuleType(package)
+        stub.__path__ = [str(TOOLS_DIR)]
+        sys.modules[package] = stub
+        try:
+            spec = importlib.util.spec_from_file_location(f"{package}.{module_name}", TOOLS_DIR / f"{module_name}.py")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        finally:
+            if saved is None:
+                sys.modules.pop(package, None)
+            else:
+                sys.modules[package] = saved
+        return module
+    return load
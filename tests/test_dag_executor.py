@@ -0,0 +1,96 @@
+"""Tests for the async pipeline DAG: dependency order, concurrency, deadline and optional stages."""
+
+import asyncio
+
+import pytest
+
+from resdex_agent.utils.dag_executor import DAGExecutor, PipelineStage
+
+
+def stage(name, log, value=None, delay=0.0, error=None, **kwargs):
+    async def func(deps):
+        log.append(("start", name, dict(deps)))
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        log.append(("end", name))
+        return value if value is not None else name
+    return PipelineStage(name=name, func=func, **kwargs)
+
+
+def run(stages, deadline=None):
+    return asyncio.run(DAGExecutor(stages, deadline=deadline).run())
+
+
+def test_dependencies_run_first_and_receive_results():
+    log = []
+    result = run([
+        stage("details", log, value=["d"], delay=0.02, depends_on=["search"]),
+        stage("names", log, value={"n": 1}, delay=0.02, depends_on=["search"]),
+        stage("search", log, value=[1, 2], delay=0.01),
+        stage("merge", log, depends_on=["details", "names"]),
+    ])
+
+    assert result["results"] == {"search": [1, 2], "details": ["d"], "names": {"n": 1}, "merge": "merge"}
+    assert result["errors"] == {} and result["degraded"] == []
+    starts = [entry[1] for entry in log if entry[0] == "start"]
+    assert starts[0] == "search" and starts[-1] == "merge"
+    # details and names fan out: both start before either finishes
+    assert log.index(("end", "details")) > log.index(("start", "names", {"search": [1, 2]}))
+    assert ("start", "merge", {"details": ["d"], "names": {"n": 1}}) in log
+    assert set(result["timings"]) == {"search", "details", "names", "merge", "total"}
+
+
+def test_optional_stage_failure_degrades_to_default():
+    log = []
+    result = run([
+        stage("search", log),
+        stage("names", log, error=RuntimeError("db down"), depends_on=["search"], required=False, default={}),
+        stage("merge", log, depends_on=["names"]),
+    ])
+
+    assert result["results"]["names"] == {}
+    assert result["results"]["merge"] == "merge"
+    assert result["errors"] == {"names": "db down"}
+    assert result["degraded"] == ["names"]
+
+
+def test_required_failure_fails_its_dependents_only():
+    log = []
+    result = run([
+        stage("search", log, error=RuntimeError("503")),
+        stage("details", log, depends_on=["search"]),
+        stage("facets", log),
+    ])
+
+    assert result["errors"] == {"search": "503", "details": "dependency 'search' failed"}
+    assert result["results"] == {"facets": "facets"}
+    assert ("start", "details", {}) not in log
+
+
+def test_deadline_bounds_every_stage():
+    log = []
+    result = run([
+        stage("search", log, delay=0.01),
+        stage("names", log, delay=1.0, depends_on=["search"], required=False, default={}),
+        stage("details", log, delay=1.0, depends_on=["search"]),
+    ], deadline=0.1)
+
+    assert result["timings"]["total"] < 0.5
+    assert result["results"] == {"search": "search", "names": {}}
+    assert result["errors"]["names"].startswith("timed out")
+    assert result["errors"]["details"].startswith("timed out")
+
+
+def test_stage_timeout():
+    log = []
+    result = run([stage("slow", log, delay=1.0, timeout=0.05, required=False, default="fallback")])
+    assert result["results"] == {"slow": "fallback"}
+    assert result["degraded"] == ["slow"]
+
+
+def test_invalid_graphs_are_rejected():
+    with pytest.raises(ValueError, match="unknown stage"):
+        DAGExecutor([stage("a", [], depends_on=["b"])])
+    with pytest.raises(ValueError, match="Cycle"):
+        run([stage("a", [], depends_on=["b"]), stage("b", [], depends_on=["a"])])
@@ -0,0 +1,20 @@
+"""Tests for DataProcessor normalization helpers."""
+
+import pytest
+
+from resdex_agent.utils import location_resolver
+from resdex_agent.utils.data_processing import DataProcessor
+
+
+@pytest.mark.parametrize("raw, expected", [("bombay", "Mumbai"), ("gurugram", "Gurgaon"), ("pune", "Pune")])
+def test_normalize_location_uses_resolver_spellings(raw, expected):
+    assert DataProcessor.normalize_location(raw) == expected
+
+
+def test_normalize_location_without_resolver(monkeypatch):
+    def unavailable():
+        raise OSError("location bundle unreadable")
+
+    monkeypatch.setattr(location_resolver, "get_location_resolver", unavailable)
+    assert DataProcessor.normalize_location("mumbai") == "Mumbai"
+    assert DataProcessor.normalize_location("some town") == "Some Town"
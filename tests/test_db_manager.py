@@ -0,0 +1,96 @@
+"""Tests for real-name lookups: chunked queries and the name cache, including negative entries."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from resdex_agent.utils.cache import TTLCache
+from resdex_agent.utils.db_manager import DatabaseManager
+
+
+class CountingEngine:
+    """Wraps an engine, counting queried ids and failing chunks that contain a poisoned id."""
+
+    def __init__(self, engine, poisoned=()):
+        self.engine = engine
+        self.poisoned = set(poisoned)
+        self.queried = []
+
+    def connect(self):
+        return CountingConnection(self, self.engine.connect())
+
+
+class CountingConnection:
+    def __init__(self, owner, conn):
+        self.owner = owner
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.close()
+
+    def execute(self, query, params):
+        self.owner.queried.append(list(params["user_ids"]))
+        if self.owner.poisoned & set(params["user_ids"]):
+            raise RuntimeError("lost connection")
+        return self.conn.execute(query, params)
+
+
+@pytest.fixture
+def engine():
+    sqlite = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    with sqlite.begin() as conn:
+        conn.execute(text("CREATE TABLE UserDetails (userid INTEGER, name TEXT)"))
+        conn.execute(text("INSERT INTO UserDetails VALUES (1, 'Asha'), (2, ' Ravi '), (3, NULL), (4, 'null')"))
+    return CountingEngine(sqlite)
+
+
+@pytest.fixture
+def manager(engine):
+    manager = DatabaseManager()
+    manager._engine = engine
+    manager.name_chunk_size = 2
+    manager.name_cache = TTLCache(maxsize=100, ttl=60)
+    return manager
+
+
+def test_names_are_fetched_in_chunks(manager, engine):
+    names = asyncio.run(manager.get_real_names(["1", "2", "3", "4", "5"]))
+    assert names == {1: "Asha", 2: "Ravi"}
+    assert engine.queried == [[1, 2], [3, 4], [5]]
+
+
+def test_ids_without_a_name_are_negative_cached(manager, engine):
+    asyncio.run(manager.get_real_names(["1", "3", "5"]))
+    engine.queried.clear()
+
+    assert asyncio.run(manager.get_real_names(["1", "3", "5", "2"])) == {1: "Asha", 2: "Ravi"}
+    assert engine.queried == [[2]]
+    assert manager.name_cache.get(3) == "" and manager.name_cache.get(5) == ""
+
+
+def test_failed_chunks_are_not_cached(manager, engine):
+    engine.poisoned = {3}
+    assert asyncio.run(manager.get_real_names([1, 2, 3, 4])) == {1: "Asha", 2: "Ravi"}
+    assert 3 not in manager.name_cache and 4 not in manager.name_cache
+
+    engine.poisoned = set()
+    engine.queried.clear()
+    assert asyncio.run(manager.get_real_names([1, 2, 3, 4])) == {1: "Asha", 2: "Ravi"}
+    assert engine.queried == [[3, 4]]
+
+
+def test_no_engine_caches_nothing(manager):
+    manager._engine = None
+    manager.get_connection = lambda: None
+    assert asyncio.run(manager.get_real_names(["1"])) == {}
+    assert len(manager.name_cache) == 0
+
+
+def test_empty_input(manager, engine):
+    assert asyncio.run(manager.get_real_names([])) == {}
+    assert engine.queried == []
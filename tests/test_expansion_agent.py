@@ -0,0 +1,55 @@
+"""Tests for concurrent multi-expansion: isolation of timed-out expansions and merge order."""
+
+import asyncio
+from types import SimpleNamespace
+
+from resdex_agent.base_agent import Content
+from resdex_agent.sub_agents.expansion.agent import ExpansionAgent
+
+
+def make_agent(timeout=0.05):
+    agent = ExpansionAgent.__new__(ExpansionAgent)
+    agent._config = SimpleNamespace(sub_expansion_timeout=timeout)
+    return agent
+
+
+def expansion(key, values, delay=0.0, success=True):
+    async def handle(user_input, session_state, memory_context, session_id, user_id):
+        for value in values:
+            session_state.setdefault(key, []).append(value)
+            await asyncio.sleep(delay)
+        return Content(data={"success": success, "method": "test", "message": f"added {values}",
+                             "modifications": [{"type": key, "value": value} for value in values]})
+    return handle
+
+
+def test_timed_out_expansion_leaves_no_partial_changes():
+    agent = make_agent(timeout=0.05)
+    agent._handle_matrix_skill_expansion = expansion("keywords", ["Django", "Flask"])
+    agent._handle_location_expansion = expansion("current_cities", ["Mumbai", "Nashik", "Thane"], delay=0.04)
+    session_state = {"keywords": ["Python"], "current_cities": ["Pune"]}
+
+    result = asyncio.run(agent._handle_multi_expansion("similar skills and nearby cities", session_state, [], "s", "u"))
+
+    assert session_state == {"keywords": ["Python", "Django", "Flask"], "current_cities": ["Pune"]}
+    assert [m["value"] for m in result.data["modifications"]] == ["Django", "Flask"]
+    assert "Locations: timed out" in result.data["message"]
+
+
+def test_failed_expansion_is_not_merged():
+    agent = make_agent()
+    agent._handle_matrix_skill_expansion = expansion("keywords", ["Django"], success=False)
+    session_state = {"keywords": ["Python"]}
+    asyncio.run(agent._handle_multi_expansion("similar skills", session_state, [], "s", "u"))
+    assert session_state == {"keywords": ["Python"]}
+
+
+def test_expansions_writing_the_same_list_are_merged_in_order():
+    agent = make_agent(timeout=1.0)
+    agent._handle_matrix_skill_expansion = expansion("keywords", ["Django"], delay=0.02)
+    agent._handle_matrix_title_expansion = expansion("keywords", ["Backend Developer", "Django"])
+    session_state = {"keywords": ["Python"]}
+
+    asyncio.run(agent._handle_multi_expansion("similar skills and titles", session_state, [], "s", "u"))
+
+    assert session_state["keywords"] == ["Python", "Django", "Backend Developer"]
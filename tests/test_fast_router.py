@@ -0,0 +1,111 @@
+"""Tests for the deterministic fast-path router."""
+
+import pytest
+
+from resdex_agent.utils.fast_router import FastPathRouter
+
+
+@pytest.fixture
+def router():
+    return FastPathRouter(min_confidence=0.8, enabled=True)
+
+
+def route(router, text, session_state=None):
+    return router.route(text, session_state or {})
+
+
+@pytest.mark.parametrize("text, expected_route", [
+    ("show facets", "facet_generation"),
+    ("generate categories", "facet_generation"),
+    ("relax the search", "query_relaxation"),
+    ("get more candidates", "query_relaxation"),
+    ("similar skills to react", "skill_expansion"),
+    ("experience 5-10 years", "modify_experience"),
+    ("salary 10 to 20 lpa", "modify_salary"),
+    ("add pune", "add_location"),
+    ("add python", "add_skill"),
+    ("remove java", "remove_skill"),
+])
+def test_each_route(router, text, expected_route):
+    result = route(router, text)
+    assert result is not None
+    assert result["route"] == expected_route
+    assert result["intent_breakdown"]["intents"][0]["execution_order"] == 1
+
+
+def test_filter_intents(router):
+    intent = route(router, "add python and java as mandatory")["filter_intent"]
+    assert [(i["action"], i["value"], i["mandatory"]) for i in intent] == [
+        ("add_skill", "Python", True), ("add_skill", "Java", True)
+    ]
+
+    intent = route(router, "experience 5-10 years")["filter_intent"]
+    assert (intent["operation"], intent["value"]) == ("set_range", "5-10")
+
+    intent = route(router, "experience 3 years")["filter_intent"]
+    assert (intent["operation"], intent["value"]) == ("set", "3")
+
+
+def test_one_sided_ranges_use_the_current_filters(router):
+    intent = route(router, "max experience 8", {"min_exp": 2})["filter_intent"]
+    assert intent["value"] == "2-8"
+    intent = route(router, "set min salary 10")["filter_intent"]
+    assert intent["value"] == "10-15"
+
+
+@pytest.mark.parametrize("text, session_state", [
+    ("max experience 2", {"min_exp": 5}),
+    ("set min salary 20", {}),
+    ("experience 10-5 years", {}),
+])
+def test_inverted_ranges_fall_through(router, text, session_state):
+    assert route(router, text, session_state) is None
+
+
+@pytest.mark.parametrize("text", [
+    "add remote", "add senior", "add freshers", "add immediate joiners", "add notice period"
+])
+def test_unknown_skills_fall_through(router, text):
+    assert route(router, text) is None
+    assert router.stats["low_confidence"] == 1
+
+
+def test_removing_a_current_keyword_is_known(router):
+    result = route(router, "remove foo bar", {"keywords": ["★ Foo Bar"]})
+    assert result["filter_intent"]["value"] == "Foo Bar"
+    assert route(router, "remove foo bar") is None
+
+
+def test_cities_and_skills_are_split(router):
+    assert route(router, "add mumbai")["route"] == "add_location"
+    assert route(router, "add mumbai and pune")["route"] == "add_location"
+    # A mixed list is neither a pure location nor a pure skill command
+    assert route(router, "add python and mumbai") is None
+    assert route(router, "remove mumbai") is None
+
+
+@pytest.mark.parametrize("text, names", [
+    ("add aws", ["AWS"]),
+    ("add sql server", ["SQL Server"]),
+    ("add ai and nlp", ["AI", "NLP"]),
+    ("add node.js", ["Node.js"]),
+    ("similar skills to reactjs", ["reactjs"]),
+    ("add delhi ncr", ["Delhi/NCR"]),
+    ("add bombay", ["Mumbai"]),
+])
+def test_canonical_spelling(router, text, names):
+    assert route(router, text)["intent_breakdown"]["intents"][0]["raw_entities"] == names
+
+
+def test_prose_and_disabled_router(router):
+    assert route(router, "add candidates who know python") is None
+    assert route(router, "what is the weather today") is None
+    assert FastPathRouter(enabled=False).route("add python") is None
+
+
+def test_stats(router):
+    route(router, "add python")
+    route(router, "hello there")
+    stats = router.get_stats()
+    assert stats["total"] == 2 and stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["route_hit_rates"] == {"add_skill": 0.5}
@@ -0,0 +1,308 @@
+"""Tests for the affinity-matrix loaders in tools/FeatureMatrixLoader.py."""
+
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import sparse
+
+
+@pytest.fixture(scope="module")
+def fml(load_tool):
+    return load_tool("FeatureMatrixLoader")
+
+
+def random_matrix(n_rows=40, n_cols=30, density=0.3, seed=7):
+    rng = np.random.default_rng(seed)
+    matrix = sparse.random(n_rows, n_cols, density=density, format="csr", random_state=rng, dtype=np.float64)
+    # Repeated scores exercise tie-breaking
+    matrix.data = np.round(matrix.data * 10) / 10 + 0.1
+    return matrix
+
+
+@pytest.fixture
+def matrix_dir(tmp_path):
+    """A legacy pickle + npz matrix directory with integer row ids and string column names."""
+    matrix = random_matrix()
+    row_vocab = [int(i) * 3 + 100 for i in range(matrix.shape[0])]
+    col_vocab = [f"col{i}" for i in range(matrix.shape[1])]
+    for name, obj in [("row_vocab", row_vocab), ("col_vocab", col_vocab),
+                      ("row_vocab_dict", {v: i for i, v in enumerate(row_vocab)})]:
+        with open(tmp_path / f"{name}.pkl", "wb") as f:
+            pickle.dump(obj, f)
+    sparse.save_npz(tmp_path / "matrix.npz", matrix)
+    return str(tmp_path)
+
+
+def is_file_backed(array):
+    # scipy wraps the mapped arrays in plain ndarray views; the memmap sits further down .base
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base
+    return False
+
+
+def load_2d(fml, path, **kwargs):
+    return fml.Feature2dMatrix(None, None, None, file_path=path, use_topk=False, **kwargs)
+
+
+def test_mmap_round_trip(fml, matrix_dir):
+    legacy = load_2d(fml, matrix_dir)
+    fml.convert_to_mmap(matrix_dir)
+    mapped = load_2d(fml, matrix_dir)
+
+    assert all(is_file_backed(getattr(mapped.matrix, name)) for name in ("data", "indices", "indptr"))
+    assert not is_file_backed(legacy.matrix.data)
+    assert (mapped.matrix != legacy.matrix.astype(np.float32)).nnz == 0
+    assert mapped.row_vocab_dict.get(103) == legacy.row_vocab_dict[103]
+    assert mapped.row_vocab_dict.get(101) is None and 100 in mapped.row_vocab_dict
+
+    for values in ([100], [103, 160, 999], [190, 100]):
+        expected = legacy.get_feature_value(values, topN=5)
+        actual = mapped.get_feature_value(values, topN=5)
+        assert list(actual) == list(expected)
+        assert np.allclose(list(actual.values()), list(expected.values()), atol=1e-6)
+
+
+def test_checksum_mismatch_is_rejected(fml, matrix_dir):
+    mmap_dir = fml.convert_to_mmap(matrix_dir)
+    data = np.load(os.path.join(mmap_dir, "data.npy"))
+    data[0] += 1.0
+    np.save(os.path.join(mmap_dir, "data.npy"), data)
+
+    with pytest.raises(fml.MatrixChecksumError, match="checksum mismatch"):
+        load_2d(fml, matrix_dir)
+    fml.load_arrays(mmap_dir, fml.MMAP_ARRAYS, verify=False)
+
+
+def test_unchanged_files_are_not_rehashed(fml, matrix_dir, monkeypatch):
+    mmap_dir = fml.convert_to_mmap(matrix_dir)
+    hashed = []
+    checksum = fml.file_checksum
+    monkeypatch.setattr(fml, "file_checksum", lambda path: hashed.append(os.path.basename(path)) or checksum(path))
+
+    load_2d(fml, matrix_dir)
+    assert hashed == []
+
+    # A copy that resets mtimes is hashed once, then the refreshed manifest is trusted again
+    indptr_path = os.path.join(mmap_dir, "indptr.npy")
+    os.utime(indptr_path, ns=(0, 0))
+    load_2d(fml, matrix_dir)
+    assert hashed == ["indptr.npy"]
+    load_2d(fml, matrix_dir)
+    assert hashed == ["indptr.npy"]
+
+
+def test_unsupported_version_is_rejected(fml, matrix_dir):
+    mmap_dir = fml.convert_to_mmap(matrix_dir)
+    manifest, _ = fml.load_arrays(mmap_dir, [])
+    fml.write_manifest(mmap_dir, dict(manifest, version=fml.MMAP_FORMAT_VERSION + 1))
+    with pytest.raises(fml.MatrixChecksumError, match="version"):
+        load_2d(fml, matrix_dir)
+
+
+def per_item_feature_value(feature, values, topN=None, normalize=True):
+    """The per-query loop get_feature_values_batch replaced."""
+    indices = [feature.row_vocab_dict.get(s) for s in values if feature.row_vocab_dict.get(s) is not None]
+    if not indices:
+        return {}
+    scores = np.array(feature.matrix[indices].mean(axis=0))[0]
+    x = np.argsort(scores)[::-1][:topN]
+    values = scores[x]
+    if normalize:
+        values = values / values.sum()
+    return dict(zip(np.array(feature.col_vocab)[x].tolist(), values.tolist()))
+
+
+@pytest.fixture
+def dense_2d(fml, tmp_path):
+    # Fully dense with continuous scores, so no two columns tie and both orderings agree
+    matrix = random_matrix(n_rows=25, n_cols=40, density=1.0, seed=3)
+    matrix.data = np.random.default_rng(3).random(matrix.nnz) + 0.01
+    feature = fml.Feature2dMatrix.__new__(fml.Feature2dMatrix)
+    feature.topk = None
+    feature.matrix = matrix
+    feature.row_vocab = list(range(500, 525))
+    feature.col_vocab = [f"col{i}" for i in range(40)]
+    feature.row_vocab_dict = {v: i for i, v in enumerate(feature.row_vocab)}
+    return feature
+
+
+@pytest.mark.parametrize("topN", [None, 1, 7, 40, 100])
+def test_top_n_2d_matches_full_sort(fml, topN):
+    scores = np.random.default_rng(11).random((6, 40))
+    top, top_scores = fml.Feature2dMatrix.top_n_2d(scores, topN)
+    expected = np.argsort(-scores, axis=1)[:, :topN]
+    np.testing.assert_array_equal(top, expected)
+    np.testing.assert_array_equal(top_scores, np.take_along_axis(scores, expected, axis=1))
+
+
+def test_top_n_2d_breaks_ties_by_column(fml):
+    scores = np.array([[0.5, 0.9, 0.5, 0.9, 0.1]])
+    assert fml.Feature2dMatrix.top_n_2d(scores, 3)[0].tolist() == [[1, 3, 0]]
+    assert fml.Feature2dMatrix.top_n_2d(scores, None)[0].tolist() == [[1, 3, 0, 2, 4]]
+
+
+@pytest.mark.parametrize("topN, normalize", [(15, True), (15, False), (None, True), (3, True)])
+def test_batch_matches_per_item_loop(dense_2d, topN, normalize):
+    queries = [[500], [501, 510, 524], [999], [], [503, 503, 507], [524, 999]]
+    batch = dense_2d.get_feature_values_batch(queries, topN=topN, normalize=normalize)
+    assert len(batch) == len(queries)
+    for values, result in zip(queries, batch):
+        expected = per_item_feature_value(dense_2d, values, topN=topN, normalize=normalize)
+        assert list(result) == list(expected)
+        np.testing.assert_allclose(list(result.values()), list(expected.values()), rtol=1e-12)
+    assert dense_2d.get_feature_value([501, 510, 524], topN=topN, normalize=normalize) == batch[1]
+
+
+def test_batch_hit_mask(dense_2d):
+    top, top_scores, has_hits = dense_2d.get_topn_batch([[500], [999], [501, 999]], topN=4)
+    assert has_hits.tolist() == [True, False, True]
+    assert top.shape == top_scores.shape == (3, 4)
+    np.testing.assert_allclose(top_scores[[0, 2]].sum(axis=1), 1.0)
+    assert not top_scores[1].any()
+    assert dense_2d.get_feature_values_batch([]) == []
+
+
+def full_sort_topk(matrix, k):
+    """Reference: each row's nonzero columns sorted by score desc, then column asc."""
+    dense = matrix.toarray()
+    expected = []
+    for row in dense:
+        cols = np.flatnonzero(row)
+        cols = cols[np.lexsort((cols, -row[cols]))][:k]
+        expected.append((cols.tolist(), row[cols].tolist()))
+    return expected
+
+
+@pytest.mark.parametrize("k", [1, 5, 30])
+def test_topk_per_row_matches_full_sort(fml, k):
+    matrix = random_matrix()
+    ids, scores = fml.topk_per_row(matrix, k)
+    assert ids.shape == scores.shape == (matrix.shape[0], k)
+    for row, (cols, values) in enumerate(full_sort_topk(matrix, k)):
+        valid = ids[row] >= 0
+        assert ids[row][valid].tolist() == cols
+        np.testing.assert_allclose(scores[row][valid], values, rtol=1e-6)
+        assert not scores[row][~valid].any()
+
+
+def test_single_item_queries_match_the_full_matrix(fml, dense_2d):
+    ids, scores = fml.topk_per_row(dense_2d.matrix, 10)
+    index = fml.TopKNeighborIndex(ids, scores, np.asarray(dense_2d.col_vocab), dense_2d.row_vocab_dict)
+    for item in dense_2d.row_vocab:
+        for topN in (1, 5, 10):
+            expected = dense_2d.get_feature_value([item], topN=topN)
+            actual = index.query([item], topN=topN)
+            assert list(actual) == list(expected)
+            np.testing.assert_allclose(list(actual.values()), list(expected.values()), rtol=1e-5)
+    assert index.query([999]) == {}
+
+
+def test_multi_item_queries(fml, dense_2d):
+    # With every column kept the heap merge is exactly the full row mean
+    ids, scores = fml.topk_per_row(dense_2d.matrix, 40)
+    full_index = fml.TopKNeighborIndex(ids, scores, np.asarray(dense_2d.col_vocab), dense_2d.row_vocab_dict)
+    values = [501, 510, 524, 999]
+    expected = dense_2d.get_feature_value(values, topN=8, normalize=False)
+    actual = full_index.query(values, topN=8, normalize=False)
+    assert list(actual) == list(expected)
+    np.testing.assert_allclose(list(actual.values()), list(expected.values()), rtol=1e-5)
+
+    # A truncated index scores each column no higher than the full mean
+    ids, scores = fml.topk_per_row(dense_2d.matrix, 5)
+    index = fml.TopKNeighborIndex(ids, scores, np.asarray(dense_2d.col_vocab), dense_2d.row_vocab_dict)
+    full = dense_2d.get_feature_value(values, normalize=False)
+    for column, score in index.query(values, topN=5, normalize=False).items():
+        assert score <= full[column] + 1e-6
+
+
+def test_topk_index_is_used_by_feature2d(fml, matrix_dir, monkeypatch):
+    fml.build_topk_index(matrix_dir, k=5)
+    assert set(os.listdir(os.path.join(matrix_dir, fml.TOPK_DIR))) >= {f"{name}.npy" for name in fml.TOPK_ARRAYS}
+
+    plain = load_2d(fml, matrix_dir)
+    indexed = fml.Feature2dMatrix(None, None, None, file_path=matrix_dir)
+    assert indexed.topk is not None and indexed.topk.k == 5
+    assert indexed.get_feature_value([103], topN=3) == indexed.topk.query([103], topN=3)
+    expected = plain.get_feature_value([103], topN=3)
+    assert np.allclose(list(indexed.get_feature_value([103], topN=3).values()), list(expected.values()), atol=1e-6)
+    # Deeper than k falls back to the sparse matrix
+    assert indexed.get_feature_value([103], topN=8) == plain.get_feature_value([103], topN=8)
+
+    monkeypatch.setenv("MATRIX_TOPK_ONLY", "1")
+    topk_only = fml.Feature2dMatrix(None, None, None, file_path=matrix_dir)
+    assert topk_only.matrix is None
+    assert topk_only.get_feature_value([103], topN=8) == topk_only.topk.query([103], topN=8)
+    assert topk_only.get_size() == topk_only.topk.get_size()
+
+
+@pytest.fixture(scope="module")
+def affinity_3d():
+    """skill -> segment -> role rows; low-count (segment, skill) pairs fall under the threshold."""
+    rng = np.random.default_rng(5)
+    rows = [(skill, segment, role, rng.random(), int(rng.integers(1, 8)))
+            for skill in range(12) for segment in (10, 20, 30, 40) for role in range(15)
+            if rng.random() < 0.6]
+    return pd.DataFrame(rows, columns=["skill", "segment", "role", "score", "count"])
+
+
+def build_3d(fml, df, thres=20):
+    feature = fml.Feature3dMatrix.__new__(fml.Feature3dMatrix)
+    feature.build(df, "skill", "segment", "role", "score", thres)
+    return feature
+
+
+def per_segment_feature_value(fml, df, values, col2_scores, topN=None, normalize=True, thres=20):
+    """The one-Feature2dMatrix-per-segment loop the stacked matrix replaced."""
+    col2List = df["segment"].unique().tolist()
+    col3List = df["role"].unique().tolist()
+    output, segments = [], []
+    for segment in col2List:
+        matrix = fml.Feature2dMatrix("skill", "role", "score", df=df[df["segment"] == segment].copy(),
+                                     thres=thres, create_now=1)
+        m_out = per_item_feature_value(matrix, values)
+        if m_out:
+            output.append([m_out.get(s) or 0 for s in col3List])
+            segments.append(segment)
+    if not output:
+        return {}
+    multiplier = np.array([col2_scores.get(s) or 0 for s in segments])[:, None]
+    output = list(zip(col3List, np.around((np.array(output) * multiplier).sum(axis=0), 3)))
+    output.sort(key=lambda x: -1 * x[1])
+    if topN:
+        output = output[0:topN]
+    output = dict(output)
+    if normalize:
+        total_sum = sum(output.values())
+        output = {k: round(v / total_sum, 4) for k, v in output.items()}
+    return output
+
+
+@pytest.mark.parametrize("values", [[3], [0, 5, 11], [2, 2, 7], [99], [4, 99]])
+@pytest.mark.parametrize("topN, normalize", [(None, True), (5, True), (5, False)])
+def test_stacked_3d_matches_per_segment_product(fml, affinity_3d, values, topN, normalize):
+    col2_scores = {10: 0.5, 20: 0.1, 40: 0.4, 99: 0.3}
+    stacked = build_3d(fml, affinity_3d)
+    expected = per_segment_feature_value(fml, affinity_3d, values, col2_scores, topN=topN, normalize=normalize)
+    actual = stacked.get_feature_value(values, col2_scores, topN=topN, normalize=normalize)
+    assert list(actual) == list(expected)
+    assert {k: pytest.approx(v, abs=1e-3) for k, v in expected.items()} == actual
+
+
+def test_stacked_3d_save_and_load(fml, affinity_3d, tmp_path):
+    built = build_3d(fml, affinity_3d)
+    parquet_path = str(tmp_path / "skill_to_segment_to_role")
+    built.save(parquet_path + fml.STACKED_3D_SUFFIX)
+
+    # The parquet itself is never read once the stacked layout exists
+    loaded = fml.Feature3dMatrix("skill", "segment", "role", "score", file_path=parquet_path)
+    assert loaded.col2List == built.col2List and loaded.col3List == built.col3List
+    assert (loaded.matrix != built.matrix).nnz == 0
+    assert loaded.get_size() == built.get_size()
+    col2_scores = {10: 0.2, 30: 0.8}
+    assert loaded.get_feature_value([1, 6], col2_scores, topN=4) == built.get_feature_value([1, 6], col2_scores, topN=4)
+    assert loaded.get_feature_value([99], col2_scores) == {}
@@ -0,0 +1,85 @@
+"""GeoIndex radius, nearest and tier queries checked against a brute-force haversine scan."""
+
+import math
+
+import numpy as np
+import pytest
+
+from resdex_agent.utils.geo_index import DEFAULT_RADIUS_TIERS, GeoIndex
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(7)
+    # A dense cluster around Pune plus scattered points across India
+    lat = np.concatenate([18.52 + rng.normal(0, 0.2, 300), rng.uniform(8, 34, 700)])
+    lng = np.concatenate([73.85 + rng.normal(0, 0.2, 300), rng.uniform(68, 92, 700)])
+    return [str(i) for i in range(len(lat))], lat, lng
+
+
+@pytest.fixture(scope="module")
+def index(points):
+    return GeoIndex(*points)
+
+
+def brute_force(points, lat, lng, radius_km, exclude=None):
+    ids, lats, lngs = points
+    found = [(haversine(lat, lng, la, ln), location_id) for location_id, la, ln in zip(ids, lats, lngs)
+             if location_id != exclude]
+    return sorted((d, location_id) for d, location_id in found if d <= radius_km)
+
+
+@pytest.mark.parametrize("radius_km", [1, 5, 15, 30, 50, 200])
+def test_query_radius_matches_brute_force(index, points, radius_km):
+    expected = brute_force(points, 18.52, 73.85, radius_km)
+    result = index.query_radius(18.52, 73.85, radius_km)
+    assert [r["location_id"] for r in result] == [location_id for _, location_id in expected]
+    for r, (distance, _) in zip(result, expected):
+        assert r["distance_km"] == pytest.approx(distance, abs=0.01)
+
+
+def test_query_radius_respects_exclude_and_max_results(index, points):
+    expected = brute_force(points, float(points[1][0]), float(points[2][0]), 20, exclude="0")
+    result = index.nearby("0", 20, max_results=5)
+    assert [r["location_id"] for r in result] == [location_id for _, location_id in expected][:5]
+    assert all(r["location_id"] != "0" for r in result)
+
+
+def test_query_nearest_matches_brute_force(index, points):
+    expected = brute_force(points, 22.0, 80.0, float("inf"))[:10]
+    result = index.query_nearest(22.0, 80.0, 10)
+    assert [r["location_id"] for r in result] == [location_id for _, location_id in expected]
+
+
+def test_radius_tiers_match_brute_force(index, points):
+    tiers = index.query_radius_tiers(18.52, 73.85)
+    for tier in DEFAULT_RADIUS_TIERS:
+        expected = brute_force(points, 18.52, 73.85, tier["radius_km"])[:tier["max_results"]]
+        assert [r["location_id"] for r in tiers[tier["label"]]] == [location_id for _, location_id in expected]
+
+
+def test_distances_to(index, points):
+    ids, lats, lngs = points
+    distances = index.distances_to("0", ["1", "500"])
+    assert distances[0] == pytest.approx(haversine(lats[0], lngs[0], lats[1], lngs[1]), abs=1e-6)
+    assert distances[1] == pytest.approx(haversine(lats[0], lngs[0], lats[500], lngs[500]), abs=1e-6)
+
+
+def test_from_coordinates_skips_invalid_points():
+    index = GeoIndex.from_coordinates({"1": [18.5, 73.8], "2": [-1.0, -1.0], "3": [95, 10], "4": "n/a"})
+    assert index.ids == ["1"]
+    assert index.query_radius(18.5, 73.8, 1)[0]["location_id"] == "1"
+
+
+def test_empty_index():
+    index = GeoIndex([], [], [])
+    assert index.query_radius(18.5, 73.8, 100) == []
+    assert index.query_nearest(18.5, 73.8, 3) == []
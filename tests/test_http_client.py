@@ -0,0 +1,97 @@
+"""Tests for the pooled upstream HTTP transport: session reuse per loop and close."""
+
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from resdex_agent.config import HTTPConfig
+from resdex_agent.utils.http_client import HTTPSessionPool
+
+
+async def ping(request):
+    return web.json_response({"pong": True})
+
+
+async def echo(request):
+    return web.json_response(await request.json())
+
+
+async def start_server():
+    app = web.Application()
+    app.router.add_get("/ping", ping)
+    app.router.add_post("/echo", echo)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+@pytest.fixture
+def pool():
+    return HTTPSessionPool(http_config=HTTPConfig())
+
+
+def test_session_is_reused_within_a_loop(pool):
+    async def run():
+        runner, base = await start_server()
+        try:
+            first = await pool.get("search", f"{base}/ping")
+            session = pool.get_session("search")
+            second = await pool.post("search", f"{base}/echo", json={"a": 1})
+            assert pool.get_session("search") is session
+            assert pool.get_session("facet") is not session
+            await pool.close()
+            return first, second, session
+        finally:
+            await runner.cleanup()
+
+    first, second, session = asyncio.run(run())
+    assert first.ok and first.json() == {"pong": True}
+    assert second.json() == {"a": 1}
+    assert session.closed
+    stats = pool.get_stats()["search"]
+    assert stats["requests"] == 2 and stats["errors"] == 0 and not stats["open"]
+
+
+def test_new_loop_gets_a_new_session(pool):
+    async def grab():
+        return pool.get_session("search")
+
+    async def grab_and_close():
+        session = pool.get_session("search")
+        await pool.close()
+        return session
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab_and_close())
+    assert second is not first
+    assert second.closed
+    assert pool._sessions == {}
+
+
+def test_close_only_touches_the_running_loop(pool):
+    async def grab():
+        return pool.get_session("location")
+
+    stale = asyncio.run(grab())
+
+    async def close_elsewhere():
+        await pool.close()
+
+    asyncio.run(close_elsewhere())
+    # The session was bound to a finished loop; it is forgotten rather than awaited
+    assert pool._sessions == {}
+    assert not stale.closed
+
+
+def test_errors_are_counted(pool):
+    async def run():
+        with pytest.raises(Exception):
+            await pool.get("search", "http://127.0.0.1:1/unreachable", timeout=1.0)
+        await pool.close()
+
+    asyncio.run(run())
+    assert pool.get_stats()["search"]["errors"] == 1
@@ -0,0 +1,129 @@
+"""Tests for dependency planning and deterministic merging of orchestrated intents."""
+
+import asyncio
+
+from resdex_agent.utils.intent_scheduler import IntentScheduler
+
+
+def intent(intent_type, **extra):
+    return {"intent_type": intent_type, **extra}
+
+
+def test_disjoint_footprints_run_independently():
+    depends_on, speculative_on = IntentScheduler().plan([
+        intent("skill_expansion"), intent("location_expansion"), intent("company_expansion")
+    ])
+    assert depends_on == {0: set(), 1: set(), 2: set()}
+    assert speculative_on == {0: set(), 1: set(), 2: set()}
+
+
+def test_writers_of_the_same_key_are_ordered():
+    depends_on, _ = IntentScheduler().plan([
+        intent("skill_expansion"), intent("location_expansion"), intent("title_expansion")
+    ])
+    assert depends_on[2] == {0}
+
+
+def test_read_only_intents_are_speculative():
+    depends_on, speculative_on = IntentScheduler().plan([intent("skill_expansion"), intent("facet_generation")])
+    assert depends_on[1] == set()
+    assert speculative_on[1] == {0}
+
+    depends_on, speculative_on = IntentScheduler(speculative=False).plan(
+        [intent("skill_expansion"), intent("facet_generation")]
+    )
+    assert depends_on[1] == {0}
+    assert speculative_on[1] == set()
+
+
+def test_unknown_and_searching_intents_run_exclusively():
+    depends_on, _ = IntentScheduler().plan([
+        intent("skill_expansion"),
+        intent("general_query"),
+        intent("filter_operation", filter_operations=[{"action": "add_skill", "trigger_search": True}]),
+    ])
+    assert depends_on[1] == {0}
+    assert depends_on[2] == {0, 1}
+
+
+def test_filter_actions_narrow_the_footprint():
+    depends_on, _ = IntentScheduler().plan([
+        intent("filter_operation", filter_operations=[{"action": "modify_experience"}]),
+        intent("filter_operation", filter_operations=[{"action": "add_location"}]),
+        intent("skill_expansion"),
+        intent("filter_operation", filter_operations=[{"action": "add_skill"}]),
+    ])
+    assert depends_on == {0: set(), 1: set(), 2: set(), 3: {2}}
+
+
+def make_runner(delays, effects, seen):
+    """Runner that records its input state, sleeps, then applies ``effects[index](state)``."""
+    async def run_intent(index, _intent, state):
+        seen.setdefault(index, []).append(dict(state))
+        await asyncio.sleep(delays[index])
+        effects[index](state)
+        return {"success": True, "session_state": state}
+    return run_intent
+
+
+def test_merge_follows_execution_order_not_completion_order():
+    seen = {}
+    effects = {
+        0: lambda s: s.update(keywords=s["keywords"] + ["Django"]),
+        1: lambda s: s.update(current_cities=["Pune"]),
+        2: lambda s: s.update(keywords=s["keywords"] + ["Flask"]),
+    }
+    result = asyncio.run(IntentScheduler().run(
+        [intent("skill_expansion"), intent("location_expansion"), intent("skill_expansion")],
+        {"keywords": ["Python"], "current_cities": []},
+        make_runner({0: 0.03, 1: 0.0, 2: 0.0}, effects, seen)
+    ))
+
+    assert result["session_state"]["keywords"] == ["Python", "Django", "Flask"]
+    assert result["session_state"]["current_cities"] == ["Pune"]
+    assert seen[2][0]["keywords"] == ["Python", "Django"]
+    assert seen[1][0]["keywords"] == ["Python"]
+    assert all(record["success"] for record in result["records"])
+
+
+def test_speculative_reader_is_rerun_when_its_input_changed():
+    seen = {}
+    effects = {
+        0: lambda s: s.update(keywords=s["keywords"] + ["Django"]),
+        1: lambda s: s.update(facets=list(s["keywords"])),
+    }
+    result = asyncio.run(IntentScheduler().run(
+        [intent("skill_expansion"), intent("facet_generation")],
+        {"keywords": ["Python"]},
+        make_runner({0: 0.02, 1: 0.0}, effects, seen)
+    ))
+
+    assert result["stats"]["reruns"] == 1
+    assert len(seen[1]) == 2
+    assert result["session_state"]["facets"] == ["Python", "Django"]
+
+
+def test_speculative_reader_is_not_rerun_when_input_is_unchanged():
+    seen = {}
+    effects = {0: lambda s: None, 1: lambda s: s.update(facets=list(s["keywords"]))}
+    result = asyncio.run(IntentScheduler().run(
+        [intent("skill_expansion"), intent("facet_generation")],
+        {"keywords": ["Python"]},
+        make_runner({0: 0.0, 1: 0.0}, effects, seen)
+    ))
+    assert result["stats"]["reruns"] == 0
+    assert len(seen[1]) == 1
+
+
+def test_failed_intent_contributes_no_changes():
+    async def run_intent(index, _intent, state):
+        state["keywords"] = state["keywords"] + [f"Skill{index}"]
+        return {"success": index != 0, "session_state": state}
+
+    result = asyncio.run(IntentScheduler().run(
+        [intent("skill_expansion"), intent("location_expansion")],
+        {"keywords": ["Python"], "current_cities": []},
+        run_intent
+    ))
+    assert result["session_state"]["keywords"] == ["Python", "Skill1"]
+    assert result["records"][0]["success"] is False
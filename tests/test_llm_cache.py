@@ -0,0 +1,122 @@
+"""Tests for LLM response cache keys, TTL expiry and persistence."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from resdex_agent.utils import cache as cache_module
+from resdex_agent.utils.llm_cache import LLMResponseCache, normalize_text
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake.time)
+    return fake
+
+
+def make_cache(**overrides):
+    settings = {"cache_enabled": True, "cache_tasks": "extract_intent,route", "cache_similarity": 0.0,
+                "cache_path": "", "cache_size": 100, "cache_ttl": 60.0}
+    settings.update(overrides)
+    return LLMResponseCache(llm_config=SimpleNamespace(**settings))
+
+
+def test_normalize_text():
+    assert normalize_text("  Add PYTHON!!  ") == "add python"
+    assert normalize_text("c++ & c#") == "c++ c#"
+    assert normalize_text("exp 5-10 years.") == "exp 5-10 years"
+
+
+def test_key_ignores_case_and_punctuation():
+    cache = make_cache()
+    cache.set("extract_intent", "Add Python", {"action": "add_skill"})
+    assert cache.get("extract_intent", "add python!") == {"action": "add_skill"}
+    assert cache.stats["hits"] == 1
+
+
+def test_key_includes_task_and_context():
+    cache = make_cache()
+    cache.set("extract_intent", "add python", {"v": 1}, context={"keywords": ["Java"]})
+    assert cache.get("extract_intent", "add python", context={"keywords": ["Java"]}) == {"v": 1}
+    assert cache.get("extract_intent", "add python", context={"keywords": ["Go"]}) is None
+    assert cache.get("extract_intent", "add python") is None
+    assert cache.get("route", "add python", context={"keywords": ["Java"]}) is None
+
+
+def test_context_key_order_does_not_matter():
+    cache = make_cache()
+    cache.set("route", "relax", {"v": 1}, context={"a": 1, "b": 2})
+    assert cache.get("route", "relax", context={"b": 2, "a": 1}) == {"v": 1}
+
+
+def test_uncacheable_tasks_and_values_are_skipped():
+    cache = make_cache()
+    cache.set("general_chat", "hello", {"v": 1})
+    assert cache.get("general_chat", "hello") is None
+
+    cache.set("route", "hello", {"v": object()})
+    assert cache.stats["skipped"] == 1
+    assert cache.get("route", "hello") is None
+
+    disabled = make_cache(cache_enabled=False)
+    disabled.set("route", "hello", {"v": 1})
+    assert disabled.get("route", "hello") is None
+
+
+def test_hits_return_independent_copies():
+    cache = make_cache()
+    cache.set("route", "add python", {"intents": ["a"]})
+    first = cache.get("route", "add python")
+    first["intents"].append("b")
+    assert cache.get("route", "add python") == {"intents": ["a"]}
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = make_cache(cache_ttl=60.0)
+    cache.set("route", "add python", {"v": 1})
+    clock.now += 59
+    assert cache.get("route", "add python") == {"v": 1}
+    clock.now += 2
+    assert cache.get("route", "add python") is None
+
+
+def test_zero_ttl_never_expires(clock):
+    cache = make_cache(cache_ttl=0)
+    cache.set("route", "add python", {"v": 1})
+    clock.now += 10 ** 7
+    assert cache.get("route", "add python") == {"v": 1}
+
+
+def test_near_duplicates_need_matching_numbers():
+    cache = make_cache(cache_similarity=0.6)
+    cache.set("route", "increase experience by 5 years", {"v": 5})
+    assert cache.get("route", "increase the experience by 5 years") == {"v": 5}
+    assert cache.stats["near_hits"] == 1
+    assert cache.get("route", "increase the experience by 6 years") is None
+    assert cache.get("route", "increase the experience by 5 years", allow_similar=False) is None
+
+
+def test_persistence_round_trip_drops_expired_entries(tmp_path, clock):
+    path = tmp_path / "llm_cache.jsonl"
+    cache = make_cache(cache_path=str(path), cache_ttl=60.0)
+    cache.set("route", "add python", {"v": 1})
+    clock.now += 30
+    cache.set("route", "add java", {"v": 2})
+
+    clock.now += 45
+    reloaded = make_cache(cache_path=str(path), cache_ttl=60.0)
+    assert reloaded.get("route", "add python") is None
+    assert reloaded.get("route", "add java") == {"v": 2}
+    assert len(path.read_text().splitlines()) == 1
+
+    clock.now += 20
+    assert reloaded.get("route", "add java") is None
@@ -0,0 +1,106 @@
+"""Tests for the binary location bundle: build/load round trip and staleness detection."""
+
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from resdex_agent.utils.location_dataset import (
+    LocationBundleError, build_location_bundle, load_location_bundle, load_location_dataset, pack_sources
+)
+
+
+@pytest.fixture
+def sources(tmp_path):
+    coordinates_path = tmp_path / "coordinates.json"
+    city_dict_path = tmp_path / "city_dict.pickle"
+    coordinates_path.write_text(json.dumps({
+        "1": [18.52, 73.85], "2": [19.07, 72.87], "3": [-1.0, -1.0], "9": [12.97, 77.59]
+    }))
+    with open(city_dict_path, 'wb') as f:
+        pickle.dump({1: "Pune", 2: "Mumbai / Bombay", 3: "Nowhere", 4: "Bengaluru / Bangalore"}, f)
+    return coordinates_path, city_dict_path
+
+
+def test_pack_sources_layout(sources):
+    arrays = pack_sources(*sources)
+    assert arrays["ids"].tolist() == [1, 2, 3, 4, 9]
+    assert arrays["coords"].dtype == np.float32
+    assert np.isnan(arrays["coords"][2]).all() and np.isnan(arrays["coords"][3]).all()
+    assert arrays["name_offsets"][-1] == len(arrays["name_blob"])
+
+
+def test_bundle_round_trip(tmp_path, sources):
+    bundle_dir = build_location_bundle(tmp_path / "bundle", *sources)
+    packed = pack_sources(*sources)
+    loaded = load_location_bundle(bundle_dir, sources=list(sources))
+    for name, array in packed.items():
+        assert isinstance(loaded[name], np.memmap)
+        np.testing.assert_array_equal(np.asarray(loaded[name]), array)
+
+    dataset = load_location_dataset(bundle_dir, *sources)
+    assert dataset.source == "bundle"
+    assert dataset.id_to_name == {"1": "Pune", "2": "Mumbai / Bombay", "3": "Nowhere",
+                                  "4": "Bengaluru / Bangalore"}
+    assert dataset.located_ids == ["1", "2", "9"]
+    assert dataset.coordinates["2"] == [19.07, 72.87]
+    assert dataset.geo_index.query_nearest(18.5, 73.8, 1)[0]["location_id"] == "1"
+
+
+def test_changed_source_makes_bundle_stale(tmp_path, sources):
+    coordinates_path, city_dict_path = sources
+    bundle_dir = build_location_bundle(tmp_path / "bundle", coordinates_path, city_dict_path)
+
+    # Same size, different content: only the checksum catches it
+    original = coordinates_path.read_text()
+    coordinates_path.write_text(original.replace("18.52", "18.53"))
+    with pytest.raises(LocationBundleError, match="stale"):
+        load_location_bundle(bundle_dir, verify=True, sources=[coordinates_path, city_dict_path])
+    load_location_bundle(bundle_dir, verify=False, sources=[coordinates_path, city_dict_path])
+
+    coordinates_path.write_text(original.replace("18.52", "18.5"))
+    with pytest.raises(LocationBundleError, match="stale"):
+        load_location_bundle(bundle_dir, verify=False, sources=[coordinates_path, city_dict_path])
+
+    dataset = load_location_dataset(bundle_dir, coordinates_path, city_dict_path)
+    assert dataset.source == "json+pickle"
+    assert dataset.coordinates["1"] == [18.5, 73.85]
+
+
+def test_corrupted_array_is_rejected(tmp_path, sources):
+    bundle_dir = build_location_bundle(tmp_path / "bundle", *sources)
+    coords = np.load(bundle_dir / "coords.npy")
+    coords[0] = [0.0, 0.0]
+    np.save(bundle_dir / "coords.npy", coords)
+    with pytest.raises(LocationBundleError, match="Checksum mismatch"):
+        load_location_bundle(bundle_dir, verify=True)
+
+
+def test_missing_bundle_falls_back_to_sources(tmp_path, sources):
+    with pytest.raises(LocationBundleError):
+        load_location_bundle(tmp_path / "missing")
+    dataset = load_location_dataset(tmp_path / "missing", *sources)
+    assert dataset.source == "json+pickle"
+    assert len(dataset) == 5
+
+
+def test_missing_sources_give_an_empty_dataset(tmp_path):
+    dataset = load_location_dataset(tmp_path / "missing", tmp_path / "none.json", tmp_path / "none.pickle")
+    assert len(dataset) == 0
+    assert dataset.id_to_name == {}
+    assert dataset.geo_index.query_radius(18.5, 73.8, 100) == []
+
+
+def test_one_missing_source_keeps_the_other(tmp_path, sources):
+    coordinates_path, _ = sources
+    dataset = load_location_dataset(tmp_path / "missing", coordinates_path, tmp_path / "none.pickle")
+    assert dataset.id_to_name == {}
+    assert dataset.located_ids == ["1", "2", "9"]
+
+
+def test_build_requires_both_sources(tmp_path, sources):
+    coordinates_path, _ = sources
+    with pytest.raises(LocationBundleError, match="missing"):
+        build_location_bundle(tmp_path / "bundle", coordinates_path, tmp_path / "none.pickle")
+    assert not (tmp_path / "bundle").exists()
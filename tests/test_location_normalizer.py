@@ -0,0 +1,105 @@
+"""Tests for city-name normalization: static tier, TTL cache and one batched API call."""
+
+import asyncio
+import json
+import pickle
+
+import pytest
+
+from resdex_agent.utils import location_normalizer as normalizer_module
+from resdex_agent.utils.location_normalizer import LocationNormalizer
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.text = payload if isinstance(payload, str) else json.dumps(payload)
+
+
+class FakePool:
+    """Answers each requested city with a globalId from a table, recording every request."""
+
+    def __init__(self, ids, fail=False):
+        self.ids = ids
+        self.fail = fail
+        self.requests = []
+
+    def answer(self, payload):
+        self.requests.append([entry["city"] for entry in payload["location"]])
+        if self.fail:
+            raise ConnectionError("location API down")
+        return FakeResponse([
+            {"city": {"globalId": self.ids[entry["city"]]}} if entry["city"] in self.ids else {}
+            for entry in payload["location"]
+        ])
+
+    async def post(self, upstream, url, headers=None, json=None):
+        assert upstream == "location"
+        return self.answer(json)
+
+
+@pytest.fixture
+def city_dict_path(tmp_path):
+    path = tmp_path / "city_dict.pickle"
+    with open(path, 'wb') as f:
+        pickle.dump({17: "Pune", 23: "Mumbai / Bombay"}, f)
+    return path
+
+
+@pytest.fixture
+def pool():
+    return FakePool({"Nashik": 101, "Thane": 102})
+
+
+@pytest.fixture
+def normalizer(city_dict_path, pool):
+    normalizer = LocationNormalizer(api_url="http://location.test", cache_size=10, cache_ttl=60, prewarm=False)
+    normalizer.warm_from_city_dict(city_dict_path)
+    normalizer.http_pool = pool
+    return normalizer
+
+
+def test_static_tier_needs_no_api_call(normalizer, pool):
+    assert asyncio.run(normalizer.resolve(["Pune", "bombay", " MUMBAI "])) == {
+        "Pune": "17", "bombay": "23", " MUMBAI ": "23"
+    }
+    assert pool.requests == []
+    assert normalizer.seed_hits == 3
+    assert normalizer.is_known_city("Bombay") and not normalizer.is_known_city("Nashik")
+    assert normalizer.canonical_city(" pune ") == "Pune"
+    assert normalizer.canonical_city("Nashik") is None
+
+
+def test_unknown_cities_share_one_batched_request(normalizer, pool):
+    result = asyncio.run(normalizer.resolve(["Nashik", "Pune", "Thane", "Nashik", "Atlantis"]))
+    assert result == {"Pune": "17", "Nashik": "101", "Thane": "102", "Atlantis": None}
+    assert pool.requests == [["Nashik", "Thane", "Atlantis"]]
+
+
+def test_api_answers_are_cached(normalizer, pool):
+    asyncio.run(normalizer.resolve(["Nashik", "Atlantis"]))
+    assert asyncio.run(normalizer.resolve(["nashik"])) == {"nashik": "101"}
+    # Cities the API could not place are asked again next time
+    asyncio.run(normalizer.resolve(["Nashik", "Atlantis"]))
+    assert pool.requests == [["Nashik", "Atlantis"], ["Atlantis"]]
+    assert normalizer.api_requests == 2
+    assert normalizer.get_stats()["cache_size"] == 1
+
+
+def test_failed_request_resolves_to_none(normalizer, pool):
+    pool.fail = True
+    assert asyncio.run(normalizer.resolve(["Pune", "Nashik"])) == {"Pune": "17", "Nashik": None}
+    pool.fail = False
+    assert asyncio.run(normalizer.resolve(["Nashik"])) == {"Nashik": "101"}
+
+
+def test_malformed_response_resolves_to_none(normalizer):
+    assert normalizer._parse_response("not json", ["Nashik"]) == {"Nashik": None}
+    assert normalizer._parse_response('{"city": {}}', ["Nashik"]) == {"Nashik": None}
+
+
+def test_resolve_sync_matches_resolve(normalizer, pool, monkeypatch):
+    monkeypatch.setattr(normalizer_module.requests, "post",
+                        lambda url, headers=None, json=None, timeout=None: pool.answer(json))
+    assert normalizer.resolve_sync(["Thane", "Pune"]) == {"Pune": "17", "Thane": "102"}
+    assert normalizer.resolve_sync(["thane"]) == {"thane": "102"}
+    assert pool.requests == [["Thane"]]
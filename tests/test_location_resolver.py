@@ -0,0 +1,95 @@
+"""Tests for the indexed location resolver: aliases, fuzzy matching and globalId parity."""
+
+import pickle
+
+import pytest
+
+from resdex_agent.utils.location_dataset import CITY_DICT_PATH
+from resdex_agent.utils.location_resolver import LocationResolver, get_location_resolver, normalize_name
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return get_location_resolver()
+
+
+@pytest.fixture(scope="module")
+def seed_ids():
+    """The {normalized spelling: globalId} table LocationNormalizer used to pre-warm from city_dict."""
+    with open(CITY_DICT_PATH, 'rb') as f:
+        city_dict = pickle.load(f)
+
+    def key(text):
+        return " ".join(str(text).lower().split())
+
+    seed = {}
+    for location_id, name in city_dict.items():
+        seed.setdefault(key(name), str(location_id))
+        for alias in str(name).split('/'):
+            if key(alias):
+                seed.setdefault(key(alias), str(location_id))
+    return seed
+
+
+def test_normalize_name():
+    assert normalize_name("  Navi-Mumbai ") == "navi mumbai"
+    assert normalize_name("Bengaluru / Bangalore") == "bengaluru/bangalore"
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("bombay", "Mumbai"),
+    ("Calcutta", "Kolkata"),
+    ("madras", "Chennai"),
+    ("gurugram", "Gurgaon"),
+    ("Bangalore", "Bangalore"),
+    ("new delhi", "Delhi"),
+])
+def test_aliases_resolve_to_canonical_spelling(resolver, query, expected):
+    assert resolver.canonical_name(query) == expected
+
+
+def test_alias_match_type(resolver):
+    match = resolver.best_match("bombay")
+    assert match["match_type"] == "alias"
+    assert match["matched_name"] == "Mumbai"
+
+
+def test_typos_and_prefixes(resolver):
+    assert resolver.best_match("Hyderbad")["matched_name"] == "Hyderabad"
+    assert resolver.best_match("Hyderbad")["match_type"] == "fuzzy"
+    assert resolver.best_match("Chenn")["matched_name"] == "Chennai"
+    assert resolver.best_match("Pune, Maharashtra")["matched_name"] == "Pune"
+
+
+def test_unknown_names_fall_below_confident_scores(resolver):
+    assert resolver.canonical_name("zzqx") is None
+    assert resolver.resolve_id("atlantis", min_score=0.9) is None
+
+
+@pytest.mark.parametrize("city, global_id", [("Delhi", "6"), ("Bangalore", "3"), ("Gurugram", "7")])
+def test_known_global_ids(resolver, city, global_id):
+    assert resolver.resolve_id(city, min_score=0.9, prefer_located=False) == global_id
+
+
+def test_global_id_parity_with_seed_table(resolver, seed_ids):
+    # Compound "A/B" keys are spellings no user types; several ids share them with different spacing
+    mismatches = {
+        spelling: (global_id, resolver.resolve_id(spelling, min_score=0.9, prefer_located=False))
+        for spelling, global_id in seed_ids.items()
+        if "/" not in spelling and normalize_name(spelling) == spelling
+        and resolver.resolve_id(spelling, min_score=0.9, prefer_located=False) != global_id
+    }
+    assert mismatches == {}
+
+
+def test_prefer_located_ranks_ids_with_coordinates_first():
+    resolver = LocationResolver({"1": "Springfield", "2": "Springfield"}, located_ids=["2"])
+    assert resolver.resolve_id("springfield") == "2"
+    assert resolver.resolve_id("springfield", prefer_located=False) == "1"
+
+
+def test_results_are_cached_as_copies():
+    resolver = LocationResolver({"1": "Pune"})
+    first = resolver.match("pune")
+    first[0]["name"] = "changed"
+    assert resolver.match("pune")[0]["name"] == "Pune"
@@ -0,0 +1,163 @@
+"""Tests for the shared matrix-expansion service: micro-batching and parity with local mode."""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+SKILLS = ["python", "java", "reactjs", "django", "flask", "sql", "docker", "aws", "pandas", "numpy"]
+TITLES = ["data_scientist", "software_engineer", "backend_developer", "devops_engineer", "data_analyst"]
+
+
+@pytest.fixture(scope="module")
+def fml(load_tool):
+    return load_tool("FeatureMatrixLoader")
+
+
+@pytest.fixture(scope="module")
+def service_module(load_tool):
+    return load_tool("matrix_service")
+
+
+@pytest.fixture(scope="module")
+def tool_module(load_tool):
+    return load_tool("matrix_expansion_tool")
+
+
+def make_feature(fml, rows, cols, seed):
+    feature = fml.Feature2dMatrix.__new__(fml.Feature2dMatrix)
+    feature.topk = None
+    feature.matrix = sparse.csr_matrix(np.random.default_rng(seed).random((len(rows), len(cols))))
+    feature.row_vocab = rows
+    feature.col_vocab = cols
+    feature.row_vocab_dict = {name: i for i, name in enumerate(rows)}
+    return feature
+
+
+@pytest.fixture
+def tool(fml, tool_module, monkeypatch):
+    """A local-mode MatrixExpansionTool over small in-memory matrices, with kernel calls counted."""
+    features = SimpleNamespace(
+        skillToSkillFeature=make_feature(fml, SKILLS, SKILLS, 1),
+        skillToTitleFeature=make_feature(fml, SKILLS, TITLES, 2),
+        titleToSkillFeature=make_feature(fml, TITLES, SKILLS, 3),
+        titleToTitleFeature=make_feature(fml, TITLES, TITLES, 4),
+    )
+    calls = []
+    for feature in vars(features).values():
+        batch = feature.get_feature_values_batch
+        feature.get_feature_values_batch = (
+            lambda queries, _batch=batch, **kwargs: calls.append(len(queries)) or _batch(queries, **kwargs)
+        )
+
+    cls = tool_module.MatrixExpansionTool
+    for name, value in [("_instance", None), ("_initialized", True), ("_matrix_features", features),
+                        ("_initialization_error", None), ("_skill_convertor", None), ("_title_convertor", None),
+                        ("_service_client", None)]:
+        monkeypatch.setattr(cls, name, value)
+    # MatrixService.start() imports the tool relative to its own package
+    monkeypatch.setitem(sys.modules, "resdex_agent.tools.matrix_expansion_tool", tool_module)
+
+    tool = cls("matrix_expansion_tool", local=True)
+    tool.kernel_calls = calls
+    return tool
+
+
+REQUESTS = [
+    ("skill_to_skill", ["Python"], 3),
+    ("skill_to_skill", ["Django", "Flask"], 3),
+    ("skill_to_skill", ["Cobol"], 3),
+    ("skill_to_title", ["SQL", "Pandas"], 2),
+    ("title_to_title", ["Data Scientist"], 3),
+    ("title_to_skill", ["Backend Developer", "DevOps Engineer"], 4),
+    ("skill_to_skill", ["Docker"], 5),
+]
+
+
+def run_with_service(service_module, tool, socket_path, scenario, batch_window_ms=50):
+    async def run():
+        service = service_module.MatrixService(socket_path=socket_path, batch_window_ms=batch_window_ms)
+        await service.start()
+        client = service_module.MatrixServiceClient(socket_path=socket_path, request_timeout=5)
+        try:
+            return await scenario(service, client)
+        finally:
+            if client._writer is not None:
+                client._writer.close()
+                await client._writer.wait_closed()
+                # Let the service see EOF before the server goes away
+                await asyncio.sleep(0.01)
+            service._server.close()
+            await service._server.wait_closed()
+            service._batcher.cancel()
+    return asyncio.run(run())
+
+
+def test_concurrent_requests_match_local_mode(service_module, tool, tmp_path):
+    local = [asyncio.run(tool.expand_batch(kind, [items], top_n))[0] for kind, items, top_n in REQUESTS]
+    tool.kernel_calls.clear()
+
+    async def scenario(service, client):
+        results = await asyncio.gather(*[client.expand(kind, items, top_n) for kind, items, top_n in REQUESTS])
+        return results, await client.get_stats()
+
+    results, stats = run_with_service(service_module, tool, str(tmp_path / "matrix.sock"), scenario)
+
+    assert results == local
+    assert results[2]["success"] and results[2]["expanded_items"] == []
+    # Requests that share (expansion_type, top_n) are scored by one kernel call
+    # The stats call itself is the last request
+    assert stats["requests"] == len(REQUESTS) + 1 and stats["batches"] == 1
+    assert sorted(tool.kernel_calls) == [1, 1, 1, 1, 3]
+    assert stats["matrix"]["available"] is True
+
+
+def test_max_batch_size_splits_batches(service_module, tool, tmp_path):
+    async def scenario(service, client):
+        service.max_batch_size = 2
+        await asyncio.gather(*[client.expand("skill_to_skill", [skill], 3) for skill in ("Python", "Java", "SQL")])
+        return service.get_stats()
+
+    stats = run_with_service(service_module, tool, str(tmp_path / "matrix.sock"), scenario)
+    assert stats["batches"] == 2 and stats["max_batch"] == 2
+
+
+def test_client_mode_tool_matches_local_mode(service_module, tool, tmp_path):
+    groups = [["Python"], ["Django", "Flask"], ["AWS", "Docker"]]
+    local = asyncio.run(tool.expand_batch("skill_to_skill", groups, 4))
+    local_multi = asyncio.run(tool.expand_multi(["title_to_title", "title_to_skill"], ["Data Analyst"], 3))
+
+    async def scenario(service, client):
+        # A worker's tool in client mode; the singleton itself stays local inside the service
+        worker_tool = object.__new__(type(tool))
+        worker_tool._service_client = client
+        return (await worker_tool.expand_batch("skill_to_skill", groups, 4),
+                await worker_tool.expand_multi(["title_to_title", "title_to_skill"], ["Data Analyst"], 3),
+                await worker_tool("skill_to_skill", ["Python"], 4))
+
+    remote, remote_multi, single = run_with_service(service_module, tool, str(tmp_path / "matrix.sock"), scenario)
+    assert remote == local
+    assert remote_multi == local_multi
+    assert single == local[0]
+
+
+def test_errors_are_returned_to_the_caller(service_module, tool, tmp_path):
+    async def scenario(service, client):
+        unknown = await client.expand("role_to_role", ["Python"])
+        with pytest.raises(service_module.MatrixServiceError, match="Unknown op"):
+            await client.request("drop")
+        return unknown, await client.request("ping")
+
+    unknown, pong = run_with_service(service_module, tool, str(tmp_path / "matrix.sock"), scenario)
+    assert unknown == {"success": False, "error": "Unknown expansion type: role_to_role", "method": "invalid_type"}
+    assert pong == "pong"
+
+
+def test_unreachable_service(service_module, tmp_path):
+    client = service_module.MatrixServiceClient(socket_path=str(tmp_path / "missing.sock"), request_timeout=1)
+    assert not client.is_available()
+    with pytest.raises(service_module.MatrixServiceError, match="Cannot reach"):
+        asyncio.run(client.expand("skill_to_skill", ["Python"]))
@@ -0,0 +1,49 @@
+"""Tests for validation of upstream filter operations."""
+
+import pytest
+
+from resdex_agent.sub_agents.search_interaction.tools import IntentProcessor
+
+validate = IntentProcessor.validate_filter_operations
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (True, True), ("true", True), ("True", True),
+    (False, False), ("false", False), ("False", False), ("no", False), (None, False), (1, False),
+])
+def test_boolean_flags_are_parsed_not_truthiness_tested(raw, expected):
+    [operation] = validate({"action": "add_skill", "value": "Python", "mandatory": raw, "trigger_search": raw})
+    assert operation["mandatory"] is expected
+    assert operation["trigger_search"] is expected
+
+
+def test_defaults_are_filled_in():
+    assert validate({"action": "add_skill", "value": "Python"}) == [{
+        "action": "add_skill", "value": "Python", "mandatory": False, "trigger_search": False, "response_text": ""
+    }]
+
+
+@pytest.mark.parametrize("action", sorted(IntentProcessor.TEXT_ACTIONS))
+@pytest.mark.parametrize("value", [None, "", "   ", 5, ["Python"], {"min": 1}])
+def test_name_actions_require_a_string(action, value):
+    assert validate({"action": action, "value": value}) is None
+
+
+def test_one_bad_operation_rejects_the_batch():
+    assert validate([{"action": "add_skill", "value": "Python"}, {"action": "add_location", "value": 42}]) is None
+
+
+@pytest.mark.parametrize("value, valid", [
+    ("5", True), ("3-8", True), ("2.5 - 6", True), ({"min": 2}, True), (7, True),
+    ("five", False), ({"low": 2}, False), ("", False),
+])
+def test_range_values(value, valid):
+    result = validate({"action": "modify_experience", "value": value})
+    assert (result is not None) is valid
+
+
+def test_unknown_actions_and_shapes_are_rejected():
+    assert validate({"action": "drop_table", "value": "x"}) is None
+    assert validate([]) is None
+    assert validate("add python") is None
+    assert validate(["add python"]) is None
@@ -0,0 +1,98 @@
+"""Tests for SearchTool.stream(): page order, bounded prefetch and failure pages."""
+
+import asyncio
+
+import pytest
+
+
+class FakeAPI:
+    """Search returns ids 1..n; later pages hydrate faster so they finish out of order."""
+
+    def __init__(self, count, success=True):
+        self.count = count
+        self.success = success
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.detail_calls = []
+
+    async def build_search_request_async(self, search_filters):
+        return {}
+
+    async def search_candidates(self, payload):
+        if not self.success:
+            return {"success": False, "error": "search API returned 503"}
+        return {"success": True, "total_count": 1234,
+                "data": {"results": [{"USERID": i} for i in range(1, self.count + 1)]}}
+
+    async def get_user_details(self, user_ids):
+        self.detail_calls.append(list(user_ids))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.05 / len(self.detail_calls))
+            return [{"basic": {"userid": uid, "username": f"user{uid}"}} for uid in user_ids]
+        finally:
+            self.in_flight -= 1
+
+
+class FakeDB:
+    chunk = staticmethod(lambda ids, size: [ids[i:i + size] for i in range(0, len(ids), size)])
+
+    async def get_real_names(self, user_ids):
+        return {uid: f"Name {uid}" for uid in user_ids if uid != "3"}
+
+
+@pytest.fixture(scope="module")
+def search_tools(load_tool):
+    return load_tool("search_tools")
+
+
+def make_tool(search_tools, api):
+    tool = search_tools.SearchTool()
+    tool.api_client = api
+    tool.db_manager = FakeDB()
+    return tool
+
+
+def collect(tool, filters, **kwargs):
+    async def run():
+        return [page async for page in tool.stream(filters, **kwargs)]
+    return asyncio.run(run())
+
+
+def test_pages_arrive_in_order(search_tools):
+    api = FakeAPI(count=25)
+    pages = collect(make_tool(search_tools, api), {"max_candidates": 25}, page_size=4, prefetch_pages=2)
+
+    assert [page["page"] for page in pages] == list(range(7))
+    assert [page["done"] for page in pages] == [False] * 6 + [True]
+    names = [candidate["name"] for page in pages for candidate in page["candidates"]]
+    assert names == [f"Name {i}" if i != 3 else "User3" for i in range(1, 26)]
+    assert all(page["total_count"] == 1234 and page["total_pages"] == 7 for page in pages)
+
+
+def test_first_page_is_dispatched_alone_and_prefetch_is_bounded(search_tools):
+    api = FakeAPI(count=40)
+    collect(make_tool(search_tools, api), {"max_candidates": 40}, page_size=5, prefetch_pages=2)
+
+    assert api.detail_calls[0] == [str(i) for i in range(1, 6)]
+    assert len(api.detail_calls) == 8
+    assert api.max_in_flight <= 3
+
+
+def test_no_prefetch_hydrates_one_page_at_a_time(search_tools):
+    api = FakeAPI(count=12)
+    collect(make_tool(search_tools, api), {"max_candidates": 12}, page_size=5, prefetch_pages=0)
+    assert api.max_in_flight == 1
+
+
+def test_search_failure_yields_one_final_page(search_tools):
+    pages = collect(make_tool(search_tools, FakeAPI(count=5, success=False)), {})
+    assert len(pages) == 1
+    assert pages[0]["success"] is False and pages[0]["done"] is True
+    assert "503" in pages[0]["error"]
+
+
+def test_no_results_yield_one_empty_page(search_tools):
+    pages = collect(make_tool(search_tools, FakeAPI(count=0)), {})
+    assert [(page["candidates"], page["done"]) for page in pages] == [([], True)]
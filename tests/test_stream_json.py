@@ -0,0 +1,86 @@
+"""Tests for incremental JSON extraction from streamed LLM output."""
+
+from resdex_agent.utils.stream_json import StreamingJSONParser, parse_first_json
+
+
+def feed_all(chunks):
+    parser = StreamingJSONParser()
+    for chunk in chunks:
+        if parser.feed(chunk):
+            break
+    return parser
+
+
+def test_plain_object():
+    assert parse_first_json('Here you go: {"action": "add_skill", "value": "Python"} done') == {
+        "action": "add_skill", "value": "Python"
+    }
+
+
+def test_think_block_is_skipped():
+    assert parse_first_json('<think>maybe {"wrong": 1}</think>{"right": 2}') == {"right": 2}
+
+
+def test_think_tags_split_across_chunks():
+    parser = feed_all(['<thi', 'nk>draft {"wrong": ', '1}</th', 'ink>\n{"right"', ': 2}'])
+    assert parser.done
+    assert parser.value == {"right": 2}
+
+
+def test_unterminated_think_waits_for_more_input():
+    parser = StreamingJSONParser()
+    assert not parser.feed('<think>{"wrong": 1}')
+    assert not parser.feed('</think')
+    assert parser.feed('>{"right": 2}')
+    assert parser.value == {"right": 2}
+
+
+def test_object_split_across_chunks():
+    parser = StreamingJSONParser()
+    assert not parser.feed('{"intents": [{"intent_type": "skill_')
+    assert not parser.feed('expansion"}, {"note": "brace } in a string"}')
+    assert parser.feed(']} trailing chatter')
+    assert parser.value["intents"][1]["note"] == "brace } in a string"
+
+
+def test_mismatched_brackets_are_skipped():
+    assert parse_first_json('see (a[b} c) then {"value": [1, 2]}') == {"value": [1, 2]}
+
+
+def test_trailing_commas_are_tolerated():
+    assert parse_first_json('{"keywords": ["Python", "Java",], "mandatory": false,}') == {
+        "keywords": ["Python", "Java"], "mandatory": False
+    }
+
+
+def test_invalid_candidate_falls_through_to_next_value():
+    assert parse_first_json('{not json} {"ok": true}') == {"ok": True}
+
+
+def test_stray_scalar_array_does_not_win_over_object():
+    assert parse_first_json('As noted in [1], the answer is {"action": "add_skill"}') == {"action": "add_skill"}
+
+
+def test_stray_scalar_array_does_not_stop_the_stream():
+    parser = StreamingJSONParser()
+    assert not parser.feed('Per [1] and [2, 3]: ')
+    assert parser.feed('{"action": "remove_skill"}')
+    assert parser.value == {"action": "remove_skill"}
+
+
+def test_array_of_objects_is_an_answer():
+    assert parse_first_json('[{"intent_id": 1}, {"intent_id": 2}] extra') == [{"intent_id": 1}, {"intent_id": 2}]
+
+
+def test_scalar_array_is_returned_when_nothing_better_follows():
+    assert parse_first_json('The ids are [3, 7, 9].') == [3, 7, 9]
+
+
+def test_no_json():
+    assert parse_first_json("<think>{}</think> nothing here") is None
+
+
+def test_think_tags_are_case_insensitive():
+    assert parse_first_json('<THINK>draft {"a": 1}</THINK>[{"b": 2}]') == [{"b": 2}]
+    parser = feed_all(['<Th', 'InK>{"a": 1}</tH', 'ink>{"b": 2}'])
+    assert parser.value == {"b": 2}